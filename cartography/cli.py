@@ -160,6 +160,25 @@ class CLI:
                 'syncing other accounts and delay raising an exception until the very end.'
             ),
         )
+        parser.add_argument(
+            '--aws-sync-concurrency',
+            type=int,
+            default=1,
+            help=(
+                'The number of AWS accounts to sync concurrently. Each account is synced in its own worker with its '
+                'own Neo4j session and boto3 session. Org-wide cleanup and analysis jobs still run once after every '
+                'account has finished. Default = 1, which syncs accounts one at a time.'
+            ),
+        )
+        parser.add_argument(
+            '--aws-iam-use-authorization-details',
+            action='store_true',
+            help=(
+                'Collect AWS IAM users, groups, roles, their policies and role tags with the paginated '
+                'GetAccountAuthorizationDetails API instead of making several API calls per principal. This needs the '
+                'iam:GetAccountAuthorizationDetails permission, which is part of the SecurityAudit policy.'
+            ),
+        )
         parser.add_argument(
             '--oci-sync-all-profiles',
             action='store_true',
@@ -232,6 +251,17 @@ class CLI:
                 'jobs are executed.'
             ),
         )
+        parser.add_argument(
+            '--analysis-job-concurrency',
+            type=int,
+            default=1,
+            help=(
+                'The number of analysis jobs to run concurrently, each with its own Neo4j session. A job can declare '
+                'the node labels and relationship types it reads and writes in the optional "reads" and "writes" '
+                'lists of its JSON file. Jobs that do not declare both, or that write what another job reads or '
+                'writes, keep their order. Default = 1, which runs jobs one at a time.'
+            ),
+        )
         parser.add_argument(
             '--okta-org-id',
             type=str,
@@ -269,6 +299,14 @@ class CLI:
                 'Required if you are using the GitHub intel module. Ignored otherwise.'
             ),
         )
+        parser.add_argument(
+            '--github-incremental-repo-sync',
+            action='store_true',
+            help=(
+                'Only fetch the GitHub repos that were updated or pushed to since the previous sync. Repos that did '
+                'not change are kept as they are in the graph. The first sync of each organization is a full sync.'
+            ),
+        )
         parser.add_argument(
             '--digitalocean-token-env-var',
             type=str,
@@ -340,6 +378,16 @@ class CLI:
                 'The path to kubeconfig file specifying context to access K8s cluster(s).'
             ),
         )
+        parser.add_argument(
+            '--k8s-sync-concurrency',
+            type=int,
+            default=1,
+            help=(
+                'The number of K8s clusters to sync concurrently. Each cluster is synced in its own worker with its '
+                'own Neo4j session. The cleanup job still runs once after every cluster has finished. Default = 1, '
+                'which syncs clusters one at a time.'
+            ),
+        )
         parser.add_argument(
             '--nist-cve-url',
             type=str,
@@ -591,6 +639,17 @@ class CLI:
         if config.aws_requested_syncs:
             # No need to store the returned value; we're using this for input validation.
             parse_and_validate_aws_requested_syncs(config.aws_requested_syncs)
+        if config.aws_sync_concurrency < 1:
+            raise ValueError(f'--aws-sync-concurrency must be a positive integer, got {config.aws_sync_concurrency}.')
+
+        if config.analysis_job_concurrency < 1:
+            raise ValueError(
+                f'--analysis-job-concurrency must be a positive integer, got {config.analysis_job_concurrency}.',
+            )
+
+        # K8s config
+        if config.k8s_sync_concurrency < 1:
+            raise ValueError(f'--k8s-sync-concurrency must be a positive integer, got {config.k8s_sync_concurrency}.')
 
         # Azure config
         if config.azure_sp_auth and config.azure_client_secret_env_var:
@@ -29,6 +29,13 @@ class Config:
     :type aws_best_effort_mode: bool
     :param aws_best_effort_mode: If True, AWS sync will not raise any exceptions, just log. If False (default),
         exceptions will be raised.
+    :type aws_sync_concurrency: int
+    :param aws_sync_concurrency: Number of AWS accounts to sync at the same time, each in its own worker with its own
+        Neo4j session and boto3 session. Defaults to 1, which syncs accounts one after another. Optional.
+    :type aws_iam_use_authorization_details: bool
+    :param aws_iam_use_authorization_details: If True, AWS IAM users, groups, roles, policies and role tags are
+        collected with the paginated GetAccountAuthorizationDetails API instead of per-principal API calls. If False
+        (default), the per-principal APIs are used. Optional.
     :type azure_sync_all_subscriptions: bool
     :param azure_sync_all_subscriptions: If True, Azure sync will run for all profiles in azureProfile.json. If
         False (default), Azure sync will run using current user session via CLI credentials. Optional.
@@ -45,6 +52,10 @@ class Config:
     :param aws_requested_syncs: Comma-separated list of AWS resources to sync. Optional.
     :type analysis_job_directory: str
     :param analysis_job_directory: Path to a directory tree containing analysis jobs to run. Optional.
+    :type analysis_job_concurrency: int
+    :param analysis_job_concurrency: Number of analysis jobs to run at the same time, each with its own Neo4j session.
+        Only jobs that declare the labels they read and write, and that do not conflict, run together. Defaults to 1,
+        which runs jobs one after another. Optional.
     :type oci_sync_all_profiles: bool
     :param oci_sync_all_profiles: whether OCI will sync non-default profiles in OCI_CONFIG_FILE. Optional.
     :type okta_org_id: str
@@ -55,6 +66,9 @@ class Config:
     :param okta_saml_role_regex: The regex used to map okta groups to AWS roles. Optional.
     :type github_config: str
     :param github_config: Base64 encoded config object for GitHub ingestion. Optional.
+    :type github_incremental_repo_sync: bool
+    :param github_incremental_repo_sync: If True, only fetch the GitHub repos that were updated or pushed to since the
+        previous sync, and keep the other repos as they are in the graph. Optional.
     :type digitalocean_token: str
     :param digitalocean_token: DigitalOcean access token. Optional.
     :type permission_relationships_file: str
@@ -79,6 +93,9 @@ class Config:
     :param statsd_port: If statsd_enabled is True, send metrics to this port on statsd_host. Optional.
     :type: k8s_kubeconfig: str
     :param k8s_kubeconfig: Path to kubeconfig file for kubernetes cluster(s). Optional
+    :type k8s_sync_concurrency: int
+    :param k8s_sync_concurrency: Number of kubernetes clusters to sync at the same time, each in its own worker with its
+        own Neo4j session. Defaults to 1, which syncs clusters one after another. Optional.
     :type: pagerduty_api_key: str
     :param pagerduty_api_key: API authentication key for pagerduty. Optional.
     :type: pagerduty_request_timeout: int
@@ -126,6 +143,8 @@ class Config:
         update_tag=None,
         aws_sync_all_profiles=False,
         aws_best_effort_mode=False,
+        aws_sync_concurrency=1,
+        aws_iam_use_authorization_details=False,
         azure_sync_all_subscriptions=False,
         azure_sp_auth=None,
         azure_tenant_id=None,
@@ -133,11 +152,13 @@ class Config:
         azure_client_secret=None,
         aws_requested_syncs=None,
         analysis_job_directory=None,
+        analysis_job_concurrency=1,
         oci_sync_all_profiles=None,
         okta_org_id=None,
         okta_api_key=None,
         okta_saml_role_regex=None,
         github_config=None,
+        github_incremental_repo_sync=False,
         digitalocean_token=None,
         permission_relationships_file=None,
         jamf_base_uri=None,
@@ -147,6 +168,7 @@ class Config:
         kandji_tenant_id=None,
         kandji_token=None,
         k8s_kubeconfig=None,
+        k8s_sync_concurrency=1,
         statsd_enabled=False,
         statsd_prefix=None,
         statsd_host=None,
@@ -183,6 +205,8 @@ class Config:
         self.update_tag = update_tag
         self.aws_sync_all_profiles = aws_sync_all_profiles
         self.aws_best_effort_mode = aws_best_effort_mode
+        self.aws_sync_concurrency = aws_sync_concurrency
+        self.aws_iam_use_authorization_details = aws_iam_use_authorization_details
         self.azure_sync_all_subscriptions = azure_sync_all_subscriptions
         self.azure_sp_auth = azure_sp_auth
         self.azure_tenant_id = azure_tenant_id
@@ -190,11 +214,13 @@ class Config:
         self.azure_client_secret = azure_client_secret
         self.aws_requested_syncs = aws_requested_syncs
         self.analysis_job_directory = analysis_job_directory
+        self.analysis_job_concurrency = analysis_job_concurrency
         self.oci_sync_all_profiles = oci_sync_all_profiles
         self.okta_org_id = okta_org_id
         self.okta_api_key = okta_api_key
         self.okta_saml_role_regex = okta_saml_role_regex
         self.github_config = github_config
+        self.github_incremental_repo_sync = github_incremental_repo_sync
         self.digitalocean_token = digitalocean_token
         self.permission_relationships_file = permission_relationships_file
         self.jamf_base_uri = jamf_base_uri
@@ -204,6 +230,7 @@ class Config:
         self.kandji_tenant_id = kandji_tenant_id
         self.kandji_token = kandji_token
         self.k8s_kubeconfig = k8s_kubeconfig
+        self.k8s_sync_concurrency = k8s_sync_concurrency
         self.statsd_enabled = statsd_enabled
         self.statsd_prefix = statsd_prefix
         self.statsd_host = statsd_host
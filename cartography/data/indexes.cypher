@@ -18,6 +18,7 @@ CREATE INDEX IF NOT EXISTS FOR (n:AWSCidrBlock) ON (n.id);
 CREATE INDEX IF NOT EXISTS FOR (n:AWSCidrBlock) ON (n.lastupdated);
 CREATE INDEX IF NOT EXISTS FOR (n:AWSDNSRecord) ON (n.id);
 CREATE INDEX IF NOT EXISTS FOR (n:AWSDNSRecord) ON (n.lastupdated);
+CREATE INDEX IF NOT EXISTS FOR (n:AWSDNSRecord) ON (n.value);
 CREATE INDEX IF NOT EXISTS FOR (n:AWSDNSZone) ON (n.name);
 CREATE INDEX IF NOT EXISTS FOR (n:AWSDNSZone) ON (n.zoneid);
 CREATE INDEX IF NOT EXISTS FOR (n:AWSDNSZone) ON (n.lastupdated);
@@ -1,6 +1,7 @@
 import json
 import logging
 import string
+import time
 from pathlib import Path
 from string import Template
 from typing import Any
@@ -13,11 +14,14 @@ from typing import Union
 import neo4j
 
 from cartography.graph.cleanupbuilder import build_cleanup_queries
+from cartography.graph.statement import AdaptiveIterationSize
 from cartography.graph.statement import get_job_shortname
 from cartography.graph.statement import GraphStatement
 from cartography.models.core.nodes import CartographyNodeSchema
+from cartography.stats import get_stats_client
 
 logger = logging.getLogger(__name__)
+stat_handler = get_stats_client(__name__)
 
 
 def _get_identifiers(template: string.Template) -> List[str]:
@@ -71,12 +75,23 @@ class GraphJob:
     A job that will run against the cartography graph. A job is a sequence of statements which execute sequentially.
     """
 
-    def __init__(self, name: str, statements: List[GraphStatement], short_name: Optional[str] = None):
+    def __init__(
+        self,
+        name: str,
+        statements: List[GraphStatement],
+        short_name: Optional[str] = None,
+        reads: Optional[Set[str]] = None,
+        writes: Optional[Set[str]] = None,
+    ):
         # E.g. "Okta intel module cleanup"
         self.name = name
         self.statements: List[GraphStatement] = statements
         # E.g. "okta_import_cleanup"
         self.short_name = short_name
+        # The node labels and relationship types that the job reads and writes, if declared. See
+        # cartography.graph.jobscheduler.
+        self.reads = reads
+        self.writes = writes
 
     def merge_parameters(self, parameters: Dict) -> None:
         """
@@ -90,6 +105,10 @@ class GraphJob:
         Run the job. This will execute all statements sequentially.
         """
         logger.debug("Starting job '%s'.", self.name)
+        timer = stat_handler.timer(f'job.{self.short_name}') if self.short_name else None
+        if timer:
+            timer.start()
+        start = time.monotonic()
         for stm in self.statements:
             try:
                 stm.run(neo4j_session)
@@ -100,18 +119,25 @@ class GraphJob:
                     e,
                 )
                 raise
+        if timer:
+            timer.stop()
         log_msg = f"Finished job {self.short_name}" if self.short_name else f"Finished job {self.name}"
-        logger.info(log_msg)
+        logger.info(f"{log_msg} in {time.monotonic() - start:.2f} seconds")
 
     def as_dict(self) -> Dict:
         """
         Convert job to a dictionary.
         """
-        return {
+        job: Dict[str, Any] = {
             "name": self.name,
             "statements": [s.as_dict() for s in self.statements],
             "short_name": self.short_name,
         }
+        if self.reads is not None:
+            job["reads"] = sorted(self.reads)
+        if self.writes is not None:
+            job["writes"] = sorted(self.writes)
+        return job
 
     @classmethod
     def from_json(cls, blob: str, short_name: Optional[str] = None) -> 'GraphJob':
@@ -121,18 +147,27 @@ class GraphJob:
         data: Dict = json.loads(blob)
         statements = _get_statements_from_json(data, short_name)
         name = data["name"]
-        return cls(name, statements, short_name)
+        return cls(
+            name,
+            statements,
+            short_name,
+            _get_labels_from_json(data, "reads"),
+            _get_labels_from_json(data, "writes"),
+        )
 
     @classmethod
     def from_node_schema(
             cls,
             node_schema: CartographyNodeSchema,
             parameters: Dict[str, Any],
+            adaptive_iteration: Optional[AdaptiveIterationSize] = AdaptiveIterationSize(),
     ) -> 'GraphJob':
         """
         Create a cleanup job from a CartographyNodeSchema object.
         For a given node, the fields used in the node_schema.sub_resource_relationship.target_node_node_matcher.keys()
         must be provided as keys and values in the params dict.
+        The cleanup statements delete in batches whose size adapts to transaction latency according to
+        `adaptive_iteration`. Pass None to delete in fixed batches of 100 instead.
         """
         queries: List[str] = build_cleanup_queries(node_schema)
 
@@ -157,6 +192,7 @@ class GraphJob:
                 iterationsize=100,
                 parent_job_name=node_schema.label,
                 parent_job_sequence_num=idx,
+                adaptive_iteration=adaptive_iteration,
             ) for idx, query in enumerate(queries, start=1)
         ]
 
@@ -177,7 +213,13 @@ class GraphJob:
         job_shortname: str = get_job_shortname(file_path)
         statements: List[GraphStatement] = _get_statements_from_json(data, job_shortname)
         name: str = data["name"]
-        return cls(name, statements, job_shortname)
+        return cls(
+            name,
+            statements,
+            job_shortname,
+            _get_labels_from_json(data, "reads"),
+            _get_labels_from_json(data, "writes"),
+        )
 
     @classmethod
     def run_from_json(
@@ -218,3 +260,13 @@ def _get_statements_from_json(blob: Dict, short_job_name: Optional[str] = None)
         statements.append(statement)
 
     return statements
+
+
+def _get_labels_from_json(blob: Dict, key: str) -> Optional[Set[str]]:
+    """
+    Deserialize the optional list of node labels and relationship types that the job declares under `key`.
+    """
+    labels = blob.get(key)
+    if labels is None:
+        return None
+    return set(labels)
@@ -0,0 +1,85 @@
+import logging
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Set
+from typing import Tuple
+
+import neo4j
+
+from cartography.graph.job import GraphJob
+
+logger = logging.getLogger(__name__)
+
+
+def _conflict(job: GraphJob, other: GraphJob) -> bool:
+    """
+    Two jobs conflict when one of them writes a label that the other reads or writes. A job that does not declare both
+    the labels it reads and writes conflicts with every other job.
+    """
+    if job.reads is None or job.writes is None or other.reads is None or other.writes is None:
+        return True
+    return bool(job.writes & (other.reads | other.writes) or other.writes & job.reads)
+
+
+def get_job_dependencies(jobs: List[GraphJob]) -> List[Set[int]]:
+    """
+    Build the dependency DAG of the given jobs.
+    :param jobs: The jobs, in the order they would run one after another
+    :return: For each job, the indexes of the earlier jobs it conflicts with, and so must run after.
+    """
+    return [
+        {j for j in range(i) if _conflict(jobs[j], job)}
+        for i, job in enumerate(jobs)
+    ]
+
+
+def _run_job_in_worker(neo4j_driver: neo4j.Driver, neo4j_database: Optional[str], job: GraphJob) -> None:
+    with neo4j_driver.session(database=neo4j_database) as neo4j_session:
+        job.run(neo4j_session)
+
+
+def run_jobs(
+    jobs: List[GraphJob],
+    neo4j_session: neo4j.Session,
+    neo4j_driver: Optional[neo4j.Driver] = None,
+    neo4j_database: Optional[str] = None,
+    max_workers: int = 1,
+) -> List[Tuple[GraphJob, Exception]]:
+    """
+    Run the given jobs. A job that fails does not stop the others.
+    If `max_workers` is greater than 1 and a `neo4j_driver` is given, jobs that do not conflict run at the same time,
+    each worker opening its own session on the driver. Conflicting jobs run in the given order. Otherwise jobs run one
+    after another on `neo4j_session`.
+    :return: The jobs that failed with their exception, in the given order of jobs.
+    """
+    failures: Dict[int, Exception] = {}
+    if max_workers <= 1 or neo4j_driver is None or len(jobs) <= 1:
+        for i, job in enumerate(jobs):
+            try:
+                job.run(neo4j_session)
+            except Exception as e:
+                failures[i] = e
+        return [(jobs[i], failures[i]) for i in sorted(failures)]
+
+    dependencies = get_job_dependencies(jobs)
+    pending = list(range(len(jobs)))
+    finished: Set[int] = set()
+    running: Dict[Future, int] = {}
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='cartography-jobs') as executor:
+        while pending or running:
+            for i in [i for i in pending if dependencies[i] <= finished]:
+                pending.remove(i)
+                running[executor.submit(_run_job_in_worker, neo4j_driver, neo4j_database, jobs[i])] = i
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                i = running.pop(future)
+                finished.add(i)
+                exception = future.exception()
+                if isinstance(exception, Exception):
+                    failures[i] = exception
+    return [(jobs[i], failures[i]) for i in sorted(failures)]
@@ -1,6 +1,8 @@
 import json
 import logging
 import os
+import time
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 from typing import Dict
@@ -35,6 +37,25 @@ def get_job_shortname(file_path: Union[Path, str]) -> str:
     return os.path.splitext(file_path)[0]
 
 
+@dataclass(frozen=True)
+class AdaptiveIterationSize:
+    """
+    Settings for running an iterative cleanup statement with a batch size that adapts to the observed transaction
+    latency. The batch size starts at `min_size`, doubles while transactions take less than half of `target_seconds`
+    and halves when they take longer than `target_seconds`, always staying within [min_size, max_size].
+    """
+    min_size: int = 100
+    max_size: int = 10000
+    target_seconds: float = 1.0
+
+    def next_size(self, size: int, elapsed_seconds: float) -> int:
+        if elapsed_seconds < self.target_seconds / 2:
+            size *= 2
+        elif elapsed_seconds > self.target_seconds:
+            size //= 2
+        return max(self.min_size, min(self.max_size, size))
+
+
 class GraphStatement:
     """
     A statement that will run against the cartography graph. Statements can query or update the graph.
@@ -48,6 +69,7 @@ class GraphStatement:
             iterationsize: int = 0,
             parent_job_name: Optional[str] = None,
             parent_job_sequence_num: Optional[int] = None,
+            adaptive_iteration: Optional[AdaptiveIterationSize] = None,
     ):
         self.query = query
         self.parameters = parameters or {}
@@ -57,6 +79,8 @@ class GraphStatement:
 
         self.parent_job_name = parent_job_name if parent_job_name else None
         self.parent_job_sequence_num = parent_job_sequence_num if parent_job_sequence_num else None
+        # When set, iterative runs ignore `iterationsize` and adapt the batch size, see _run_iterative_adaptive()
+        self.adaptive_iteration = adaptive_iteration
 
     def merge_parameters(self, parameters: Dict) -> None:
         """
@@ -70,7 +94,9 @@ class GraphStatement:
         """
         Run the statement. This will execute the query against the graph.
         """
-        if self.iterative:
+        if self.iterative and self.adaptive_iteration:
+            self._run_iterative_adaptive(session, self.adaptive_iteration)
+        elif self.iterative:
             self._run_iterative(session)
         else:
             session.write_transaction(self._run_noniterative).consume()
@@ -127,6 +153,40 @@ class GraphStatement:
                 break
             result.consume()
 
+    def _run_iterative_adaptive(self, session: neo4j.Session, adaptive_iteration: AdaptiveIterationSize) -> None:
+        """
+        Iterative execution of a cleanup statement, with a batch size that adapts to transaction latency.
+
+        Expects the query to delete at most $LIMIT_SIZE nodes, or at most $LIMIT_SIZE relationships if it deletes no
+        nodes, per run. A run that deletes fewer items than that means there is nothing left to delete, so unlike
+        _run_iterative this does not need a final empty transaction.
+        """
+        size = adaptive_iteration.min_size
+        nodes_deleted = 0
+        relationships_deleted = 0
+        num_transactions = 0
+        while True:
+            self.parameters["LIMIT_SIZE"] = size
+            start = time.monotonic()
+            summary: neo4j.ResultSummary = session.write_transaction(self._run_noniterative).consume()
+            elapsed_seconds = time.monotonic() - start
+            num_transactions += 1
+            nodes_deleted += summary.counters.nodes_deleted
+            relationships_deleted += summary.counters.relationships_deleted
+
+            deleted_in_batch = summary.counters.nodes_deleted or summary.counters.relationships_deleted
+            if not summary.counters.contains_updates or deleted_in_batch < size:
+                break
+            size = adaptive_iteration.next_size(size, elapsed_seconds)
+
+        stat_prefix = f"{self.parent_job_name}.statement_{self.parent_job_sequence_num}"
+        stat_handler.incr(f"{stat_prefix}.nodes_deleted", nodes_deleted)
+        stat_handler.incr(f"{stat_prefix}.relationships_deleted", relationships_deleted)
+        logger.debug(
+            f"{self.parent_job_name} statement #{self.parent_job_sequence_num} deleted {nodes_deleted} nodes and "
+            f"{relationships_deleted} relationships in {num_transactions} transactions.",
+        )
+
     @classmethod
     def create_from_json(
             cls,
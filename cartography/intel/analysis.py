@@ -1,10 +1,13 @@
 import logging
 import pathlib
+from typing import List
 
 import neo4j
 
 from cartography.config import Config
 from cartography.graph.job import GraphJob
+from cartography.graph.jobscheduler import run_jobs
+from cartography.util import build_neo4j_driver
 
 logger = logging.getLogger(__name__)
 
@@ -28,15 +31,28 @@ def run(neo4j_session: neo4j.Session, config: Config) -> None:
         )
         return
     logger.info("Loading analysis jobs from directory: %s", analysis_job_directory)
+    jobs: List[GraphJob] = []
     for path in analysis_job_directory.glob("**/*.json"):
-        logger.info("Running discovered analysis job: %s", path)
+        logger.info("Discovered analysis job: %s", path)
         try:
-            GraphJob.run_from_json_file(
-                path,
-                neo4j_session,
-                {"UPDATE_TAG": config.update_tag},
-            )
-        except (KeyboardInterrupt, SystemExit):
-            raise
+            job = GraphJob.from_json_file(path)
+            job.merge_parameters({"UPDATE_TAG": config.update_tag})
         except Exception:
-            logger.exception("An exception occurred while executing discovered analysis job: %s", path)
+            logger.exception("An exception occurred while loading discovered analysis job: %s", path)
+            continue
+        jobs.append(job)
+
+    neo4j_driver = build_neo4j_driver(config) if config.analysis_job_concurrency > 1 else None
+    try:
+        failures = run_jobs(
+            jobs,
+            neo4j_session,
+            neo4j_driver,
+            config.neo4j_database,
+            config.analysis_job_concurrency,
+        )
+    finally:
+        if neo4j_driver:
+            neo4j_driver.close()
+    for job, e in failures:
+        logger.error("An exception occurred while executing discovered analysis job: %s", job.short_name, exc_info=e)
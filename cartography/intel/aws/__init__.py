@@ -1,10 +1,14 @@
+import asyncio
 import datetime
 import logging
 import traceback
+from concurrent.futures import as_completed
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 from typing import Dict
 from typing import Iterable
 from typing import List
+from typing import Optional
 
 import boto3
 import botocore.exceptions
@@ -12,12 +16,17 @@ import neo4j
 
 from . import ec2
 from . import organizations
+from . import route53
 from .resources import RESOURCE_FUNCTIONS
 from cartography.config import Config
+from cartography.graph.job import GraphJob
+from cartography.graph.jobscheduler import run_jobs
 from cartography.intel.aws.util.common import parse_and_validate_aws_requested_syncs
 from cartography.stats import get_stats_client
+from cartography.util import analysis_job_deps_met
+from cartography.util import build_neo4j_driver
+from cartography.util import load_analysis_job
 from cartography.util import merge_module_sync_metadata
-from cartography.util import run_analysis_and_ensure_deps
 from cartography.util import run_analysis_job
 from cartography.util import run_cleanup_job
 from cartography.util import timeit
@@ -138,6 +147,132 @@ def _autodiscover_accounts(
         logger.warning(f"The current account ({account_id}) doesn't have enough permissions to perform autodiscovery.")
 
 
+def _get_boto3_session_for_profile(profile_name: str, num_accounts: int) -> boto3.session.Session:
+    if num_accounts == 1:
+        # Use the default boto3 session because boto3 gets confused if you give it a profile name with 1 account
+        return boto3.Session()
+    return boto3.Session(profile_name=profile_name)
+
+
+def _format_account_exception(account_id: str, e: Exception) -> str:
+    timestamp = datetime.datetime.now()
+    exception_traceback = traceback.TracebackException.from_exception(e)
+    traceback_string = ''.join(exception_traceback.format())
+    return f'{timestamp} - Exception for account ID: {account_id}\n{traceback_string}'
+
+
+def _log_best_effort_failure(account_id: str) -> None:
+    logger.warning(
+        f"Caught exception syncing account {account_id}. aws-best-effort-mode is on so we are continuing "
+        f"on to the next AWS account. All exceptions will be aggregated and re-logged at the end of the "
+        f"sync.",
+        exc_info=True,
+    )
+
+
+class _AccountAutodiscoveryError(Exception):
+    """
+    Raised by an account worker when `_autodiscover_accounts` fails. Like in the serial sync, this aborts the whole
+    sync, even in best effort mode.
+    """
+
+    def __init__(self, error: Exception):
+        super().__init__(str(error))
+        self.error = error
+
+
+def _sync_account_in_worker(
+    neo4j_driver: neo4j.Driver,
+    neo4j_database: Optional[str],
+    profile_name: str,
+    account_id: str,
+    num_accounts: int,
+    sync_tag: int,
+    common_job_parameters: Dict[str, Any],
+    aws_requested_syncs: List[str],
+) -> None:
+    """
+    Syncs a single AWS account from a worker thread. Neo4j sessions and boto3 sessions are not thread safe, so each
+    worker gets its own of both, as well as its own copy of the job parameters scoped to the given account.
+
+    asyncio only sets up an event loop for the main thread, so the worker also gets its own loop for the modules that
+    use `to_synchronous`. The loop and its default executor are closed once the account is synced.
+    """
+    logger.info("Syncing AWS account with ID '%s' using configured profile '%s'.", account_id, profile_name)
+    account_job_parameters = {**common_job_parameters, "AWS_ID": account_id}
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    try:
+        with neo4j_driver.session(database=neo4j_database) as neo4j_session:
+            boto3_session = _get_boto3_session_for_profile(profile_name, num_accounts)
+            try:
+                _autodiscover_accounts(neo4j_session, boto3_session, account_id, sync_tag, account_job_parameters)
+            except Exception as e:
+                raise _AccountAutodiscoveryError(e) from e
+            _sync_one_account(
+                neo4j_session,
+                boto3_session,
+                account_id,
+                sync_tag,
+                account_job_parameters,
+                aws_requested_syncs=aws_requested_syncs,
+            )
+    finally:
+        asyncio.set_event_loop(None)
+        loop.run_until_complete(loop.shutdown_default_executor())
+        loop.close()
+
+
+def _sync_multiple_accounts_concurrently(
+    neo4j_driver: neo4j.Driver,
+    neo4j_database: Optional[str],
+    accounts: Dict[str, str],
+    sync_tag: int,
+    common_job_parameters: Dict[str, Any],
+    aws_best_effort_mode: bool,
+    aws_requested_syncs: List[str],
+    aws_sync_concurrency: int,
+) -> Dict[str, str]:
+    """
+    Syncs the given accounts on a pool of `aws_sync_concurrency` workers.
+    :return: A dict of account ID to formatted traceback for every account that failed while in best effort mode. If
+    best effort mode is off, the first failure cancels all accounts that have not started yet and is re-raised.
+    Autodiscovery failures are re-raised the same way in best effort mode too, as in the serial sync.
+    """
+    failures: Dict[str, str] = {}
+    num_accounts = len(accounts)
+    executor = ThreadPoolExecutor(max_workers=aws_sync_concurrency, thread_name_prefix='cartography-aws')
+    try:
+        futures = {
+            executor.submit(
+                _sync_account_in_worker,
+                neo4j_driver,
+                neo4j_database,
+                profile_name,
+                account_id,
+                num_accounts,
+                sync_tag,
+                common_job_parameters,
+                aws_requested_syncs,
+            ): account_id
+            for profile_name, account_id in accounts.items()
+        }
+        for future in as_completed(futures):
+            account_id = futures[future]
+            try:
+                future.result()
+            except _AccountAutodiscoveryError as e:
+                raise e.error
+            except Exception as e:
+                if not aws_best_effort_mode:
+                    raise
+                failures[account_id] = _format_account_exception(account_id, e)
+                _log_best_effort_failure(account_id)
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+    return failures
+
+
 def _sync_multiple_accounts(
     neo4j_session: neo4j.Session,
     accounts: Dict[str, str],
@@ -145,57 +280,68 @@ def _sync_multiple_accounts(
     common_job_parameters: Dict[str, Any],
     aws_best_effort_mode: bool,
     aws_requested_syncs: List[str] = [],
+    neo4j_driver: Optional[neo4j.Driver] = None,
+    neo4j_database: Optional[str] = None,
+    aws_sync_concurrency: int = 1,
 ) -> bool:
+    """
+    Syncs the given accounts and then runs the org-wide principals cleanup.
+    If `aws_sync_concurrency` is greater than 1 and a `neo4j_driver` is given, accounts are synced concurrently, each
+    worker opening its own session on the driver. Otherwise accounts are synced one at a time on `neo4j_session`.
+    """
     logger.info("Syncing AWS accounts: %s", ', '.join(accounts.values()))
     organizations.sync(neo4j_session, accounts, sync_tag, common_job_parameters)
 
-    failed_account_ids = []
-    exception_tracebacks = []
+    failed_account_ids: List[str] = []
+    exception_tracebacks: List[str] = []
 
     num_accounts = len(accounts)
 
-    for profile_name, account_id in accounts.items():
-        logger.info("Syncing AWS account with ID '%s' using configured profile '%s'.", account_id, profile_name)
-        common_job_parameters["AWS_ID"] = account_id
-        if num_accounts == 1:
-            # Use the default boto3 session because boto3 gets confused if you give it a profile name with 1 account
-            boto3_session = boto3.Session()
-        else:
-            boto3_session = boto3.Session(profile_name=profile_name)
-
-        _autodiscover_accounts(neo4j_session, boto3_session, account_id, sync_tag, common_job_parameters)
-
-        try:
-            _sync_one_account(
-                neo4j_session,
-                boto3_session,
-                account_id,
-                sync_tag,
-                common_job_parameters,
-                aws_requested_syncs=aws_requested_syncs,  # Could be replaced later with per-account requested syncs
-            )
-        except Exception as e:
-            if aws_best_effort_mode:
-                timestamp = datetime.datetime.now()
-                failed_account_ids.append(account_id)
-                exception_traceback = traceback.TracebackException.from_exception(e)
-                traceback_string = ''.join(exception_traceback.format())
-                exception_tracebacks.append(f'{timestamp} - Exception for account ID: {account_id}\n{traceback_string}')
-                logger.warning(
-                    f"Caught exception syncing account {account_id}. aws-best-effort-mode is on so we are continuing "
-                    f"on to the next AWS account. All exceptions will be aggregated and re-logged at the end of the "
-                    f"sync.",
-                    exc_info=True,
+    if aws_sync_concurrency > 1 and neo4j_driver is not None and num_accounts > 1:
+        logger.info("Syncing %d AWS accounts with %d concurrent workers.", num_accounts, aws_sync_concurrency)
+        failures = _sync_multiple_accounts_concurrently(
+            neo4j_driver,
+            neo4j_database,
+            accounts,
+            sync_tag,
+            common_job_parameters,
+            aws_best_effort_mode,
+            aws_requested_syncs,
+            aws_sync_concurrency,
+        )
+        failed_account_ids.extend(failures.keys())
+        exception_tracebacks.extend(failures.values())
+    else:
+        for profile_name, account_id in accounts.items():
+            logger.info("Syncing AWS account with ID '%s' using configured profile '%s'.", account_id, profile_name)
+            common_job_parameters["AWS_ID"] = account_id
+            boto3_session = _get_boto3_session_for_profile(profile_name, num_accounts)
+
+            _autodiscover_accounts(neo4j_session, boto3_session, account_id, sync_tag, common_job_parameters)
+
+            try:
+                _sync_one_account(
+                    neo4j_session,
+                    boto3_session,
+                    account_id,
+                    sync_tag,
+                    common_job_parameters,
+                    aws_requested_syncs=aws_requested_syncs,  # Could be replaced later with per-account requested syncs
                 )
-                continue
-            else:
-                raise
+            except Exception as e:
+                if aws_best_effort_mode:
+                    failed_account_ids.append(account_id)
+                    exception_tracebacks.append(_format_account_exception(account_id, e))
+                    _log_best_effort_failure(account_id)
+                    continue
+                else:
+                    raise
 
     if failed_account_ids:
         logger.error(f'AWS sync failed for accounts {failed_account_ids}')
         raise Exception('\n'.join(exception_tracebacks))
 
-    del common_job_parameters["AWS_ID"]
+    common_job_parameters.pop("AWS_ID", None)
 
     # There may be orphan Principals which point outside of known AWS accounts. This job cleans
     # up those nodes after all AWS accounts have been synced.
@@ -210,8 +356,20 @@ def _perform_aws_analysis(
         requested_syncs: List[str],
         neo4j_session: neo4j.Session,
         common_job_parameters: Dict[str, Any],
+        synced_account_ids: Iterable[str],
+        neo4j_driver: Optional[neo4j.Driver] = None,
+        neo4j_database: Optional[str] = None,
+        analysis_job_concurrency: int = 1,
 ) -> None:
+    """
+    Runs the AWS analysis jobs. Jobs about the resources of a single account are scoped to each of the
+    `synced_account_ids`, so that accounts not synced in this run are not analyzed again. Jobs that compare
+    resources across accounts run once over the whole graph.
+    If `analysis_job_concurrency` is greater than 1 and a `neo4j_driver` is given, jobs that do not conflict run
+    concurrently, see cartography.graph.jobscheduler.
+    """
     requested_syncs_as_set = set(requested_syncs)
+    jobs: List[GraphJob] = []
 
     ec2_asset_exposure_requirements = {
         'ec2:instance',
@@ -219,37 +377,39 @@ def _perform_aws_analysis(
         'ec2:load_balancer',
         'ec2:load_balancer_v2',
     }
-    run_analysis_and_ensure_deps(
-        'aws_ec2_asset_exposure.json',
-        ec2_asset_exposure_requirements,
-        requested_syncs_as_set,
-        common_job_parameters,
-        neo4j_session,
-    )
+    for account_id in synced_account_ids:
+        account_job_parameters = {**common_job_parameters, 'AWS_ID': account_id}
+        if analysis_job_deps_met(
+            'aws_ec2_asset_exposure.json', ec2_asset_exposure_requirements, requested_syncs_as_set,
+        ):
+            jobs.append(
+                load_analysis_job(
+                    'aws_ec2_asset_exposure.json',
+                    account_job_parameters,
+                    package='cartography.data.jobs.scoped_analysis',
+                ),
+            )
 
-    run_analysis_and_ensure_deps(
-        'aws_ec2_keypair_analysis.json',
-        {'ec2:keypair'},
-        requested_syncs_as_set,
-        common_job_parameters,
-        neo4j_session,
-    )
+        if analysis_job_deps_met('aws_eks_asset_exposure.json', {'eks'}, requested_syncs_as_set):
+            jobs.append(
+                load_analysis_job(
+                    'aws_eks_asset_exposure.json',
+                    account_job_parameters,
+                    package='cartography.data.jobs.scoped_analysis',
+                ),
+            )
 
-    run_analysis_and_ensure_deps(
-        'aws_eks_asset_exposure.json',
-        {'eks'},
-        requested_syncs_as_set,
-        common_job_parameters,
-        neo4j_session,
-    )
+    if analysis_job_deps_met('aws_ec2_keypair_analysis.json', {'ec2:keypair'}, requested_syncs_as_set):
+        jobs.append(load_analysis_job('aws_ec2_keypair_analysis.json', common_job_parameters))
 
-    run_analysis_and_ensure_deps(
-        'aws_foreign_accounts.json',
-        set(),  # This job has no requirements
-        requested_syncs_as_set,
-        common_job_parameters,
-        neo4j_session,
-    )
+    # This job has no requirements
+    jobs.append(load_analysis_job('aws_foreign_accounts.json', common_job_parameters))
+
+    failures = run_jobs(jobs, neo4j_session, neo4j_driver, neo4j_database, analysis_job_concurrency)
+    for job, e in failures:
+        logger.error("AWS analysis job %s failed.", job.short_name, exc_info=e)
+    if failures:
+        raise failures[0][1]
 
 
 @timeit
@@ -257,6 +417,7 @@ def start_aws_ingestion(neo4j_session: neo4j.Session, config: Config) -> None:
     common_job_parameters = {
         "UPDATE_TAG": config.update_tag,
         "permission_relationships_file": config.permission_relationships_file,
+        "aws_iam_use_authorization_details": config.aws_iam_use_authorization_details,
     }
     try:
         boto3_session = boto3.Session()
@@ -295,14 +456,36 @@ def start_aws_ingestion(neo4j_session: neo4j.Session, config: Config) -> None:
     if config.aws_requested_syncs:
         requested_syncs = parse_and_validate_aws_requested_syncs(config.aws_requested_syncs)
 
-    sync_successful = _sync_multiple_accounts(
-        neo4j_session,
-        aws_accounts,
-        config.update_tag,
-        common_job_parameters,
-        config.aws_best_effort_mode,
-        requested_syncs,
-    )
+    neo4j_driver = None
+    if config.aws_sync_concurrency > 1 or config.analysis_job_concurrency > 1:
+        neo4j_driver = build_neo4j_driver(config)
+    try:
+        sync_successful = _sync_multiple_accounts(
+            neo4j_session,
+            aws_accounts,
+            config.update_tag,
+            common_job_parameters,
+            config.aws_best_effort_mode,
+            requested_syncs,
+            neo4j_driver=neo4j_driver if config.aws_sync_concurrency > 1 else None,
+            neo4j_database=config.neo4j_database,
+            aws_sync_concurrency=config.aws_sync_concurrency,
+        )
 
-    if sync_successful:
-        _perform_aws_analysis(requested_syncs, neo4j_session, common_job_parameters)
+        if sync_successful:
+            if 'route53' in requested_syncs:
+                # Each account only links its DNS records to its own resources. Link the records that point across
+                # accounts once all of them are in the graph.
+                route53.link_aws_resources(neo4j_session, config.update_tag)
+            _perform_aws_analysis(
+                requested_syncs,
+                neo4j_session,
+                common_job_parameters,
+                list(aws_accounts.values()),
+                neo4j_driver=neo4j_driver,
+                neo4j_database=config.neo4j_database,
+                analysis_job_concurrency=config.analysis_job_concurrency,
+            )
+    finally:
+        if neo4j_driver:
+            neo4j_driver.close()
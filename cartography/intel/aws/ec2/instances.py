@@ -1,6 +1,7 @@
 import logging
 import time
 from collections import namedtuple
+from functools import partial
 from typing import Any
 from typing import Dict
 from typing import List
@@ -11,6 +12,7 @@ import neo4j
 from cartography.client.core.tx import load
 from cartography.graph.job import GraphJob
 from cartography.intel.aws.ec2.util import get_botocore_config
+from cartography.intel.aws.util.regions import fetch_regions_concurrently
 from cartography.models.aws.ec2.instances import EC2InstanceSchema
 from cartography.models.aws.ec2.keypairs import EC2KeyPairSchema
 from cartography.models.aws.ec2.networkinterface_instance import EC2NetworkInterfaceInstanceSchema
@@ -319,10 +321,13 @@ def sync_ec2_instances(
         update_tag: int,
         common_job_parameters: Dict[str, Any],
 ) -> None:
-    for region in regions:
+    for region, ec2_data in fetch_regions_concurrently(
+        boto3_session,
+        regions,
+        get_ec2_instances,
+        partial(transform_ec2_instances, current_aws_account_id=current_aws_account_id),
+    ):
         logger.info("Syncing EC2 instances for region '%s' in account '%s'.", region, current_aws_account_id)
-        reservations = get_ec2_instances(boto3_session, region)
-        ec2_data = transform_ec2_instances(reservations, region, current_aws_account_id)
         load_ec2_instance_data(
             neo4j_session,
             region,
@@ -1,12 +1,14 @@
 import logging
 from typing import Dict
 from typing import List
+from typing import Tuple
 
 import boto3
 import botocore.exceptions
 import neo4j
 
 from .util import get_botocore_config
+from cartography.intel.aws.util.regions import fetch_regions_concurrently
 from cartography.util import aws_handle_regions
 from cartography.util import run_cleanup_job
 from cartography.util import timeit
@@ -67,6 +69,19 @@ def get_tgw_vpc_attachments(boto3_session: boto3.session.Session, region: str) -
     return tgw_vpc_attachments
 
 
+def get_transit_gateways_and_attachments(
+    boto3_session: boto3.session.Session, region: str,
+) -> Tuple[List[Dict], List[Dict], List[Dict]]:
+    """
+    Per-region fetch for transit gateways: returns the gateways, their attachments and their VPC attachments.
+    """
+    return (
+        get_transit_gateways(boto3_session, region),
+        get_tgw_attachments(boto3_session, region),
+        get_tgw_vpc_attachments(boto3_session, region),
+    )
+
+
 @timeit
 def load_transit_gateways(
     neo4j_session: neo4j.Session, data: List[Dict], region: str, current_aws_account_id: str,
@@ -241,17 +256,16 @@ def sync_transit_gateways(
     neo4j_session: neo4j.Session, boto3_session: boto3.session.Session, regions: List[str], current_aws_account_id: str,
     update_tag: int, common_job_parameters: Dict,
 ) -> None:
-    for region in regions:
+    for region, (tgws, tgw_attachments, tgw_vpc_attachments) in fetch_regions_concurrently(
+        boto3_session, regions, get_transit_gateways_and_attachments,
+    ):
         logger.info("Syncing AWS Transit Gateways for region '%s' in account '%s'.", region, current_aws_account_id)
-        tgws = get_transit_gateways(boto3_session, region)
         load_transit_gateways(neo4j_session, tgws, region, current_aws_account_id, update_tag)
 
         logger.debug(
             "Syncing AWS Transit Gateway Attachments for region '%s' in account '%s'.",
             region, current_aws_account_id,
         )
-        tgw_attachments = get_tgw_attachments(boto3_session, region)
-        tgw_vpc_attachments = get_tgw_vpc_attachments(boto3_session, region)
         load_tgw_attachments(
             neo4j_session, tgw_attachments + tgw_vpc_attachments,
             region, current_aws_account_id, update_tag,
@@ -1,20 +1,24 @@
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 from typing import Dict
 from typing import List
+from typing import Tuple
 
 import boto3
 import neo4j
 
+from cartography.intel.aws.util.regions import fetch_regions_concurrently
 from cartography.util import aws_handle_regions
 from cartography.util import batch
 from cartography.util import run_cleanup_job
 from cartography.util import timeit
-from cartography.util import to_asynchronous
-from cartography.util import to_synchronous
 
 logger = logging.getLogger(__name__)
 
+# Number of repositories whose images are fetched at the same time within a region.
+ECR_REPOSITORY_CONCURRENCY = 10
+
 
 @timeit
 @aws_handle_regions
@@ -151,27 +155,45 @@ def _get_image_data(
     Given a list of repositories, get the image data for each repository,
     return as a mapping from repositoryUri to image object
     '''
-    image_data = {}
-
-    async def async_get_images(repo: Dict[str, Any]) -> None:
-        repo_image_obj = await to_asynchronous(get_ecr_repository_images, boto3_session, region, repo['repositoryName'])
-        image_data[repo['repositoryUri']] = repo_image_obj
-    to_synchronous(*[async_get_images(repo) for repo in repositories])
+    if not repositories:
+        return {}
+    # This runs inside the region fan-out of fetch_regions_concurrently, so use a bounded pool that is shut down here
+    # rather than an asyncio loop per region thread.
+    with ThreadPoolExecutor(max_workers=min(ECR_REPOSITORY_CONCURRENCY, len(repositories))) as executor:
+        images = executor.map(
+            lambda repo: get_ecr_repository_images(boto3_session, region, repo['repositoryName']),
+            repositories,
+        )
+        image_data = {repo['repositoryUri']: repo_images for repo, repo_images in zip(repositories, images)}
 
     return image_data
 
 
+def _get_repositories_and_images(
+    boto3_session: boto3.session.Session,
+    region: str,
+) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    repositories = get_ecr_repositories(boto3_session, region)
+    return repositories, _get_image_data(boto3_session, region, repositories)
+
+
+def _transform_repositories_and_images(
+    data: Tuple[List[Dict[str, Any]], Dict[str, Any]],
+    region: str,
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    repositories, image_data = data
+    return repositories, transform_ecr_repository_images(image_data)
+
+
 @timeit
 def sync(
     neo4j_session: neo4j.Session, boto3_session: boto3.session.Session, regions: List[str], current_aws_account_id: str,
     update_tag: int, common_job_parameters: Dict,
 ) -> None:
-    for region in regions:
+    for region, (repositories, repo_images_list) in fetch_regions_concurrently(
+        boto3_session, regions, _get_repositories_and_images, _transform_repositories_and_images,
+    ):
         logger.info("Syncing ECR for region '%s' in account '%s'.", region, current_aws_account_id)
-        image_data = {}
-        repositories = get_ecr_repositories(boto3_session, region)
-        image_data = _get_image_data(boto3_session, region, repositories)
         load_ecr_repositories(neo4j_session, repositories, region, current_aws_account_id, update_tag)
-        repo_images_list = transform_ecr_repository_images(image_data)
         load_ecr_repository_images(neo4j_session, repo_images_list, region, update_tag)
     cleanup(neo4j_session, common_job_parameters)
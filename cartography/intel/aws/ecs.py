@@ -1,11 +1,16 @@
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 from typing import Dict
 from typing import List
+from typing import Optional
+from typing import Tuple
 
 import boto3
 import neo4j
 
+from cartography.intel.aws.ec2.util import get_botocore_config
+from cartography.intel.aws.util.regions import ThreadSafeBoto3Session
 from cartography.util import aws_handle_regions
 from cartography.util import camel_to_snake
 from cartography.util import dict_date_to_epoch
@@ -14,11 +19,17 @@ from cartography.util import timeit
 
 logger = logging.getLogger(__name__)
 
+# Number of clusters whose container instances, services and tasks are fetched at the same time.
+ECS_CLUSTER_CONCURRENCY = 5
+# Number of describe_task_definition calls in flight at the same time. Throttled calls are retried with backoff by
+# botocore.
+ECS_DESCRIBE_CONCURRENCY = 10
+
 
 @timeit
 @aws_handle_regions
 def get_ecs_cluster_arns(boto3_session: boto3.session.Session, region: str) -> List[str]:
-    client = boto3_session.client('ecs', region_name=region)
+    client = boto3_session.client('ecs', region_name=region, config=get_botocore_config())
     paginator = client.get_paginator('list_clusters')
     cluster_arns: List[str] = []
     for page in paginator.paginate():
@@ -33,7 +44,7 @@ def get_ecs_clusters(
     region: str,
     cluster_arns: List[str],
 ) -> List[Dict[str, Any]]:
-    client = boto3_session.client('ecs', region_name=region)
+    client = boto3_session.client('ecs', region_name=region, config=get_botocore_config())
     # TODO: also include attachment info, and make relationships between the attachements
     # and the cluster.
     includes = ['SETTINGS', 'CONFIGURATIONS']
@@ -52,7 +63,7 @@ def get_ecs_container_instances(
     boto3_session: boto3.session.Session,
     region: str,
 ) -> List[Dict[str, Any]]:
-    client = boto3_session.client('ecs', region_name=region)
+    client = boto3_session.client('ecs', region_name=region, config=get_botocore_config())
     paginator = client.get_paginator('list_container_instances')
     container_instances: List[Dict[str, Any]] = []
     container_instance_arns: List[str] = []
@@ -73,7 +84,7 @@ def get_ecs_container_instances(
 @timeit
 @aws_handle_regions
 def get_ecs_services(cluster_arn: str, boto3_session: boto3.session.Session, region: str) -> List[Dict[str, Any]]:
-    client = boto3_session.client('ecs', region_name=region)
+    client = boto3_session.client('ecs', region_name=region, config=get_botocore_config())
     paginator = client.get_paginator('list_services')
     services: List[Dict[str, Any]] = []
     service_arns: List[str] = []
@@ -95,21 +106,43 @@ def get_ecs_task_definitions(
     boto3_session: boto3.session.Session,
     region: str,
     tasks: List[Dict[str, Any]],
+    task_definition_cache: Optional[Dict[str, Dict[str, Any]]] = None,
 ) -> List[Dict[str, Any]]:
-    client = boto3_session.client('ecs', region_name=region)
-    task_definitions: List[Dict[str, Any]] = []
-    for task in tasks:
-        task_definition = client.describe_task_definition(
-            taskDefinition=task['taskDefinitionArn'],
+    """
+    Describe the task definitions used by the given tasks. Tasks usually share a handful of task definitions, so each
+    definition is described once, and ECS_DESCRIBE_CONCURRENCY definitions are described at the same time.
+
+    When a `task_definition_cache` is given, the definitions described by this call are added to it, and the ones
+    already in it are skipped: they were returned by an earlier call of the same sync.
+    """
+    if task_definition_cache is None:
+        task_definition_cache = {}
+    task_definition_arns = [
+        arn for arn in dict.fromkeys(task['taskDefinitionArn'] for task in tasks)
+        if arn not in task_definition_cache
+    ]
+    if not task_definition_arns:
+        return []
+
+    client = boto3_session.client('ecs', region_name=region, config=get_botocore_config())
+    with ThreadPoolExecutor(
+        max_workers=min(ECS_DESCRIBE_CONCURRENCY, len(task_definition_arns)),
+        thread_name_prefix='cartography-ecs',
+    ) as executor:
+        responses = executor.map(
+            lambda arn: client.describe_task_definition(taskDefinition=arn),
+            task_definition_arns,
         )
-        task_definitions.append(task_definition['taskDefinition'])
+        task_definitions = [response['taskDefinition'] for response in responses]
+    for arn, task_definition in zip(task_definition_arns, task_definitions):
+        task_definition_cache[arn] = task_definition
     return task_definitions
 
 
 @timeit
 @aws_handle_regions
 def get_ecs_tasks(cluster_arn: str, boto3_session: boto3.session.Session, region: str) -> List[Dict[str, Any]]:
-    client = boto3_session.client('ecs', region_name=region)
+    client = boto3_session.client('ecs', region_name=region, config=get_botocore_config())
     paginator = client.get_paginator('list_tasks')
     tasks: List[Dict[str, Any]] = []
     task_arns: List[str] = []
@@ -545,68 +578,81 @@ def cleanup_ecs(neo4j_session: neo4j.Session, common_job_parameters: Dict) -> No
     run_cleanup_job('aws_import_ecs_cleanup.json', neo4j_session, common_job_parameters)
 
 
+def _get_ecs_cluster_details(
+    cluster_arn: str,
+    boto3_session: boto3.session.Session,
+    region: str,
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Get the container instances, services and tasks of an ECS cluster.
+    """
+    container_instances = get_ecs_container_instances(cluster_arn, boto3_session, region)
+    services = get_ecs_services(cluster_arn, boto3_session, region)
+    tasks = get_ecs_tasks(cluster_arn, boto3_session, region)
+    return container_instances, services, tasks
+
+
 @timeit
 def sync(
     neo4j_session: neo4j.Session, boto3_session: boto3.session.Session, regions: List[str], current_aws_account_id: str,
     update_tag: int, common_job_parameters: Dict,
 ) -> None:
+    shared_session = ThreadSafeBoto3Session(boto3_session)
+    # Task definitions described so far in this sync, by ARN. Each one is described and loaded once, the tasks of
+    # later clusters are linked to it by load_ecs_tasks.
+    task_definition_cache: Dict[str, Dict[str, Any]] = {}
     for region in regions:
         logger.info("Syncing ECS for region '%s' in account '%s'.", region, current_aws_account_id)
-        cluster_arns = get_ecs_cluster_arns(boto3_session, region)
-        clusters = get_ecs_clusters(boto3_session, region, cluster_arns)
+        cluster_arns = get_ecs_cluster_arns(shared_session, region)
+        clusters = get_ecs_clusters(shared_session, region, cluster_arns)
         if len(clusters) == 0:
             continue
         load_ecs_clusters(neo4j_session, clusters, region, current_aws_account_id, update_tag)
-        for cluster_arn in cluster_arns:
-            cluster_instances = get_ecs_container_instances(
-                cluster_arn,
-                boto3_session,
-                region,
-            )
-            load_ecs_container_instances(
-                neo4j_session,
-                cluster_arn,
-                cluster_instances,
-                region,
-                current_aws_account_id,
-                update_tag,
-            )
-            services = get_ecs_services(
-                cluster_arn,
-                boto3_session,
-                region,
-            )
-            load_ecs_services(
-                neo4j_session,
-                cluster_arn,
-                services,
-                region,
-                current_aws_account_id,
-                update_tag,
-            )
-            tasks = get_ecs_tasks(
-                cluster_arn,
-                boto3_session,
-                region,
-            )
-            load_ecs_tasks(
-                neo4j_session,
-                cluster_arn,
-                tasks,
-                region,
-                current_aws_account_id,
-                update_tag,
-            )
-            task_definitions = get_ecs_task_definitions(
-                boto3_session,
-                region,
-                tasks,
-            )
-            load_ecs_task_definitions(
-                neo4j_session,
-                task_definitions,
-                region,
-                current_aws_account_id,
-                update_tag,
+        # Clusters are fetched ECS_CLUSTER_CONCURRENCY at a time, and loaded in order on this thread as they complete.
+        with ThreadPoolExecutor(
+            max_workers=min(ECS_CLUSTER_CONCURRENCY, len(cluster_arns)),
+            thread_name_prefix='cartography-ecs-cluster',
+        ) as executor:
+            cluster_details = executor.map(
+                lambda cluster_arn: _get_ecs_cluster_details(cluster_arn, shared_session, region),
+                cluster_arns,
             )
+            for cluster_arn, (cluster_instances, services, tasks) in zip(cluster_arns, cluster_details):
+                load_ecs_container_instances(
+                    neo4j_session,
+                    cluster_arn,
+                    cluster_instances,
+                    region,
+                    current_aws_account_id,
+                    update_tag,
+                )
+                load_ecs_services(
+                    neo4j_session,
+                    cluster_arn,
+                    services,
+                    region,
+                    current_aws_account_id,
+                    update_tag,
+                )
+                load_ecs_tasks(
+                    neo4j_session,
+                    cluster_arn,
+                    tasks,
+                    region,
+                    current_aws_account_id,
+                    update_tag,
+                )
+                task_definitions = get_ecs_task_definitions(
+                    shared_session,
+                    region,
+                    tasks,
+                    task_definition_cache,
+                )
+                load_ecs_task_definitions(
+                    neo4j_session,
+                    task_definitions,
+                    region,
+                    current_aws_account_id,
+                    update_tag,
+                )
     cleanup_ecs(neo4j_session, common_job_parameters)
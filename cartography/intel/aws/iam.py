@@ -4,14 +4,17 @@ import logging
 from typing import Any
 from typing import Dict
 from typing import List
+from typing import Optional
 from typing import Tuple
 
 import boto3
 import neo4j
 
+from cartography.client.core.tx import write_list_of_dicts_tx
 from cartography.intel.aws.permission_relationships import parse_statement_node
-from cartography.intel.aws.permission_relationships import principal_allowed_on_resource
+from cartography.intel.aws.permission_relationships import PrincipalPolicyIndex
 from cartography.stats import get_stats_client
+from cartography.util import batch
 from cartography.util import merge_module_sync_metadata
 from cartography.util import run_cleanup_job
 from cartography.util import timeit
@@ -216,6 +219,39 @@ def get_role_list_data(boto3_session: boto3.session.Session) -> Dict:
     return {'Roles': roles}
 
 
+@timeit
+def get_account_authorization_details(
+    boto3_session: boto3.session.Session, filters: Optional[List[str]] = None,
+) -> Dict[str, List[Dict]]:
+    """
+    Returns the users, groups and roles of the account together with their inline policies, attached managed policies,
+    group memberships and tags, as well as the documents of the managed policies, in a handful of paginated calls.
+    :param filters: Optional list of entity types to return, e.g. ['Role']. All types are returned by default.
+    """
+    client = boto3_session.client('iam')
+    paginator = client.get_paginator('get_account_authorization_details')
+    details: Dict[str, List[Dict]] = {
+        'UserDetailList': [],
+        'GroupDetailList': [],
+        'RoleDetailList': [],
+        'Policies': [],
+    }
+    kwargs = {'Filter': filters} if filters else {}
+    for page in paginator.paginate(**kwargs):
+        for key, items in details.items():
+            items.extend(page.get(key, []))
+    return details
+
+
+@timeit
+def get_role_tags_from_authorization_details(boto3_session: boto3.session.Session) -> List[Dict]:
+    """
+    Same output as `get_role_tags`, without a GetRole call per role.
+    """
+    details = get_account_authorization_details(boto3_session, filters=['Role'])
+    return transform_role_tags(details['RoleDetailList'])
+
+
 @timeit
 def get_account_access_key_data(boto3_session: boto3.session.Session, username: str) -> Dict:
     client = boto3_session.client('iam')
@@ -241,15 +277,39 @@ def get_account_access_key_data(boto3_session: boto3.session.Session, username:
     return access_keys
 
 
+def _load_iam_batch(neo4j_session: neo4j.Session, query: str, dict_list: List[Dict], **kwargs: Any) -> None:
+    """
+    Runs the given `UNWIND $DictList ...` query over `dict_list` in batches, so that loading an IAM entity type takes a
+    handful of transactions instead of one round trip per item.
+    """
+    for data_batch in batch(dict_list):
+        neo4j_session.write_transaction(write_list_of_dicts_tx, query, DictList=data_batch, **kwargs)
+
+
+def transform_users(users: List[Dict]) -> List[Dict]:
+    return [
+        {
+            'Arn': user['Arn'],
+            'UserId': user['UserId'],
+            'CreateDate': str(user['CreateDate']),
+            'UserName': user['UserName'],
+            'Path': user['Path'],
+            'PasswordLastUsed': str(user.get('PasswordLastUsed', '')),
+        }
+        for user in users
+    ]
+
+
 @timeit
 def load_users(
     neo4j_session: neo4j.Session, users: List[Dict], current_aws_account_id: str, aws_update_tag: int,
 ) -> None:
     ingest_user = """
-    MERGE (unode:AWSUser{arn: $ARN})
-    ON CREATE SET unode:AWSPrincipal, unode.userid = $USERID, unode.firstseen = timestamp(),
-    unode.createdate = $CREATE_DATE
-    SET unode.name = $USERNAME, unode.path = $PATH, unode.passwordlastused = $PASSWORD_LASTUSED,
+    UNWIND $DictList AS user
+    MERGE (unode:AWSUser{arn: user.Arn})
+    ON CREATE SET unode:AWSPrincipal, unode.userid = user.UserId, unode.firstseen = timestamp(),
+    unode.createdate = user.CreateDate
+    SET unode.name = user.UserName, unode.path = user.Path, unode.passwordlastused = user.PasswordLastUsed,
     unode.lastupdated = $aws_update_tag
     WITH unode
     MATCH (aa:AWSAccount{id: $AWS_ACCOUNT_ID})
@@ -258,18 +318,26 @@ def load_users(
     SET r.lastupdated = $aws_update_tag
     """
     logger.info(f"Loading {len(users)} IAM users.")
-    for user in users:
-        neo4j_session.run(
-            ingest_user,
-            ARN=user["Arn"],
-            USERID=user["UserId"],
-            CREATE_DATE=str(user["CreateDate"]),
-            USERNAME=user["UserName"],
-            PATH=user["Path"],
-            PASSWORD_LASTUSED=str(user.get("PasswordLastUsed", "")),
-            AWS_ACCOUNT_ID=current_aws_account_id,
-            aws_update_tag=aws_update_tag,
-        )
+    _load_iam_batch(
+        neo4j_session,
+        ingest_user,
+        transform_users(users),
+        AWS_ACCOUNT_ID=current_aws_account_id,
+        aws_update_tag=aws_update_tag,
+    )
+
+
+def transform_groups(groups: List[Dict]) -> List[Dict]:
+    return [
+        {
+            'Arn': group['Arn'],
+            'GroupId': group['GroupId'],
+            'CreateDate': str(group['CreateDate']),
+            'GroupName': group['GroupName'],
+            'Path': group['Path'],
+        }
+        for group in groups
+    ]
 
 
 @timeit
@@ -277,9 +345,11 @@ def load_groups(
     neo4j_session: neo4j.Session, groups: List[Dict], current_aws_account_id: str, aws_update_tag: int,
 ) -> None:
     ingest_group = """
-    MERGE (gnode:AWSGroup{arn: $ARN})
-    ON CREATE SET gnode.groupid = $GROUP_ID, gnode.firstseen = timestamp(), gnode.createdate = $CREATE_DATE
-    SET gnode:AWSPrincipal, gnode.name = $GROUP_NAME, gnode.path = $PATH,gnode.lastupdated = $aws_update_tag
+    UNWIND $DictList AS group
+    MERGE (gnode:AWSGroup{arn: group.Arn})
+    ON CREATE SET gnode.groupid = group.GroupId, gnode.firstseen = timestamp(), gnode.createdate = group.CreateDate
+    SET gnode:AWSPrincipal, gnode.name = group.GroupName, gnode.path = group.Path,
+    gnode.lastupdated = $aws_update_tag
     WITH gnode
     MATCH (aa:AWSAccount{id: $AWS_ACCOUNT_ID})
     MERGE (aa)-[r:RESOURCE]->(gnode)
@@ -287,17 +357,13 @@ def load_groups(
     SET r.lastupdated = $aws_update_tag
     """
     logger.info(f"Loading {len(groups)} IAM groups to the graph.")
-    for group in groups:
-        neo4j_session.run(
-            ingest_group,
-            ARN=group["Arn"],
-            GROUP_ID=group["GroupId"],
-            CREATE_DATE=str(group["CreateDate"]),
-            GROUP_NAME=group["GroupName"],
-            PATH=group["Path"],
-            AWS_ACCOUNT_ID=current_aws_account_id,
-            aws_update_tag=aws_update_tag,
-        )
+    _load_iam_batch(
+        neo4j_session,
+        ingest_group,
+        transform_groups(groups),
+        AWS_ACCOUNT_ID=current_aws_account_id,
+        aws_update_tag=aws_update_tag,
+    )
 
 
 def _parse_principal_entries(principal: Dict) -> List[Tuple[Any, Any]]:
@@ -315,19 +381,55 @@ def _parse_principal_entries(principal: Dict) -> List[Tuple[Any, Any]]:
     return principal_entries
 
 
+def transform_roles(roles: List[Dict]) -> Tuple[List[Dict], List[Dict], List[Dict]]:
+    """
+    Splits the roles returned by list_roles into the three lists loaded by `load_roles`:
+    - the roles themselves,
+    - one (role, principal) pair per principal of each statement of the role's trust policy, and
+    - one (principal, account) pair for each of those principals that is identified by an ARN.
+    """
+    role_data: List[Dict] = []
+    trusted_principals: List[Dict] = []
+    principal_accounts: List[Dict] = []
+    for role in roles:
+        role_data.append({
+            'Arn': role['Arn'],
+            'RoleId': role['RoleId'],
+            'CreateDate': str(role['CreateDate']),
+            'RoleName': role['RoleName'],
+            'Path': role['Path'],
+        })
+        for statement in role["AssumeRolePolicyDocument"]["Statement"]:
+            principal_entries = _parse_principal_entries(statement["Principal"])
+            for principal_type, principal_value in principal_entries:
+                trusted_principals.append({
+                    'RoleArn': role['Arn'],
+                    'SpnArn': principal_value,
+                    'SpnType': principal_type,
+                })
+                spn_account_id = get_account_from_arn(principal_value)
+                if spn_account_id:
+                    principal_accounts.append({
+                        'SpnArn': principal_value,
+                        'SpnAccountId': spn_account_id,
+                    })
+    return role_data, trusted_principals, principal_accounts
+
+
 @timeit
 def load_roles(
     neo4j_session: neo4j.Session, roles: List[Dict], current_aws_account_id: str, aws_update_tag: int,
 ) -> None:
     ingest_role = """
-    MERGE (rnode:AWSPrincipal{arn: $Arn})
+    UNWIND $DictList AS role
+    MERGE (rnode:AWSPrincipal{arn: role.Arn})
     ON CREATE SET rnode.firstseen = timestamp()
     SET
         rnode:AWSRole,
-        rnode.roleid = $RoleId,
-        rnode.createdate = $CreateDate,
-        rnode.name = $RoleName,
-        rnode.path = $Path,
+        rnode.roleid = role.RoleId,
+        rnode.createdate = role.CreateDate,
+        rnode.name = role.RoleName,
+        rnode.path = role.Path,
         rnode.lastupdated = $aws_update_tag
     WITH rnode
     MATCH (aa:AWSAccount{id: $AWS_ACCOUNT_ID})
@@ -337,11 +439,12 @@ def load_roles(
     """
 
     ingest_policy_statement = """
-    MERGE (spnnode:AWSPrincipal{arn: $SpnArn})
+    UNWIND $DictList AS trust
+    MERGE (spnnode:AWSPrincipal{arn: trust.SpnArn})
     ON CREATE SET spnnode.firstseen = timestamp()
-    SET spnnode.lastupdated = $aws_update_tag, spnnode.type = $SpnType
-    WITH spnnode
-    MATCH (role:AWSRole{arn: $RoleArn})
+    SET spnnode.lastupdated = $aws_update_tag, spnnode.type = trust.SpnType
+    WITH spnnode, trust
+    MATCH (role:AWSRole{arn: trust.RoleArn})
     MERGE (role)-[r:TRUSTS_AWS_PRINCIPAL]->(spnnode)
     ON CREATE SET r.firstseen = timestamp()
     SET r.lastupdated = $aws_update_tag
@@ -356,11 +459,12 @@ def load_roles(
     # - The foreign attribute - the attribute assignment logic is in aws_foreign_accounts.json analysis job
     # - Why seperate statement is needed - the arn may point to service level principals ex - ec2.amazonaws.com
     ingest_spnmap_statement = """
-    MERGE (aa:AWSAccount{id: $SpnAccountId})
+    UNWIND $DictList AS spn
+    MERGE (aa:AWSAccount{id: spn.SpnAccountId})
     ON CREATE SET aa.firstseen = timestamp()
     SET aa.lastupdated = $aws_update_tag
-    WITH aa
-    MATCH (spnnode:AWSPrincipal{arn: $SpnArn})
+    WITH aa, spn
+    MATCH (spnnode:AWSPrincipal{arn: spn.SpnArn})
     WITH spnnode, aa
     MERGE (aa)-[r:RESOURCE]->(spnnode)
     ON CREATE SET r.firstseen = timestamp()
@@ -368,44 +472,35 @@ def load_roles(
 
     # TODO support conditions
     logger.info(f"Loading {len(roles)} IAM roles to the graph.")
-    for role in roles:
-        neo4j_session.run(
-            ingest_role,
-            Arn=role["Arn"],
-            RoleId=role["RoleId"],
-            CreateDate=str(role["CreateDate"]),
-            RoleName=role["RoleName"],
-            Path=role["Path"],
-            AWS_ACCOUNT_ID=current_aws_account_id,
-            aws_update_tag=aws_update_tag,
-        )
+    role_data, trusted_principals, principal_accounts = transform_roles(roles)
+    _load_iam_batch(
+        neo4j_session,
+        ingest_role,
+        role_data,
+        AWS_ACCOUNT_ID=current_aws_account_id,
+        aws_update_tag=aws_update_tag,
+    )
+    # Trust relationships are loaded after all of the account's roles so that a role trusting another role of the
+    # same account always finds it already labeled as an AWSRole.
+    _load_iam_batch(neo4j_session, ingest_policy_statement, trusted_principals, aws_update_tag=aws_update_tag)
+    _load_iam_batch(neo4j_session, ingest_spnmap_statement, principal_accounts, aws_update_tag=aws_update_tag)
 
-        for statement in role["AssumeRolePolicyDocument"]["Statement"]:
-            principal_entries = _parse_principal_entries(statement["Principal"])
-            for principal_type, principal_value in principal_entries:
-                neo4j_session.run(
-                    ingest_policy_statement,
-                    SpnArn=principal_value,
-                    SpnType=principal_type,
-                    RoleArn=role['Arn'],
-                    aws_update_tag=aws_update_tag,
-                )
-                spn_arn = get_account_from_arn(principal_value)
-                if spn_arn:
-                    neo4j_session.run(
-                        ingest_spnmap_statement,
-                        SpnArn=principal_value,
-                        SpnAccountId=get_account_from_arn(principal_value),
-                        aws_update_tag=aws_update_tag,
-                    )
+
+def transform_group_memberships(group_memberships: Dict) -> List[Dict]:
+    return [
+        {'GroupArn': group_arn, 'PrincipalArn': info['Arn']}
+        for group_arn, membership_data in group_memberships.items()
+        for info in membership_data.get("Users", [])
+    ]
 
 
 @timeit
 def load_group_memberships(neo4j_session: neo4j.Session, group_memberships: Dict, aws_update_tag: int) -> None:
     ingest_membership = """
-    MATCH (group:AWSGroup{arn: $GroupArn})
-    WITH group
-    MATCH (user:AWSUser{arn: $PrincipalArn})
+    UNWIND $DictList AS membership
+    MATCH (group:AWSGroup{arn: membership.GroupArn})
+    WITH group, membership
+    MATCH (user:AWSUser{arn: membership.PrincipalArn})
     MERGE (user)-[r:MEMBER_AWS_GROUP]->(group)
     ON CREATE SET r.firstseen = timestamp()
     SET r.lastupdated = $aws_update_tag
@@ -414,37 +509,61 @@ def load_group_memberships(neo4j_session: neo4j.Session, group_memberships: Dict
     MERGE (user)-[r2:POLICY]->(policy)
     SET r2.lastupdated = $aws_update_tag
     """
-
-    for group_arn, membership_data in group_memberships.items():
-        for info in membership_data.get("Users", []):
-            principal_arn = info["Arn"]
-            neo4j_session.run(
-                ingest_membership,
-                GroupArn=group_arn,
-                PrincipalArn=principal_arn,
-                aws_update_tag=aws_update_tag,
-            )
+    _load_iam_batch(
+        neo4j_session,
+        ingest_membership,
+        transform_group_memberships(group_memberships),
+        aws_update_tag=aws_update_tag,
+    )
 
 
 @timeit
-def get_policies_for_principal(neo4j_session: neo4j.Session, principal_arn: str) -> Dict:
+def get_policies_for_principals(neo4j_session: neo4j.Session, principal_arns: List[str]) -> Dict[str, Dict]:
+    """
+    Returns {principal_arn: {policy_id: statements}} for all of the given principals in a single query.
+    """
     get_policy_query = """
+    UNWIND $Arns AS arn
     MATCH
-    (principal:AWSPrincipal{arn:$Arn})-[:POLICY]->
+    (principal:AWSPrincipal{arn: arn})-[:POLICY]->
     (policy:AWSPolicy)-[:STATEMENT]->
     (statements:AWSPolicyStatement)
     RETURN
-    DISTINCT policy.id AS policy_id,
+    principal.arn AS principal_arn,
+    policy.id AS policy_id,
     COLLECT(DISTINCT statements) AS statements
     """
     results = neo4j_session.run(
         get_policy_query,
-        Arn=principal_arn,
+        Arns=principal_arns,
     )
-    policies = {r["policy_id"]: parse_statement_node(r["statements"]) for r in results}
+    policies: Dict[str, Dict] = {}
+    for r in results:
+        policies.setdefault(r["principal_arn"], {})[r["policy_id"]] = parse_statement_node(r["statements"])
     return policies
 
 
+def calculate_assumerole_relationships(
+    potential_matches: List[Tuple[str, str]], principal_policies: Dict[str, Dict],
+) -> List[Dict]:
+    """
+    Returns the (source, target) pairs of `potential_matches` for which the source's policies allow sts:AssumeRole on
+    the target role, as a list of {"SourceArn": ..., "TargetArn": ...} dicts in the order of `potential_matches`.
+    Each source's statements are compiled only once, however many roles trust it.
+    """
+    policy_index = PrincipalPolicyIndex(principal_policies)
+    target_arns = list(dict.fromkeys(target_arn for _, target_arn in potential_matches))
+    allowed = {
+        (mapping["principal_arn"], mapping["resource_arn"])
+        for mapping in policy_index.calculate_permission_relationships(target_arns, ["sts:AssumeRole"])
+    }
+    return [
+        {"SourceArn": source_arn, "TargetArn": target_arn}
+        for source_arn, target_arn in potential_matches
+        if (source_arn, target_arn) in allowed
+    ]
+
+
 @timeit
 def sync_assumerole_relationships(
     neo4j_session: neo4j.Session, current_aws_account_id: str, aws_update_tag: int,
@@ -463,9 +582,10 @@ def sync_assumerole_relationships(
     """
 
     ingest_policies_assume_role = """
-    MATCH (source:AWSPrincipal{arn: $SourceArn})
-    WITH source
-    MATCH (role:AWSRole{arn: $TargetArn})
+    UNWIND $DictList AS assume_role
+    MATCH (source:AWSPrincipal{arn: assume_role.SourceArn})
+    WITH source, assume_role
+    MATCH (role:AWSRole{arn: assume_role.TargetArn})
     WITH role, source
     MERGE (source)-[r:STS_ASSUMEROLE_ALLOW]->(role)
     ON CREATE SET r.firstseen = timestamp()
@@ -476,16 +596,20 @@ def sync_assumerole_relationships(
         query_potential_matches,
         AccountId=current_aws_account_id,
     )
-    potential_matches = [(r["source_arn"], r["target_arn"]) for r in results]
-    for source_arn, target_arn in potential_matches:
-        policies = get_policies_for_principal(neo4j_session, source_arn)
-        if principal_allowed_on_resource(policies, target_arn, ["sts:AssumeRole"]):
-            neo4j_session.run(
-                ingest_policies_assume_role,
-                SourceArn=source_arn,
-                TargetArn=target_arn,
-                aws_update_tag=aws_update_tag,
-            )
+    potential_matches = list(dict.fromkeys((r["source_arn"], r["target_arn"]) for r in results))
+    source_arns = list(dict.fromkeys(source_arn for source_arn, _ in potential_matches))
+    principal_policies = get_policies_for_principals(neo4j_session, source_arns)
+    assume_role_relationships = calculate_assumerole_relationships(potential_matches, principal_policies)
+    logger.info(
+        f"Loading {len(assume_role_relationships)} STS_ASSUMEROLE_ALLOW relationships out of "
+        f"{len(potential_matches)} trust relationships.",
+    )
+    _load_iam_batch(
+        neo4j_session,
+        ingest_policies_assume_role,
+        assume_role_relationships,
+        aws_update_tag=aws_update_tag,
+    )
     run_cleanup_job(
         'aws_import_roles_policy_cleanup.json',
         neo4j_session,
@@ -493,39 +617,48 @@ def sync_assumerole_relationships(
     )
 
 
+def transform_user_access_keys(user_access_keys: Dict) -> List[Dict]:
+    return [
+        {
+            'UserARN': arn,
+            'AccessKeyId': key['AccessKeyId'],
+            'CreateDate': str(key['CreateDate']),
+            'Status': key['Status'],
+            'LastUsedDate': key['LastUsedDate'],
+            'LastUsedService': key['LastUsedService'],
+            'LastUsedRegion': key['LastUsedRegion'],
+        }
+        for arn, access_keys in user_access_keys.items()
+        for key in access_keys["AccessKeyMetadata"]
+        if key.get('AccessKeyId')
+    ]
+
+
 @timeit
 def load_user_access_keys(neo4j_session: neo4j.Session, user_access_keys: Dict, aws_update_tag: int) -> None:
     # TODO change the node label to reflect that this is a user access key, not an account access key
     ingest_account_key = """
-    MATCH (user:AWSUser{arn: $UserARN})
-    WITH user
-    MERGE (key:AccountAccessKey{accesskeyid: $AccessKeyId})
-    ON CREATE SET key.firstseen = timestamp(), key.createdate = $CreateDate
-    SET key.status = $Status,
+    UNWIND $DictList AS key_data
+    MATCH (user:AWSUser{arn: key_data.UserARN})
+    WITH user, key_data
+    MERGE (key:AccountAccessKey{accesskeyid: key_data.AccessKeyId})
+    ON CREATE SET key.firstseen = timestamp(), key.createdate = key_data.CreateDate
+    SET key.status = key_data.Status,
         key.lastupdated = $aws_update_tag,
-        key.lastuseddate = $LastUsedDate,
-        key.lastusedservice = $LastUsedService,
-        key.lastusedregion = $LastUsedRegion
+        key.lastuseddate = key_data.LastUsedDate,
+        key.lastusedservice = key_data.LastUsedService,
+        key.lastusedregion = key_data.LastUsedRegion
     WITH user,key
     MERGE (user)-[r:AWS_ACCESS_KEY]->(key)
     ON CREATE SET r.firstseen = timestamp()
     SET r.lastupdated = $aws_update_tag
     """
-
-    for arn, access_keys in user_access_keys.items():
-        for key in access_keys["AccessKeyMetadata"]:
-            if key.get('AccessKeyId'):
-                neo4j_session.run(
-                    ingest_account_key,
-                    UserARN=arn,
-                    AccessKeyId=key['AccessKeyId'],
-                    CreateDate=str(key['CreateDate']),
-                    Status=key['Status'],
-                    LastUsedDate=key['LastUsedDate'],
-                    LastUsedService=key['LastUsedService'],
-                    LastUsedRegion=key['LastUsedRegion'],
-                    aws_update_tag=aws_update_tag,
-                )
+    _load_iam_batch(
+        neo4j_session,
+        ingest_account_key,
+        transform_user_access_keys(user_access_keys),
+        aws_update_tag=aws_update_tag,
+    )
 
 
 def ensure_list(obj: Any) -> List[Any]:
@@ -570,6 +703,70 @@ def transform_policy_data(policy_map: Dict, policy_type: str) -> None:
             policy_statement_map[policy_key] = _transform_policy_statements(statements, policy_id)
 
 
+def transform_inline_policies(principal_details: List[Dict], policy_list_key: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Builds the {principal_arn: {policy_name: statements}} map returned by e.g. `get_user_policy_data` from the
+    UserDetailList, GroupDetailList or RoleDetailList of GetAccountAuthorizationDetails.
+    :param policy_list_key: 'UserPolicyList', 'GroupPolicyList' or 'RolePolicyList'
+    """
+    return {
+        principal['Arn']: {
+            policy['PolicyName']: policy['PolicyDocument']['Statement']
+            for policy in principal.get(policy_list_key, [])
+        }
+        for principal in principal_details
+    }
+
+
+def transform_managed_policies(principal_details: List[Dict], policies: List[Dict]) -> Dict[str, Dict[str, Any]]:
+    """
+    Builds the {principal_arn: {policy_arn: statements}} map returned by e.g. `get_user_managed_policy_data` from the
+    principal and policy lists of GetAccountAuthorizationDetails, using the default version of each policy.
+    """
+    default_statements: Dict[str, Any] = {}
+    for policy in policies:
+        for version in policy.get('PolicyVersionList', []):
+            if version.get('IsDefaultVersion'):
+                default_statements[policy['Arn']] = version['Document']['Statement']
+
+    policy_map: Dict[str, Dict[str, Any]] = {}
+    for principal in principal_details:
+        policy_map[principal['Arn']] = {}
+        for attached_policy in principal.get('AttachedManagedPolicies', []):
+            policy_arn = attached_policy['PolicyArn']
+            if policy_arn not in default_statements:
+                logger.warning(
+                    f"Managed policy {policy_arn} attached to {principal['Arn']} was not returned by "
+                    "GetAccountAuthorizationDetails; skipping.",
+                )
+                continue
+            policy_map[principal['Arn']][policy_arn] = default_statements[policy_arn]
+    return policy_map
+
+
+def transform_group_memberships_from_users(user_details: List[Dict], group_details: List[Dict]) -> Dict[str, Dict]:
+    """
+    Builds the {group_arn: get_group response} map consumed by `load_group_memberships` from the GroupList of each
+    user returned by GetAccountAuthorizationDetails, so that no GetGroup call is needed per group.
+    """
+    group_arns_by_name = {group['GroupName']: group['Arn'] for group in group_details}
+    memberships: Dict[str, Dict] = {group['Arn']: {'Users': []} for group in group_details}
+    for user in user_details:
+        for group_name in user.get('GroupList', []):
+            group_arn = group_arns_by_name.get(group_name)
+            if group_arn:
+                memberships[group_arn]['Users'].append({'UserName': user['UserName'], 'Arn': user['Arn']})
+    return memberships
+
+
+def transform_role_tags(role_details: List[Dict]) -> List[Dict]:
+    return [
+        {'ResourceARN': role['Arn'], 'Tags': role['Tags']}
+        for role in role_details
+        if role.get('Tags')
+    ]
+
+
 def transform_policy_id(principal_arn: str, policy_type: str, name: str) -> str:
     return f"{principal_arn}/{policy_type}_policy/{name}"
 
@@ -792,11 +989,13 @@ def sync_user_access_keys(
     logger.info("Syncing IAM user access keys for account '%s'.", current_aws_account_id)
     query = "MATCH (user:AWSUser)<-[:RESOURCE]-(:AWSAccount{id: $AWS_ACCOUNT_ID}) " \
             "RETURN user.name as name, user.arn as arn"
-    for user in neo4j_session.run(query, AWS_ACCOUNT_ID=current_aws_account_id):
+    users = neo4j_session.run(query, AWS_ACCOUNT_ID=current_aws_account_id).data()
+    account_access_keys = {}
+    for user in users:
         access_keys = get_account_access_key_data(boto3_session, user["name"])
         if access_keys:
-            account_access_keys = {user["arn"]: access_keys}
-            load_user_access_keys(neo4j_session, account_access_keys, aws_update_tag)
+            account_access_keys[user["arn"]] = access_keys
+    load_user_access_keys(neo4j_session, account_access_keys, aws_update_tag)
     run_cleanup_job(
         'aws_import_account_access_key_cleanup.json',
         neo4j_session,
@@ -804,6 +1003,65 @@ def sync_user_access_keys(
     )
 
 
+def _load_principal_policies(
+    neo4j_session: neo4j.Session, inline_policy_data: Dict, managed_policy_data: Dict, aws_update_tag: int,
+) -> None:
+    transform_policy_data(inline_policy_data, PolicyType.inline.value)
+    load_policy_data(neo4j_session, inline_policy_data, PolicyType.inline.value, aws_update_tag)
+    transform_policy_data(managed_policy_data, PolicyType.managed.value)
+    load_policy_data(neo4j_session, managed_policy_data, PolicyType.managed.value, aws_update_tag)
+
+
+@timeit
+def sync_principals_from_authorization_details(
+    neo4j_session: neo4j.Session, boto3_session: boto3.session.Session,
+    current_aws_account_id: str, aws_update_tag: int, common_job_parameters: Dict,
+) -> None:
+    """
+    Alternative to sync_users, sync_groups, sync_roles and sync_group_memberships that collects the principals, their
+    policies and group memberships with GetAccountAuthorizationDetails, and loads the same data with the same loaders.
+    """
+    logger.info("Syncing IAM principals from account authorization details for account '%s'.", current_aws_account_id)
+    details = get_account_authorization_details(boto3_session)
+    policies = details['Policies']
+
+    # GetAccountAuthorizationDetails does not return PasswordLastUsed, so users still come from the list_users pages.
+    users = get_user_list_data(boto3_session)['Users']
+    load_users(neo4j_session, users, current_aws_account_id, aws_update_tag)
+    _load_principal_policies(
+        neo4j_session,
+        transform_inline_policies(details['UserDetailList'], 'UserPolicyList'),
+        transform_managed_policies(details['UserDetailList'], policies),
+        aws_update_tag,
+    )
+    run_cleanup_job('aws_import_users_cleanup.json', neo4j_session, common_job_parameters)
+
+    load_groups(neo4j_session, details['GroupDetailList'], current_aws_account_id, aws_update_tag)
+    _load_principal_policies(
+        neo4j_session,
+        transform_inline_policies(details['GroupDetailList'], 'GroupPolicyList'),
+        transform_managed_policies(details['GroupDetailList'], policies),
+        aws_update_tag,
+    )
+    run_cleanup_job('aws_import_groups_cleanup.json', neo4j_session, common_job_parameters)
+
+    load_roles(neo4j_session, details['RoleDetailList'], current_aws_account_id, aws_update_tag)
+    _load_principal_policies(
+        neo4j_session,
+        transform_inline_policies(details['RoleDetailList'], 'RolePolicyList'),
+        transform_managed_policies(details['RoleDetailList'], policies),
+        aws_update_tag,
+    )
+    run_cleanup_job('aws_import_roles_cleanup.json', neo4j_session, common_job_parameters)
+
+    load_group_memberships(
+        neo4j_session,
+        transform_group_memberships_from_users(details['UserDetailList'], details['GroupDetailList']),
+        aws_update_tag,
+    )
+    run_cleanup_job('aws_import_groups_membership_cleanup.json', neo4j_session, common_job_parameters)
+
+
 @timeit
 def sync(
     neo4j_session: neo4j.Session, boto3_session: boto3.session.Session, regions: List[str], current_aws_account_id: str,
@@ -812,10 +1070,17 @@ def sync(
     logger.info("Syncing IAM for account '%s'.", current_aws_account_id)
     # This module only syncs IAM information that is in use.
     # As such only policies that are attached to a user, role or group are synced
-    sync_users(neo4j_session, boto3_session, current_aws_account_id, update_tag, common_job_parameters)
-    sync_groups(neo4j_session, boto3_session, current_aws_account_id, update_tag, common_job_parameters)
-    sync_roles(neo4j_session, boto3_session, current_aws_account_id, update_tag, common_job_parameters)
-    sync_group_memberships(neo4j_session, boto3_session, current_aws_account_id, update_tag, common_job_parameters)
+    if common_job_parameters.get('aws_iam_use_authorization_details'):
+        sync_principals_from_authorization_details(
+            neo4j_session, boto3_session, current_aws_account_id, update_tag, common_job_parameters,
+        )
+    else:
+        sync_users(neo4j_session, boto3_session, current_aws_account_id, update_tag, common_job_parameters)
+        sync_groups(neo4j_session, boto3_session, current_aws_account_id, update_tag, common_job_parameters)
+        sync_roles(neo4j_session, boto3_session, current_aws_account_id, update_tag, common_job_parameters)
+        sync_group_memberships(
+            neo4j_session, boto3_session, current_aws_account_id, update_tag, common_job_parameters,
+        )
     sync_assumerole_relationships(neo4j_session, current_aws_account_id, update_tag, common_job_parameters)
     sync_user_access_keys(neo4j_session, boto3_session, current_aws_account_id, update_tag, common_job_parameters)
     run_cleanup_job('aws_import_principals_cleanup.json', neo4j_session, common_job_parameters)
@@ -8,6 +8,7 @@ import boto3
 import botocore
 import neo4j
 
+from cartography.intel.aws.util.regions import fetch_regions_concurrently
 from cartography.util import aws_handle_regions
 from cartography.util import run_cleanup_job
 from cartography.util import timeit
@@ -121,6 +122,17 @@ def get_lambda_function_details(
     return details
 
 
+def get_lambda_data_and_details(
+        boto3_session: boto3.session.Session, region: str,
+) -> Tuple[List[Dict], List[Tuple[str, List[Any], List[Any], List[Any]]]]:
+    """
+    Per-region fetch for Lambda: returns the functions in the region along with their aliases, event source mappings
+    and layers.
+    """
+    data = get_lambda_data(boto3_session, region)
+    return data, get_lambda_function_details(boto3_session, data, region)
+
+
 @timeit
 def load_lambda_function_details(
         neo4j_session: neo4j.Session, lambda_function_details: List[Tuple[str, List[Dict], List[Dict], List[Dict]]],
@@ -241,11 +253,11 @@ def sync_lambda_functions(
         neo4j_session: neo4j.Session, boto3_session: boto3.session.Session, regions: List[str],
         current_aws_account_id: str, aws_update_tag: int, common_job_parameters: Dict,
 ) -> None:
-    for region in regions:
+    for region, (data, lambda_function_details) in fetch_regions_concurrently(
+        boto3_session, regions, get_lambda_data_and_details,
+    ):
         logger.info("Syncing Lambda for region in '%s' in account '%s'.", region, current_aws_account_id)
-        data = get_lambda_data(boto3_session, region)
         load_lambda_functions(neo4j_session, data, region, current_aws_account_id, aws_update_tag)
-        lambda_function_details = get_lambda_function_details(boto3_session, data, region)
         load_lambda_function_details(neo4j_session, lambda_function_details, aws_update_tag)
 
     cleanup_lambda(neo4j_session, common_job_parameters)
@@ -1,11 +1,18 @@
+import bisect
+import enum
 import logging
 import os
 import re
 from string import Template
 from typing import Any
+from typing import Callable
 from typing import Dict
+from typing import FrozenSet
+from typing import Iterable
 from typing import List
+from typing import Optional
 from typing import Pattern
+from typing import Set
 from typing import Tuple
 
 import boto3
@@ -184,6 +191,292 @@ def calculate_permission_relationships(
     return allowed_mappings
 
 
+class _ClauseKind(enum.Enum):
+    # The clause has no wildcards, e.g. "arn:aws:s3:::mybucket"
+    LITERAL = 'literal'
+    # The clause's only wildcard is a trailing "*", e.g. "arn:aws:s3:::mybucket*" or "s3:Get*"
+    PREFIX = 'prefix'
+    # Anything else. These are evaluated with their regex, on only the values that share their literal prefix.
+    GLOB = 'glob'
+
+
+# Characters that carry meaning in a regex produced by compile_regex(). A clause that contains any of them (other than
+# the escaped periods and the wildcards that compile_regex() itself generates) is evaluated as a GLOB.
+_REGEX_SPECIAL_CHARS = frozenset('\\.^$*+?{}[]|()')
+_REGEX_QUANTIFIERS = frozenset('*+?{')
+
+
+class _Clause:
+    """
+    A single [not]action or [not]resource clause, classified so that it can be matched without running its regex.
+    Matching is guaranteed to give the same result as `evaluate_clause()`: ASCII values are compared case-insensitively
+    by lower-casing, and anything that cannot be proven equivalent falls back to the regex.
+    """
+
+    def __init__(self, pattern: Pattern):
+        self.pattern = pattern
+        self.kind = _ClauseKind.GLOB
+        # For LITERAL, the whole lower-cased clause. For PREFIX and GLOB, the lower-cased text that every match starts
+        # with.
+        self.text = ''
+
+        literal: List[str] = []
+        regex = pattern.pattern
+        i = 0
+        ends_with_star = False
+        while i < len(regex):
+            char = regex[i]
+            next_char = regex[i + 1] if i + 1 < len(regex) else ''
+            if char == '\\' and next_char == '.':
+                literal.append('.')
+                i += 2
+            elif char == '.' and next_char == '*' and i + 2 == len(regex):
+                ends_with_star = True
+                i += 2
+            elif char in _REGEX_SPECIAL_CHARS or not char.isascii():
+                if char in _REGEX_QUANTIFIERS:
+                    # The quantifier applies to the preceding character, which is therefore not a required prefix
+                    literal = literal[:-1]
+                break
+            else:
+                literal.append(char)
+                i += 1
+        if '|' in regex:
+            # An alternation can match values that don't start with the text before it
+            literal = []
+        self.text = ''.join(literal).lower()
+        if not pattern.flags & re.IGNORECASE:
+            # Lower-casing is only a valid shortcut for case insensitive clauses. `text` is still a valid
+            # case-insensitive pre-filter for GLOB matching.
+            return
+        if i == len(regex):
+            self.kind = _ClauseKind.PREFIX if ends_with_star else _ClauseKind.LITERAL
+
+    @property
+    def namespace(self) -> Optional[str]:
+        """
+        The lower-cased service namespace that every value matched by this action clause must have, e.g. "s3" for
+        "s3:Get*". None if the clause can match values in more than one namespace.
+        """
+        namespace, separator, _ = self.text.partition(':')
+        if separator or self.kind == _ClauseKind.LITERAL:
+            return namespace
+        return None
+
+    def matches(self, value: str) -> bool:
+        if not value.isascii():
+            return self.pattern.fullmatch(value) is not None
+        if self.kind == _ClauseKind.LITERAL:
+            return value.lower() == self.text
+        if self.kind == _ClauseKind.PREFIX:
+            return value.lower().startswith(self.text)
+        return value.lower().startswith(self.text) and self.pattern.fullmatch(value) is not None
+
+
+class _ResourceArnIndex:
+    """
+    A prefix index over a set of resource ARNs. Each resource clause is matched against the whole ARN set at once:
+    literal clauses are a dict lookup, and prefix and glob clauses only look at the sorted range of ARNs that start with
+    the clause's literal prefix.
+    """
+
+    def __init__(self, resource_arns: Iterable[str]):
+        self._arns_by_lower: Dict[str, List[str]] = {}
+        # ARNs with non-ASCII characters can't be lower-cased safely, so they are always evaluated with the regex.
+        self._non_ascii_arns: List[str] = []
+        for arn in set(resource_arns):
+            if not isinstance(arn, str):
+                continue
+            if arn.isascii():
+                self._arns_by_lower.setdefault(arn.lower(), []).append(arn)
+            else:
+                self._non_ascii_arns.append(arn)
+        self._sorted_keys = sorted(self._arns_by_lower)
+
+    def _keys_with_prefix(self, prefix: str) -> List[str]:
+        start = bisect.bisect_left(self._sorted_keys, prefix)
+        end = bisect.bisect_right(self._sorted_keys, prefix + '\U0010ffff', lo=start)
+        return self._sorted_keys[start:end]
+
+    def match(self, clause: _Clause) -> Set[str]:
+        matched = {arn for arn in self._non_ascii_arns if clause.pattern.fullmatch(arn)}
+        if clause.kind == _ClauseKind.LITERAL:
+            matched.update(self._arns_by_lower.get(clause.text, []))
+        elif clause.kind == _ClauseKind.PREFIX:
+            for key in self._keys_with_prefix(clause.text):
+                matched.update(self._arns_by_lower[key])
+        else:
+            for key in self._keys_with_prefix(clause.text):
+                matched.update(arn for arn in self._arns_by_lower[key] if clause.pattern.fullmatch(arn))
+        return matched
+
+
+class _Statement:
+    """
+    A policy statement with all of its clauses classified. `namespaces` is the set of service namespaces the
+    statement's actions can apply to, or None if it can apply to any namespace (e.g. "*" or a notaction-only statement).
+    """
+
+    def __init__(self, statement: Dict, clause_cache: Dict[Pattern, _Clause]):
+        def _compile(prop: str) -> List[_Clause]:
+            clauses = []
+            for item in statement.get(prop, []):
+                pattern = compile_regex(item)
+                if pattern not in clause_cache:
+                    clause_cache[pattern] = _Clause(pattern)
+                clauses.append(clause_cache[pattern])
+            return clauses
+
+        self.effect = statement['effect']
+        self.has_action = 'action' in statement
+        self.has_resource = 'resource' in statement
+        self.action = _compile('action')
+        self.notaction = _compile('notaction')
+        self.resource = _compile('resource')
+        self.notresource = _compile('notresource')
+        self.resource_key = (
+            tuple(c.pattern for c in self.resource),
+            tuple(c.pattern for c in self.notresource),
+        ) if self.has_resource else None
+
+        self.namespaces: Optional[FrozenSet[str]] = None
+        if self.has_action:
+            namespaces = [c.namespace for c in self.action]
+            if None not in namespaces:
+                self.namespaces = frozenset(n for n in namespaces if n is not None)
+
+    def applies_to_permission(self, permission: str) -> bool:
+        if any(clause.matches(permission) for clause in self.notaction):
+            return False
+        return not self.has_action or any(clause.matches(permission) for clause in self.action)
+
+
+class PrincipalPolicyIndex:
+    """
+    An index over the policies of a set of principals, used to calculate permission relationships without evaluating
+    every (resource, principal, policy, statement, clause) combination.
+
+    Statements are compiled once when the index is built, so the same index can be reused to calculate several
+    relationship types. For each call to `calculate_permission_relationships`:
+    - statements whose action namespaces don't include any of the requested permissions' namespaces are skipped,
+    - every remaining statement's [not]resource clauses are matched against the whole resource ARN set once, through a
+      prefix index, and the result is shared between statements with the same resource clauses,
+    - the policy evaluation logic of `principal_allowed_on_resource` is then applied on sets of ARNs.
+
+    The result is identical to `calculate_permission_relationships`, including the order of the returned mappings.
+    """
+
+    def __init__(self, principals: Dict):
+        clause_cache: Dict[Pattern, _Clause] = {}
+        self._principals: Dict[str, List[List[_Statement]]] = {
+            principal_arn: [
+                [_Statement(statement, clause_cache) for statement in statements]
+                for statements in policies.values()
+            ]
+            for principal_arn, policies in principals.items()
+        }
+
+    def calculate_permission_relationships(self, resource_arns: List[str], permissions: List[str]) -> List[Dict]:
+        if not isinstance(permissions, list):
+            raise ValueError("permissions is not a list")
+        if not resource_arns:
+            return []
+
+        arn_index = _ResourceArnIndex(resource_arns)
+        permission_namespaces = {permission.partition(':')[0].lower() for permission in permissions}
+        # Namespaces are compared lower-cased, which is only equivalent to the regex for ASCII permissions
+        use_namespaces = all(permission.isascii() for permission in permissions)
+        resource_matches: Dict[Any, Set[str]] = {}
+        applicable_permissions: Dict[int, FrozenSet[int]] = {}
+
+        def _permissions_for(statement: _Statement) -> FrozenSet[int]:
+            key = id(statement)
+            if key not in applicable_permissions:
+                if (
+                    use_namespaces and statement.namespaces is not None
+                    and statement.namespaces.isdisjoint(permission_namespaces)
+                ):
+                    applicable_permissions[key] = frozenset()
+                else:
+                    applicable_permissions[key] = frozenset(
+                        i for i, permission in enumerate(permissions) if statement.applies_to_permission(permission)
+                    )
+            return applicable_permissions[key]
+
+        def _resources_for(statement: _Statement) -> Set[str]:
+            if statement.resource_key is None:
+                return set()
+            if statement.resource_key not in resource_matches:
+                matched: Set[str] = set()
+                for clause in statement.resource:
+                    matched |= arn_index.match(clause)
+                for clause in statement.notresource:
+                    if not matched:
+                        break
+                    matched -= arn_index.match(clause)
+                resource_matches[statement.resource_key] = matched
+            return resource_matches[statement.resource_key]
+
+        principals_by_resource: Dict[str, List[str]] = {}
+        for principal_arn, policies in self._principals.items():
+            denied: Set[str] = set()
+            allowed: Set[str] = set()
+            for statements in policies:
+                policy_denied, policy_allowed = self._evaluate_policy(
+                    statements, len(permissions), _permissions_for, _resources_for,
+                )
+                denied |= policy_denied
+                allowed |= policy_allowed
+            for resource_arn in allowed - denied:
+                principals_by_resource.setdefault(resource_arn, []).append(principal_arn)
+
+        return [
+            {"principal_arn": principal_arn, "resource_arn": resource_arn}
+            for resource_arn in resource_arns
+            for principal_arn in principals_by_resource.get(resource_arn, [])
+        ]
+
+    @staticmethod
+    def _evaluate_policy(
+        statements: List[_Statement],
+        num_permissions: int,
+        permissions_for: Callable[[_Statement], FrozenSet[int]],
+        resources_for: Callable[[_Statement], Set[str]],
+    ) -> Tuple[Set[str], Set[str]]:
+        """
+        Set-based equivalent of `evaluate_policy_for_permissions`: for each resource, the first permission (in order)
+        that is either denied or allowed by the policy decides the outcome for that resource.
+        :return: (resources explicitly denied by the policy, resources allowed by the policy)
+        """
+        relevant = [(s, permissions_for(s)) for s in statements if s.effect in ('Allow', 'Deny')]
+        relevant = [(s, p) for s, p in relevant if p]
+        if not relevant:
+            return set(), set()
+        decided: Set[str] = set()
+        denied: Set[str] = set()
+        allowed: Set[str] = set()
+        for i in range(num_permissions):
+            for effect, outcome in (('Deny', denied), ('Allow', allowed)):
+                matched: Set[str] = set()
+                for statement, statement_permissions in relevant:
+                    if statement.effect == effect and i in statement_permissions:
+                        matched |= resources_for(statement)
+                matched -= decided
+                outcome |= matched
+                decided |= matched
+        return denied, allowed
+
+
+def calculate_permission_relationships_indexed(
+    principals: Dict, resource_arns: List[str], permissions: List[str],
+) -> List[Dict]:
+    """
+    Same as `calculate_permission_relationships`, computed with a `PrincipalPolicyIndex`. Prefer building the index
+    once with `PrincipalPolicyIndex(principals)` when calculating several relationships for the same principals.
+    """
+    return PrincipalPolicyIndex(principals).calculate_permission_relationships(resource_arns, permissions)
+
+
 def parse_statement_node(node_group: List[Any]) -> List[Any]:
     """ Parse a dict from group of Neo4J node
 
@@ -372,6 +665,7 @@ def sync(
         )
         return
     relationship_mapping = parse_permission_relationships_file(pr_file)
+    principal_index = PrincipalPolicyIndex(principals)
     for rpr in relationship_mapping:
         if not is_valid_rpr(rpr):
             raise ValueError("""
@@ -383,7 +677,7 @@ def sync(
         target_label = rpr["target_label"]
         resource_arns = get_resource_arns(neo4j_session, current_aws_account_id, target_label)
         logger.info("Syncing relationship '%s' for node label '%s'", relationship_name, target_label)
-        allowed_mappings = calculate_permission_relationships(principals, resource_arns, permissions)
+        allowed_mappings = principal_index.calculate_permission_relationships(resource_arns, permissions)
         load_principal_mappings(
             neo4j_session, allowed_mappings,
             target_label, relationship_name, update_tag,
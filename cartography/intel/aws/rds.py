@@ -6,6 +6,7 @@ from typing import List
 import boto3
 import neo4j
 
+from cartography.intel.aws.util.regions import fetch_regions_concurrently
 from cartography.stats import get_stats_client
 from cartography.util import aws_handle_regions
 from cartography.util import aws_paginate
@@ -527,10 +528,9 @@ def sync_rds_clusters(
     """
     Grab RDS instance data from AWS, ingest to neo4j, and run the cleanup job.
     """
-    for region in regions:
+    for region, data in fetch_regions_concurrently(boto3_session, regions, get_rds_cluster_data):
         logger.info("Syncing RDS for region '%s' in account '%s'.", region, current_aws_account_id)
-        data = get_rds_cluster_data(boto3_session, region)
-        load_rds_clusters(neo4j_session, data, region, current_aws_account_id, update_tag)  # type: ignore
+        load_rds_clusters(neo4j_session, data, region, current_aws_account_id, update_tag)
     cleanup_rds_clusters(neo4j_session, common_job_parameters)
 
 
@@ -542,10 +542,9 @@ def sync_rds_instances(
     """
     Grab RDS instance data from AWS, ingest to neo4j, and run the cleanup job.
     """
-    for region in regions:
+    for region, data in fetch_regions_concurrently(boto3_session, regions, get_rds_instance_data):
         logger.info("Syncing RDS for region '%s' in account '%s'.", region, current_aws_account_id)
-        data = get_rds_instance_data(boto3_session, region)
-        load_rds_instances(neo4j_session, data, region, current_aws_account_id, update_tag)  # type: ignore
+        load_rds_instances(neo4j_session, data, region, current_aws_account_id, update_tag)
     cleanup_rds_instances_and_db_subnet_groups(neo4j_session, common_job_parameters)
 
 
@@ -557,10 +556,9 @@ def sync_rds_snapshots(
     """
     Grab RDS snapshot data from AWS, ingest to neo4j, and run the cleanup job.
     """
-    for region in regions:
+    for region, data in fetch_regions_concurrently(boto3_session, regions, get_rds_snapshot_data):
         logger.info("Syncing RDS for region '%s' in account '%s'.", region, current_aws_account_id)
-        data = get_rds_snapshot_data(boto3_session, region)
-        load_rds_snapshots(neo4j_session, data, region, current_aws_account_id, update_tag)  # type: ignore
+        load_rds_snapshots(neo4j_session, data, region, current_aws_account_id, update_tag)
     cleanup_rds_snapshots(neo4j_session, common_job_parameters)
 
 
@@ -2,11 +2,13 @@ import logging
 from string import Template
 from typing import Dict
 from typing import List
+from typing import Optional
 
 import boto3
 import neo4j
 
 from cartography.intel.aws.iam import get_role_tags
+from cartography.intel.aws.iam import get_role_tags_from_authorization_details
 from cartography.util import aws_handle_regions
 from cartography.util import batch
 from cartography.util import run_cleanup_job
@@ -228,10 +230,18 @@ def sync(
     common_job_parameters: Dict,
     tag_resource_type_mappings: Dict = TAG_RESOURCE_TYPE_MAPPINGS,
 ) -> None:
+    # IAM is a global service, so when role tags come from GetAccountAuthorizationDetails they are fetched only once and
+    # reused for every region.
+    iam_role_tags: Optional[List[Dict]] = None
     for region in regions:
         logger.info(f"Syncing AWS tags for account {current_aws_account_id} and region {region}")
         for resource_type in tag_resource_type_mappings.keys():
-            tag_data = get_tags(boto3_session, resource_type, region)
+            if resource_type == 'iam:role' and common_job_parameters.get('aws_iam_use_authorization_details'):
+                if iam_role_tags is None:
+                    iam_role_tags = get_role_tags_from_authorization_details(boto3_session)
+                tag_data = iam_role_tags
+            else:
+                tag_data = get_tags(boto3_session, resource_type, region)
             transform_tags(tag_data, resource_type)  # type: ignore
             logger.info(f"Loading {len(tag_data)} tags for resource type {resource_type}")
             load_tags(
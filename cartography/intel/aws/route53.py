@@ -1,4 +1,7 @@
 import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict
 from typing import List
 from typing import Optional
@@ -8,56 +11,108 @@ import boto3
 import botocore
 import neo4j
 
+from cartography.client.core.tx import load_graph_data
+from cartography.intel.aws.ec2.util import get_botocore_config
 from cartography.util import run_cleanup_job
 from cartography.util import timeit
 
 logger = logging.getLogger(__name__)
 
+# Number of hosted zones whose record sets are fetched at the same time
+ROUTE53_ZONE_CONCURRENCY = 5
+# Route53 allows 5 API requests per second per account. Stay under it, throttled calls are retried with backoff by
+# botocore.
+ROUTE53_MAX_REQUESTS_PER_SECOND = 4
+
+
+class _RequestRateLimiter:
+    """
+    Spaces out requests made from any number of threads so that at most `max_requests_per_second` of them start in
+    each second.
+    """
+
+    def __init__(self, max_requests_per_second: float) -> None:
+        self._interval = 1.0 / max_requests_per_second
+        self._next_request = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            request_at = max(now, self._next_request)
+            self._next_request = request_at + self._interval
+        if request_at > now:
+            time.sleep(request_at - now)
+
 
 @timeit
-def link_aws_resources(neo4j_session: neo4j.Session, update_tag: int) -> None:
+def link_aws_resources(neo4j_session: neo4j.Session, update_tag: int, current_aws_id: Optional[str] = None) -> None:
+    """
+    Create DNS_POINTS_TO relationships from the AWSDNSRecords synced in this run to the AWSDNSRecords, LoadBalancers,
+    LoadBalancerV2s and EC2Instances that they point to.
+    If `current_aws_id` is given, only the records of that account are linked, to targets of that account. Otherwise
+    the records of all accounts are linked to targets in any account; this global pass is run once, at the end of the
+    AWS sync, to find the links that cross accounts.
+    """
+    if current_aws_id:
+        match_records = """
+        MATCH (:AWSAccount{id: $AWS_ID})-[:RESOURCE]->(:AWSDNSZone)
+            <-[:MEMBER_OF_DNS_ZONE]-(n:AWSDNSRecord{lastupdated: $update_tag})
+        """
+        target_account = "<-[:RESOURCE]-(:AWSAccount{id: $AWS_ID})"
+    else:
+        match_records = """
+        MATCH (n:AWSDNSRecord{lastupdated: $update_tag})
+        """
+        target_account = ""
+
     # find records that point to other records
-    link_records = """
-    MATCH (n:AWSDNSRecord) WITH n MATCH (v:AWSDNSRecord{value: n.name})
+    link_records = match_records + f"""
+    WITH n
+    MATCH (v:AWSDNSRecord{{value: n.name, lastupdated: $update_tag}})
+        -[:MEMBER_OF_DNS_ZONE]->(:AWSDNSZone){target_account}
     WHERE NOT n = v
     MERGE (v)-[p:DNS_POINTS_TO]->(n)
     ON CREATE SET p.firstseen = timestamp()
     SET p.lastupdated = $update_tag
     """
-    neo4j_session.run(link_records, update_tag=update_tag)
+    neo4j_session.run(link_records, update_tag=update_tag, AWS_ID=current_aws_id)
 
     # find records that point to AWS LoadBalancers
-    link_elb = """
-    MATCH (n:AWSDNSRecord) WITH n MATCH (l:LoadBalancer{dnsname: n.value})
+    link_elb = match_records + f"""
+    WITH n
+    MATCH (l:LoadBalancer{{dnsname: n.value}}){target_account}
     MERGE (n)-[p:DNS_POINTS_TO]->(l)
     ON CREATE SET p.firstseen = timestamp()
     SET p.lastupdated = $update_tag
     """
-    neo4j_session.run(link_elb, update_tag=update_tag)
+    neo4j_session.run(link_elb, update_tag=update_tag, AWS_ID=current_aws_id)
 
     # find records that point to AWS LoadBalancersV2
-    link_elbv2 = """
-    MATCH (n:AWSDNSRecord) WITH n MATCH (l:LoadBalancerV2{dnsname: n.value})
+    link_elbv2 = match_records + f"""
+    WITH n
+    MATCH (l:LoadBalancerV2{{dnsname: n.value}}){target_account}
     MERGE (n)-[p:DNS_POINTS_TO]->(l)
     ON CREATE SET p.firstseen = timestamp()
     SET p.lastupdated = $update_tag
     """
-    neo4j_session.run(link_elbv2, update_tag=update_tag)
+    neo4j_session.run(link_elbv2, update_tag=update_tag, AWS_ID=current_aws_id)
 
     # find records that point to AWS EC2 Instances
-    link_ec2 = """
-    MATCH (n:AWSDNSRecord) WITH n MATCH (e:EC2Instance{publicdnsname: n.value})
+    link_ec2 = match_records + f"""
+    WITH n
+    MATCH (e:EC2Instance{{publicdnsname: n.value}}){target_account}
     MERGE (n)-[p:DNS_POINTS_TO]->(e)
     ON CREATE SET p.firstseen = timestamp()
     SET p.lastupdated = $update_tag
     """
-    neo4j_session.run(link_ec2, update_tag=update_tag)
+    neo4j_session.run(link_ec2, update_tag=update_tag, AWS_ID=current_aws_id)
 
 
 @timeit
 def load_a_records(neo4j_session: neo4j.Session, records: List[Dict], update_tag: int) -> None:
     ingest_records = """
-    UNWIND $records as record
+    UNWIND $DictList as record
         MERGE (a:DNSRecord:AWSDNSRecord{id: record.id})
         ON CREATE SET
             a.firstseen = timestamp(),
@@ -72,18 +127,14 @@ def load_a_records(neo4j_session: neo4j.Session, records: List[Dict], update_tag
         ON CREATE SET r.firstseen = timestamp()
         SET r.lastupdated = $update_tag
     """
-    neo4j_session.run(
-        ingest_records,
-        records=records,
-        update_tag=update_tag,
-    )
+    load_graph_data(neo4j_session, ingest_records, records, update_tag=update_tag)
 
 
 @timeit
 def load_alias_records(neo4j_session: neo4j.Session, records: List[Dict], update_tag: int) -> None:
     # create the DNSRecord nodes and link them to matching DNSZone and S3Bucket nodes
     ingest_records = """
-    UNWIND $records as record
+    UNWIND $DictList as record
         MERGE (a:DNSRecord:AWSDNSRecord{id: record.id})
         ON CREATE SET
             a.firstseen = timestamp(),
@@ -98,17 +149,13 @@ def load_alias_records(neo4j_session: neo4j.Session, records: List[Dict], update
         ON CREATE SET r.firstseen = timestamp()
         SET r.lastupdated = $update_tag
     """
-    neo4j_session.run(
-        ingest_records,
-        records=records,
-        update_tag=update_tag,
-    )
+    load_graph_data(neo4j_session, ingest_records, records, update_tag=update_tag)
 
 
 @timeit
 def load_cname_records(neo4j_session: neo4j.Session, records: List[Dict], update_tag: int) -> None:
     ingest_records = """
-    UNWIND $records as record
+    UNWIND $DictList as record
         MERGE (a:DNSRecord:AWSDNSRecord{id: record.id})
         ON CREATE SET
             a.firstseen = timestamp(),
@@ -123,36 +170,36 @@ def load_cname_records(neo4j_session: neo4j.Session, records: List[Dict], update
         ON CREATE SET r.firstseen = timestamp()
         SET r.lastupdated = $update_tag
     """
-    neo4j_session.run(
-        ingest_records,
-        records=records,
-        update_tag=update_tag,
-    )
+    load_graph_data(neo4j_session, ingest_records, records, update_tag=update_tag)
 
 
 @timeit
 def load_zone(neo4j_session: neo4j.Session, zone: Dict, current_aws_id: str, update_tag: int) -> None:
+    load_zones(neo4j_session, [zone], current_aws_id, update_tag)
+
+
+@timeit
+def load_zones(neo4j_session: neo4j.Session, zones: List[Dict], current_aws_id: str, update_tag: int) -> None:
     ingest_z = """
-    MERGE (zone:DNSZone:AWSDNSZone{zoneid:$ZoneId})
-    ON CREATE SET
-        zone.firstseen = timestamp(),
-        zone.name = $ZoneName
-    SET
-        zone.lastupdated = $update_tag,
-        zone.comment = $Comment,
-        zone.privatezone = $PrivateZone
-    WITH zone
-    MATCH (aa:AWSAccount{id: $AWS_ACCOUNT_ID})
-    MERGE (aa)-[r:RESOURCE]->(zone)
-    ON CREATE SET r.firstseen = timestamp()
-    SET r.lastupdated = $update_tag
+    UNWIND $DictList as z
+        MERGE (zone:DNSZone:AWSDNSZone{zoneid: z.zoneid})
+        ON CREATE SET
+            zone.firstseen = timestamp(),
+            zone.name = z.name
+        SET
+            zone.lastupdated = $update_tag,
+            zone.comment = z.comment,
+            zone.privatezone = z.privatezone
+        WITH zone
+        MATCH (aa:AWSAccount{id: $AWS_ACCOUNT_ID})
+        MERGE (aa)-[r:RESOURCE]->(zone)
+        ON CREATE SET r.firstseen = timestamp()
+        SET r.lastupdated = $update_tag
     """
-    neo4j_session.run(
+    load_graph_data(
+        neo4j_session,
         ingest_z,
-        ZoneName=zone['name'][:-1],
-        ZoneId=zone['zoneid'],
-        Comment=zone['comment'],
-        PrivateZone=zone['privatezone'],
+        [{**zone, 'name': zone['name'][:-1]} for zone in zones],
         AWS_ACCOUNT_ID=current_aws_id,
         update_tag=update_tag,
     )
@@ -160,8 +207,17 @@ def load_zone(neo4j_session: neo4j.Session, zone: Dict, current_aws_id: str, upd
 
 @timeit
 def load_ns_records(neo4j_session: neo4j.Session, records: List[Dict], zone_name: str, update_tag: int) -> None:
+    _load_ns_records(neo4j_session, records, update_tag)
+    _load_zone_name_servers(
+        neo4j_session,
+        [record for record in records if record["name"] == zone_name],
+        update_tag,
+    )
+
+
+def _load_ns_records(neo4j_session: neo4j.Session, records: List[Dict], update_tag: int) -> None:
     ingest_records = """
-    UNWIND $records as record
+    UNWIND $DictList as record
         MERGE (a:DNSRecord:AWSDNSRecord{id: record.id})
         ON CREATE SET
             a.firstseen = timestamp(),
@@ -185,28 +241,23 @@ def load_ns_records(neo4j_session: neo4j.Session, records: List[Dict], zone_name
             MERGE (a)-[pt:DNS_POINTS_TO]->(ns)
             SET pt.lastupdated = $update_tag
     """
-    neo4j_session.run(
-        ingest_records,
-        records=records,
-        update_tag=update_tag,
-    )
+    load_graph_data(neo4j_session, ingest_records, records, update_tag=update_tag)
+
 
-    # Map the official name servers for a domain.
+def _load_zone_name_servers(neo4j_session: neo4j.Session, records: List[Dict], update_tag: int) -> None:
+    """
+    Map the official name servers for a domain, from the NS records named after their own zone.
+    """
     map_ns_records = """
-    UNWIND $servers as server
-        MATCH (ns:NameServer{id:server})
-        MATCH (zone:AWSDNSZone{zoneid:$zoneid})
-        MERGE (ns)<-[r:NAMESERVER]-(zone)
-        SET r.lastupdated = $update_tag
+    UNWIND $DictList as record
+        MATCH (zone:AWSDNSZone{zoneid: record.zoneid})
+        WITH zone, record
+        UNWIND record.servers as server
+            MATCH (ns:NameServer{id: server})
+            MERGE (ns)<-[r:NAMESERVER]-(zone)
+            SET r.lastupdated = $update_tag
     """
-    for record in records:
-        if zone_name == record["name"]:
-            neo4j_session.run(
-                map_ns_records,
-                servers=record["servers"],
-                zoneid=record["zoneid"],
-                update_tag=update_tag,
-            )
+    load_graph_data(neo4j_session, map_ns_records, records, update_tag=update_tag)
 
 
 @timeit
@@ -338,64 +389,93 @@ def load_dns_details(
     (:AWSDNSRecord{type:"NS"})-[:DNS_POINTS_TO]->(:NameServer),
     (:AWSDNSRecord)-[:DNS_POINTS_TO]->(:AWSDNSRecord).
     """
+    zones = []
+    a_records = []
+    alias_records = []
+    cname_records = []
+    ns_records = []
+    zone_ns_records = []
     for zone, zone_record_sets in dns_details:
-        zone_a_records = []
-        zone_alias_records = []
-        zone_cname_records = []
-        zone_ns_records = []
         parsed_zone = transform_zone(zone)
-
-        load_zone(neo4j_session, parsed_zone, current_aws_id, update_tag)
+        zones.append(parsed_zone)
 
         for record_set in zone_record_sets:
             if record_set['Type'] == 'A' or record_set['Type'] == 'CNAME':
                 record = transform_record_set(record_set, zone['Id'], record_set['Name'][:-1])
 
                 if record['type'] == 'A':
-                    zone_a_records.append(record)
+                    a_records.append(record)
                 elif record['type'] == 'ALIAS':
-                    zone_alias_records.append(record)
+                    alias_records.append(record)
                 elif record['type'] == 'CNAME':
-                    zone_cname_records.append(record)
+                    cname_records.append(record)
 
             if record_set['Type'] == 'NS':
                 record = transform_ns_record_set(record_set, zone['Id'])
-                zone_ns_records.append(record)
-        if zone_a_records:
-            load_a_records(neo4j_session, zone_a_records, update_tag)
-
-        if zone_alias_records:
-            load_alias_records(neo4j_session, zone_alias_records, update_tag)
-
-        if zone_cname_records:
-            load_cname_records(neo4j_session, zone_cname_records, update_tag)
-        if zone_ns_records:
-            load_ns_records(neo4j_session, zone_ns_records, parsed_zone['name'][:-1], update_tag)
-    link_aws_resources(neo4j_session, update_tag)
+                ns_records.append(record)
+                if record['name'] == parsed_zone['name'][:-1]:
+                    zone_ns_records.append(record)
+
+    load_zones(neo4j_session, zones, current_aws_id, update_tag)
+    if a_records:
+        load_a_records(neo4j_session, a_records, update_tag)
+    if alias_records:
+        load_alias_records(neo4j_session, alias_records, update_tag)
+    if cname_records:
+        load_cname_records(neo4j_session, cname_records, update_tag)
+    if ns_records:
+        _load_ns_records(neo4j_session, ns_records, update_tag)
+        _load_zone_name_servers(neo4j_session, zone_ns_records, update_tag)
+    link_aws_resources(neo4j_session, update_tag, current_aws_id)
 
 
 @timeit
-def get_zone_record_sets(client: botocore.client.BaseClient, zone_id: str) -> List[Dict]:
+def get_zone_record_sets(
+    client: botocore.client.BaseClient, zone_id: str, rate_limiter: Optional[_RequestRateLimiter] = None,
+) -> List[Dict]:
+    """
+    Get the record sets of a hosted zone. Pages are requested one by one rather than through a paginator, so that the
+    `rate_limiter` is only waited on before a call that actually sends a request.
+    """
     resource_record_sets: List[Dict] = []
-    paginator = client.get_paginator('list_resource_record_sets')
-    pages = paginator.paginate(HostedZoneId=zone_id)
-    for page in pages:
+    params = {'HostedZoneId': zone_id}
+    while True:
+        if rate_limiter:
+            rate_limiter.wait()
+        page = client.list_resource_record_sets(**params)
         resource_record_sets.extend(page['ResourceRecordSets'])
+        if not page.get('IsTruncated'):
+            break
+        params['StartRecordName'] = page['NextRecordName']
+        params['StartRecordType'] = page['NextRecordType']
+        if 'NextRecordIdentifier' in page:
+            params['StartRecordIdentifier'] = page['NextRecordIdentifier']
     return resource_record_sets
 
 
 @timeit
 def get_zones(client: botocore.client.BaseClient) -> List[Tuple[Dict, List[Dict]]]:
+    """
+    Get the hosted zones of the account with their record sets. The record sets of ROUTE53_ZONE_CONCURRENCY zones are
+    fetched at the same time, and all requests share a ROUTE53_MAX_REQUESTS_PER_SECOND rate limit.
+    """
+    rate_limiter = _RequestRateLimiter(ROUTE53_MAX_REQUESTS_PER_SECOND)
     paginator = client.get_paginator('list_hosted_zones')
     hosted_zones: List[Dict] = []
     for page in paginator.paginate():
         hosted_zones.extend(page['HostedZones'])
+    if not hosted_zones:
+        return []
 
-    results: List[Tuple[Dict, List[Dict]]] = []
-    for hosted_zone in hosted_zones:
-        record_sets = get_zone_record_sets(client, hosted_zone['Id'])
-        results.append((hosted_zone, record_sets))
-    return results
+    with ThreadPoolExecutor(
+        max_workers=min(ROUTE53_ZONE_CONCURRENCY, len(hosted_zones)),
+        thread_name_prefix='cartography-route53',
+    ) as executor:
+        record_sets = executor.map(
+            lambda hosted_zone: get_zone_record_sets(client, hosted_zone['Id'], rate_limiter),
+            hosted_zones,
+        )
+        return list(zip(hosted_zones, record_sets))
 
 
 def _create_dns_record_id(zoneid: str, name: str, record_type: str) -> str:
@@ -421,7 +501,7 @@ def sync(
     update_tag: int, common_job_parameters: Dict,
 ) -> None:
     logger.info("Syncing Route53 for account '%s'.", current_aws_account_id)
-    client = boto3_session.client('route53')
+    client = boto3_session.client('route53', config=get_botocore_config())
     zones = get_zones(client)
     load_dns_details(neo4j_session, zones, current_aws_account_id, update_tag)
     link_sub_zones(neo4j_session, update_tag)
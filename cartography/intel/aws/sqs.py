@@ -9,6 +9,7 @@ import boto3
 import neo4j
 from botocore.exceptions import ClientError
 
+from cartography.intel.aws.util.regions import fetch_regions_concurrently
 from cartography.util import aws_handle_regions
 from cartography.util import run_cleanup_job
 from cartography.util import timeit
@@ -53,6 +54,16 @@ def get_sqs_queue_attributes(
     return queue_attributes
 
 
+def get_sqs_queues(boto3_session: boto3.session.Session, region: str) -> List[Tuple[str, Any]]:
+    """
+    Per-region fetch for SQS: lists the queues in the region and returns their attributes.
+    """
+    queue_urls = get_sqs_queue_list(boto3_session, region)
+    if len(queue_urls) == 0:
+        return []
+    return get_sqs_queue_attributes(boto3_session, queue_urls)
+
+
 @timeit
 def load_sqs_queues(
     neo4j_session: neo4j.Session,
@@ -150,11 +161,9 @@ def sync(
     neo4j_session: neo4j.Session, boto3_session: boto3.session.Session, regions: List[str], current_aws_account_id: str,
     update_tag: int, common_job_parameters: Dict,
 ) -> None:
-    for region in regions:
+    for region, queue_attributes in fetch_regions_concurrently(boto3_session, regions, get_sqs_queues):
         logger.info("Syncing SQS for region '%s' in account '%s'.", region, current_aws_account_id)
-        queue_urls = get_sqs_queue_list(boto3_session, region)
-        if len(queue_urls) == 0:
+        if len(queue_attributes) == 0:
             continue
-        queue_attributes = get_sqs_queue_attributes(boto3_session, queue_urls)
         load_sqs_queues(neo4j_session, queue_attributes, region, current_aws_account_id, update_tag)
     cleanup_sqs_queues(neo4j_session, common_job_parameters)
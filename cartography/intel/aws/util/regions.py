@@ -0,0 +1,92 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+from typing import Callable
+from typing import List
+from typing import Optional
+from typing import Tuple
+from typing import TypeVar
+
+import boto3
+
+logger = logging.getLogger(__name__)
+
+# Default number of regions fetched at the same time for a single AWS service. Modules can lower this (e.g. for APIs
+# with tight account-wide rate limits) by passing `max_workers` to `fetch_regions_concurrently`.
+DEFAULT_REGION_CONCURRENCY = 8
+
+R = TypeVar('R')
+T = TypeVar('T')
+
+
+class ThreadSafeBoto3Session:
+    """
+    Wraps a boto3 session so that it can be shared across the threads of a region fan-out.
+
+    boto3 clients are thread safe but sessions are not: creating clients from the same session on multiple threads at
+    once can race while credentials and service models are lazily loaded. This proxy serializes client and resource
+    creation on the wrapped session and forwards everything else, so `get_*` functions can keep calling
+    `boto3_session.client(...)` as usual.
+    """
+
+    def __init__(self, boto3_session: boto3.session.Session):
+        self._boto3_session = boto3_session
+        self._lock = threading.Lock()
+
+    def client(self, *args: Any, **kwargs: Any) -> Any:
+        with self._lock:
+            return self._boto3_session.client(*args, **kwargs)
+
+    def resource(self, *args: Any, **kwargs: Any) -> Any:
+        with self._lock:
+            return self._boto3_session.resource(*args, **kwargs)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._boto3_session, name)
+
+
+def fetch_regions_concurrently(
+    boto3_session: boto3.session.Session,
+    regions: List[str],
+    get_func: Callable[[boto3.session.Session, str], R],
+    transform_func: Optional[Callable[[R, str], T]] = None,
+    max_workers: int = DEFAULT_REGION_CONCURRENCY,
+) -> List[Tuple[str, Any]]:
+    """
+    Runs the fetch stage of a per-region AWS sync for all given regions at the same time.
+
+    Modules opt in by declaring a per-region pair of functions:
+    - `get_func(boto3_session, region)` calls the AWS API for one region. It should be decorated with
+      `aws_handle_regions` so that disabled opt-in regions are skipped and throttling is retried with backoff, exactly
+      as when regions are fetched one after another.
+    - `transform_func(raw_data, region)` (optional) turns the result of `get_func` into what the module's loader
+      expects.
+
+    Region threads are short-lived and have no asyncio event loop, so `get_func` must not use `to_synchronous`. When
+    it needs to fan out further, e.g. per repository, it should use a bounded `ThreadPoolExecutor` of its own.
+
+    Loading is intentionally not done here: callers iterate over the returned list and write to Neo4j on their own
+    session, so Neo4j writes stay serialized on a single thread.
+
+    :param boto3_session: The boto3 session for the current account
+    :param regions: The regions to fetch
+    :param get_func: The per-region fetch function
+    :param transform_func: The per-region transform function, or None to return the raw fetched data
+    :param max_workers: The maximum number of regions of this service to fetch at once
+    :return: A list of (region, data) tuples in the same order as `regions`. If fetching any region raises, the
+    exception is re-raised here.
+    """
+    if not regions:
+        return []
+    shared_session = ThreadSafeBoto3Session(boto3_session)
+
+    def _fetch_one_region(region: str) -> Any:
+        data = get_func(shared_session, region)
+        if transform_func is not None:
+            return transform_func(data, region)
+        return data
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(regions))) as executor:
+        results = list(executor.map(_fetch_one_region, regions))
+    return list(zip(regions, results))
@@ -1,9 +1,13 @@
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from functools import partial
 from typing import Any
+from typing import Callable
 from typing import Dict
-from typing import Generator
 from typing import List
 from typing import Tuple
+from typing import TypeVar
 
 import neo4j
 from azure.core.exceptions import ClientAuthenticationError
@@ -17,16 +21,37 @@ from cartography.util import timeit
 
 logger = logging.getLogger(__name__)
 
+# Number of storage management API calls made at the same time for a subscription.
+STORAGE_API_CONCURRENCY = 10
+
+R = TypeVar('R')
+
 
 @timeit
+@lru_cache(maxsize=32)
 def get_client(credentials: Credentials, subscription_id: str) -> StorageManagementClient:
     """
-    Getting the Azure Storage client
+    Getting the Azure Storage client. Clients are cached per credentials and subscription, and are shared by the
+    threads of _call_concurrently().
     """
     client = StorageManagementClient(credentials, subscription_id)
     return client
 
 
+def _call_concurrently(calls: List[Callable[[], R]]) -> List[R]:
+    """
+    Runs the given API calls on a pool of at most STORAGE_API_CONCURRENCY threads.
+    :return: The results of the calls, in the same order as `calls`.
+    """
+    if not calls:
+        return []
+    with ThreadPoolExecutor(
+        max_workers=min(STORAGE_API_CONCURRENCY, len(calls)),
+        thread_name_prefix='cartography-azure-storage',
+    ) as executor:
+        return list(executor.map(lambda call: call(), calls))
+
+
 @timeit
 def get_storage_account_list(credentials: Credentials, subscription_id: str) -> List[Dict]:
     """
@@ -106,18 +131,25 @@ def sync_storage_account_details(
 @timeit
 def get_storage_account_details(
         credentials: Credentials, subscription_id: str, storage_account_list: List[Dict],
-) -> Generator[Any, Any, Any]:
+) -> List[Tuple[Any, Any, Any, Any, Any, Any, Any]]:
     """
-    Iterates over all Storage Accounts to get the different storage services.
+    Gets the different storage services of all Storage Accounts, fetching the services of several accounts and
+    service types at the same time.
     """
-    for storage_account in storage_account_list:
-        queue_services = get_queue_services(credentials, subscription_id, storage_account)
-        table_services = get_table_services(credentials, subscription_id, storage_account)
-        file_services = get_file_services(credentials, subscription_id, storage_account)
-        blob_services = get_blob_services(credentials, subscription_id, storage_account)
-        yield storage_account['id'], storage_account['name'], storage_account[
-            'resourceGroup'
-        ], queue_services, table_services, file_services, blob_services
+    service_getters = [get_queue_services, get_table_services, get_file_services, get_blob_services]
+    services = _call_concurrently([
+        partial(getter, credentials, subscription_id, storage_account)
+        for storage_account in storage_account_list
+        for getter in service_getters
+    ])
+    details = []
+    for i, storage_account in enumerate(storage_account_list):
+        queue_services, table_services, file_services, blob_services = services[4 * i: 4 * i + 4]
+        details.append((
+            storage_account['id'], storage_account['name'], storage_account['resourceGroup'],
+            queue_services, table_services, file_services, blob_services,
+        ))
+    return details
 
 
 @timeit
@@ -394,13 +426,14 @@ def sync_queue_services_details(
 @timeit
 def get_queue_services_details(
         credentials: Credentials, subscription_id: str, queue_services: List[Dict],
-) -> Generator[Any, Any, Any]:
+) -> List[Tuple[Any, Any]]:
     """
     Returning the queues with their respective queue service id.
     """
-    for queue_service in queue_services:
-        queues = get_queues(credentials, subscription_id, queue_service)
-        yield queue_service['id'], queues
+    queues = _call_concurrently([
+        partial(get_queues, credentials, subscription_id, queue_service) for queue_service in queue_services
+    ])
+    return list(zip([service['id'] for service in queue_services], queues))
 
 
 @timeit
@@ -487,13 +520,14 @@ def sync_table_services_details(
 @timeit
 def get_table_services_details(
         credentials: Credentials, subscription_id: str, table_services: List[Dict],
-) -> Generator[Any, Any, Any]:
+) -> List[Tuple[Any, Any]]:
     """
     Returning the tables with their respective table service id.
     """
-    for table_service in table_services:
-        tables = get_tables(credentials, subscription_id, table_service)
-        yield table_service['id'], tables
+    tables = _call_concurrently([
+        partial(get_tables, credentials, subscription_id, table_service) for table_service in table_services
+    ])
+    return list(zip([service['id'] for service in table_services], tables))
 
 
 @timeit
@@ -581,13 +615,14 @@ def sync_file_services_details(
 @timeit
 def get_file_services_details(
         credentials: Credentials, subscription_id: str, file_services: List[Dict],
-) -> Generator[Any, Any, Any]:
+) -> List[Tuple[Any, Any]]:
     """
     Returning the shares with their respective file service id.
     """
-    for file_service in file_services:
-        shares = get_shares(credentials, subscription_id, file_service)
-        yield file_service['id'], shares
+    shares = _call_concurrently([
+        partial(get_shares, credentials, subscription_id, file_service) for file_service in file_services
+    ])
+    return list(zip([service['id'] for service in file_services], shares))
 
 
 @timeit
@@ -685,13 +720,14 @@ def sync_blob_services_details(
 @timeit
 def get_blob_services_details(
         credentials: Credentials, subscription_id: str, blob_services: List[Dict],
-) -> Generator[Any, Any, Any]:
+) -> List[Tuple[Any, Any]]:
     """
     Returning the blob containers with their respective blob service id.
     """
-    for blob_service in blob_services:
-        blob_containers = get_blob_containers(credentials, subscription_id, blob_service)
-        yield blob_service['id'], blob_containers
+    blob_containers = _call_concurrently([
+        partial(get_blob_containers, credentials, subscription_id, blob_service) for blob_service in blob_services
+    ])
+    return list(zip([service['id'] for service in blob_services], blob_containers))
 
 
 @timeit
@@ -1,11 +1,13 @@
 import logging
 from typing import Dict
+from typing import Iterator
 from typing import List
 
 import neo4j
 from falconpy.hosts import Hosts
 from falconpy.oauth2 import OAuth2
 
+from cartography.intel.crowdstrike.util import fetch_and_load
 from cartography.util import timeit
 
 logger = logging.getLogger(__name__)
@@ -18,10 +20,14 @@ def sync_hosts(
     authorization: OAuth2,
 ) -> None:
     client = Hosts(auth_object=authorization)
-    all_ids = get_host_ids(client)
-    for ids in all_ids:
-        host_data = get_hosts(client, ids)
-        load_host_data(neo4j_session, host_data, update_tag)
+    fetch_and_load(
+        (
+            get_hosts(client, ids)
+            for ids in get_host_ids(client)
+        ),
+        lambda data: load_host_data(neo4j_session, data, update_tag),
+        'hosts',
+    )
 
 
 def load_host_data(
@@ -76,16 +82,17 @@ def load_host_data(
     )
 
 
-def get_host_ids(client: Hosts, crowdstrikeapi_filter: str = '', crowdstrikeapi_limit: int = 5000) -> List[List[str]]:
-    ids = []
+def get_host_ids(
+    client: Hosts, crowdstrikeapi_filter: str = '', crowdstrikeapi_limit: int = 5000,
+) -> Iterator[List[str]]:
     parameters = {"filter": crowdstrikeapi_filter, "limit": crowdstrikeapi_limit}
     response = client.QueryDevicesByFilter(parameters=parameters)
     body = response.get("body", {})
     resources = body.get("resources", [])
     if not resources:
         logger.warning("No host IDs in QueryDevicesByFilter.")
-        return []
-    ids.append(resources)
+        return
+    yield resources
     offset = body.get("meta", {}).get("pagination", {}).get("offset")
     while offset:
         parameters["offset"] = offset
@@ -94,9 +101,8 @@ def get_host_ids(client: Hosts, crowdstrikeapi_filter: str = '', crowdstrikeapi_
         resources = body.get("resources", [])
         if not resources:
             break
-        ids.append(resources)
+        yield resources
         offset = body.get("meta", {}).get("pagination", {}).get("offset")
-    return ids
 
 
 def get_hosts(client: Hosts, ids: List[str]) -> List[Dict]:
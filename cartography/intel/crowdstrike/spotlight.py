@@ -1,11 +1,13 @@
 import logging
 from typing import Dict
+from typing import Iterator
 from typing import List
 
 import neo4j
 from falconpy.oauth2 import OAuth2
 from falconpy.spotlight_vulnerabilities import Spotlight_Vulnerabilities
 
+from cartography.intel.crowdstrike.util import fetch_and_load
 from cartography.util import timeit
 
 logger = logging.getLogger(__name__)
@@ -18,10 +20,14 @@ def sync_vulnerabilities(
     authorization: OAuth2,
 ) -> None:
     client = Spotlight_Vulnerabilities(auth_object=authorization)
-    all_ids = get_spotlight_vulnerability_ids(client)
-    for ids in all_ids:
-        vulnerability_data = get_spotlight_vulnerabilities(client, ids)
-        load_vulnerability_data(neo4j_session, vulnerability_data, update_tag)
+    fetch_and_load(
+        (
+            get_spotlight_vulnerabilities(client, ids)
+            for ids in get_spotlight_vulnerability_ids(client)
+        ),
+        lambda data: load_vulnerability_data(neo4j_session, data, update_tag),
+        'vulnerabilities',
+    )
 
 
 def load_vulnerability_data(
@@ -111,16 +117,15 @@ def _load_cves(neo4j_session: neo4j.Session, data: List[Dict], update_tag: int)
     )
 
 
-def get_spotlight_vulnerability_ids(client: Spotlight_Vulnerabilities) -> List[List[str]]:
-    ids = []
+def get_spotlight_vulnerability_ids(client: Spotlight_Vulnerabilities) -> Iterator[List[str]]:
     parameters = {"filter": 'status:!"closed"', "limit": 400}
     response = client.queryVulnerabilities(parameters=parameters)
     body = response.get("body", {})
     resources = body.get("resources", [])
     if not resources:
         logger.warning("No vulnerability IDs in spotlight queryVulnerabilities.")
-        return []
-    ids.append(resources)
+        return
+    yield resources
     after = body.get("meta", {}).get("pagination", {}).get("after")
     while after:
         parameters["after"] = after
@@ -129,9 +134,8 @@ def get_spotlight_vulnerability_ids(client: Spotlight_Vulnerabilities) -> List[L
         resources = body.get("resources", [])
         if not resources:
             break
-        ids.append(resources)
+        yield resources
         after = body.get("meta", {}).get("pagination", {}).get("after")
-    return ids
 
 
 def get_spotlight_vulnerabilities(
@@ -1,5 +1,27 @@
+import logging
+import queue
+import threading
+import time
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Iterable
+from typing import List
+
 from falconpy.oauth2 import OAuth2
 
+from cartography.stats import get_stats_client
+
+logger = logging.getLogger(__name__)
+stat_handler = get_stats_client(__name__)
+
+# Number of fetched batches that can wait to be loaded. Bounds memory use when loading is slower than fetching.
+PIPELINE_QUEUE_SIZE = 4
+# Seconds between two progress reports of fetch_and_load()
+PIPELINE_PROGRESS_INTERVAL = 60
+
+_DONE = object()
+
 
 def get_authorization(client_id: str, client_secret: str, api_url: str) -> OAuth2:
     authorization = OAuth2(
@@ -7,3 +29,73 @@ def get_authorization(client_id: str, client_secret: str, api_url: str) -> OAuth
         base_url=api_url,
     )
     return authorization
+
+
+def fetch_and_load(
+    batches: Iterable[List[Dict]],
+    load_batch: Callable[[List[Dict]], None],
+    resource_name: str,
+    queue_size: int = PIPELINE_QUEUE_SIZE,
+) -> int:
+    """
+    Load batches of resources while the next ones are fetched. `batches` is iterated on a fetcher thread, which puts
+    each batch on a queue of at most `queue_size` batches. `load_batch` is called on the calling thread, so that it can
+    use the caller's Neo4j session. Progress and throughput are logged and reported as stats every
+    PIPELINE_PROGRESS_INTERVAL seconds. An error on either side stops both, and is raised.
+    :param batches: Lazy iterable of batches of resources. Fetching happens while iterating it.
+    :param load_batch: Function loading one batch of resources to the graph
+    :param resource_name: Name of the resources, used in logs and stat names
+    :param queue_size: Maximum number of fetched batches waiting to be loaded
+    :return: The number of loaded resources
+    """
+    batch_queue: queue.Queue = queue.Queue(maxsize=queue_size)
+    stop = threading.Event()
+
+    def _put(item: Any) -> None:
+        while not stop.is_set():
+            try:
+                batch_queue.put(item, timeout=1)
+                return
+            except queue.Full:
+                continue
+
+    def _fetch() -> None:
+        try:
+            for batch in batches:
+                if stop.is_set():
+                    return
+                _put(batch)
+            _put(_DONE)
+        except Exception as e:
+            _put(e)
+
+    fetcher = threading.Thread(target=_fetch, name=f'cartography-crowdstrike-{resource_name}', daemon=True)
+    start = time.monotonic()
+    last_report = start
+    loaded = 0
+    fetcher.start()
+    try:
+        while True:
+            item = batch_queue.get()
+            if item is _DONE:
+                break
+            if isinstance(item, Exception):
+                raise item
+            load_batch(item)
+            loaded += len(item)
+            stat_handler.incr(f'{resource_name}.loaded', len(item))
+            now = time.monotonic()
+            if now - last_report >= PIPELINE_PROGRESS_INTERVAL:
+                last_report = now
+                _report_progress(resource_name, loaded, now - start)
+    finally:
+        stop.set()
+        fetcher.join()
+    _report_progress(resource_name, loaded, time.monotonic() - start)
+    return loaded
+
+
+def _report_progress(resource_name: str, loaded: int, elapsed: float) -> None:
+    throughput = loaded / elapsed if elapsed > 0 else 0.0
+    logger.info(f"Loaded {loaded} crowdstrike {resource_name} in {elapsed:.1f}s ({throughput:.1f}/s).")
+    stat_handler.gauge(f'{resource_name}.throughput', int(throughput))
@@ -1,5 +1,6 @@
 import logging
 from datetime import datetime
+from datetime import timezone
 
 import neo4j
 
@@ -12,6 +13,9 @@ from cartography.util import timeit
 logger = logging.getLogger(__name__)
 stat_handler = get_stats_client(__name__)
 
+PUBLISHED_DATE_PARAM_NAMES = {"start": "pubStartDate", "end": "pubEndDate"}
+MODIFIED_DATE_PARAM_NAMES = {"start": "lastModStartDate", "end": "lastModEndDate"}
+
 
 @timeit
 def start_cve_ingestion(
@@ -19,6 +23,7 @@ def start_cve_ingestion(
 ) -> None:
     """
     Perform ingestion of CVE data from NIST APIs.
+    CVEs are loaded page by page as they are fetched, and an interrupted sync resumes from its last loaded page.
     :param neo4j_session: Neo4J session for database interface
     :param config: A cartography.config object
     :return: None
@@ -34,11 +39,16 @@ def start_cve_ingestion(
         if year in existing_years:
             continue
         logger.info(f"Syncing CVE data for year {year}")
-        cves = feed.get_published_cves_per_year(config.nist_cve_url, str(year), cve_api_key)
-        feed_metadata = feed.transform_cve_feed(cves)
-        feed.load_cve_feed(neo4j_session, [feed_metadata], config.update_tag)
-        published_cves = feed.transform_cves(cves)
-        feed.load_cves(neo4j_session, published_cves, feed_metadata['FEED_ID'], config.update_tag)
+        feed.sync_cve_pages(
+            neo4j_session,
+            config.nist_cve_url,
+            cve_api_key,
+            datetime(year, 1, 1, tzinfo=timezone.utc),
+            datetime(year + 1, 1, 1, tzinfo=timezone.utc),
+            PUBLISHED_DATE_PARAM_NAMES,
+            str(year),
+            config.update_tag,
+        )
         merge_module_sync_metadata(
             neo4j_session,
             group_type='CVE',
@@ -50,16 +60,25 @@ def start_cve_ingestion(
 
     # sync modified data
     logger.info("Syncing CVE data for modified data")
+    # The checkpoint of an interrupted modified sync, if any, takes precedence over this start date. It must, since the
+    # CVEs loaded before the interruption may have moved the last modified date past CVEs that were not loaded yet.
     last_modified_date = feed.get_last_modified_cve_date(neo4j_session)
-    cves = feed.get_modified_cves(config.nist_cve_url, last_modified_date, cve_api_key)
-    feed_metadata = feed.transform_cve_feed(cves)
-    feed.load_cve_feed(neo4j_session, [feed_metadata], config.update_tag)
-    modified_cves = feed.transform_cves(cves)
-    feed.load_cves(neo4j_session, modified_cves, feed_metadata['FEED_ID'], config.update_tag)
+    feed_metadata = feed.sync_cve_pages(
+        neo4j_session,
+        config.nist_cve_url,
+        cve_api_key,
+        datetime.strptime(last_modified_date, feed.NVD_DATE_FORMAT).replace(tzinfo=timezone.utc),
+        datetime.now(tz=timezone.utc),
+        MODIFIED_DATE_PARAM_NAMES,
+        'modified',
+        config.update_tag,
+    )
+    # Record the modified sync even when no CVE was modified since the last one, so that its timestamp still advances.
+    modified_year = feed_metadata['timestamp'][:4] if feed_metadata else str(datetime.now(tz=timezone.utc).year)
     merge_module_sync_metadata(
         neo4j_session,
         group_type='CVE',
-        group_id=feed_metadata['timestamp'][:4],
+        group_id=modified_year,
         synced_type='modified',
         update_tag=config.update_tag,
         stat_handler=stat_handler,
@@ -1,3 +1,4 @@
+import itertools
 import logging
 import time
 from datetime import datetime
@@ -7,14 +8,17 @@ from functools import reduce
 from typing import Any
 from typing import cast
 from typing import Dict
+from typing import Iterator
 from typing import List
 from typing import Optional
+from typing import Tuple
 
 import neo4j
 import requests
 
 from cartography.client.core.tx import load
 from cartography.client.core.tx import read_list_of_values_tx
+from cartography.client.core.tx import read_single_dict_tx
 from cartography.client.core.tx import read_single_value_tx
 from cartography.models.cve.cve import CVESchema
 from cartography.models.cve.cve_feed import CVEFeedSchema
@@ -30,6 +34,7 @@ BATCH_SIZE_DAYS = 120
 RESULTS_PER_PAGE = 2000
 DEFAULT_SLEEP_TIME = 3.0
 DELAYED_SLEEP_TIME = 6.0
+NVD_DATE_FORMAT = "%Y-%m-%dT%H:%M:%S"
 
 
 @timeit
@@ -56,23 +61,16 @@ def get_last_modified_cve_date(neo4j_session: neo4j.Session) -> str:
     return result.strftime("%Y-%m-%dT%H:%M:%S")
 
 
-def _map_cve_dict(cve_dict: Dict[Any, Any], data: Dict[Any, Any]) -> None:
-    cve_dict["format"] = data["format"]
-    cve_dict["version"] = data["version"]
-    cve_dict["timestamp"] = data["timestamp"]
-    cve_dict["totalResults"] = data["totalResults"]
-    cve_dict["vulnerabilities"] = cve_dict.get("vulnerabilities", []) + data.get(
-        "vulnerabilities", [],
-    )
-    cve_dict["resultsPerPage"] = data["resultsPerPage"]
-    cve_dict["startIndex"] = data["startIndex"]
-
-
-def _call_cves_api(url: str, api_key: str, params: Dict[str, Any]) -> Dict[Any, Any]:
+def _iter_cves_api_pages(
+    url: str, api_key: Optional[str], params: Dict[str, Any], start_index: int = 0,
+) -> Iterator[Dict[Any, Any]]:
+    """
+    Yield the result pages of a NIST NVD CVE API query one at a time, starting at `start_index`.
+    """
     totalResults = 0
     sleep_time = DEFAULT_SLEEP_TIME
     retries = 0
-    params["startIndex"] = 0
+    params["startIndex"] = start_index
     params["resultsPerPage"] = RESULTS_PER_PAGE
     headers = {}
     headers["Content-Type"] = "application/json"
@@ -83,7 +81,6 @@ def _call_cves_api(url: str, api_key: str, params: Dict[str, Any]) -> Dict[Any,
         logger.warning(
             f"No NIST NVD API key provided. Increasing sleep time to {sleep_time}.",
         )
-    results: Dict[Any, Any] = dict()
 
     while params["resultsPerPage"] > 0 or params["startIndex"] < totalResults:
         try:
@@ -100,91 +97,125 @@ def _call_cves_api(url: str, api_key: str, params: Dict[str, Any]) -> Dict[Any,
                 raise
             continue
         data = res.json()
-        _map_cve_dict(results, data)
         totalResults = data["totalResults"]
         params["resultsPerPage"] = data["resultsPerPage"]
         params["startIndex"] += data["resultsPerPage"]
         retries = 0
+        yield data
         time.sleep(sleep_time)
-    return results
 
 
-def get_cves_in_batches(
-    nist_cve_url: str,
-    start_date: datetime,
-    end_date: datetime,
-    date_param_names: Dict[str, str],
-    api_key: str,
-) -> Dict[Any, Any]:
-    cves: Dict[Any, Any] = dict()
-    current_start_date: datetime = start_date
-    current_end_date = end_date
-    total_days = (current_end_date - current_start_date).days
-    batch_size = timedelta(days=BATCH_SIZE_DAYS)
-    if total_days < 0:
+def get_date_windows(start_date: datetime, end_date: datetime) -> Iterator[Tuple[datetime, datetime]]:
+    """
+    Split [start_date, end_date] into consecutive windows of at most BATCH_SIZE_DAYS, the longest date range that the
+    NIST NVD API accepts in a single query.
+    """
+    if start_date > end_date:
         raise ValueError(f"Start date {start_date} must be before end date {end_date}.")
+    batch_size = timedelta(days=BATCH_SIZE_DAYS)
+    window_start = start_date
+    while window_start < end_date:
+        window_end = min(window_start + batch_size, end_date)
+        yield window_start, window_end
+        window_start = window_end
+
+
+def _get_window_params(
+    window_start: datetime, window_end: datetime, date_param_names: Dict[str, str],
+) -> Dict[str, Any]:
     if not date_param_names["start"] or not date_param_names["end"]:
         raise ValueError("Date parameter names 'start' and 'end' must be provided.")
-    while current_start_date < end_date:
-        remaining = current_end_date - current_start_date
-        if remaining > batch_size:
-            current_end_date = current_start_date + batch_size
-        else:
-            current_end_date = (
-                end_date if remaining.days == 0 else current_start_date + remaining
-            )
-        params = {
-            date_param_names["start"]: current_start_date.strftime(
-                "%Y-%m-%dT%H:%M:%S",
-            ),
-            date_param_names["end"]: current_end_date.strftime("%Y-%m-%dT%H:%M:%S"),
-        }
-        logger.info(
-            f"Querying CVE data between {current_start_date} and {current_end_date}",
-        )
-        batch_cves = _call_cves_api(nist_cve_url, api_key, params)
-        _map_cve_dict(cves, batch_cves)
-        current_start_date = current_end_date
-        new_end_date = current_start_date + batch_size
-        if new_end_date > end_date:
-            new_end_date = end_date
-        current_end_date = new_end_date
-    return cves
+    return {
+        date_param_names["start"]: window_start.strftime(NVD_DATE_FORMAT),
+        date_param_names["end"]: window_end.strftime(NVD_DATE_FORMAT),
+    }
 
 
-def get_modified_cves(
-    nist_cve_url: str, last_modified_date: str, api_key: str,
-) -> Dict[Any, Any]:
-    cves = dict()
-    end_date = datetime.now(tz=timezone.utc)
-    start_date = datetime.strptime(last_modified_date, "%Y-%m-%dT%H:%M:%S").replace(
-        tzinfo=timezone.utc,
-    )
-    date_param_names = {
-        "start": "lastModStartDate",
-        "end": "lastModEndDate",
-    }
-    cves = get_cves_in_batches(
-        nist_cve_url, start_date, end_date, date_param_names, api_key,
+def get_cve_pages(
+    nist_cve_url: str,
+    window_start: datetime,
+    window_end: datetime,
+    date_param_names: Dict[str, str],
+    api_key: Optional[str],
+    start_index: int = 0,
+) -> Iterator[Dict[Any, Any]]:
+    """
+    Yield the CVE API result pages for a single date window as they are fetched, so that callers can load each page
+    without holding the whole window in memory.
+    """
+    params = _get_window_params(window_start, window_end, date_param_names)
+    logger.info(
+        f"Querying CVE data between {window_start} and {window_end}, starting at index {start_index}",
     )
-    return cves
+    yield from _iter_cves_api_pages(nist_cve_url, api_key, params, start_index)
 
 
-def get_published_cves_per_year(
-    nist_cve_url: str, year: str, api_key: str,
-) -> Dict[Any, Any]:
-    cves = {}
-    start_of_year = datetime.strptime(f"{year}-01-01", "%Y-%m-%d")
-    next_year = int(year) + 1
-    end_of_next_year = datetime.strptime(f"{next_year}-01-01", "%Y-%m-%d")
-    date_param_names = {
-        "start": "pubStartDate",
-        "end": "pubEndDate",
+@timeit
+def get_cve_sync_checkpoint(neo4j_session: neo4j.Session, group_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Return the resume point of an interrupted streaming sync of `group_id` (a year or "modified"), as a dict with the
+    `window_start` and `window_end` datetimes and the `start_index` of the next page to fetch, or None if there is none.
+    """
+    query = """
+    MATCH (s:SyncMetadata{id: $Id})
+    RETURN s.window_start AS window_start, s.window_end AS window_end, s.start_index AS start_index
+    """
+    checkpoint = read_single_dict_tx(neo4j_session, query, Id=_get_checkpoint_id(group_id))
+    if not checkpoint:
+        return None
+    return {
+        "window_start": _parse_nvd_date(checkpoint["window_start"]),
+        "window_end": _parse_nvd_date(checkpoint["window_end"]),
+        "start_index": checkpoint["start_index"],
     }
-    cves = get_cves_in_batches(
-        nist_cve_url, start_of_year, end_of_next_year, date_param_names, api_key,
+
+
+@timeit
+def save_cve_sync_checkpoint(
+    neo4j_session: neo4j.Session,
+    group_id: str,
+    window_start: datetime,
+    window_end: datetime,
+    start_index: int,
+    update_tag: int,
+) -> None:
+    query = """
+    MERGE (s:ModuleSyncMetadata{id: $Id})
+    ON CREATE SET s:SyncMetadata, s.firstseen = timestamp()
+    SET s.grouptype = 'CVE',
+        s.groupid = $GroupId,
+        s.syncedtype = 'checkpoint',
+        s.window_start = $WindowStart,
+        s.window_end = $WindowEnd,
+        s.start_index = $StartIndex,
+        s.lastupdated = $UpdateTag
+    """
+    neo4j_session.run(
+        query,
+        Id=_get_checkpoint_id(group_id),
+        GroupId=group_id,
+        WindowStart=window_start.strftime(NVD_DATE_FORMAT),
+        WindowEnd=window_end.strftime(NVD_DATE_FORMAT),
+        StartIndex=start_index,
+        UpdateTag=update_tag,
     )
-    return cves
+
+
+@timeit
+def delete_cve_sync_checkpoint(neo4j_session: neo4j.Session, group_id: str) -> None:
+    query = """
+    MATCH (s:SyncMetadata{id: $Id})
+    DETACH DELETE s
+    """
+    neo4j_session.run(query, Id=_get_checkpoint_id(group_id))
+
+
+def _get_checkpoint_id(group_id: str) -> str:
+    return f"CVE_{group_id}_checkpoint"
+
+
+def _parse_nvd_date(date: str) -> datetime:
+    return datetime.strptime(date, NVD_DATE_FORMAT).replace(tzinfo=timezone.utc)
 
 
 def _get_primary_metric(metrics: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
@@ -292,3 +323,52 @@ def load_cve_feed(
         data,
         lastupdated=update_tag,
     )
+
+
+@timeit
+def sync_cve_pages(
+    neo4j_session: neo4j.Session,
+    nist_cve_url: str,
+    api_key: Optional[str],
+    start_date: datetime,
+    end_date: datetime,
+    date_param_names: Dict[str, str],
+    group_id: str,
+    update_tag: int,
+) -> Optional[Dict[str, str]]:
+    """
+    Sync the CVEs between `start_date` and `end_date` one API page at a time: each page is transformed and loaded as
+    soon as it is fetched, and a checkpoint is saved after it. If a checkpoint exists for `group_id`, the sync resumes
+    from it instead of starting over. The checkpoint is removed once the whole date range is loaded.
+    :return: The feed metadata of the last page, or None if no page was fetched.
+    """
+    windows = get_date_windows(start_date, end_date)
+    start_index = 0
+    checkpoint = get_cve_sync_checkpoint(neo4j_session, group_id)
+    if checkpoint:
+        logger.info(
+            f"Resuming CVE sync for {group_id} at {checkpoint['window_start']}, index {checkpoint['start_index']}",
+        )
+        windows = itertools.chain(
+            [(checkpoint["window_start"], checkpoint["window_end"])],
+            get_date_windows(checkpoint["window_end"], end_date),
+        )
+        start_index = checkpoint["start_index"]
+
+    feed_metadata = None
+    for window_start, window_end in windows:
+        for page in get_cve_pages(nist_cve_url, window_start, window_end, date_param_names, api_key, start_index):
+            feed_metadata = transform_cve_feed(page)
+            load_cve_feed(neo4j_session, [feed_metadata], update_tag)
+            load_cves(neo4j_session, transform_cves(page), feed_metadata["FEED_ID"], update_tag)
+            save_cve_sync_checkpoint(
+                neo4j_session,
+                group_id,
+                window_start,
+                window_end,
+                page["startIndex"] + page["resultsPerPage"],
+                update_tag,
+            )
+        start_index = 0
+    delete_cve_sync_checkpoint(neo4j_session, group_id)
+    return feed_metadata
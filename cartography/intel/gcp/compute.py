@@ -14,6 +14,13 @@ import neo4j
 from googleapiclient.discovery import HttpError
 from googleapiclient.discovery import Resource
 
+from cartography.client.core.tx import load
+from cartography.client.core.tx import load_graph_data
+from cartography.models.gcp.compute.instance import GCPInstanceSchema
+from cartography.models.gcp.compute.network_interface import GCPNetworkInterfaceSchema
+from cartography.models.gcp.compute.network_tag import GCPNetworkTagSchema
+from cartography.models.gcp.compute.nic_access_config import GCPNicAccessConfigSchema
+from cartography.models.gcp.compute.subnet_network_interface import GCPSubnetNetworkInterfaceSchema
 from cartography.util import run_cleanup_job
 from cartography.util import timeit
 
@@ -97,6 +104,56 @@ def get_zones_in_project(project_id: str, compute: Resource, max_results: Option
             raise
 
 
+def _get_all_pages(collection: Resource, **kwargs: Any) -> Dict:
+    """
+    Call `collection.list()` with the given arguments and follow `nextPageToken` until all results are fetched.
+    :param collection: A compute collection resource object, e.g. `compute.subnetworks()`
+    :param kwargs: The arguments to `list()`
+    :return: The first response object, with the `items` of all the pages
+    """
+    req = collection.list(**kwargs)
+    response: Dict = {}
+    items: List[Dict] = []
+    while req is not None:
+        res = req.execute()
+        if not response:
+            response = res
+        items.extend(res.get('items', []))
+        req = collection.list_next(previous_request=req, previous_response=res)
+    response['items'] = items
+    response.pop('nextPageToken', None)
+    return response
+
+
+def _get_aggregated_list_responses(
+    collection: Resource, project_id: str, items_key: str, scopes: Set[str],
+) -> List[Dict]:
+    """
+    Call `collection.aggregatedList()` for the given project and follow `nextPageToken` until all results are fetched.
+    This returns the resources of all zones or regions in a handful of calls, instead of one `list()` call per zone
+    or region.
+    :param collection: A compute collection resource object, e.g. `compute.instances()`
+    :param project_id: The project ID
+    :param items_key: The key holding the resources in each scope of the aggregated list, e.g. `instances`
+    :param scopes: The scopes to return, of the form `zones/{zone name}` or `regions/{region name}`
+    :return: One response object per scope of the form {id: 'projects/{project}/{scope}/{items_key}', items: []}, like
+    the ones returned by `list()` for that scope.
+    """
+    items_by_scope: Dict[str, List[Dict]] = {}
+    req = collection.aggregatedList(project=project_id)
+    while req is not None:
+        res = req.execute()
+        for scope, scoped_list in res.get('items', {}).items():
+            # Scopes without resources have a `warning` instead of `items_key`
+            items_by_scope.setdefault(scope, []).extend(scoped_list.get(items_key, []))
+        req = collection.aggregatedList_next(previous_request=req, previous_response=res)
+    return [
+        {'id': f"projects/{project_id}/{scope}/{items_key}", 'items': items}
+        for scope, items in items_by_scope.items()
+        if scope in scopes
+    ]
+
+
 @timeit
 def get_gcp_instance_responses(project_id: str, zones: Optional[List[Dict]], compute: Resource) -> List[Resource]:
     """
@@ -109,12 +166,8 @@ def get_gcp_instance_responses(project_id: str, zones: Optional[List[Dict]], com
     if not zones:
         # If the Compute Engine API is not enabled for a project, there are no zones and therefore no instances.
         return []
-    response_objects: List[Resource] = []
-    for zone in zones:
-        req = compute.instances().list(project=project_id, zone=zone['name'])
-        res = req.execute()
-        response_objects.append(res)
-    return response_objects
+    zone_scopes = {f"zones/{zone['name']}" for zone in zones}
+    return _get_aggregated_list_responses(compute.instances(), project_id, 'instances', zone_scopes)
 
 
 @timeit
@@ -126,8 +179,20 @@ def get_gcp_subnets(projectid: str, region: str, compute: Resource) -> Resource:
     :param compute: The compute resource object created by googleapiclient.discovery.build()
     :return: Response object containing data on all GCP subnets for a given project
     """
-    req = compute.subnetworks().list(project=projectid, region=region)
-    return req.execute()
+    return _get_all_pages(compute.subnetworks(), project=projectid, region=region)
+
+
+@timeit
+def get_gcp_subnets_in_regions(project_id: str, regions: List[str], compute: Resource) -> List[Resource]:
+    """
+    Return the subnets of the given project in the given regions, using a single aggregated list
+    :param project_id: The project ID
+    :param regions: The regions to pull subnets from
+    :param compute: The compute resource object created by googleapiclient.discovery.build()
+    :return: One response object per region, of the form returned by get_gcp_subnets()
+    """
+    region_scopes = {f"regions/{region}" for region in regions}
+    return _get_aggregated_list_responses(compute.subnetworks(), project_id, 'subnetworks', region_scopes)
 
 
 @timeit
@@ -138,8 +203,7 @@ def get_gcp_vpcs(projectid: str, compute: Resource) -> Resource:
     :param compute: The compute resource object created by googleapiclient.discovery.build()
     :return: VPC response object
     """
-    req = compute.networks().list(project=projectid)
-    return req.execute()
+    return _get_all_pages(compute.networks(), project=projectid)
 
 
 @timeit
@@ -151,8 +215,20 @@ def get_gcp_regional_forwarding_rules(project_id: str, region: str, compute: Res
     :param compute: The compute resource object created by googleapiclient.discovery.build()
     :return: Response object containing data on all GCP forwarding rules for a given project
     """
-    req = compute.forwardingRules().list(project=project_id, region=region)
-    return req.execute()
+    return _get_all_pages(compute.forwardingRules(), project=project_id, region=region)
+
+
+@timeit
+def get_gcp_forwarding_rules_in_regions(project_id: str, regions: List[str], compute: Resource) -> List[Resource]:
+    """
+    Return the regional forwarding rules of the given project in the given regions, using a single aggregated list
+    :param project_id: The project ID
+    :param regions: The regions to pull forwarding rules from
+    :param compute: The compute resource object created by googleapiclient.discovery.build()
+    :return: One response object per region, of the form returned by get_gcp_regional_forwarding_rules()
+    """
+    region_scopes = {f"regions/{region}" for region in regions}
+    return _get_aggregated_list_responses(compute.forwardingRules(), project_id, 'forwardingRules', region_scopes)
 
 
 @timeit
@@ -163,8 +239,7 @@ def get_gcp_global_forwarding_rules(project_id: str, compute: Resource) -> Resou
     :param compute: The compute resource object created by googleapiclient.discovery.build()
     :return: Response object containing data on all GCP forwarding rules for a given project
     """
-    req = compute.globalForwardingRules().list(project=project_id)
-    return req.execute()
+    return _get_all_pages(compute.globalForwardingRules(), project=project_id)
 
 
 @timeit
@@ -175,8 +250,7 @@ def get_gcp_firewall_ingress_rules(project_id: str, compute: Resource) -> Resour
     :param compute: The compute resource object created by googleapiclient.discovery.build()
     :return: Firewall response object
     """
-    req = compute.firewalls().list(project=project_id, filter='(direction="INGRESS")')
-    return req.execute()
+    return _get_all_pages(compute.firewalls(), project=project_id, filter='(direction="INGRESS")')
 
 
 @timeit
@@ -241,6 +315,71 @@ def _create_gcp_network_tag_id(vpc_partial_uri: str, tag: str) -> str:
     return f"{vpc_partial_uri}/tags/{tag}"
 
 
+def transform_gcp_instance_network_tags(instances: List[Dict]) -> List[Dict]:
+    """
+    Flatten the network tags of the given GCP instances. A tag is defined in the VPC of each of the instance's NICs.
+    :param instances: The output of transform_gcp_instances()
+    :return: A list of network tags, one per tagged instance and NIC VPC
+    """
+    tags = []
+    for instance in instances:
+        for tag in instance.get('tags', {}).get('items', []):
+            for nic in instance.get('networkInterfaces', []):
+                tags.append({
+                    'tag_id': _create_gcp_network_tag_id(nic['vpc_partial_uri'], tag),
+                    'value': tag,
+                    'instance_partial_uri': instance['partial_uri'],
+                    'vpc_partial_uri': nic['vpc_partial_uri'],
+                })
+    return tags
+
+
+def transform_gcp_instance_nics(instances: List[Dict]) -> List[Dict]:
+    """
+    Flatten the network interfaces of the given GCP instances
+    :param instances: The output of transform_gcp_instances()
+    :return: A list of network interfaces
+    """
+    nics = []
+    for instance in instances:
+        for nic in instance.get('networkInterfaces', []):
+            nics.append({
+                # Make an ID for GCPNetworkInterface nodes because GCP doesn't define one but we need to uniquely
+                # identify them
+                'nic_id': f"{instance['partial_uri']}/networkinterfaces/{nic['name']}",
+                'name': nic['name'],
+                'networkIP': nic.get('networkIP'),
+                'subnet_partial_uri': nic['subnet_partial_uri'],
+                'instance_partial_uri': instance['partial_uri'],
+                'accessConfigs': nic.get('accessConfigs', []),
+            })
+    return nics
+
+
+def transform_gcp_nic_access_configs(nics: List[Dict]) -> List[Dict]:
+    """
+    Flatten the access configs of the given GCP network interfaces
+    :param nics: The output of transform_gcp_instance_nics()
+    :return: A list of access configs
+    """
+    access_configs = []
+    for nic in nics:
+        for ac in nic['accessConfigs']:
+            access_configs.append({
+                # Make an ID for GCPNicAccessConfig nodes because GCP doesn't define one but we need to uniquely
+                # identify them
+                'access_config_id': f"{nic['nic_id']}/accessconfigs/{ac['type']}",
+                'nic_id': nic['nic_id'],
+                'type': ac['type'],
+                'name': ac['name'],
+                'natIP': ac.get('natIP', None),
+                'setPublicPtr': ac.get('setPublicPtr', None),
+                'publicPtrDomainName': ac.get('publicPtrDomainName', None),
+                'networkTier': ac.get('networkTier', None),
+            })
+    return access_configs
+
+
 @timeit
 def transform_gcp_vpcs(vpc_res: Dict) -> List[Dict]:
     """
@@ -499,49 +638,45 @@ def _parse_port_string_to_rule(port: Optional[str], protocol: str, fw_partial_ur
 @timeit
 def load_gcp_instances(neo4j_session: neo4j.Session, data: List[Dict], gcp_update_tag: int) -> None:
     """
-    Ingest GCP instance objects to Neo4j
+    Ingest GCP instance objects to Neo4j, along with their network tags, network interfaces, access configs and VPCs
     :param neo4j_session: The Neo4j session object
     :param data: List of GCP instances to ingest. Basically the output of
     https://cloud.google.com/compute/docs/reference/rest/v1/instances/list
     :param gcp_update_tag: The timestamp value to set our new Neo4j nodes with
     :return: Nothing
     """
+    _load_gcp_instance_projects(neo4j_session, data, gcp_update_tag)
+    load(neo4j_session, GCPInstanceSchema(), data, lastupdated=gcp_update_tag)
+    load(neo4j_session, GCPNetworkTagSchema(), transform_gcp_instance_network_tags(data), lastupdated=gcp_update_tag)
+
+    nics = transform_gcp_instance_nics(data)
+    load(neo4j_session, GCPSubnetNetworkInterfaceSchema(), nics, lastupdated=gcp_update_tag)
+    load(neo4j_session, GCPNetworkInterfaceSchema(), nics, lastupdated=gcp_update_tag)
+    load(neo4j_session, GCPNicAccessConfigSchema(), transform_gcp_nic_access_configs(nics), lastupdated=gcp_update_tag)
+
+    _attach_gcp_vpcs(neo4j_session, data, gcp_update_tag)
+
+
+@timeit
+def _load_gcp_instance_projects(neo4j_session: neo4j.Session, instances: List[Dict], gcp_update_tag: int) -> None:
+    """
+    Ensure that the projects of the given GCP instances exist, so that the instances can be attached to them
+    :param neo4j_session: The Neo4j session object
+    :param instances: The transformed GCP instances
+    :param gcp_update_tag: The timestamp value to set our new Neo4j nodes with
+    :return: Nothing
+    """
     query = """
-    MERGE (p:GCPProject{id:$ProjectId})
+    UNWIND $ProjectIds AS project_id
+    MERGE (p:GCPProject{id:project_id})
     ON CREATE SET p.firstseen = timestamp()
     SET p.lastupdated = $gcp_update_tag
-
-    MERGE (i:Instance:GCPInstance{id:$PartialUri})
-    ON CREATE SET i.firstseen = timestamp(),
-    i.partial_uri = $PartialUri
-    SET i.self_link = $SelfLink,
-    i.instancename = $InstanceName,
-    i.hostname = $Hostname,
-    i.zone_name = $ZoneName,
-    i.project_id = $ProjectId,
-    i.status = $Status,
-    i.lastupdated = $gcp_update_tag
-    WITH i, p
-
-    MERGE (p)-[r:RESOURCE]->(i)
-    ON CREATE SET r.firstseen = timestamp()
-    SET r.lastupdated = $gcp_update_tag
     """
-    for instance in data:
-        neo4j_session.run(
-            query,
-            ProjectId=instance['project_id'],
-            PartialUri=instance['partial_uri'],
-            SelfLink=instance['selfLink'],
-            InstanceName=instance['name'],
-            ZoneName=instance['zone_name'],
-            Hostname=instance.get('hostname', None),
-            Status=instance['status'],
-            gcp_update_tag=gcp_update_tag,
-        )
-        _attach_instance_tags(neo4j_session, instance, gcp_update_tag)
-        _attach_gcp_nics(neo4j_session, instance, gcp_update_tag)
-        _attach_gcp_vpc(neo4j_session, instance['partial_uri'], gcp_update_tag)
+    neo4j_session.run(
+        query,
+        ProjectIds=sorted({instance['project_id'] for instance in instances}),
+        gcp_update_tag=gcp_update_tag,
+    )
 
 
 @timeit
@@ -742,158 +877,26 @@ def _attach_fwd_rule_to_vpc(neo4j_session: neo4j.Session, fwd: Dict, gcp_update_
 
 
 @timeit
-def _attach_instance_tags(neo4j_session: neo4j.Session, instance: Resource, gcp_update_tag: int) -> None:
+def _attach_gcp_vpcs(neo4j_session: neo4j.Session, instances: List[Dict], gcp_update_tag: int) -> None:
     """
-    Attach tags to GCP instance and to the VPCs that they are defined in.
-    :param neo4j_session: The session
-    :param instance: The instance object
-    :param gcp_update_tag: The timestamp
-    :return: Nothing
-    """
-    query = """
-    MATCH (i:GCPInstance{id:$InstanceId})
-
-    MERGE (t:GCPNetworkTag{id:$TagId})
-    ON CREATE SET t.tag_id = $TagId,
-    t.value = $TagValue,
-    t.firstseen = timestamp()
-    SET t.lastupdated = $gcp_update_tag
-
-    MERGE (i)-[h:TAGGED]->(t)
-    ON CREATE SET h.firstseen = timestamp()
-    SET h.lastupdated = $gcp_update_tag
-
-    WITH t
-    MATCH (vpc:GCPVpc{id:$VpcPartialUri})
-
-    MERGE (vpc)<-[d:DEFINED_IN]-(t)
-    ON CREATE SET d.firstseen = timestamp()
-    SET d.lastupdated = $gcp_update_tag
-    """
-    for tag in instance.get('tags', {}).get('items', []):
-        for nic in instance.get('networkInterfaces', []):
-            tag_id = _create_gcp_network_tag_id(nic['vpc_partial_uri'], tag)
-            neo4j_session.run(
-                query,
-                InstanceId=instance['partial_uri'],
-                TagId=tag_id,
-                TagValue=tag,
-                VpcPartialUri=nic['vpc_partial_uri'],
-                gcp_update_tag=gcp_update_tag,
-            )
-
-
-@timeit
-def _attach_gcp_nics(neo4j_session: neo4j.Session, instance: Resource, gcp_update_tag: int) -> None:
-    """
-    Attach GCP Network Interfaces to GCP Instances and GCP Subnets.
-    Then, attach GCP Instances directly to VPCs.
-    :param neo4j_session: The Neo4j session
-    :param instance: The GCP instance
-    :param gcp_update_tag: Timestamp to set the nodes
-    :return: Nothing
-    """
-    query = """
-    MATCH (i:GCPInstance{id:$InstanceId})
-    MERGE (nic:GCPNetworkInterface:NetworkInterface{id:$NicId})
-    ON CREATE SET nic.firstseen = timestamp(),
-    nic.nic_id = $NicId
-    SET nic.private_ip = $NetworkIP,
-    nic.name = $NicName,
-    nic.lastupdated = $gcp_update_tag
-
-    MERGE (i)-[r:NETWORK_INTERFACE]->(nic)
-    ON CREATE SET r.firstseen = timestamp()
-    SET r.lastupdated = $gcp_update_tag
-
-    MERGE (subnet:GCPSubnet{id:$SubnetPartialUri})
-    ON CREATE SET subnet.firstseen = timestamp(),
-    subnet.partial_uri = $SubnetPartialUri
-    SET subnet.lastupdated = $gcp_update_tag
-
-    MERGE (nic)-[p:PART_OF_SUBNET]->(subnet)
-    ON CREATE SET p.firstseen = timestamp()
-    SET p.lastupdated = $gcp_update_tag
-    """
-    for nic in instance.get('networkInterfaces', []):
-        # Make an ID for GCPNetworkInterface nodes because GCP doesn't define one but we need to uniquely identify them
-        nic_id = f"{instance['partial_uri']}/networkinterfaces/{nic['name']}"
-        neo4j_session.run(
-            query,
-            InstanceId=instance['partial_uri'],
-            NicId=nic_id,
-            NetworkIP=nic.get('networkIP'),
-            NicName=nic['name'],
-            gcp_update_tag=gcp_update_tag,
-            SubnetPartialUri=nic['subnet_partial_uri'],
-        )
-        _attach_gcp_nic_access_configs(neo4j_session, nic_id, nic, gcp_update_tag)
-
-
-@timeit
-def _attach_gcp_nic_access_configs(
-    neo4j_session: neo4j.Session, nic_id: str, nic: Resource, gcp_update_tag: int,
-) -> None:
-    """
-    Attach an access configuration to the GCP NIC.
-    :param neo4j_session: The Neo4j session
-    :param instance: The GCP instance
-    :param gcp_update_tag: The timestamp to set updated nodes to
-    :return: Nothing
-    """
-    query = """
-    MATCH (nic{id:$NicId})
-    MERGE (ac:GCPNicAccessConfig{id:$AccessConfigId})
-    ON CREATE SET ac.firstseen = timestamp(),
-    ac.access_config_id = $AccessConfigId
-    SET ac.type=$Type,
-    ac.name = $Name,
-    ac.public_ip = $NatIP,
-    ac.set_public_ptr = $SetPublicPtr,
-    ac.public_ptr_domain_name = $PublicPtrDomainName,
-    ac.network_tier = $NetworkTier,
-    ac.lastupdated = $gcp_update_tag
-
-    MERGE (nic)-[r:RESOURCE]->(ac)
-    ON CREATE SET r.firstseen = timestamp()
-    SET r.lastupdated = $gcp_update_tag
-    """
-    for ac in nic.get('accessConfigs', []):
-        # Make an ID for GCPNicAccessConfig nodes because GCP doesn't define one but we need to uniquely identify them
-        access_config_id = f"{nic_id}/accessconfigs/{ac['type']}"
-        neo4j_session.run(
-            query,
-            NicId=nic_id,
-            AccessConfigId=access_config_id,
-            Type=ac['type'],
-            Name=ac['name'],
-            NatIP=ac.get('natIP', None),
-            SetPublicPtr=ac.get('setPublicPtr', None),
-            PublicPtrDomainName=ac.get('publicPtrDomainName', None),
-            NetworkTier=ac.get('networkTier', None),
-            gcp_update_tag=gcp_update_tag,
-        )
-
-
-@timeit
-def _attach_gcp_vpc(neo4j_session: neo4j.Session, instance_id: str, gcp_update_tag: int) -> None:
-    """
-    Attach a GCP instance directly to a VPC
+    Attach GCP instances directly to the VPCs of their network interfaces' subnets
     :param neo4j_session: neo4j_session
-    :param instance: The GCP instance object
+    :param instances: The transformed GCP instances
     :param gcp_update_tag:
     :return: Nothing
     """
     query = """
-    MATCH (i:GCPInstance{id:$InstanceId})-[:NETWORK_INTERFACE]->(nic:GCPNetworkInterface)
+    UNWIND $DictList AS instance
+    MATCH (i:GCPInstance{id:instance.partial_uri})-[:NETWORK_INTERFACE]->(nic:GCPNetworkInterface)
           -[p:PART_OF_SUBNET]->(sn:GCPSubnet)<-[r:RESOURCE]-(vpc:GCPVpc)
     MERGE (i)-[m:MEMBER_OF_GCP_VPC]->(vpc)
     ON CREATE SET m.firstseen = timestamp()
     SET m.lastupdated = $gcp_update_tag
     """
-    neo4j_session.run(
+    load_graph_data(
+        neo4j_session,
         query,
-        InstanceId=instance_id,
+        [{'partial_uri': instance['partial_uri']} for instance in instances],
         gcp_update_tag=gcp_update_tag,
     )
 
@@ -1136,12 +1139,11 @@ def sync_gcp_subnets(
     neo4j_session: neo4j.Session, compute: Resource, project_id: str, regions: List[str], gcp_update_tag: int,
     common_job_parameters: Dict,
 ) -> None:
-    for r in regions:
-        subnet_res = get_gcp_subnets(project_id, r, compute)
+    for subnet_res in get_gcp_subnets_in_regions(project_id, regions, compute):
         subnets = transform_gcp_subnets(subnet_res)
         load_gcp_subnets(neo4j_session, subnets, gcp_update_tag)
-        # TODO scope the cleanup to the current project - https://github.com/lyft/cartography/issues/381
-        cleanup_gcp_subnets(neo4j_session, common_job_parameters)
+    # TODO scope the cleanup to the current project - https://github.com/lyft/cartography/issues/381
+    cleanup_gcp_subnets(neo4j_session, common_job_parameters)
 
 
 @timeit
@@ -1163,15 +1165,12 @@ def sync_gcp_forwarding_rules(
     global_fwd_response = get_gcp_global_forwarding_rules(project_id, compute)
     forwarding_rules = transform_gcp_forwarding_rules(global_fwd_response)
     load_gcp_forwarding_rules(neo4j_session, forwarding_rules, gcp_update_tag)
-    # TODO scope the cleanup to the current project - https://github.com/lyft/cartography/issues/381
-    cleanup_gcp_forwarding_rules(neo4j_session, common_job_parameters)
 
-    for r in regions:
-        fwd_response = get_gcp_regional_forwarding_rules(project_id, r, compute)
+    for fwd_response in get_gcp_forwarding_rules_in_regions(project_id, regions, compute):
         forwarding_rules = transform_gcp_forwarding_rules(fwd_response)
         load_gcp_forwarding_rules(neo4j_session, forwarding_rules, gcp_update_tag)
-        # TODO scope the cleanup to the current project - https://github.com/lyft/cartography/issues/381
-        cleanup_gcp_forwarding_rules(neo4j_session, common_job_parameters)
+    # TODO scope the cleanup to the current project - https://github.com/lyft/cartography/issues/381
+    cleanup_gcp_forwarding_rules(neo4j_session, common_job_parameters)
 
 
 @timeit
@@ -33,14 +33,18 @@ def start_github_ingestion(neo4j_session: neo4j.Session, config: Config) -> None
     # run sync for the provided github tokens
     for auth_data in auth_tokens['organization']:
         try:
-            cartography.intel.github.users.sync(
+            # Repos are synced before users: the users cleanup job removes GitHubUser nodes that were not updated in
+            # this run, which would otherwise include the outside collaborators of repos not refetched by an
+            # incremental repo sync.
+            cartography.intel.github.repos.sync(
                 neo4j_session,
                 common_job_parameters,
                 auth_data['token'],
                 auth_data['url'],
                 auth_data['name'],
+                incremental=config.github_incremental_repo_sync,
             )
-            cartography.intel.github.repos.sync(
+            cartography.intel.github.users.sync(
                 neo4j_session,
                 common_job_parameters,
                 auth_data['token'],
@@ -1,5 +1,6 @@
 import configparser
 import logging
+from functools import partial
 from string import Template
 from typing import Any
 from typing import Dict
@@ -11,6 +12,8 @@ from packaging.requirements import InvalidRequirement
 from packaging.requirements import Requirement
 from packaging.utils import canonicalize_name
 
+from cartography.client.core.tx import load_graph_data
+from cartography.client.core.tx import read_single_value_tx
 from cartography.intel.github.util import fetch_all
 from cartography.util import run_cleanup_job
 from cartography.util import timeit
@@ -18,12 +21,12 @@ from cartography.util import timeit
 logger = logging.getLogger(__name__)
 
 GITHUB_ORG_REPOS_PAGINATED_GRAPHQL = """
-    query($login: String!, $cursor: String) {
+    query($login: String!, $cursor: String, $orderBy: RepositoryOrder) {
     organization(login: $login)
         {
             url
             login
-            repositories(first: 50, after: $cursor){
+            repositories(first: 50, after: $cursor, orderBy: $orderBy){
                 pageInfo{
                     endCursor
                     hasNextPage
@@ -39,6 +42,7 @@ GITHUB_ORG_REPOS_PAGINATED_GRAPHQL = """
                     createdAt
                     description
                     updatedAt
+                    pushedAt
                     homepageUrl
                     languages(first: 25){
                         totalCount
@@ -84,11 +88,40 @@ GITHUB_ORG_REPOS_PAGINATED_GRAPHQL = """
                 }
             }
         }
+        rateLimit {
+            cost
+            remaining
+            resetAt
+        }
     }
     """
 # Note: In the above query, `HEAD` references the default branch.
 # See https://stackoverflow.com/questions/48935381/github-graphql-api-default-branch-in-repository
 
+GITHUB_ORG_REPO_URLS_PAGINATED_GRAPHQL = """
+    query($login: String!, $cursor: String) {
+    organization(login: $login)
+        {
+            url
+            login
+            repositories(first: 100, after: $cursor){
+                pageInfo{
+                    endCursor
+                    hasNextPage
+                }
+                nodes{
+                    url
+                }
+            }
+        }
+        rateLimit {
+            cost
+            remaining
+            resetAt
+        }
+    }
+    """
+
 
 @timeit
 def get(token: str, api_url: str, organization: str) -> List[Dict]:
@@ -111,6 +144,110 @@ def get(token: str, api_url: str, organization: str) -> List[Dict]:
     return repos.nodes
 
 
+def _is_any_repo_older_than(date_field: str, watermark: str, repos: List[Dict]) -> bool:
+    # GitHub returns ISO 8601 UTC timestamps such as `2020-01-02T20:10:09Z`, which sort lexicographically.
+    # `pushedAt` is null for repos that were never pushed to.
+    return any(not repo.get(date_field) or repo[date_field] < watermark for repo in repos)
+
+
+@timeit
+def get_changed(token: str, api_url: str, organization: str, watermark: str) -> List[Dict]:
+    """
+    Retrieve the repos of a Github organization that were updated or pushed to at or after the given watermark, in the
+    same shape as get(). The repos are paginated newest first, once ordered by `UPDATED_AT` and once by `PUSHED_AT`,
+    and each pass stops as soon as it reaches a repo older than the watermark.
+    :param token: The Github API token as string.
+    :param api_url: The Github v4 API endpoint as string.
+    :param organization: The name of the target Github organization as string.
+    :param watermark: An ISO 8601 timestamp as returned by GitHub, see get_repos_watermark().
+    :return: A list of dicts representing the changed repos.
+    """
+    changed_repos: Dict[str, Dict] = {}
+    for order_field, date_field in (('UPDATED_AT', 'updatedAt'), ('PUSHED_AT', 'pushedAt')):
+        repos, _ = fetch_all(
+            token,
+            api_url,
+            organization,
+            GITHUB_ORG_REPOS_PAGINATED_GRAPHQL,
+            'repositories',
+            stop_paging=partial(_is_any_repo_older_than, date_field, watermark),
+            orderBy={'field': order_field, 'direction': 'DESC'},
+        )
+        for repo in repos.nodes:
+            if repo.get(date_field) and repo[date_field] >= watermark:
+                changed_repos[repo['url']] = repo
+    return list(changed_repos.values())
+
+
+@timeit
+def get_repo_urls(token: str, api_url: str, organization: str) -> List[str]:
+    """
+    Retrieve the URLs, which are also the graph ids, of all the repos of a Github organization. This is much cheaper
+    than get() since it fetches no other fields.
+    :param token: The Github API token as string.
+    :param api_url: The Github v4 API endpoint as string.
+    :param organization: The name of the target Github organization as string.
+    :return: A list of repo URLs.
+    """
+    repos, _ = fetch_all(
+        token,
+        api_url,
+        organization,
+        GITHUB_ORG_REPO_URLS_PAGINATED_GRAPHQL,
+        'repositories',
+    )
+    return [repo['url'] for repo in repos.nodes]
+
+
+def get_watermark_from_repos(repos_json: List[Dict]) -> Optional[str]:
+    """
+    Return the most recent `updatedAt` or `pushedAt` timestamp of the given repos, or None if there are no repos.
+    """
+    timestamps = [
+        repo[date_field] for repo in repos_json for date_field in ('updatedAt', 'pushedAt') if repo.get(date_field)
+    ]
+    return max(timestamps) if timestamps else None
+
+
+def _get_repos_sync_metadata_id(organization: str) -> str:
+    # Same id format as cartography.util.merge_module_sync_metadata()
+    return f"GitHubOrganization_{organization}_GitHubRepository"
+
+
+@timeit
+def get_repos_watermark(neo4j_session: neo4j.Session, organization: str) -> Optional[str]:
+    """
+    Return the watermark saved by the previous incremental repo sync of the given organization, or None if there is
+    none.
+    """
+    query = """
+    MATCH (s:SyncMetadata{id: $Id})
+    RETURN s.watermark
+    """
+    watermark = read_single_value_tx(neo4j_session, query, Id=_get_repos_sync_metadata_id(organization))
+    return str(watermark) if watermark else None
+
+
+@timeit
+def save_repos_watermark(neo4j_session: neo4j.Session, organization: str, watermark: str, update_tag: int) -> None:
+    query = """
+    MERGE (s:ModuleSyncMetadata{id: $Id})
+    ON CREATE SET s:SyncMetadata, s.firstseen = timestamp()
+    SET s.syncedtype = 'GitHubRepository',
+        s.grouptype = 'GitHubOrganization',
+        s.groupid = $Organization,
+        s.watermark = $Watermark,
+        s.lastupdated = $UpdateTag
+    """
+    neo4j_session.run(
+        query,
+        Id=_get_repos_sync_metadata_id(organization),
+        Organization=organization,
+        Watermark=watermark,
+        UpdateTag=update_tag,
+    )
+
+
 def transform(repos_json: List[Dict]) -> Dict:
     """
     Parses the JSON returned from GitHub API to create data for graph ingestion
@@ -543,12 +680,42 @@ def load_python_requirements(neo4j_session: neo4j.Session, update_tag: int, requ
     )
 
 
+@timeit
+def load_unchanged_repos(neo4j_session: neo4j.Session, update_tag: int, repo_urls: List[str]) -> None:
+    """
+    Mark the given repos, which did not change since the previous sync, as fresh along with their branch, owner,
+    languages, Python requirements and outside collaborators, so that the cleanup job keeps them.
+    :param neo4j_session: Neo4J session object for server communication
+    :param update_tag: Timestamp used to determine data freshness
+    :param repo_urls: The ids of the unchanged repos
+    :return: Nothing
+    """
+    query = """
+    UNWIND $DictList AS repository
+    MATCH (repo:GitHubRepository{id: repository.url})
+    SET repo.lastupdated = $UpdateTag
+    WITH repo
+
+    OPTIONAL MATCH (repo)-[r:BRANCH|OWNER|LANGUAGE|REQUIRES]->(n)
+    SET r.lastupdated = $UpdateTag,
+    n.lastupdated = $UpdateTag
+    WITH DISTINCT repo
+
+    OPTIONAL MATCH (repo)<-[o]-(u:GitHubUser)
+    WHERE type(o) STARTS WITH 'OUTSIDE_COLLAB_'
+    SET o.lastupdated = $UpdateTag,
+    u.lastupdated = $UpdateTag
+    """
+    load_graph_data(neo4j_session, query, [{'url': url} for url in repo_urls], UpdateTag=update_tag)
+
+
 def sync(
         neo4j_session: neo4j.Session,
         common_job_parameters: Dict[str, Any],
         github_api_key: str,
         github_url: str,
         organization: str,
+        incremental: bool = False,
 ) -> None:
     """
     Performs the sequential tasks to collect, transform, and sync github data
@@ -557,10 +724,31 @@ def sync(
     :param github_api_key: The API key to access the GitHub v4 API
     :param github_url: The URL for the GitHub v4 endpoint to use
     :param organization: The organization to query GitHub for
+    :param incremental: If True and a previous incremental sync saved a watermark for this organization, only fetch
+    the repos that were updated or pushed to since then, and mark the others as fresh without fetching them.
     :return: Nothing
     """
     logger.info("Syncing GitHub repos")
-    repos_json = get(github_api_key, github_url, organization)
+    watermark = get_repos_watermark(neo4j_session, organization) if incremental else None
+    if watermark:
+        repos_json = get_changed(github_api_key, github_url, organization, watermark)
+        changed_repo_urls = {repo['url'] for repo in repos_json}
+        # Repos deleted from GitHub are not in this list, so the cleanup job still removes them.
+        unchanged_repo_urls = [
+            url for url in get_repo_urls(github_api_key, github_url, organization) if url not in changed_repo_urls
+        ]
+        logger.info(
+            f"{len(repos_json)} GitHub repos of {organization} changed since {watermark}, "
+            f"{len(unchanged_repo_urls)} did not change.",
+        )
+        load_unchanged_repos(neo4j_session, common_job_parameters['UPDATE_TAG'], unchanged_repo_urls)
+    else:
+        repos_json = get(github_api_key, github_url, organization)
     repo_data = transform(repos_json)
     load(neo4j_session, common_job_parameters, repo_data)
     run_cleanup_job('github_repos_cleanup.json', neo4j_session, common_job_parameters)
+
+    if incremental:
+        new_watermark = get_watermark_from_repos(repos_json) or watermark
+        if new_watermark:
+            save_repos_watermark(neo4j_session, organization, new_watermark, common_job_parameters['UPDATE_TAG'])
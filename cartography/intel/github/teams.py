@@ -1,5 +1,6 @@
 import logging
 from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
 from time import sleep
 from typing import Any
 from typing import Dict
@@ -19,6 +20,9 @@ logger = logging.getLogger(__name__)
 
 RepoPermission = namedtuple('RepoPermission', ['repo_url', 'permission'])
 
+# Number of teams whose repos are fetched at the same time.
+GITHUB_TEAM_REPOS_CONCURRENCY = 8
+
 
 @timeit
 def get_teams(org: str, api_url: str, token: str) -> Tuple[PaginatedGraphqlData, Dict[str, Any]]:
@@ -42,6 +46,11 @@ def get_teams(org: str, api_url: str, token: str) -> Tuple[PaginatedGraphqlData,
                     }
                 }
             }
+            rateLimit {
+                cost
+                remaining
+                resetAt
+            }
         }
     """
     return fetch_all(token, api_url, org, org_teams_gql, 'teams')
@@ -53,50 +62,63 @@ def _get_team_repos_for_multiple_teams(
         org: str,
         api_url: str,
         token: str,
+        max_workers: int = GITHUB_TEAM_REPOS_CONCURRENCY,
 ) -> dict[str, list[RepoPermission]]:
-    result: dict[str, list[RepoPermission]] = {}
-    for team in team_raw_data:
-        team_name = team['slug']
-        repo_count = team['repositories']['totalCount']
-
-        if repo_count == 0:
-            # This team has access to no repos so let's move on
-            result[team_name] = []
-            continue
-
-        repo_urls = []
-        repo_permissions = []
-
-        max_tries = 5
-
-        for current_try in range(1, max_tries + 1):
-            team_repos = _get_team_repos(org, api_url, token, team_name)
-
-            try:
-                # The `or []` is because `.nodes` can be None. See:
-                # https://docs.github.com/en/graphql/reference/objects#teamrepositoryconnection
-                for repo in team_repos.nodes or []:
-                    repo_urls.append(repo['url'])
-
-                # The `or []` is because `.edges` can be None.
-                for edge in team_repos.edges or []:
-                    repo_permissions.append(edge['permission'])
-                # We're done! Break out of the retry loop.
-                break
-
-            except TypeError:
-                # Handles issue #1334
-                logger.warning(
-                    f"GitHub returned None when trying to find repo or permission data for team {team_name}.",
-                    exc_info=True,
-                )
-                if current_try == max_tries:
-                    raise RuntimeError(f"GitHub returned a None repo url for team {team_name}, retries exhausted.")
-                sleep(current_try ** 2)
-
-        # Shape = [(repo_url, 'WRITE'), ...]]
-        result[team_name] = [RepoPermission(url, perm) for url, perm in zip(repo_urls, repo_permissions)]
-    return result
+    """
+    Fetch the repos of the given teams, `max_workers` teams at a time. All the calls share the GraphQL rate limit
+    budget of `token`, see cartography.intel.github.util.GitHubRateLimiter.
+    """
+    teams_with_repos = [team['slug'] for team in team_raw_data if team['repositories']['totalCount'] > 0]
+    team_repos: dict[str, list[RepoPermission]] = {}
+    if teams_with_repos:
+        with ThreadPoolExecutor(
+            max_workers=min(max_workers, len(teams_with_repos)),
+            thread_name_prefix='cartography-github-teams',
+        ) as executor:
+            futures = {
+                team_name: executor.submit(_get_repo_permissions_for_team, org, api_url, token, team_name)
+                for team_name in teams_with_repos
+            }
+            for team_name, future in futures.items():
+                team_repos[team_name] = future.result()
+
+    # Teams with access to no repos get an empty list.
+    return {team['slug']: team_repos.get(team['slug'], []) for team in team_raw_data}
+
+
+def _get_repo_permissions_for_team(org: str, api_url: str, token: str, team_name: str) -> list[RepoPermission]:
+    repo_urls = []
+    repo_permissions = []
+
+    max_tries = 5
+
+    for current_try in range(1, max_tries + 1):
+        team_repos = _get_team_repos(org, api_url, token, team_name)
+
+        try:
+            # The `or []` is because `.nodes` can be None. See:
+            # https://docs.github.com/en/graphql/reference/objects#teamrepositoryconnection
+            for repo in team_repos.nodes or []:
+                repo_urls.append(repo['url'])
+
+            # The `or []` is because `.edges` can be None.
+            for edge in team_repos.edges or []:
+                repo_permissions.append(edge['permission'])
+            # We're done! Break out of the retry loop.
+            break
+
+        except TypeError:
+            # Handles issue #1334
+            logger.warning(
+                f"GitHub returned None when trying to find repo or permission data for team {team_name}.",
+                exc_info=True,
+            )
+            if current_try == max_tries:
+                raise RuntimeError(f"GitHub returned a None repo url for team {team_name}, retries exhausted.")
+            sleep(current_try ** 2)
+
+    # Shape = [(repo_url, 'WRITE'), ...]]
+    return [RepoPermission(url, perm) for url, perm in zip(repo_urls, repo_permissions)]
 
 
 @timeit
@@ -41,6 +41,11 @@ GITHUB_ORG_USERS_PAGINATED_GRAPHQL = """
                 }
             }
         }
+        rateLimit {
+            cost
+            remaining
+            resetAt
+        }
     }
     """
 
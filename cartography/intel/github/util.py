@@ -1,23 +1,29 @@
 import json
 import logging
+import threading
 import time
 from datetime import datetime
 from datetime import timedelta
 from datetime import timezone as tz
 from typing import Any
+from typing import Callable
 from typing import Dict
 from typing import List
+from typing import Mapping
 from typing import NamedTuple
 from typing import Optional
 from typing import Tuple
 
 import requests
+from requests.adapters import HTTPAdapter
 
 
 logger = logging.getLogger(__name__)
 # Connect and read timeouts of 60 seconds each; see https://requests.readthedocs.io/en/master/user/advanced/#timeouts
 _TIMEOUT = (60, 60)
 _GRAPHQL_RATE_LIMIT_REMAINING_THRESHOLD = 500
+# Size of the connection pool of the shared requests.Session, see get_session()
+_SESSION_POOL_SIZE = 10
 
 
 class PaginatedGraphqlData(NamedTuple):
@@ -25,33 +31,116 @@ class PaginatedGraphqlData(NamedTuple):
     edges: List[Dict[str, Any]]
 
 
-def handle_rate_limit_sleep(token: str) -> None:
+class GitHubRateLimiter:
+    '''
+    Tracks the GraphQL rate limit of one Github token from the responses to the calls made with it, so that no extra
+    request is needed to check the limit. Before each call, wait() predicts the cost of the query from the last time it
+    ran and only sleeps if that cost would bring the remaining points under the threshold.
+    '''
+
+    def __init__(self, threshold: int = _GRAPHQL_RATE_LIMIT_REMAINING_THRESHOLD) -> None:
+        self.threshold = threshold
+        self.remaining: Optional[int] = None
+        self.reset_at: Optional[datetime] = None
+        self._query_costs: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def predict_cost(self, query: str) -> int:
+        '''
+        :param query: The GraphQL query about to run.
+        :return: The cost reported by Github the last time this query ran, or 1 if it has not run yet.
+        '''
+        return self._query_costs.get(query, 1)
+
+    def wait(self, query: str) -> None:
+        '''
+        Sleep until the rate limit resets if running `query` would bring the remaining points under the threshold, then
+        reserve the predicted cost of the query so that concurrent callers account for it.
+        :param query: The GraphQL query about to run.
+        '''
+        with self._lock:
+            cost = self.predict_cost(query)
+            sleep_duration = None
+            if self.remaining is not None and self.reset_at is not None:
+                now = datetime.now(tz.utc)
+                if self.remaining - cost <= self.threshold and self.reset_at > now:
+                    # add an extra minute for safety
+                    sleep_duration = self.reset_at - now + timedelta(minutes=1)
+                    logger.warning(
+                        f'Github graphql ratelimit has {self.remaining} remaining, the next query costs about {cost} '
+                        f'and the threshold is {self.threshold}, sleeping until reset at {self.reset_at} for '
+                        f'{sleep_duration}',
+                    )
+                else:
+                    self.remaining -= cost
+        if sleep_duration:
+            time.sleep(sleep_duration.total_seconds())
+
+    def update_from_headers(self, headers: Mapping[str, str]) -> None:
+        '''
+        Update the rate limit state from the `x-ratelimit-*` headers of a response, which are also sent when the call
+        failed because the limit was exceeded. A `retry-after` header, sent for secondary rate limits, blocks calls for
+        its duration.
+        :param headers: The (case-insensitive) headers of the response.
+        '''
+        with self._lock:
+            if 'retry-after' in headers:
+                self.remaining = 0
+                self.reset_at = datetime.now(tz.utc) + timedelta(seconds=int(headers['retry-after']))
+            elif 'x-ratelimit-remaining' in headers and 'x-ratelimit-reset' in headers:
+                self.remaining = int(headers['x-ratelimit-remaining'])
+                self.reset_at = datetime.fromtimestamp(int(headers['x-ratelimit-reset']), tz=tz.utc)
+
+    def update_from_graphql(self, query: str, response_json: Dict[str, Any]) -> None:
+        '''
+        Update the rate limit state and the cost of `query` from the `rateLimit { cost remaining resetAt }` object of a
+        GraphQL response, if the query asked for it.
+        :param query: The GraphQL query that ran.
+        :param response_json: The response to the query.
+        '''
+        rate_limit = (response_json.get('data') or {}).get('rateLimit')
+        if not rate_limit:
+            return
+        with self._lock:
+            self._query_costs[query] = rate_limit['cost']
+            self.remaining = rate_limit['remaining']
+            self.reset_at = datetime.fromisoformat(rate_limit['resetAt'].replace('Z', '+00:00'))
+
+
+_rate_limiters: Dict[str, GitHubRateLimiter] = {}
+_session: Optional[requests.Session] = None
+_shared_state_lock = threading.Lock()
+
+
+def get_rate_limiter(token: str) -> GitHubRateLimiter:
     '''
-    Check the remaining rate limit and sleep if remaining is below threshold
     :param token: The Github API token as string.
+    :return: The rate limiter of the given token, shared by all the Github syncs that use it.
     '''
-    response = requests.get('https://api.github.com/rate_limit', headers={'Authorization': f"token {token}"})
-    response.raise_for_status()
-    response_json = response.json()
-    rate_limit_obj = response_json['resources']['graphql']
-    remaining = rate_limit_obj['remaining']
-    threshold = _GRAPHQL_RATE_LIMIT_REMAINING_THRESHOLD
-    if remaining > threshold:
-        return
-    reset_at = datetime.fromtimestamp(rate_limit_obj['reset'], tz=tz.utc)
-    now = datetime.now(tz.utc)
-    # add an extra minute for safety
-    sleep_duration = reset_at - now + timedelta(minutes=1)
-    logger.warning(
-        f'Github graphql ratelimit has {remaining} remaining and is under threshold {threshold},'
-        f' sleeping until reset at {reset_at} for {sleep_duration}',
-    )
-    time.sleep(sleep_duration.seconds)
+    with _shared_state_lock:
+        if token not in _rate_limiters:
+            _rate_limiters[token] = GitHubRateLimiter()
+        return _rate_limiters[token]
+
+
+def get_session() -> requests.Session:
+    '''
+    :return: The requests.Session used for all calls to the Github API, so that connections are kept alive and reused.
+    '''
+    global _session
+    with _shared_state_lock:
+        if _session is None:
+            _session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=_SESSION_POOL_SIZE, pool_maxsize=_SESSION_POOL_SIZE)
+            _session.mount('https://', adapter)
+            _session.mount('http://', adapter)
+        return _session
 
 
 def call_github_api(query: str, variables: str, token: str, api_url: str) -> Dict:
     """
-    Calls the GitHub v4 API and executes a query
+    Calls the GitHub v4 API and executes a query. The call waits on the rate limiter of the token, which is then updated
+    from the response headers and from the `rateLimit` object of the response if the query asks for it.
     :param query: the GraphQL query to run
     :param variables: parameters for the query
     :param token: the Oauth token for the API
@@ -59,8 +148,10 @@ def call_github_api(query: str, variables: str, token: str, api_url: str) -> Dic
     :return: query results json
     """
     headers = {'Authorization': f"token {token}"}
+    rate_limiter = get_rate_limiter(token)
+    rate_limiter.wait(query)
     try:
-        response = requests.post(
+        response = get_session().post(
             api_url,
             json={'query': query, 'variables': variables},
             headers=headers,
@@ -70,8 +161,10 @@ def call_github_api(query: str, variables: str, token: str, api_url: str) -> Dic
         # Add context and re-raise for callers to handle
         logger.warning("GitHub: requests.get('%s') timed out.", api_url)
         raise
+    rate_limiter.update_from_headers(response.headers)
     response.raise_for_status()
     response_json = response.json()
+    rate_limiter.update_from_graphql(query, response_json)
     if "errors" in response_json:
         logger.warning(
             f'call_github_api() response has errors, please investigate. Raw response: {response_json["errors"]}; '
@@ -117,6 +210,7 @@ def fetch_all(
         resource_type: str,
         retries: int = 5,
         resource_inner_type: Optional[str] = None,
+        stop_paging: Optional[Callable[[List[Dict[str, Any]]], bool]] = None,
         **kwargs: Any,
 ) -> Tuple[PaginatedGraphqlData, Dict[str, Any]]:
     """
@@ -133,6 +227,8 @@ def fetch_all(
     :param resource_inner_type: Optional str. Default = None. Sometimes we need to paginate a field that is inside
     `resource_type` - for example: organization['team']['repositories']. In this case, we specify 'repositories' as the
     `resource_inner_type`.
+    :param stop_paging: Optional callable. Default = None. Called with the nodes of each page; if it returns True, no
+    further pages are fetched. This allows stopping early when paginating a resource ordered by e.g. update date.
     :param kwargs: Additional key-value args (other than `login` and `cursor`) to pass to the GraphQL query variables.
     :return: A 2-tuple containing 1. A list of data items of the given `resource_type` and `field_name`,  and 2. a dict
     containing the `url` and the `login` fields of the organization that the items belong to.
@@ -146,9 +242,6 @@ def fetch_all(
     while has_next_page:
         exc: Any = None
         try:
-            # In the future, we may use also use the rateLimit object from the graphql response.
-            # But we still need at least one call to the REST endpoint in case the graphql remaining is already 0
-            handle_rate_limit_sleep(token)
             resp = fetch_page(token, api_url, organization, query, cursor, **kwargs)
             retry = 0
         except requests.exceptions.Timeout as err:
@@ -190,6 +283,8 @@ def fetch_all(
 
         cursor = resource['pageInfo']['endCursor']
         has_next_page = resource['pageInfo']['hasNextPage']
+        if stop_paging and stop_paging(resource.get('nodes', [])):
+            has_next_page = False
         if not org_data:
             org_data = {
                 'url': resp['data']['organization']['url'],
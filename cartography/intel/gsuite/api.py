@@ -1,10 +1,15 @@
 import logging
+from typing import Any
 from typing import Dict
 from typing import List
+from typing import Optional
+from typing import Tuple
 
 import neo4j
 from googleapiclient.discovery import Resource
 
+from cartography.client.core.tx import load_graph_data
+from cartography.util import batch
 from cartography.util import run_cleanup_job
 from cartography.util import timeit
 
@@ -13,6 +18,9 @@ logger = logging.getLogger(__name__)
 
 
 GOOGLE_API_NUM_RETRIES = 5
+# Maximum number of calls in a single batch request.
+# See https://developers.google.com/admin-sdk/directory/v1/guides/batch
+GOOGLE_API_MAX_BATCH_SIZE = 1000
 
 
 @timeit
@@ -83,26 +91,62 @@ def get_all_groups_for_email(admin: Resource, email: str) -> List[Dict]:
 
 
 @timeit
-def get_members_for_group(admin: Resource, group_email: str) -> List[Dict]:
-    """ Get all members for a google group
+def get_members_for_groups(
+    admin: Resource, group_emails: List[str], batch_size: int = GOOGLE_API_MAX_BATCH_SIZE,
+) -> Dict[str, List[Dict]]:
+    """ Get all members for many google groups, using batch requests of up to `batch_size` calls
 
-    :param group_email: A string representing the email address for the group
+    Each round sends the next page of members for every group that has one, so groups with many members only take
+    as many rounds as they have pages. A call that fails inside a batch is retried on its own with
+    `GOOGLE_API_NUM_RETRIES` retries.
 
-    :return: List of dictionaries representing Users or Groups.
-    """
-    request = admin.members().list(
-        groupKey=group_email,
-        maxResults=500,
-    )
-    members: List[Dict] = []
-    while request is not None:
-        resp = request.execute(num_retries=GOOGLE_API_NUM_RETRIES)
-        members = members + resp.get('members', [])
-        request = admin.members().list_next(request, resp)
+    :param group_emails: A list of strings representing the email addresses of the groups
 
+    :return: Dictionary of group email to the list of dictionaries representing its Users or Groups.
+    """
+    members: Dict[str, List[Dict]] = {email: [] for email in group_emails}
+    pending = [(email, admin.members().list(groupKey=email, maxResults=500)) for email in group_emails]
+    while pending:
+        next_pending = []
+        for requests_batch in batch(pending, size=batch_size):
+            responses: Dict[str, Tuple[Optional[Dict], Optional[Exception]]] = {}
+
+            def _collect_response(request_id: str, response: Dict, exception: Exception) -> None:
+                responses[request_id] = (response, exception)
+
+            batch_request = admin.new_batch_http_request(callback=_collect_response)
+            for request_id, (_, request) in enumerate(requests_batch):
+                batch_request.add(request, request_id=str(request_id))
+            batch_request.execute()
+
+            for request_id, (email, request) in enumerate(requests_batch):
+                resp, exception = responses.get(str(request_id), (None, None))
+                if exception or resp is None:
+                    logger.debug(f'Batched members request for group {email} failed, retrying it on its own.')
+                    resp = request.execute(num_retries=GOOGLE_API_NUM_RETRIES)
+                members[email].extend(resp.get('members', []))
+                next_request = admin.members().list_next(request, resp)
+                if next_request is not None:
+                    next_pending.append((email, next_request))
+        pending = next_pending
     return members
 
 
+@timeit
+def transform_members(groups: List[Dict], members_by_group_email: Dict[str, List[Dict]]) -> List[Dict]:
+    """  Flattens the members of all groups to a list of memberships
+
+    :param groups: list of group objects
+    :param members_by_group_email: as returned by get_members_for_groups()
+    :return: list of dictionary objects with the `id` of the member (a user or a group) and the `group_id` of the group
+    """
+    memberships: List[Dict] = []
+    for group in groups:
+        for member in members_by_group_email.get(group['email'], []):
+            memberships.append({'id': member.get('id'), 'group_id': group.get('id')})
+    return memberships
+
+
 @timeit
 def get_all_users(admin: Resource) -> List[Dict]:
     """
@@ -186,32 +230,30 @@ def load_gsuite_users(neo4j_session: neo4j.Session, users: List[Dict], gsuite_up
 
 
 @timeit
-def load_gsuite_members(neo4j_session: neo4j.Session, group: Dict, members: List[Dict], gsuite_update_tag: int) -> None:
+def load_gsuite_members(
+    neo4j_session: neo4j.Session, memberships: List[Dict[str, Any]], gsuite_update_tag: int,
+) -> None:
     ingestion_qry = """
-        UNWIND $MemberData as member
-        MATCH (user:GSuiteUser {id: member.id}),(group:GSuiteGroup {id: $GroupID })
+        UNWIND $DictList as member
+        MATCH (user:GSuiteUser {id: member.id}),(group:GSuiteGroup {id: member.group_id})
         MERGE (user)-[r:MEMBER_GSUITE_GROUP]->(group)
         ON CREATE SET
         r.firstseen = $UpdateTag
         SET
         r.lastupdated = $UpdateTag
     """
-    neo4j_session.run(
-        ingestion_qry,
-        MemberData=members,
-        GroupID=group.get("id"),
-        UpdateTag=gsuite_update_tag,
-    )
+    logger.info(f'Ingesting {len(memberships)} gsuite group memberships')
+    load_graph_data(neo4j_session, ingestion_qry, memberships, UpdateTag=gsuite_update_tag)
     membership_qry = """
-        UNWIND $MemberData as member
-        MATCH(group_1: GSuiteGroup{id: member.id}), (group_2:GSuiteGroup {id: $GroupID})
+        UNWIND $DictList as member
+        MATCH(group_1: GSuiteGroup{id: member.id}), (group_2:GSuiteGroup {id: member.group_id})
         MERGE (group_1)-[r:MEMBER_GSUITE_GROUP]->(group_2)
         ON CREATE SET
         r.firstseen = $UpdateTag
         SET
         r.lastupdated = $UpdateTag
     """
-    neo4j_session.run(membership_qry, MemberData=members, GroupID=group.get("id"), UpdateTag=gsuite_update_tag)
+    load_graph_data(neo4j_session, membership_qry, memberships, UpdateTag=gsuite_update_tag)
 
 
 @timeit
@@ -279,6 +321,6 @@ def sync_gsuite_groups(
 def sync_gsuite_members(
     groups: List[Dict], neo4j_session: neo4j.Session, admin: Resource, gsuite_update_tag: int,
 ) -> None:
-    for group in groups:
-        members = get_members_for_group(admin, group['email'])
-        load_gsuite_members(neo4j_session, group, members, gsuite_update_tag)
+    members_by_group_email = get_members_for_groups(admin, [group['email'] for group in groups])
+    memberships = transform_members(groups, members_by_group_email)
+    load_gsuite_members(neo4j_session, memberships, gsuite_update_tag)
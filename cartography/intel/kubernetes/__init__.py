@@ -1,5 +1,15 @@
+import datetime
 import logging
+import re
+import time
+import traceback
+from concurrent.futures import as_completed
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict
+from typing import List
+from typing import Optional
 
+import neo4j
 from neo4j import Session
 
 from cartography.config import Config
@@ -8,10 +18,79 @@ from cartography.intel.kubernetes.pods import sync_pods
 from cartography.intel.kubernetes.secrets import sync_secrets
 from cartography.intel.kubernetes.services import sync_services
 from cartography.intel.kubernetes.util import get_k8s_clients
+from cartography.intel.kubernetes.util import K8sClient
+from cartography.stats import get_stats_client
+from cartography.util import build_neo4j_driver
 from cartography.util import run_cleanup_job
 from cartography.util import timeit
 
 logger = logging.getLogger(__name__)
+stat_handler = get_stats_client(__name__)
+
+
+def _format_cluster_exception(cluster_name: str, e: Exception) -> str:
+    timestamp = datetime.datetime.now()
+    exception_traceback = traceback.TracebackException.from_exception(e)
+    traceback_string = ''.join(exception_traceback.format())
+    return f'{timestamp} - Exception for k8s cluster: {cluster_name}\n{traceback_string}'
+
+
+def _sync_cluster(session: Session, client: K8sClient, update_tag: int) -> None:
+    logger.info(f"Syncing data for k8s cluster {client.name}...")
+    # Context names are often ARNs or URLs, keep them usable as a statsd metric name.
+    timer = stat_handler.timer(f"cluster_sync.{re.sub(r'[^A-Za-z0-9_-]', '_', client.name)}")
+    if timer:
+        timer.start()
+    start = time.monotonic()
+    try:
+        cluster = sync_namespaces(session, client, update_tag)
+        pods = sync_pods(session, client, update_tag, cluster)
+        sync_services(session, client, update_tag, cluster, pods)
+        sync_secrets(session, client, update_tag, cluster)
+    finally:
+        if timer:
+            timer.stop()
+        logger.info(f"Finished syncing k8s cluster {client.name} in {time.monotonic() - start:.1f} seconds.")
+
+
+def _sync_cluster_in_worker(
+    neo4j_driver: neo4j.Driver,
+    neo4j_database: Optional[str],
+    client: K8sClient,
+    update_tag: int,
+) -> None:
+    """
+    Syncs one cluster on a worker thread. Neo4j sessions are not thread safe so each worker opens its own.
+    """
+    with neo4j_driver.session(database=neo4j_database) as session:
+        _sync_cluster(session, client, update_tag)
+
+
+def _sync_clusters_concurrently(
+    neo4j_driver: neo4j.Driver,
+    neo4j_database: Optional[str],
+    clients: List[K8sClient],
+    update_tag: int,
+    k8s_sync_concurrency: int,
+) -> Dict[str, str]:
+    """
+    Syncs the given clusters on a pool of `k8s_sync_concurrency` workers.
+    :return: A dict of cluster name to formatted traceback for every cluster that failed.
+    """
+    failures: Dict[str, str] = {}
+    with ThreadPoolExecutor(max_workers=k8s_sync_concurrency, thread_name_prefix='cartography-k8s') as executor:
+        futures = {
+            executor.submit(_sync_cluster_in_worker, neo4j_driver, neo4j_database, client, update_tag): client.name
+            for client in clients
+        }
+        for future in as_completed(futures):
+            cluster_name = futures[future]
+            try:
+                future.result()
+            except Exception as e:
+                logger.exception(f"Failed to sync data for k8s cluster {cluster_name}...")
+                failures[cluster_name] = _format_cluster_exception(cluster_name, e)
+    return failures
 
 
 @timeit
@@ -22,16 +101,34 @@ def start_k8s_ingestion(session: Session, config: Config) -> None:
         logger.error("kubeconfig not found.")
         return
 
-    for client in get_k8s_clients(config.k8s_kubeconfig):
-        logger.info(f"Syncing data for k8s cluster {client.name}...")
+    clients = get_k8s_clients(config.k8s_kubeconfig)
+    failures: Dict[str, str] = {}
+    if config.k8s_sync_concurrency > 1 and len(clients) > 1:
+        logger.info(f"Syncing {len(clients)} k8s clusters with {config.k8s_sync_concurrency} concurrent workers.")
+        neo4j_driver = build_neo4j_driver(config)
         try:
-            cluster = sync_namespaces(session, client, config.update_tag)
-            pods = sync_pods(session, client, config.update_tag, cluster)
-            sync_services(session, client, config.update_tag, cluster, pods)
-            sync_secrets(session, client, config.update_tag, cluster)
-        except Exception:
-            logger.exception(f"Failed to sync data for k8s cluster {client.name}...")
-            raise
+            failures = _sync_clusters_concurrently(
+                neo4j_driver,
+                config.neo4j_database,
+                clients,
+                config.update_tag,
+                config.k8s_sync_concurrency,
+            )
+        finally:
+            neo4j_driver.close()
+    else:
+        for client in clients:
+            try:
+                _sync_cluster(session, client, config.update_tag)
+            except Exception as e:
+                logger.exception(f"Failed to sync data for k8s cluster {client.name}...")
+                failures[client.name] = _format_cluster_exception(client.name, e)
+
+    # Errors are only raised once every cluster had its chance to sync. The cleanup is skipped in that case, as it would
+    # delete the data of the clusters that failed.
+    if failures:
+        logger.error(f"k8s sync failed for clusters {list(failures)}")
+        raise Exception('\n'.join(failures.values()))
 
     run_cleanup_job(
         "kubernetes_import_cleanup.json",
@@ -5,7 +5,9 @@ from typing import Tuple
 
 from neo4j import Session
 
+from cartography.client.core.tx import load_graph_data
 from cartography.intel.kubernetes.util import get_epoch
+from cartography.intel.kubernetes.util import get_paginated_items
 from cartography.intel.kubernetes.util import K8sClient
 from cartography.stats import get_stats_client
 from cartography.util import merge_module_sync_metadata
@@ -32,19 +34,23 @@ def sync_namespaces(session: Session, client: K8sClient, update_tag: int) -> Dic
 
 @timeit
 def get_namespaces(client: K8sClient) -> Tuple[Dict, List[Dict]]:
+    # Namespaces are fetched page by page like other resources, but all of them are needed before loading because the
+    # cluster id is the uid of the kube-system namespace.
     cluster = dict()
     namespaces = list()
-    for namespace in client.core.list_namespace().items:
-        namespaces.append(
-            {
-                "uid": namespace.metadata.uid,
-                "name": namespace.metadata.name,
-                "creation_timestamp": get_epoch(namespace.metadata.creation_timestamp),
-                "deletion_timestamp": get_epoch(namespace.metadata.deletion_timestamp),
-            },
-        )
-        if namespace.metadata.name == "kube-system":
-            cluster = {"uid": namespace.metadata.uid, "name": client.name}
+    for raw_namespaces in get_paginated_items(client.core.list_namespace):
+        for namespace in raw_namespaces:
+            metadata = namespace["metadata"]
+            namespaces.append(
+                {
+                    "uid": metadata["uid"],
+                    "name": metadata["name"],
+                    "creation_timestamp": get_epoch(metadata.get("creationTimestamp")),
+                    "deletion_timestamp": get_epoch(metadata.get("deletionTimestamp")),
+                },
+            )
+            if metadata["name"] == "kube-system":
+                cluster = {"uid": metadata["uid"], "name": client.name}
     return cluster, namespaces
 
 
@@ -57,7 +63,7 @@ def load_namespaces(
     SET cluster.name = $cluster_name,
         cluster.lastupdated = $update_tag
     WITH cluster
-    UNWIND $namespaces as namespace
+    UNWIND $DictList as namespace
         MERGE (space:KubernetesNamespace {id: namespace.uid})
         ON CREATE SET space.firstseen = timestamp()
         SET space.lastupdated = $update_tag,
@@ -70,9 +76,10 @@ def load_namespaces(
         SET rel1.lastupdated = $update_tag
     """
     logger.info(f"Loading {len(data)} kubernetes namespaces.")
-    session.run(
+    load_graph_data(
+        session,
         ingestion_cypher_query,
-        namespaces=data,
+        data,
         cluster_id=cluster["uid"],
         cluster_name=cluster["name"],
         update_tag=update_tag,
@@ -1,10 +1,14 @@
 import logging
+from typing import Any
 from typing import Dict
+from typing import Iterator
 from typing import List
 
 from neo4j import Session
 
+from cartography.client.core.tx import load_graph_data
 from cartography.intel.kubernetes.util import get_epoch
+from cartography.intel.kubernetes.util import get_paginated_items
 from cartography.intel.kubernetes.util import K8sClient
 from cartography.util import timeit
 
@@ -15,52 +19,67 @@ logger = logging.getLogger(__name__)
 def sync_pods(
     session: Session, client: K8sClient, update_tag: int, cluster: Dict,
 ) -> List[Dict]:
-    pods = get_pods(client, cluster)
-    load_pods(session, pods, update_tag)
+    pods = list()
+    for page in get_pods_pages(client, cluster):
+        load_pods(session, page, update_tag)
+        pods.extend(page)
     return pods
 
 
+def get_pods_pages(client: K8sClient, cluster: Dict) -> Iterator[List[Dict]]:
+    for raw_pods in get_paginated_items(client.core.list_pod_for_all_namespaces):
+        yield transform_pods(raw_pods, cluster)
+
+
 @timeit
 def get_pods(client: K8sClient, cluster: Dict) -> List[Dict]:
+    return [pod for page in get_pods_pages(client, cluster) for pod in page]
+
+
+def transform_pods(raw_pods: List[Dict[str, Any]], cluster: Dict) -> List[Dict]:
     pods = list()
-    for pod in client.core.list_pod_for_all_namespaces().items:
+    for pod in raw_pods:
+        metadata = pod["metadata"]
+        spec = pod["spec"]
+        pod_status = pod.get("status") or {}
         containers = {}
-        for container in pod.spec.containers:
-            containers[container.name] = {
-                "name": container.name,
-                "image": container.image,
-                "uid": f"{pod.metadata.uid}-{container.name}",
+        for container in spec.get("containers") or []:
+            containers[container["name"]] = {
+                "name": container["name"],
+                "image": container.get("image"),
+                "uid": f"{metadata['uid']}-{container['name']}",
             }
-        if pod.status and pod.status.container_statuses:
-            for status in pod.status.container_statuses:
-                if status.name in containers:
-                    _state = 'waiting'
-                    if status.state.running:
-                        _state = 'running'
-                    elif status.state.terminated:
-                        _state = 'terminated'
-                    try:
-                        image_sha = status.image_id.split("@")[1]
-                    except IndexError:
-                        image_sha = None
-                    containers[status.name]["status"] = {
-                        "image_id": status.image_id,
-                        "image_sha": image_sha,
-                        "ready": status.ready,
-                        "started": status.started,
-                        "state": _state,
-                    }
+        for status in pod_status.get("containerStatuses") or []:
+            if status["name"] in containers:
+                state = status.get("state") or {}
+                _state = 'waiting'
+                if state.get("running"):
+                    _state = 'running'
+                elif state.get("terminated"):
+                    _state = 'terminated'
+                image_id = status.get("imageID")
+                try:
+                    image_sha = image_id.split("@")[1] if image_id else None
+                except IndexError:
+                    image_sha = None
+                containers[status["name"]]["status"] = {
+                    "image_id": image_id,
+                    "image_sha": image_sha,
+                    "ready": status.get("ready"),
+                    "started": status.get("started"),
+                    "state": _state,
+                }
         pods.append(
             {
-                "uid": pod.metadata.uid,
-                "name": pod.metadata.name,
-                "status_phase": pod.status.phase,
-                "creation_timestamp": get_epoch(pod.metadata.creation_timestamp),
-                "deletion_timestamp": get_epoch(pod.metadata.deletion_timestamp),
-                "namespace": pod.metadata.namespace,
-                "node": pod.spec.node_name,
+                "uid": metadata["uid"],
+                "name": metadata["name"],
+                "status_phase": pod_status.get("phase"),
+                "creation_timestamp": get_epoch(metadata.get("creationTimestamp")),
+                "deletion_timestamp": get_epoch(metadata.get("deletionTimestamp")),
+                "namespace": metadata.get("namespace"),
+                "node": spec.get("nodeName"),
                 "cluster_uid": cluster["uid"],
-                "labels": pod.metadata.labels,
+                "labels": metadata.get("labels"),
                 "containers": list(containers.values()),
             },
         )
@@ -69,7 +88,7 @@ def get_pods(client: K8sClient, cluster: Dict) -> List[Dict]:
 
 def load_pods(session: Session, data: List[Dict], update_tag: int) -> None:
     ingestion_cypher_query = """
-    UNWIND $pods as k8pod
+    UNWIND $DictList as k8pod
         MERGE (pod:KubernetesPod {id: k8pod.uid})
         ON CREATE SET pod.firstseen = timestamp()
         SET pod.lastupdated = $update_tag,
@@ -104,4 +123,4 @@ def load_pods(session: Session, data: List[Dict], update_tag: int) -> None:
             SET rel3.lastupdated = $update_tag
     """
     logger.info(f"Loading {len(data)} kubernetes pods.")
-    session.run(ingestion_cypher_query, pods=data, update_tag=update_tag)
+    load_graph_data(session, ingestion_cypher_query, data, update_tag=update_tag)
@@ -1,10 +1,14 @@
 import logging
+from typing import Any
 from typing import Dict
+from typing import Iterator
 from typing import List
 
 from neo4j import Session
 
+from cartography.client.core.tx import load_graph_data
 from cartography.intel.kubernetes.util import get_epoch
+from cartography.intel.kubernetes.util import get_paginated_items
 from cartography.intel.kubernetes.util import K8sClient
 from cartography.util import timeit
 
@@ -18,31 +22,43 @@ def sync_secrets(
     update_tag: int,
     cluster: Dict,
 ) -> List[Dict]:
-    secrets = get_secrets(client, cluster)
-    load_secrets(session, secrets, update_tag)
+    secrets = list()
+    for page in get_secrets_pages(client, cluster):
+        load_secrets(session, page, update_tag)
+        secrets.extend(page)
     return secrets
 
 
+def get_secrets_pages(client: K8sClient, cluster: Dict) -> Iterator[List[Dict]]:
+    for raw_secrets in get_paginated_items(client.core.list_secret_for_all_namespaces):
+        yield transform_secrets(raw_secrets, cluster)
+
+
 @timeit
 def get_secrets(client: K8sClient, cluster: Dict) -> List[Dict]:
+    return [secret for page in get_secrets_pages(client, cluster) for secret in page]
+
+
+def transform_secrets(raw_secrets: List[Dict[str, Any]], cluster: Dict) -> List[Dict]:
+    # The secret values under `data` are deliberately left out.
     return [
         {
-            "uid": secret.metadata.uid,
-            "name": secret.metadata.name,
-            "creation_timestamp": get_epoch(secret.metadata.creation_timestamp),
-            "deletion_timestamp": get_epoch(secret.metadata.deletion_timestamp),
-            "namespace": secret.metadata.namespace,
+            "uid": secret["metadata"]["uid"],
+            "name": secret["metadata"]["name"],
+            "creation_timestamp": get_epoch(secret["metadata"].get("creationTimestamp")),
+            "deletion_timestamp": get_epoch(secret["metadata"].get("deletionTimestamp")),
+            "namespace": secret["metadata"].get("namespace"),
             "cluster_uid": cluster["uid"],
-            "labels": secret.metadata.labels,
-            "type": secret.type,
+            "labels": secret["metadata"].get("labels"),
+            "type": secret.get("type"),
         }
-        for secret in client.core.list_secret_for_all_namespaces().items
+        for secret in raw_secrets
     ]
 
 
 def load_secrets(session: Session, data: List[Dict], update_tag: int) -> None:
     ingestion_cypher_query = """
-    UNWIND $secrets as k8secret
+    UNWIND $DictList as k8secret
         MERGE (secret:KubernetesSecret {id: k8secret.uid})
         ON CREATE SET secret.firstseen = timestamp()
         SET secret.lastupdated = $update_tag,
@@ -57,4 +73,4 @@ def load_secrets(session: Session, data: List[Dict], update_tag: int) -> None:
         SET rel1.lastupdated = $update_tag
     """
     logger.info(f"Loading {len(data)} kubernetes secrets.")
-    session.run(ingestion_cypher_query, secrets=data, update_tag=update_tag)
+    load_graph_data(session, ingestion_cypher_query, data, update_tag=update_tag)
@@ -1,10 +1,14 @@
 import logging
+from typing import Any
 from typing import Dict
+from typing import Iterator
 from typing import List
 
 from neo4j import Session
 
+from cartography.client.core.tx import load_graph_data
 from cartography.intel.kubernetes.util import get_epoch
+from cartography.intel.kubernetes.util import get_paginated_items
 from cartography.intel.kubernetes.util import K8sClient
 from cartography.util import timeit
 
@@ -15,38 +19,50 @@ logger = logging.getLogger(__name__)
 def sync_services(
     session: Session, client: K8sClient, update_tag: int, cluster: Dict, pods: List[Dict],
 ) -> None:
-    services = get_services(client, cluster, pods)
-    load_services(session, services, update_tag)
+    for page in get_services_pages(client, cluster, pods):
+        load_services(session, page, update_tag)
+
+
+def get_services_pages(client: K8sClient, cluster: Dict, pods: List[Dict]) -> Iterator[List[Dict]]:
+    for raw_services in get_paginated_items(client.core.list_service_for_all_namespaces):
+        yield transform_services(raw_services, cluster, pods)
 
 
 @timeit
 def get_services(client: K8sClient, cluster: Dict, pods: List[Dict]) -> List[Dict]:
+    return [service for page in get_services_pages(client, cluster, pods) for service in page]
+
+
+def transform_services(raw_services: List[Dict[str, Any]], cluster: Dict, pods: List[Dict]) -> List[Dict]:
     services = list()
-    for service in client.core.list_service_for_all_namespaces().items:
+    for service in raw_services:
+        metadata = service["metadata"]
+        spec = service.get("spec") or {}
+        selector: Dict[str, str] = spec.get("selector") or {}
         item = {
-            "uid": service.metadata.uid,
-            "name": service.metadata.name,
-            "creation_timestamp": get_epoch(service.metadata.creation_timestamp),
-            "deletion_timestamp": get_epoch(service.metadata.deletion_timestamp),
-            "namespace": service.metadata.namespace,
+            "uid": metadata["uid"],
+            "name": metadata["name"],
+            "creation_timestamp": get_epoch(metadata.get("creationTimestamp")),
+            "deletion_timestamp": get_epoch(metadata.get("deletionTimestamp")),
+            "namespace": metadata.get("namespace"),
             "cluster_uid": cluster["uid"],
-            "type": service.spec.type,
-            "selector": service.spec.selector,
-            "load_balancer_ip": service.spec.load_balancer_ip,
+            "type": spec.get("type"),
+            "selector": spec.get("selector"),
+            "load_balancer_ip": spec.get("loadBalancerIP"),
         }
 
-        ingresses = service.status.load_balancer.ingress
+        ingresses = ((service.get("status") or {}).get("loadBalancer") or {}).get("ingress")
         for ingress in ingresses or list():
-            item.update({"ingress_host": ingress.hostname, "ingress_ip": ingress.ip})
+            item.update({"ingress_host": ingress.get("hostname"), "ingress_ip": ingress.get("ip")})
 
         service_pods = list()
         for pod in pods:
-            is_service_pod = True if service.spec.selector else False
-            for selector in service.spec.selector or dict():
+            is_service_pod = True if selector else False
+            for key in selector:
                 if (
                     not pod.get("labels") or
-                    selector not in pod["labels"] or
-                    service.spec.selector[selector] != pod["labels"][selector]
+                    key not in pod["labels"] or
+                    selector[key] != pod["labels"][key]
                 ):
                     is_service_pod = False
                     break
@@ -59,7 +75,7 @@ def get_services(client: K8sClient, cluster: Dict, pods: List[Dict]) -> List[Dic
 
 def load_services(session: Session, data: List[Dict], update_tag: int) -> None:
     ingestion_cypher_query = """
-    UNWIND $services as k8service
+    UNWIND $DictList as k8service
         MERGE (service:KubernetesService {id: k8service.uid})
         ON CREATE SET service.firstseen = timestamp()
         SET service.lastupdated = $update_tag,
@@ -83,4 +99,4 @@ def load_services(session: Session, data: List[Dict], update_tag: int) -> None:
             SET rel2.lastupdated = $update_tag
     """
     logger.info(f"Loading {len(data)} kubernetes services.")
-    session.run(ingestion_cypher_query, services=data, update_tag=update_tag)
+    load_graph_data(session, ingestion_cypher_query, data, update_tag=update_tag)
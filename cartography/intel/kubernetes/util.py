@@ -1,12 +1,22 @@
+import json
 from datetime import datetime
+from datetime import timezone
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Iterator
 from typing import List
-from typing import Union
+from typing import Optional
 
 from kubernetes import config
 from kubernetes.client import ApiClient
 from kubernetes.client import CoreV1Api
 from kubernetes.client import NetworkingV1Api
 
+# Number of objects requested per page when listing Kubernetes resources, see get_paginated_items()
+K8S_LIST_PAGE_SIZE = 500
+K8S_TIMESTAMP_FORMAT = '%Y-%m-%dT%H:%M:%SZ'
+
 
 class KubernetesContextNotFound(Exception):
     pass
@@ -45,7 +55,30 @@ def get_k8s_clients(kubeconfig: str) -> List[K8sClient]:
     return clients
 
 
-def get_epoch(date: datetime) -> Union[int, None]:
-    if date:
-        return int(date.strftime("%s"))
+def get_paginated_items(
+    list_func: Callable[..., Any],
+    page_size: int = K8S_LIST_PAGE_SIZE,
+) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Yield the items returned by a Kubernetes list call, e.g. `client.core.list_pod_for_all_namespaces`, one page at a
+    time by following the `continue` token of each response. Responses are decoded as raw JSON instead of being
+    deserialized into kubernetes client models, which is much faster and lighter on memory for large clusters. The items
+    therefore have the field names of the Kubernetes API, e.g. `metadata.creationTimestamp`.
+    """
+    _continue = None
+    while True:
+        response = list_func(limit=page_size, _continue=_continue, _preload_content=False)
+        body = json.loads(response.data)
+        yield body.get("items") or []
+        _continue = (body.get("metadata") or {}).get("continue")
+        if not _continue:
+            return
+
+
+def get_epoch(timestamp: Optional[str]) -> Optional[int]:
+    """
+    Convert a timestamp from the Kubernetes API, e.g. `2021-10-07T04:41:06Z`, to epoch seconds.
+    """
+    if timestamp:
+        return int(datetime.strptime(timestamp, K8S_TIMESTAMP_FORMAT).replace(tzinfo=timezone.utc).timestamp())
     return None
@@ -1,23 +1,30 @@
 # Okta intel module - Applications
 import json
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Dict
 from typing import List
 from typing import Optional
+from typing import Tuple
 
 import neo4j
 from okta.framework.ApiClient import ApiClient
 from okta.framework.OktaError import OktaError
 
+from cartography.client.core.tx import load_graph_data
 from cartography.intel.okta.utils import check_rate_limit
 from cartography.intel.okta.utils import create_api_client
 from cartography.intel.okta.utils import is_last_page
+from cartography.intel.okta.utils import OktaRateLimiter
 from cartography.util import timeit
 
 
 logger = logging.getLogger(__name__)
 
+# Number of applications whose assigned users and groups are fetched at the same time
+OKTA_APP_ASSIGNMENTS_CONCURRENCY = 10
+
 
 @timeit
 def _get_okta_applications(api_client: ApiClient) -> List[Dict]:
@@ -56,11 +63,15 @@ def _get_okta_applications(api_client: ApiClient) -> List[Dict]:
 
 
 @timeit
-def _get_application_assigned_users(api_client: ApiClient, app_id: str) -> List[str]:
+def _get_application_assigned_users(
+    api_client: ApiClient, app_id: str, rate_limiter: Optional[OktaRateLimiter] = None,
+) -> List[str]:
     """
     Get users assigned to a specific application
     :param api_client: api client
     :param app_id: application id to get users from
+    :param rate_limiter: Optional. Rate limiter shared with concurrent calls. If not given, each response is checked
+    with check_rate_limit()
     :return: Array of user data
     """
     app_users: List[str] = []
@@ -68,6 +79,8 @@ def _get_application_assigned_users(api_client: ApiClient, app_id: str) -> List[
     next_url = None
     while True:
         try:
+            if rate_limiter:
+                rate_limiter.wait()
             # https://developer.okta.com/docs/reference/api/apps/#list-users-assigned-to-application
             if next_url:
                 paged_response = api_client.get(next_url)
@@ -82,7 +95,10 @@ def _get_application_assigned_users(api_client: ApiClient, app_id: str) -> List[
 
         app_users.append(paged_response.text)
 
-        check_rate_limit(paged_response)
+        if rate_limiter:
+            rate_limiter.update(paged_response)
+        else:
+            check_rate_limit(paged_response)
 
         if not is_last_page(paged_response):
             next_url = paged_response.links.get("next").get("url")
@@ -93,11 +109,15 @@ def _get_application_assigned_users(api_client: ApiClient, app_id: str) -> List[
 
 
 @timeit
-def _get_application_assigned_groups(api_client: ApiClient, app_id: str) -> List[str]:
+def _get_application_assigned_groups(
+    api_client: ApiClient, app_id: str, rate_limiter: Optional[OktaRateLimiter] = None,
+) -> List[str]:
     """
     Get groups assigned to a specific application
     :param api_client: api client
     :param app_id: application id to get users from
+    :param rate_limiter: Optional. Rate limiter shared with concurrent calls. If not given, each response is checked
+    with check_rate_limit()
     :return: Array of group id
     """
     app_groups: List[str] = []
@@ -106,6 +126,8 @@ def _get_application_assigned_groups(api_client: ApiClient, app_id: str) -> List
 
     while True:
         try:
+            if rate_limiter:
+                rate_limiter.wait()
             if next_url:
                 paged_response = api_client.get(next_url)
             else:
@@ -119,7 +141,10 @@ def _get_application_assigned_groups(api_client: ApiClient, app_id: str) -> List
 
         app_groups.append(paged_response.text)
 
-        check_rate_limit(paged_response)
+        if rate_limiter:
+            rate_limiter.update(paged_response)
+        else:
+            check_rate_limit(paged_response)
 
         if not is_last_page(paged_response):
             next_url = paged_response.links.get("next").get("url")
@@ -129,6 +154,32 @@ def _get_application_assigned_groups(api_client: ApiClient, app_id: str) -> List
     return app_groups
 
 
+@timeit
+def _get_application_assignments(api_client: ApiClient, app_ids: List[str]) -> Dict[str, Tuple[List[str], List[str]]]:
+    """
+    Get users and groups assigned to the given applications, for OKTA_APP_ASSIGNMENTS_CONCURRENCY applications at a
+    time. All calls share one rate limiter, as the /api/v1/apps endpoints share the same Okta rate limit.
+    :param api_client: api client
+    :param app_ids: application ids to get assignments for
+    :return: Dictionary of application id to a tuple of its assigned users data and assigned groups data
+    """
+    if not app_ids:
+        return {}
+    rate_limiter = OktaRateLimiter()
+
+    def _get_assignments(app_id: str) -> Tuple[List[str], List[str]]:
+        return (
+            _get_application_assigned_users(api_client, app_id, rate_limiter),
+            _get_application_assigned_groups(api_client, app_id, rate_limiter),
+        )
+
+    with ThreadPoolExecutor(
+        max_workers=min(OKTA_APP_ASSIGNMENTS_CONCURRENCY, len(app_ids)),
+        thread_name_prefix='cartography-okta-apps',
+    ) as executor:
+        return dict(zip(app_ids, executor.map(_get_assignments, app_ids)))
+
+
 @timeit
 def transform_application_assigned_users_list(assigned_user_list: List[str]) -> List[str]:
     """
@@ -288,91 +339,68 @@ def _load_okta_applications(
 
 
 @timeit
-def _load_application_user(
-    neo4j_session: neo4j.Session, app_id: str, user_list: List[str],
-    okta_update_tag: int,
+def _load_application_users(
+    neo4j_session: neo4j.Session, app_users: List[Dict], okta_update_tag: int,
 ) -> None:
     """
     Add application users into the graph
     :param neo4j_session: session with the Neo4j server
-    :param app_id: application to map
-    :param user_list: users to map
+    :param app_users: list of dictionaries with the `app_id` and the `user_id` of every assignment to map
     :param okta_update_tag: The timestamp value to set our new Neo4j resources with
     :return: Nothing
     """
     ingest = """
-    MATCH (app:OktaApplication{id: $APP_ID})
-    WITH app
-    UNWIND $USER_LIST as user_id
-    MATCH (user:OktaUser{id: user_id})
-    WITH app, user
+    UNWIND $DictList as app_user
+    MATCH (app:OktaApplication{id: app_user.app_id})
+    MATCH (user:OktaUser{id: app_user.user_id})
     MERGE (user)-[r:APPLICATION]->(app)
     ON CREATE SET r.firstseen = timestamp()
     SET r.lastupdated = $okta_update_tag
     """
 
-    neo4j_session.run(
-        ingest,
-        APP_ID=app_id,
-        USER_LIST=user_list,
-        okta_update_tag=okta_update_tag,
-    )
+    load_graph_data(neo4j_session, ingest, app_users, okta_update_tag=okta_update_tag)
 
 
 @timeit
-def _load_application_group(
-    neo4j_session: neo4j.Session, app_id: str, group_list: List[str],
-    okta_update_tag: int,
+def _load_application_groups(
+    neo4j_session: neo4j.Session, app_groups: List[Dict], okta_update_tag: int,
 ) -> None:
     """
     Add application groups into the graph
     :param neo4j_session: session with the Neo4j server
-    :param app_id: application to map
-    :param group_list: groups to map
+    :param app_groups: list of dictionaries with the `app_id` and the `group_id` of every assignment to map
     :param okta_update_tag: The timestamp value to set our new Neo4j resources with
     :return: Nothing
     """
     ingest = """
-    MATCH (app:OktaApplication{id: $APP_ID})
-    WITH app
-    UNWIND $GROUP_LIST as group_id
-    MATCH (group:OktaGroup{id: group_id})
-    WITH app, group
+    UNWIND $DictList as app_group
+    MATCH (app:OktaApplication{id: app_group.app_id})
+    MATCH (group:OktaGroup{id: app_group.group_id})
     MERGE (group)-[r:APPLICATION]->(app)
     ON CREATE SET r.firstseen = timestamp()
     SET r.lastupdated = $okta_update_tag
     """
 
-    neo4j_session.run(
-        ingest,
-        APP_ID=app_id,
-        GROUP_LIST=group_list,
-        okta_update_tag=okta_update_tag,
-    )
+    load_graph_data(neo4j_session, ingest, app_groups, okta_update_tag=okta_update_tag)
 
 
 @timeit
 def _load_application_reply_urls(
-    neo4j_session: neo4j.Session, app_id: str, reply_urls: List[str],
-    okta_update_tag: int,
+    neo4j_session: neo4j.Session, app_reply_urls: List[Dict], okta_update_tag: int,
 ) -> None:
     """
     Add reply urls to their applications
     :param neo4j_session: session with the Neo4j server
-    :param app_id: application to map the reply urls to
-    :param reply_urls: reply urls to map
+    :param app_reply_urls: list of dictionaries with the `app_id` and a reply `url` of the application
     :param okta_update_tag: The timestamp value to set our new Neo4j resources with
     :return: Nothing
     """
-    if not reply_urls:
-        return
     ingest = """
-    MATCH (app:OktaApplication{id: $APP_ID})
-    WITH app
-    UNWIND $URL_LIST as url_list
-    MERGE (uri:ReplyUri{id: url_list})
+    UNWIND $DictList as app_reply_url
+    MATCH (app:OktaApplication{id: app_reply_url.app_id})
+    MERGE (uri:ReplyUri{id: app_reply_url.url})
     ON CREATE SET uri.firstseen = timestamp()
-    SET uri.uri = url_list,
+    SET uri.uri = app_reply_url.url,
     uri.lastupdated = $okta_update_tag
     WITH app, uri
     MERGE (uri)<-[r:REPLYURI]-(app)
@@ -380,12 +408,7 @@ def _load_application_reply_urls(
     SET r.lastupdated = $okta_update_tag
     """
 
-    neo4j_session.run(
-        ingest,
-        APP_ID=app_id,
-        URL_LIST=reply_urls,
-        okta_update_tag=okta_update_tag,
-    )
+    load_graph_data(neo4j_session, ingest, app_reply_urls, okta_update_tag=okta_update_tag)
 
 
 @timeit
@@ -409,15 +432,21 @@ def sync_okta_applications(
     app_data = transform_okta_application_list(okta_app_data)
     _load_okta_applications(neo4j_session, okta_org_id, app_data, okta_update_tag)
 
+    assignments = _get_application_assignments(api_client, [app["id"] for app in okta_app_data])
+
+    app_users: List[Dict] = []
+    app_groups: List[Dict] = []
+    app_reply_urls: List[Dict] = []
     for app in okta_app_data:
         app_id = app["id"]
-        user_list_data = _get_application_assigned_users(api_client, app_id)
-        user_list = transform_application_assigned_users_list(user_list_data)
-        _load_application_user(neo4j_session, app_id, user_list, okta_update_tag)
-
-        group_list_data = _get_application_assigned_groups(api_client, app_id)
-        group_list = transform_application_assigned_groups_list(group_list_data)
-        _load_application_group(neo4j_session, app_id, group_list, okta_update_tag)
-
-        reply_urls = transform_okta_application_extract_replyurls(app)
-        _load_application_reply_urls(neo4j_session, app_id, reply_urls, okta_update_tag)
+        user_list_data, group_list_data = assignments[app_id]
+        for user_id in transform_application_assigned_users_list(user_list_data):
+            app_users.append({"app_id": app_id, "user_id": user_id})
+        for group_id in transform_application_assigned_groups_list(group_list_data):
+            app_groups.append({"app_id": app_id, "group_id": group_id})
+        for url in transform_okta_application_extract_replyurls(app) or []:
+            app_reply_urls.append({"app_id": app_id, "url": url})
+
+    _load_application_users(neo4j_session, app_users, okta_update_tag)
+    _load_application_groups(neo4j_session, app_groups, okta_update_tag)
+    _load_application_reply_urls(neo4j_session, app_reply_urls, okta_update_tag)
@@ -1,8 +1,10 @@
 # Okta intel module - Group
 import json
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict
 from typing import List
+from typing import Optional
 from typing import Tuple
 
 import neo4j
@@ -11,14 +13,19 @@ from okta.framework.OktaError import OktaError
 from okta.framework.PagedResults import PagedResults
 from okta.models.usergroup import UserGroup
 
+from cartography.client.core.tx import load_graph_data
 from cartography.intel.okta.sync_state import OktaSyncState
 from cartography.intel.okta.utils import check_rate_limit
 from cartography.intel.okta.utils import create_api_client
 from cartography.intel.okta.utils import is_last_page
+from cartography.intel.okta.utils import OktaRateLimiter
 from cartography.util import timeit
 
 logger = logging.getLogger(__name__)
 
+# Number of groups whose members are fetched at the same time
+OKTA_GROUP_MEMBERS_CONCURRENCY = 10
+
 
 @timeit
 def _get_okta_groups(api_client: ApiClient) -> List[str]:
@@ -58,11 +65,15 @@ def _get_okta_groups(api_client: ApiClient) -> List[str]:
 
 
 @timeit
-def get_okta_group_members(api_client: ApiClient, group_id: str) -> List[Dict]:
+def get_okta_group_members(
+    api_client: ApiClient, group_id: str, rate_limiter: Optional[OktaRateLimiter] = None,
+) -> List[Dict]:
     """
     Get group members from Okta server
     :param api_client: Okta api client
     :param group_id: group to fetch members from
+    :param rate_limiter: Optional. Rate limiter shared with concurrent calls. If not given, each response is checked
+    with check_rate_limit()
     :return: Array or group membership information
     """
     member_list: List[Dict] = []
@@ -70,6 +81,8 @@ def get_okta_group_members(api_client: ApiClient, group_id: str) -> List[Dict]:
 
     while True:
         try:
+            if rate_limiter:
+                rate_limiter.wait()
             # https://developer.okta.com/docs/reference/api/groups/#list-group-members
             if next_url:
                 paged_response = api_client.get(next_url)
@@ -84,7 +97,10 @@ def get_okta_group_members(api_client: ApiClient, group_id: str) -> List[Dict]:
 
         member_list.extend(json.loads(paged_response.text))
 
-        check_rate_limit(paged_response)
+        if rate_limiter:
+            rate_limiter.update(paged_response)
+        else:
+            check_rate_limit(paged_response)
 
         if not is_last_page(paged_response):
             next_url = paged_response.links.get("next").get("url")
@@ -94,6 +110,26 @@ def get_okta_group_members(api_client: ApiClient, group_id: str) -> List[Dict]:
     return member_list
 
 
+@timeit
+def get_okta_groups_members(api_client: ApiClient, group_ids: List[str]) -> Dict[str, List[Dict]]:
+    """
+    Get the members of the given groups from Okta server, for OKTA_GROUP_MEMBERS_CONCURRENCY groups at a time. All calls
+    share one rate limiter. The fetch latency of each group is recorded by the timer of get_okta_group_members().
+    :param api_client: Okta api client
+    :param group_ids: groups to fetch members from
+    :return: Dictionary of group id to its array of group membership information
+    """
+    if not group_ids:
+        return {}
+    rate_limiter = OktaRateLimiter()
+    with ThreadPoolExecutor(
+        max_workers=min(OKTA_GROUP_MEMBERS_CONCURRENCY, len(group_ids)),
+        thread_name_prefix='cartography-okta-groups',
+    ) as executor:
+        members = executor.map(lambda group_id: get_okta_group_members(api_client, group_id, rate_limiter), group_ids)
+        return dict(zip(group_ids, members))
+
+
 @timeit
 def transform_okta_group_list(okta_group_list: List[UserGroup]) -> Tuple[List[Dict], List[str]]:
     groups: List[Dict] = []
@@ -217,10 +253,27 @@ def load_okta_group_members(
     :param okta_update_tag: The timestamp value to set our new Neo4j resources with
     :return: Nothing
     """
+    load_okta_groups_members(
+        neo4j_session,
+        [{**member, 'group_id': group_id} for member in member_list],
+        okta_update_tag,
+    )
+
+
+@timeit
+def load_okta_groups_members(
+    neo4j_session: neo4j.Session, membership_list: List[Dict], okta_update_tag: int,
+) -> None:
+    """
+    Add group membership data of many groups into the graph
+    :param neo4j_session: session with the Neo4j server
+    :param membership_list: group members, with the `group_id` of their group
+    :param okta_update_tag: The timestamp value to set our new Neo4j resources with
+    :return: Nothing
+    """
     ingest = """
-    MATCH (group:OktaGroup{id: $GROUP_ID})
-    WITH group
-    UNWIND $MEMBER_LIST as member
+    UNWIND $DictList as member
+        MATCH (group:OktaGroup{id: member.group_id})
         MERGE (user:OktaUser{id: member.id})
         ON CREATE SET user.firstseen = timestamp(),
             user.first_name = member.first_name,
@@ -240,13 +293,8 @@ def load_okta_group_members(
         ON CREATE SET r.firstseen = timestamp()
         SET r.lastupdated = $okta_update_tag
     """
-    logging.info(f'Loading {len(member_list)} members of group {group_id}')
-    neo4j_session.run(
-        ingest,
-        GROUP_ID=group_id,
-        MEMBER_LIST=member_list,
-        okta_update_tag=okta_update_tag,
-    )
+    logger.info(f'Loading {len(membership_list)} okta group memberships')
+    load_graph_data(neo4j_session, ingest, membership_list, okta_update_tag=okta_update_tag)
 
 
 @timeit
@@ -262,12 +310,12 @@ def sync_okta_group_membership(
     :param okta_update_tag: The timestamp value to set our new Neo4j resources with
     :return: Nothing
     """
-
-    for group_info in group_list_info:
-        group_id = group_info["id"]
-        members_data: List[Dict] = get_okta_group_members(api_client, group_id)
-        transformed_member_data: List[Dict] = transform_okta_group_member_list(members_data)
-        load_okta_group_members(neo4j_session, group_id, transformed_member_data, okta_update_tag)
+    members_by_group = get_okta_groups_members(api_client, [group_info["id"] for group_info in group_list_info])
+    membership_list: List[Dict] = []
+    for group_id, members_data in members_by_group.items():
+        for member in transform_okta_group_member_list(members_data):
+            membership_list.append({**member, 'group_id': group_id})
+    load_okta_groups_members(neo4j_session, membership_list, okta_update_tag)
 
 
 @timeit
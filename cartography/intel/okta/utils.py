@@ -1,6 +1,8 @@
 # Okta intel module - utility functions
 import logging
+import threading
 import time
+from typing import Optional
 
 from okta.framework import PagedResults
 from okta.framework.ApiClient import ApiClient
@@ -8,6 +10,9 @@ from requests import Response
 
 logger = logging.getLogger(__name__)
 
+# Fraction of the rate limit under which we wait for the limit to reset
+RATE_LIMIT_THRESHOLD = 0.1
+
 
 def is_last_page(response: PagedResults) -> bool:
     """
@@ -36,27 +41,68 @@ def create_api_client(okta_org: str, path_name: str, api_key: str) -> ApiClient:
     return api_client
 
 
+def _sleep_until_reset(reset_time: int) -> None:
+    sleep_time_seconds = reset_time - int(time.time())
+    if sleep_time_seconds <= 0:
+        # A negative sleep time does not make sense so treat it the same as a 0 sleep time
+        return
+    if sleep_time_seconds > 60:
+        raise ValueError(
+            f"Okta API limit exceeded. Sleep time of {sleep_time_seconds} would exceed one minute. Crashing "
+            f"Okta sync to avoid blocking.",
+        )
+    logger.warning(f"Okta rate limit threshold reached. Waiting {sleep_time_seconds} seconds.")
+    time.sleep(sleep_time_seconds)
+
+
 def check_rate_limit(response: Response) -> None:
     """
     Checks if we are about to hit the rate limit and waits until reset if so
     :param response: server response
     """
-    rate_limit_threshold = 0.1
-
     remaining = response.headers.get('x-rate-limit-remaining')
     limit = response.headers.get('x-rate-limit-limit')
     reset_time = response.headers.get('x-rate-limit-reset')
 
     if remaining and limit and reset_time:
-        if (int(remaining) / int(limit)) < rate_limit_threshold:
-            sleep_time_seconds = int(reset_time) - int(time.time())
-            if sleep_time_seconds <= 0:
-                # A negative sleep time does not make sense so treat it the same as a 0 sleep time
-                return
-            if sleep_time_seconds > 60:
-                raise ValueError(
-                    f"Okta API limit exceeded. Sleep time of {sleep_time_seconds} would exceed one minute. Crashing "
-                    f"Okta sync to avoid blocking.",
-                )
-            logger.warning(f"Okta rate limit threshold reached. Waiting {sleep_time_seconds} seconds.")
-            time.sleep(sleep_time_seconds)
+        if (int(remaining) / int(limit)) < RATE_LIMIT_THRESHOLD:
+            _sleep_until_reset(int(reset_time))
+
+
+class OktaRateLimiter:
+    """
+    Rate limit state of an Okta API endpoint, shared by the threads that call it.
+    The state is updated from the `x-rate-limit-*` headers of every response. Before each call, wait() counts the call
+    against the remaining requests and, as check_rate_limit() does, waits until reset once less than
+    RATE_LIMIT_THRESHOLD of the limit remains.
+    """
+
+    def __init__(self) -> None:
+        self.limit: Optional[int] = None
+        self.remaining: Optional[int] = None
+        self.reset_time: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def update(self, response: Response) -> None:
+        """
+        :param response: server response
+        """
+        remaining = response.headers.get('x-rate-limit-remaining')
+        limit = response.headers.get('x-rate-limit-limit')
+        reset_time = response.headers.get('x-rate-limit-reset')
+        if remaining and limit and reset_time:
+            with self._lock:
+                self.remaining = int(remaining)
+                self.limit = int(limit)
+                self.reset_time = int(reset_time)
+
+    def wait(self) -> None:
+        reset_time = None
+        with self._lock:
+            if self.remaining is not None and self.limit and self.reset_time:
+                if self.remaining / self.limit < RATE_LIMIT_THRESHOLD:
+                    reset_time = self.reset_time
+                else:
+                    self.remaining -= 1
+        if reset_time:
+            _sleep_until_reset(reset_time)
@@ -0,0 +1,68 @@
+from dataclasses import dataclass
+
+from cartography.models.core.common import PropertyRef
+from cartography.models.core.nodes import CartographyNodeProperties
+from cartography.models.core.nodes import CartographyNodeSchema
+from cartography.models.core.relationships import CartographyRelProperties
+from cartography.models.core.relationships import CartographyRelSchema
+from cartography.models.core.relationships import LinkDirection
+from cartography.models.core.relationships import make_target_node_matcher
+from cartography.models.core.relationships import OtherRelationships
+from cartography.models.core.relationships import TargetNodeMatcher
+
+
+@dataclass(frozen=True)
+class GCPNetworkTagNodeProperties(CartographyNodeProperties):
+    id: PropertyRef = PropertyRef('tag_id')
+    tag_id: PropertyRef = PropertyRef('tag_id')
+    value: PropertyRef = PropertyRef('value')
+    lastupdated: PropertyRef = PropertyRef('lastupdated', set_in_kwargs=True)
+
+
+@dataclass(frozen=True)
+class GCPNetworkTagToGCPInstanceRelProperties(CartographyRelProperties):
+    lastupdated: PropertyRef = PropertyRef('lastupdated', set_in_kwargs=True)
+
+
+@dataclass(frozen=True)
+# (:GCPInstance)-[:TAGGED]->(:GCPNetworkTag)
+class GCPNetworkTagToGCPInstance(CartographyRelSchema):
+    target_node_label: str = 'GCPInstance'
+    target_node_matcher: TargetNodeMatcher = make_target_node_matcher(
+        {'id': PropertyRef('instance_partial_uri')},
+    )
+    direction: LinkDirection = LinkDirection.INWARD
+    rel_label: str = "TAGGED"
+    properties: GCPNetworkTagToGCPInstanceRelProperties = GCPNetworkTagToGCPInstanceRelProperties()
+
+
+@dataclass(frozen=True)
+class GCPNetworkTagToGCPVpcRelProperties(CartographyRelProperties):
+    lastupdated: PropertyRef = PropertyRef('lastupdated', set_in_kwargs=True)
+
+
+@dataclass(frozen=True)
+# (:GCPNetworkTag)-[:DEFINED_IN]->(:GCPVpc)
+class GCPNetworkTagToGCPVpc(CartographyRelSchema):
+    target_node_label: str = 'GCPVpc'
+    target_node_matcher: TargetNodeMatcher = make_target_node_matcher(
+        {'id': PropertyRef('vpc_partial_uri')},
+    )
+    direction: LinkDirection = LinkDirection.OUTWARD
+    rel_label: str = "DEFINED_IN"
+    properties: GCPNetworkTagToGCPVpcRelProperties = GCPNetworkTagToGCPVpcRelProperties()
+
+
+@dataclass(frozen=True)
+class GCPNetworkTagSchema(CartographyNodeSchema):
+    """
+    GCP network tag as known by the instances it is set on. A tag is scoped to the VPC of the tagged network interface.
+    """
+    label: str = 'GCPNetworkTag'
+    properties: GCPNetworkTagNodeProperties = GCPNetworkTagNodeProperties()
+    other_relationships: OtherRelationships = OtherRelationships(
+        [
+            GCPNetworkTagToGCPInstance(),
+            GCPNetworkTagToGCPVpc(),
+        ],
+    )
@@ -0,0 +1,57 @@
+from dataclasses import dataclass
+
+from cartography.models.core.common import PropertyRef
+from cartography.models.core.nodes import CartographyNodeProperties
+from cartography.models.core.nodes import CartographyNodeSchema
+from cartography.models.core.relationships import CartographyRelProperties
+from cartography.models.core.relationships import CartographyRelSchema
+from cartography.models.core.relationships import LinkDirection
+from cartography.models.core.relationships import make_target_node_matcher
+from cartography.models.core.relationships import OtherRelationships
+from cartography.models.core.relationships import TargetNodeMatcher
+
+
+@dataclass(frozen=True)
+class GCPNicAccessConfigNodeProperties(CartographyNodeProperties):
+    id: PropertyRef = PropertyRef('access_config_id')
+    access_config_id: PropertyRef = PropertyRef('access_config_id')
+    type: PropertyRef = PropertyRef('type')
+    name: PropertyRef = PropertyRef('name')
+    public_ip: PropertyRef = PropertyRef('natIP')
+    set_public_ptr: PropertyRef = PropertyRef('setPublicPtr')
+    public_ptr_domain_name: PropertyRef = PropertyRef('publicPtrDomainName')
+    network_tier: PropertyRef = PropertyRef('networkTier')
+    lastupdated: PropertyRef = PropertyRef('lastupdated', set_in_kwargs=True)
+
+
+@dataclass(frozen=True)
+class GCPNicAccessConfigToGCPNetworkInterfaceRelProperties(CartographyRelProperties):
+    lastupdated: PropertyRef = PropertyRef('lastupdated', set_in_kwargs=True)
+
+
+@dataclass(frozen=True)
+# (:GCPNetworkInterface)-[:RESOURCE]->(:GCPNicAccessConfig)
+class GCPNicAccessConfigToGCPNetworkInterface(CartographyRelSchema):
+    target_node_label: str = 'GCPNetworkInterface'
+    target_node_matcher: TargetNodeMatcher = make_target_node_matcher(
+        {'id': PropertyRef('nic_id')},
+    )
+    direction: LinkDirection = LinkDirection.INWARD
+    rel_label: str = "RESOURCE"
+    properties: GCPNicAccessConfigToGCPNetworkInterfaceRelProperties = (
+        GCPNicAccessConfigToGCPNetworkInterfaceRelProperties()
+    )
+
+
+@dataclass(frozen=True)
+class GCPNicAccessConfigSchema(CartographyNodeSchema):
+    """
+    GCP doesn't define an id for access configs, so `access_config_id` is made of the NIC id and the access config type.
+    """
+    label: str = 'GCPNicAccessConfig'
+    properties: GCPNicAccessConfigNodeProperties = GCPNicAccessConfigNodeProperties()
+    other_relationships: OtherRelationships = OtherRelationships(
+        [
+            GCPNicAccessConfigToGCPNetworkInterface(),
+        ],
+    )
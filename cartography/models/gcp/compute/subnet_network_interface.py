@@ -0,0 +1,22 @@
+from dataclasses import dataclass
+
+from cartography.models.core.common import PropertyRef
+from cartography.models.core.nodes import CartographyNodeProperties
+from cartography.models.core.nodes import CartographyNodeSchema
+
+
+@dataclass(frozen=True)
+class GCPSubnetNetworkInterfaceNodeProperties(CartographyNodeProperties):
+    id: PropertyRef = PropertyRef('subnet_partial_uri')
+    partial_uri: PropertyRef = PropertyRef('subnet_partial_uri')
+    lastupdated: PropertyRef = PropertyRef('lastupdated', set_in_kwargs=True)
+
+
+@dataclass(frozen=True)
+class GCPSubnetNetworkInterfaceSchema(CartographyNodeSchema):
+    """
+    GCP Subnet as known by the network interfaces of GCP instances. The subnet may belong to another project, e.g. a
+    Shared VPC host project, that cartography has not synced.
+    """
+    label: str = 'GCPSubnet'
+    properties: GCPSubnetNetworkInterfaceNodeProperties = GCPSubnetNetworkInterfaceNodeProperties()
@@ -8,7 +8,6 @@ from typing import Tuple
 from typing import Union
 
 import neo4j.exceptions
-from neo4j import GraphDatabase
 from statsd import StatsClient
 
 import cartography.intel.analysis
@@ -32,6 +31,7 @@ import cartography.intel.semgrep
 import cartography.intel.snipeit
 from cartography.config import Config
 from cartography.stats import set_stats_client
+from cartography.util import build_neo4j_driver
 from cartography.util import STATUS_FAILURE
 from cartography.util import STATUS_SUCCESS
 
@@ -148,11 +148,7 @@ def run_with_config(sync: Sync, config: Union[Config, argparse.Namespace]) -> in
     if config.neo4j_user or config.neo4j_password:
         neo4j_auth = (config.neo4j_user, config.neo4j_password)
     try:
-        neo4j_driver = GraphDatabase.driver(
-            config.neo4j_uri,
-            auth=neo4j_auth,
-            max_connection_lifetime=config.neo4j_max_connection_lifetime,
-        )
+        neo4j_driver = build_neo4j_driver(config)
     except neo4j.exceptions.ServiceUnavailable as e:
         logger.debug("Error occurred during Neo4j connect.", exc_info=True)
         logger.error(
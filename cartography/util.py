@@ -68,12 +68,46 @@ def run_analysis_job(
     )
 
 
+def load_analysis_job(
+    filename: str,
+    common_job_parameters: Dict,
+    package: str = 'cartography.data.jobs.analysis',
+) -> GraphJob:
+    """
+    Loads the analysis job `filename` from the given Python `package` directory, with its parameters set, so that it
+    can be run later, e.g. by cartography.graph.jobscheduler.run_jobs().
+    """
+    job = GraphJob.from_json(read_text(package, filename), get_job_shortname(filename))
+    job.merge_parameters(common_job_parameters)
+    return job
+
+
+def analysis_job_deps_met(
+        analysis_job_name: str,
+        resource_dependencies: Set[str],
+        requested_syncs: Set[str],
+) -> bool:
+    """
+    Returns whether the given set of resource dependencies of the analysis job was included in the requested_syncs,
+    and logs why the job will not run if it was not.
+    """
+    if not resource_dependencies.issubset(requested_syncs):
+        logger.info(
+            f"Did not run {analysis_job_name} because it needs {resource_dependencies} to be included "
+            f"as a requested sync. You specified: {requested_syncs}. If you want this job to run, please change your "
+            f"CLI args/cartography config so that all required resources are included.",
+        )
+        return False
+    return True
+
+
 def run_analysis_and_ensure_deps(
         analysis_job_name: str,
         resource_dependencies: Set[str],
         requested_syncs: Set[str],
         common_job_parameters: Dict[str, Any],
         neo4j_session: neo4j.Session,
+        package: str = 'cartography.data.jobs.analysis',
 ) -> None:
     """
     Runs analysis job only if the given set of resource dependencies was included in the requested_syncs.
@@ -83,19 +117,17 @@ def run_analysis_and_ensure_deps(
     :param requested_syncs: The value passed to cartography.config requested syncs as a set of strings.
     :param common_job_parameters: The common job params dict used in cartography.
     :param neo4j_session: The neo4j session object.
+    :param package: The Python package containing the job, e.g. "cartography.data.jobs.scoped_analysis" for jobs
+    scoped to a single sub resource.
     """
-    if not resource_dependencies.issubset(requested_syncs):
-        logger.info(
-            f"Did not run {analysis_job_name} because it needs {resource_dependencies} to be included "
-            f"as a requested sync. You specified: {requested_syncs}. If you want this job to run, please change your "
-            f"CLI args/cartography config so that all required resources are included.",
-        )
+    if not analysis_job_deps_met(analysis_job_name, resource_dependencies, requested_syncs):
         return
 
     run_analysis_job(
         analysis_job_name,
         neo4j_session,
         common_job_parameters,
+        package,
     )
 
 
@@ -168,6 +200,24 @@ def merge_module_sync_metadata(
     stat_handler.incr(f'{group_type}_{group_id}_{synced_type}_lastupdated', update_tag)
 
 
+def build_neo4j_driver(config: Any) -> neo4j.Driver:
+    """
+    Creates a new Neo4j driver from the connection settings of a cartography config object.
+    Intel modules that run work concurrently use this to give each worker its own session, since neo4j sessions are
+    not thread safe.
+    :param config: A cartography.config.Config or the equivalent argparse.Namespace
+    :return: A neo4j driver. The caller is responsible for closing it.
+    """
+    neo4j_auth = None
+    if config.neo4j_user or config.neo4j_password:
+        neo4j_auth = (config.neo4j_user, config.neo4j_password)
+    return neo4j.GraphDatabase.driver(
+        config.neo4j_uri,
+        auth=neo4j_auth,
+        max_connection_lifetime=config.neo4j_max_connection_lifetime,
+    )
+
+
 def load_resource_binary(package: str, resource_name: str) -> BinaryIO:
     return open_binary(package, resource_name)
 
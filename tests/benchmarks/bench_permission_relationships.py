@@ -0,0 +1,59 @@
+"""
+Compares the reference and the indexed permission relationship engines on synthetic accounts.
+
+Usage: python -m tests.benchmarks.bench_permission_relationships [--principals N] [--resources N] [--seed N]
+"""
+import argparse
+import time
+from typing import Callable
+from typing import Dict
+from typing import List
+
+from cartography.intel.aws import permission_relationships
+from tests.data.aws.permission_relationships import build_synthetic_account
+from tests.data.aws.permission_relationships import PERMISSION_SETS
+
+
+def _time(func: Callable[[], List[Dict]]) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--principals', type=int, nargs='+', default=[100, 300])
+    parser.add_argument('--resources', type=int, nargs='+', default=[200, 1000])
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'principals':>10} {'resources':>10} {'reference (s)':>14} {'indexed (s)':>12} {'speedup':>8}")
+    for num_principals in args.principals:
+        for num_resources in args.resources:
+            principals, resource_arns = build_synthetic_account(num_principals, num_resources, seed=args.seed)
+            reference = 0.0
+            indexed = 0.0
+            # Build the index once per account, as `permission_relationships.sync` does.
+            start = time.perf_counter()
+            index = permission_relationships.PrincipalPolicyIndex(principals)
+            indexed += time.perf_counter() - start
+            for permissions in PERMISSION_SETS:
+                expected = permission_relationships.calculate_permission_relationships(
+                    principals, resource_arns, permissions,
+                )
+                actual = index.calculate_permission_relationships(resource_arns, permissions)
+                assert actual == expected, f'Engines disagree for {permissions}'
+                reference += _time(
+                    lambda: permission_relationships.calculate_permission_relationships(
+                        principals, resource_arns, permissions,
+                    ),
+                )
+                indexed += _time(lambda: index.calculate_permission_relationships(resource_arns, permissions))
+            print(
+                f'{num_principals:>10} {num_resources:>10} {reference:>14.3f} {indexed:>12.3f} '
+                f'{reference / indexed:>7.1f}x',
+            )
+
+
+if __name__ == '__main__':
+    main()
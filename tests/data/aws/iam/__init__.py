@@ -187,3 +187,190 @@ INSTACE = {
         },
     ],
 }
+
+GET_GROUP_MEMBERSHIPS = {
+    "arn:aws:iam::000000000000:group/example-group-0": {
+        "Users": [
+            {"UserName": "example-user-0", "Arn": "arn:aws:iam::000000000000:user/example-user-0"},
+            {"UserName": "example-user-1", "Arn": "arn:aws:iam::000000000000:user/example-user-1"},
+        ],
+    },
+    "arn:aws:iam::000000000000:group/example-group-1": {
+        "Users": [
+            {"UserName": "example-user-0", "Arn": "arn:aws:iam::000000000000:user/example-user-0"},
+        ],
+    },
+}
+
+LIST_ACCESS_KEYS = {
+    "arn:aws:iam::000000000000:user/example-user-0": {
+        "AccessKeyMetadata": [
+            {
+                "UserName": "example-user-0",
+                "AccessKeyId": "AKIA00000000000000000",
+                "Status": "Active",
+                "CreateDate": datetime.datetime(2019, 1, 1, 0, 0, 1),
+                "LastUsedDate": datetime.datetime(2019, 2, 1, 0, 0, 1),
+                "LastUsedService": "s3",
+                "LastUsedRegion": "us-east-1",
+            },
+            {
+                "UserName": "example-user-0",
+                "AccessKeyId": "AKIA00000000000000001",
+                "Status": "Inactive",
+                "CreateDate": datetime.datetime(2019, 1, 1, 0, 0, 1),
+                "LastUsedDate": None,
+                "LastUsedService": "N/A",
+                "LastUsedRegion": "N/A",
+            },
+        ],
+    },
+    "arn:aws:iam::000000000000:user/example-user-1": {
+        "AccessKeyMetadata": [],
+    },
+}
+
+# Trimmed GetAccountAuthorizationDetails response describing the users, groups and roles above.
+GET_ACCOUNT_AUTHORIZATION_DETAILS = {
+    "UserDetailList": [
+        {
+            "Path": "/",
+            "UserName": "example-user-0",
+            "UserId": "AIDA00000000000000000",
+            "Arn": "arn:aws:iam::000000000000:user/example-user-0",
+            "CreateDate": datetime.datetime(2019, 1, 1, 0, 0, 1),
+            "UserPolicyList": [
+                {
+                    "PolicyName": "user-inline-0",
+                    "PolicyDocument": {
+                        "Version": "2012-10-17",
+                        "Statement": [
+                            {"Effect": "Allow", "Action": "s3:GetObject", "Resource": "arn:aws:s3:::bucket-0/*"},
+                        ],
+                    },
+                },
+            ],
+            "GroupList": ["example-group-0", "example-group-1"],
+            "AttachedManagedPolicies": [
+                {
+                    "PolicyName": "ReadOnlyAccess",
+                    "PolicyArn": "arn:aws:iam::aws:policy/ReadOnlyAccess",
+                },
+            ],
+            "Tags": [],
+        },
+        {
+            "Path": "/",
+            "UserName": "example-user-1",
+            "UserId": "AIDA00000000000000001",
+            "Arn": "arn:aws:iam::000000000000:user/example-user-1",
+            "CreateDate": datetime.datetime(2019, 1, 1, 0, 0, 1),
+            "GroupList": ["example-group-0"],
+            "AttachedManagedPolicies": [],
+        },
+    ],
+    "GroupDetailList": [
+        {
+            "Path": "/",
+            "GroupName": "example-group-0",
+            "GroupId": "AGPA000000000000000000",
+            "Arn": "arn:aws:iam::000000000000:group/example-group-0",
+            "CreateDate": datetime.datetime(2019, 1, 1, 0, 0, 1),
+            "GroupPolicyList": [],
+            "AttachedManagedPolicies": [
+                {
+                    "PolicyName": "example-local-policy",
+                    "PolicyArn": "arn:aws:iam::000000000000:policy/example-local-policy",
+                },
+            ],
+        },
+        {
+            "Path": "/",
+            "GroupName": "example-group-1",
+            "GroupId": "AGPA000000000000000001",
+            "Arn": "arn:aws:iam::000000000000:group/example-group-1",
+            "CreateDate": datetime.datetime(2019, 1, 1, 0, 0, 1),
+            "GroupPolicyList": [
+                {
+                    "PolicyName": "group-inline-1",
+                    "PolicyDocument": {
+                        "Version": "2012-10-17",
+                        "Statement": {"Effect": "Allow", "Action": "sqs:*", "Resource": "*"},
+                    },
+                },
+            ],
+            "AttachedManagedPolicies": [],
+        },
+    ],
+    "RoleDetailList": [
+        {
+            **role,
+            "InstanceProfileList": [],
+            "RolePolicyList": [
+                {
+                    "PolicyName": f"role-inline-{i}",
+                    "PolicyDocument": {
+                        "Version": "2012-10-17",
+                        "Statement": [{"Effect": "Allow", "Action": "*", "Resource": "*"}],
+                    },
+                },
+            ] if i == 0 else [],
+            "AttachedManagedPolicies": [
+                {
+                    "PolicyName": "example-local-policy",
+                    "PolicyArn": "arn:aws:iam::000000000000:policy/example-local-policy",
+                },
+            ] if i == 1 else [],
+            "Tags": [{"Key": "team", "Value": f"team-{i}"}] if i < 2 else [],
+        }
+        for i, role in enumerate(LIST_ROLES["Roles"])
+    ],
+    "Policies": [
+        {
+            "PolicyName": "example-local-policy",
+            "PolicyId": "ANPA000000000000000000",
+            "Arn": "arn:aws:iam::000000000000:policy/example-local-policy",
+            "Path": "/",
+            "DefaultVersionId": "v2",
+            "AttachmentCount": 2,
+            "IsAttachable": True,
+            "PolicyVersionList": [
+                {
+                    "Document": {
+                        "Version": "2012-10-17",
+                        "Statement": [{"Effect": "Allow", "Action": "ec2:Describe*", "Resource": "*"}],
+                    },
+                    "VersionId": "v1",
+                    "IsDefaultVersion": False,
+                },
+                {
+                    "Document": {
+                        "Version": "2012-10-17",
+                        "Statement": [{"Effect": "Allow", "Action": ["ec2:Describe*", "s3:List*"], "Resource": "*"}],
+                    },
+                    "VersionId": "v2",
+                    "IsDefaultVersion": True,
+                },
+            ],
+        },
+        {
+            "PolicyName": "ReadOnlyAccess",
+            "PolicyId": "ANPA000000000000000001",
+            "Arn": "arn:aws:iam::aws:policy/ReadOnlyAccess",
+            "Path": "/",
+            "DefaultVersionId": "v1",
+            "AttachmentCount": 1,
+            "IsAttachable": True,
+            "PolicyVersionList": [
+                {
+                    "Document": {
+                        "Version": "2012-10-17",
+                        "Statement": [{"Effect": "Allow", "Action": "*:Get*", "Resource": "*"}],
+                    },
+                    "VersionId": "v1",
+                    "IsDefaultVersion": True,
+                },
+            ],
+        },
+    ],
+}
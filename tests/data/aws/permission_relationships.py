@@ -0,0 +1,118 @@
+"""
+Synthetic AWS accounts for comparing the permission relationship evaluation engines, see
+tests/unit/cartography/intel/aws/test_permission_relationships.py and
+tests/benchmarks/bench_permission_relationships.py.
+"""
+import random
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Tuple
+
+ACCOUNT_ID = '000000000000'
+
+SERVICES = ['s3', 'dynamodb', 'redshift', 'ec2', 'iam', 'sqs']
+
+ACTIONS = [
+    '*',
+    's3:*',
+    's3:Get*',
+    's3:GetObject',
+    'S3:getobject',
+    's3:?etObject',
+    's3:Put*',
+    's3:PutObject',
+    's3:List*',
+    'dynamodb:*',
+    'dynamodb:GetItem',
+    'dynamodb:Query',
+    'dynamodb:Batch*',
+    'redshift:*',
+    'redshift:GetClusterCredentials',
+    'ec2:Describe*',
+    'iam:PassRole',
+    'sqs:SendMessage',
+    's3.*',
+]
+
+PERMISSION_SETS = [
+    ['S3:GetObject'],
+    ['S3:PutObject'],
+    ['dynamodb:BatchGetItem', 'dynamodb:GetItem', 'dynamodb:GetRecords', 'dynamodb:Query'],
+    ['redshift:*', 'redshift:CreateClusterUser', 'redshift:GetClusterCredentials', 'redshift:JoinGroup'],
+]
+
+
+def _bucket_arn(i: int) -> str:
+    return f'arn:aws:s3:::team-{i % 17}-bucket-{i}'
+
+
+def _table_arn(i: int) -> str:
+    return f'arn:aws:dynamodb:us-east-1:{ACCOUNT_ID}:table/Table{i}'
+
+
+def _cluster_arn(i: int) -> str:
+    return f'arn:aws:redshift:us-east-1:{ACCOUNT_ID}:cluster:cluster-{i}'
+
+
+def _resource_clause(rng: random.Random, num_resources: int) -> str:
+    i = rng.randrange(num_resources)
+    return rng.choice([
+        '*',
+        _bucket_arn(i),
+        _bucket_arn(i).upper(),
+        f'arn:aws:s3:::team-{i % 17}-*',
+        f'arn:aws:s3:::team-{i % 17}-bucket-{i}/*',
+        'arn:aws:s3:::team-?-bucket-*',
+        f'arn:aws:s3:::*-bucket-{i}',
+        'arn:aws:s3:::*',
+        _table_arn(i),
+        f'arn:aws:dynamodb:us-east-1:{ACCOUNT_ID}:table/Table{i % 10}*',
+        f'arn:aws:dynamodb:*:{ACCOUNT_ID}:table/*',
+        _cluster_arn(i),
+        f'arn:aws:redshift:us-east-1:{ACCOUNT_ID}:cluster:*',
+        'arn:aws:s3:::team-1[0-5]-bucket-*',
+        'arn:aws:s3:::team-(1|2)-bucket-*',
+    ])
+
+
+def _statement(rng: random.Random, num_resources: int) -> Dict[str, Any]:
+    statement: Dict[str, Any] = {'effect': 'Deny' if rng.random() < 0.15 else 'Allow'}
+    if rng.random() < 0.1:
+        statement['notaction'] = rng.sample(ACTIONS, rng.randint(1, 2))
+    else:
+        statement['action'] = rng.sample(ACTIONS, rng.randint(1, 3))
+    if rng.random() < 0.05:
+        # No resource clause at all, like a malformed or trust policy statement
+        return statement
+    statement['resource'] = [_resource_clause(rng, num_resources) for _ in range(rng.randint(1, 3))]
+    if rng.random() < 0.1:
+        statement['notresource'] = [_resource_clause(rng, num_resources)]
+    return statement
+
+
+def build_synthetic_account(
+    num_principals: int,
+    num_resources: int,
+    policies_per_principal: int = 3,
+    statements_per_policy: int = 3,
+    seed: int = 0,
+) -> Tuple[Dict[str, Dict[str, List[Dict[str, Any]]]], List[str]]:
+    """
+    Returns (principals, resource_arns) in the shapes consumed by
+    `cartography.intel.aws.permission_relationships.calculate_permission_relationships`.
+    """
+    rng = random.Random(seed)
+    principals: Dict[str, Dict[str, List[Dict[str, Any]]]] = {}
+    for p in range(num_principals):
+        principal_arn = f'arn:aws:iam::{ACCOUNT_ID}:role/role-{p}'
+        principals[principal_arn] = {
+            f'{principal_arn}/inline_policy/policy-{i}': [
+                _statement(rng, num_resources) for _ in range(rng.randint(1, statements_per_policy))
+            ]
+            for i in range(rng.randint(1, policies_per_principal))
+        }
+    resource_arns: List[str] = []
+    for i in range(num_resources):
+        resource_arns.append(rng.choice([_bucket_arn, _table_arn, _cluster_arn])(i))
+    return principals, resource_arns
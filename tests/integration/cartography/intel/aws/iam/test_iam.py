@@ -1,3 +1,4 @@
+import copy
 from unittest import mock
 
 import cartography.intel.aws.iam
@@ -7,6 +8,7 @@ from cartography.cli import CLI
 from cartography.config import Config
 from cartography.sync import build_default_sync
 from tests.integration.util import check_nodes
+from tests.integration.util import check_rels
 
 TEST_ACCOUNT_ID = '000000000000'
 TEST_REGION = 'us-east-1'
@@ -198,3 +200,93 @@ def test_map_permissions(neo4j_session):
     assert results
     for result in results:
         assert result["rel_count"] == 1
+
+
+@mock.patch.object(cartography.intel.aws.iam, 'get_user_list_data', return_value=tests.data.aws.iam.LIST_USERS)
+@mock.patch.object(cartography.intel.aws.iam, 'get_account_authorization_details')
+def test_sync_principals_from_authorization_details(mock_get_details, mock_get_users, neo4j_session):
+    # Arrange
+    mock_get_details.return_value = copy.deepcopy(tests.data.aws.iam.GET_ACCOUNT_AUTHORIZATION_DETAILS)
+    _create_base_account(neo4j_session)
+
+    # Act
+    cartography.intel.aws.iam.sync_principals_from_authorization_details(
+        neo4j_session,
+        mock.MagicMock(),
+        TEST_ACCOUNT_ID,
+        TEST_UPDATE_TAG,
+        {'UPDATE_TAG': TEST_UPDATE_TAG, 'AWS_ID': TEST_ACCOUNT_ID},
+    )
+
+    # Assert
+    assert check_nodes(neo4j_session, 'AWSUser', ['arn', 'passwordlastused']) == {
+        ('arn:aws:iam::000000000000:user/example-user-0', '2019-01-01 00:00:01'),
+        ('arn:aws:iam::000000000000:user/example-user-1', '2019-01-01 00:00:01'),
+    }
+    # Earlier tests in this module also attach policies to these principals.
+    assert check_rels(
+        neo4j_session, 'AWSPrincipal', 'arn', 'AWSPolicy', 'id', 'POLICY',
+    ) >= {
+        (
+            'arn:aws:iam::000000000000:user/example-user-0',
+            'arn:aws:iam::000000000000:user/example-user-0/inline_policy/user-inline-0',
+        ),
+        ('arn:aws:iam::000000000000:user/example-user-0', 'arn:aws:iam::aws:policy/ReadOnlyAccess'),
+        ('arn:aws:iam::000000000000:group/example-group-0', 'arn:aws:iam::000000000000:policy/example-local-policy'),
+        (
+            'arn:aws:iam::000000000000:group/example-group-1',
+            'arn:aws:iam::000000000000:group/example-group-1/inline_policy/group-inline-1',
+        ),
+        (
+            'arn:aws:iam::000000000000:role/example-role-0',
+            'arn:aws:iam::000000000000:role/example-role-0/inline_policy/role-inline-0',
+        ),
+        ('arn:aws:iam::000000000000:role/example-role-1', 'arn:aws:iam::000000000000:policy/example-local-policy'),
+        # Group members inherit the group's policies
+        ('arn:aws:iam::000000000000:user/example-user-0', 'arn:aws:iam::000000000000:policy/example-local-policy'),
+        ('arn:aws:iam::000000000000:user/example-user-1', 'arn:aws:iam::000000000000:policy/example-local-policy'),
+        (
+            'arn:aws:iam::000000000000:user/example-user-0',
+            'arn:aws:iam::000000000000:group/example-group-1/inline_policy/group-inline-1',
+        ),
+    }
+    assert check_rels(
+        neo4j_session, 'AWSUser', 'arn', 'AWSGroup', 'arn', 'MEMBER_AWS_GROUP',
+    ) == {
+        ('arn:aws:iam::000000000000:user/example-user-0', 'arn:aws:iam::000000000000:group/example-group-0'),
+        ('arn:aws:iam::000000000000:user/example-user-0', 'arn:aws:iam::000000000000:group/example-group-1'),
+        ('arn:aws:iam::000000000000:user/example-user-1', 'arn:aws:iam::000000000000:group/example-group-0'),
+    }
+
+
+def test_sync_assumerole_relationships(neo4j_session):
+    # Arrange: example-role-1 trusts example-role-0, whose policy allows it to assume example-role-1
+    _create_base_account(neo4j_session)
+    cartography.intel.aws.iam.load_roles(
+        neo4j_session, tests.data.aws.iam.LIST_ROLES['Roles'], TEST_ACCOUNT_ID, TEST_UPDATE_TAG,
+    )
+    policy_data = {
+        'arn:aws:iam::000000000000:role/example-role-0': {
+            'assume-role-1': [{
+                'Effect': 'Allow',
+                'Action': 'sts:AssumeRole',
+                'Resource': 'arn:aws:iam::000000000000:role/example-role-*',
+            }],
+        },
+    }
+    cartography.intel.aws.iam.transform_policy_data(policy_data, cartography.intel.aws.iam.PolicyType.inline.value)
+    cartography.intel.aws.iam.load_policy_data(
+        neo4j_session, policy_data, cartography.intel.aws.iam.PolicyType.inline.value, TEST_UPDATE_TAG,
+    )
+
+    # Act
+    cartography.intel.aws.iam.sync_assumerole_relationships(
+        neo4j_session, TEST_ACCOUNT_ID, TEST_UPDATE_TAG, {'UPDATE_TAG': TEST_UPDATE_TAG, 'AWS_ID': TEST_ACCOUNT_ID},
+    )
+
+    # Assert
+    assert check_rels(
+        neo4j_session, 'AWSPrincipal', 'arn', 'AWSRole', 'arn', 'STS_ASSUMEROLE_ALLOW',
+    ) == {
+        ('arn:aws:iam::000000000000:role/example-role-0', 'arn:aws:iam::000000000000:role/example-role-1'),
+    }
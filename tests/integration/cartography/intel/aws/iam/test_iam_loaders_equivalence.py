@@ -0,0 +1,260 @@
+"""
+Checks that the batched `UNWIND` IAM loaders write exactly the same graph as the original loaders, which issued one
+query per user, group, role, trust policy principal, group membership and access key. The original queries are kept
+below verbatim as the reference.
+"""
+import cartography.intel.aws.iam
+import tests.data.aws.iam
+
+TEST_ACCOUNT_ID = '000000000000'
+TEST_UPDATE_TAG = 123456789
+
+LEGACY_INGEST_USER = """
+MERGE (unode:AWSUser{arn: $ARN})
+ON CREATE SET unode:AWSPrincipal, unode.userid = $USERID, unode.firstseen = timestamp(),
+unode.createdate = $CREATE_DATE
+SET unode.name = $USERNAME, unode.path = $PATH, unode.passwordlastused = $PASSWORD_LASTUSED,
+unode.lastupdated = $aws_update_tag
+WITH unode
+MATCH (aa:AWSAccount{id: $AWS_ACCOUNT_ID})
+MERGE (aa)-[r:RESOURCE]->(unode)
+ON CREATE SET r.firstseen = timestamp()
+SET r.lastupdated = $aws_update_tag
+"""
+
+LEGACY_INGEST_GROUP = """
+MERGE (gnode:AWSGroup{arn: $ARN})
+ON CREATE SET gnode.groupid = $GROUP_ID, gnode.firstseen = timestamp(), gnode.createdate = $CREATE_DATE
+SET gnode:AWSPrincipal, gnode.name = $GROUP_NAME, gnode.path = $PATH,gnode.lastupdated = $aws_update_tag
+WITH gnode
+MATCH (aa:AWSAccount{id: $AWS_ACCOUNT_ID})
+MERGE (aa)-[r:RESOURCE]->(gnode)
+ON CREATE SET r.firstseen = timestamp()
+SET r.lastupdated = $aws_update_tag
+"""
+
+LEGACY_INGEST_ROLE = """
+MERGE (rnode:AWSPrincipal{arn: $Arn})
+ON CREATE SET rnode.firstseen = timestamp()
+SET
+    rnode:AWSRole,
+    rnode.roleid = $RoleId,
+    rnode.createdate = $CreateDate,
+    rnode.name = $RoleName,
+    rnode.path = $Path,
+    rnode.lastupdated = $aws_update_tag
+WITH rnode
+MATCH (aa:AWSAccount{id: $AWS_ACCOUNT_ID})
+MERGE (aa)-[r:RESOURCE]->(rnode)
+ON CREATE SET r.firstseen = timestamp()
+SET r.lastupdated = $aws_update_tag
+"""
+
+LEGACY_INGEST_TRUST = """
+MERGE (spnnode:AWSPrincipal{arn: $SpnArn})
+ON CREATE SET spnnode.firstseen = timestamp()
+SET spnnode.lastupdated = $aws_update_tag, spnnode.type = $SpnType
+WITH spnnode
+MATCH (role:AWSRole{arn: $RoleArn})
+MERGE (role)-[r:TRUSTS_AWS_PRINCIPAL]->(spnnode)
+ON CREATE SET r.firstseen = timestamp()
+SET r.lastupdated = $aws_update_tag
+"""
+
+LEGACY_INGEST_SPNMAP = """
+MERGE (aa:AWSAccount{id: $SpnAccountId})
+ON CREATE SET aa.firstseen = timestamp()
+SET aa.lastupdated = $aws_update_tag
+WITH aa
+MATCH (spnnode:AWSPrincipal{arn: $SpnArn})
+WITH spnnode, aa
+MERGE (aa)-[r:RESOURCE]->(spnnode)
+ON CREATE SET r.firstseen = timestamp()
+"""
+
+LEGACY_INGEST_MEMBERSHIP = """
+MATCH (group:AWSGroup{arn: $GroupArn})
+WITH group
+MATCH (user:AWSUser{arn: $PrincipalArn})
+MERGE (user)-[r:MEMBER_AWS_GROUP]->(group)
+ON CREATE SET r.firstseen = timestamp()
+SET r.lastupdated = $aws_update_tag
+WITH user, group
+MATCH (group)-[:POLICY]->(policy:AWSPolicy)
+MERGE (user)-[r2:POLICY]->(policy)
+SET r2.lastupdated = $aws_update_tag
+"""
+
+LEGACY_INGEST_ACCESS_KEY = """
+MATCH (user:AWSUser{arn: $UserARN})
+WITH user
+MERGE (key:AccountAccessKey{accesskeyid: $AccessKeyId})
+ON CREATE SET key.firstseen = timestamp(), key.createdate = $CreateDate
+SET key.status = $Status,
+    key.lastupdated = $aws_update_tag,
+    key.lastuseddate = $LastUsedDate,
+    key.lastusedservice = $LastUsedService,
+    key.lastusedregion = $LastUsedRegion
+WITH user,key
+MERGE (user)-[r:AWS_ACCESS_KEY]->(key)
+ON CREATE SET r.firstseen = timestamp()
+SET r.lastupdated = $aws_update_tag
+"""
+
+
+def _legacy_load(neo4j_session):
+    for user in tests.data.aws.iam.LIST_USERS['Users']:
+        neo4j_session.run(
+            LEGACY_INGEST_USER,
+            ARN=user["Arn"],
+            USERID=user["UserId"],
+            CREATE_DATE=str(user["CreateDate"]),
+            USERNAME=user["UserName"],
+            PATH=user["Path"],
+            PASSWORD_LASTUSED=str(user.get("PasswordLastUsed", "")),
+            AWS_ACCOUNT_ID=TEST_ACCOUNT_ID,
+            aws_update_tag=TEST_UPDATE_TAG,
+        )
+    for group in tests.data.aws.iam.LIST_GROUPS['Groups']:
+        neo4j_session.run(
+            LEGACY_INGEST_GROUP,
+            ARN=group["Arn"],
+            GROUP_ID=group["GroupId"],
+            CREATE_DATE=str(group["CreateDate"]),
+            GROUP_NAME=group["GroupName"],
+            PATH=group["Path"],
+            AWS_ACCOUNT_ID=TEST_ACCOUNT_ID,
+            aws_update_tag=TEST_UPDATE_TAG,
+        )
+    for role in tests.data.aws.iam.LIST_ROLES['Roles'] + tests.data.aws.iam.INSTACE['Roles']:
+        neo4j_session.run(
+            LEGACY_INGEST_ROLE,
+            Arn=role["Arn"],
+            RoleId=role["RoleId"],
+            CreateDate=str(role["CreateDate"]),
+            RoleName=role["RoleName"],
+            Path=role["Path"],
+            AWS_ACCOUNT_ID=TEST_ACCOUNT_ID,
+            aws_update_tag=TEST_UPDATE_TAG,
+        )
+        for statement in role["AssumeRolePolicyDocument"]["Statement"]:
+            for principal_type, principal_value in cartography.intel.aws.iam._parse_principal_entries(
+                statement["Principal"],
+            ):
+                neo4j_session.run(
+                    LEGACY_INGEST_TRUST,
+                    SpnArn=principal_value,
+                    SpnType=principal_type,
+                    RoleArn=role['Arn'],
+                    aws_update_tag=TEST_UPDATE_TAG,
+                )
+                if cartography.intel.aws.iam.get_account_from_arn(principal_value):
+                    neo4j_session.run(
+                        LEGACY_INGEST_SPNMAP,
+                        SpnArn=principal_value,
+                        SpnAccountId=cartography.intel.aws.iam.get_account_from_arn(principal_value),
+                        aws_update_tag=TEST_UPDATE_TAG,
+                    )
+    for group_arn, membership_data in tests.data.aws.iam.GET_GROUP_MEMBERSHIPS.items():
+        for info in membership_data.get("Users", []):
+            neo4j_session.run(
+                LEGACY_INGEST_MEMBERSHIP,
+                GroupArn=group_arn,
+                PrincipalArn=info["Arn"],
+                aws_update_tag=TEST_UPDATE_TAG,
+            )
+    for arn, access_keys in tests.data.aws.iam.LIST_ACCESS_KEYS.items():
+        for key in access_keys["AccessKeyMetadata"]:
+            if key.get('AccessKeyId'):
+                neo4j_session.run(
+                    LEGACY_INGEST_ACCESS_KEY,
+                    UserARN=arn,
+                    AccessKeyId=key['AccessKeyId'],
+                    CreateDate=str(key['CreateDate']),
+                    Status=key['Status'],
+                    LastUsedDate=key['LastUsedDate'],
+                    LastUsedService=key['LastUsedService'],
+                    LastUsedRegion=key['LastUsedRegion'],
+                    aws_update_tag=TEST_UPDATE_TAG,
+                )
+
+
+def _batched_load(neo4j_session):
+    cartography.intel.aws.iam.load_users(
+        neo4j_session, tests.data.aws.iam.LIST_USERS['Users'], TEST_ACCOUNT_ID, TEST_UPDATE_TAG,
+    )
+    cartography.intel.aws.iam.load_groups(
+        neo4j_session, tests.data.aws.iam.LIST_GROUPS['Groups'], TEST_ACCOUNT_ID, TEST_UPDATE_TAG,
+    )
+    cartography.intel.aws.iam.load_roles(
+        neo4j_session,
+        tests.data.aws.iam.LIST_ROLES['Roles'] + tests.data.aws.iam.INSTACE['Roles'],
+        TEST_ACCOUNT_ID,
+        TEST_UPDATE_TAG,
+    )
+    cartography.intel.aws.iam.load_group_memberships(
+        neo4j_session, tests.data.aws.iam.GET_GROUP_MEMBERSHIPS, TEST_UPDATE_TAG,
+    )
+    cartography.intel.aws.iam.load_user_access_keys(
+        neo4j_session, tests.data.aws.iam.LIST_ACCESS_KEYS, TEST_UPDATE_TAG,
+    )
+
+
+def _snapshot_graph(neo4j_session):
+    """
+    Returns every node and relationship in the graph, ignoring `firstseen` since it holds the load time.
+    """
+    nodes = neo4j_session.run(
+        """
+        MATCH (n)
+        RETURN labels(n) AS labels, properties(n) AS props
+        """,
+    ).data()
+    rels = neo4j_session.run(
+        """
+        MATCH (a)-[r]->(b)
+        RETURN properties(a) AS a_props, type(r) AS type, properties(r) AS props, properties(b) AS b_props
+        """,
+    ).data()
+
+    def _strip(props):
+        return tuple(sorted((k, str(v)) for k, v in props.items() if k != 'firstseen'))
+
+    return (
+        sorted((tuple(sorted(n['labels'])), _strip(n['props'])) for n in nodes),
+        sorted((_strip(r['a_props']), r['type'], _strip(r['props']), _strip(r['b_props'])) for r in rels),
+    )
+
+
+def _reset_graph(neo4j_session):
+    neo4j_session.run("MATCH (n) DETACH DELETE n;")
+    neo4j_session.run(
+        """
+        MERGE (a:AWSAccount{id: $AccountId})
+        WITH a
+        MERGE (a)-[:RESOURCE]->(p:AWSPolicy{id: 'example-group-0-policy'})
+        WITH p
+        MERGE (g:AWSGroup:AWSPrincipal{arn: 'arn:aws:iam::000000000000:group/example-group-0'})
+        MERGE (g)-[:POLICY]->(p)
+        """,
+        AccountId=TEST_ACCOUNT_ID,
+    )
+
+
+def test_batched_iam_loaders_write_the_same_graph_as_per_item_loaders(neo4j_session):
+    # Arrange: a graph with the account and a group policy, so that memberships also draw user POLICY rels
+    _reset_graph(neo4j_session)
+    _legacy_load(neo4j_session)
+    expected = _snapshot_graph(neo4j_session)
+    _reset_graph(neo4j_session)
+
+    # Act
+    _batched_load(neo4j_session)
+
+    # Assert
+    assert _snapshot_graph(neo4j_session) == expected
+    assert len(expected[0]) > 0 and len(expected[1]) > 0
+
+    # Loading again with the same update tag must be idempotent, as it was before.
+    _batched_load(neo4j_session)
+    assert _snapshot_graph(neo4j_session) == expected
@@ -1,3 +1,4 @@
+import asyncio
 import inspect
 from typing import Any
 from typing import Callable
@@ -6,6 +7,7 @@ from typing import List
 from unittest import mock
 
 import neo4j
+import pytest
 from pytest import raises
 
 import cartography.config
@@ -78,6 +80,103 @@ def test_sync_multiple_accounts(
     assert mock_cleanup.call_count == 1
 
 
+@mock.patch.object(cartography.intel.aws.organizations, 'sync', return_value=None)
+@mock.patch('cartography.intel.aws.boto3.Session')
+@mock.patch.object(cartography.intel.aws, '_sync_one_account', return_value=None)
+@mock.patch.object(cartography.intel.aws, '_autodiscover_accounts', return_value=None)
+@mock.patch.object(cartography.intel.aws, 'run_cleanup_job', return_value=None)
+def test_sync_multiple_accounts_concurrently(
+    mock_cleanup, mock_autodiscover, mock_sync_one, mock_boto3_session, mock_sync_orgs,
+):
+    neo4j_session = mock.MagicMock()
+    neo4j_driver = mock.MagicMock()
+    common_job_parameters = {'UPDATE_TAG': TEST_UPDATE_TAG}
+
+    cartography.intel.aws._sync_multiple_accounts(
+        neo4j_session, TEST_ACCOUNTS, TEST_UPDATE_TAG, common_job_parameters, False,
+        neo4j_driver=neo4j_driver, aws_sync_concurrency=2,
+    )
+
+    # Each account gets its own session from the driver and its own copy of the job parameters.
+    assert neo4j_driver.session.call_count == len(TEST_ACCOUNTS)
+    synced_params = {call.args[2]: call.args[4] for call in mock_sync_one.call_args_list}
+    assert synced_params == {
+        account_id: {'UPDATE_TAG': TEST_UPDATE_TAG, 'AWS_ID': account_id} for account_id in TEST_ACCOUNTS.values()
+    }
+    assert common_job_parameters == {'UPDATE_TAG': TEST_UPDATE_TAG}
+    assert mock_autodiscover.call_count == len(TEST_ACCOUNTS)
+
+    # The org-wide cleanup runs once, on the main session, after all accounts are done.
+    mock_cleanup.assert_called_once_with(
+        'aws_post_ingestion_principals_cleanup.json', neo4j_session, common_job_parameters,
+    )
+
+
+@mock.patch.object(cartography.intel.aws.organizations, 'sync', return_value=None)
+@mock.patch('cartography.intel.aws.boto3.Session')
+@mock.patch.object(cartography.intel.aws, '_sync_one_account', return_value=None)
+@mock.patch.object(cartography.intel.aws, '_autodiscover_accounts', return_value=None)
+@mock.patch.object(cartography.intel.aws, 'run_cleanup_job', return_value=None)
+def test_sync_multiple_accounts_concurrently_aggregates_exceptions_with_aws_best_effort_mode(
+    mock_cleanup, mock_autodiscover, mock_sync_one, mock_boto3_session, mock_sync_orgs,
+):
+    mock_sync_one.side_effect = KeyError('foo')
+
+    with raises(Exception) as e:
+        cartography.intel.aws._sync_multiple_accounts(
+            mock.MagicMock(), TEST_ACCOUNTS, TEST_UPDATE_TAG, {'UPDATE_TAG': TEST_UPDATE_TAG}, True,
+            neo4j_driver=mock.MagicMock(), aws_sync_concurrency=3,
+        )
+
+    message = str(e.value)
+    assert message.count('KeyError') == len(TEST_ACCOUNTS)
+    for account_id in TEST_ACCOUNTS.values():
+        assert account_id in message
+    assert mock_cleanup.call_count == 0
+
+
+@mock.patch.object(cartography.intel.aws.organizations, 'sync', return_value=None)
+@mock.patch('cartography.intel.aws.boto3.Session')
+@mock.patch.object(cartography.intel.aws, '_sync_one_account', return_value=None)
+@mock.patch.object(cartography.intel.aws, '_autodiscover_accounts', return_value=None)
+@mock.patch.object(cartography.intel.aws, 'run_cleanup_job', return_value=None)
+def test_sync_multiple_accounts_concurrently_closes_worker_event_loops(
+    mock_cleanup, mock_autodiscover, mock_sync_one, mock_boto3_session, mock_sync_orgs,
+):
+    loops = []
+    mock_sync_one.side_effect = lambda *args, **kwargs: loops.append(asyncio.get_event_loop())
+
+    cartography.intel.aws._sync_multiple_accounts(
+        mock.MagicMock(), TEST_ACCOUNTS, TEST_UPDATE_TAG, {'UPDATE_TAG': TEST_UPDATE_TAG}, False,
+        neo4j_driver=mock.MagicMock(), aws_sync_concurrency=2,
+    )
+
+    # Each account ran on its own event loop, which was closed once the account was synced.
+    assert len({id(loop) for loop in loops}) == len(TEST_ACCOUNTS)
+    assert all(loop.is_closed() for loop in loops)
+
+
+@mock.patch.object(cartography.intel.aws.organizations, 'sync', return_value=None)
+@mock.patch('cartography.intel.aws.boto3.Session')
+@mock.patch.object(cartography.intel.aws, '_sync_one_account', return_value=None)
+@mock.patch.object(cartography.intel.aws, '_autodiscover_accounts', return_value=None)
+@mock.patch.object(cartography.intel.aws, 'run_cleanup_job', return_value=None)
+@pytest.mark.parametrize('aws_sync_concurrency', [1, 2])
+def test_sync_multiple_accounts_raises_autodiscover_exceptions_with_aws_best_effort_mode(
+    mock_cleanup, mock_autodiscover, mock_sync_one, mock_boto3_session, mock_sync_orgs, aws_sync_concurrency,
+):
+    mock_autodiscover.side_effect = KeyError('foo')
+
+    # Autodiscovery failures are not aggregated: they abort the sync, both serially and concurrently.
+    with raises(KeyError):
+        cartography.intel.aws._sync_multiple_accounts(
+            mock.MagicMock(), TEST_ACCOUNTS, TEST_UPDATE_TAG, {'UPDATE_TAG': TEST_UPDATE_TAG}, True,
+            neo4j_driver=mock.MagicMock(), aws_sync_concurrency=aws_sync_concurrency,
+        )
+
+    assert mock_cleanup.call_count == 0
+
+
 @mock.patch('cartography.intel.aws.boto3.Session')
 @mock.patch('cartography.intel.aws.organizations')
 @mock.patch.object(cartography.intel.aws, '_sync_multiple_accounts', return_value=True)
@@ -90,6 +189,8 @@ def test_start_aws_ingestion(mock_perform_analysis, mock_sync_multiple, mock_org
         aws_sync_all_profiles=True,
     )
 
+    mock_orgs.get_aws_accounts_from_botocore_config.return_value = TEST_ACCOUNTS
+
     # Act
     cartography.intel.aws.start_aws_ingestion(neo4j_session, test_config)
 
@@ -101,7 +202,12 @@ def test_start_aws_ingestion(mock_perform_analysis, mock_sync_multiple, mock_org
         {
             "UPDATE_TAG": test_config.update_tag,
             "permission_relationships_file": test_config.permission_relationships_file,
+            "aws_iam_use_authorization_details": False,
         },
+        list(TEST_ACCOUNTS.values()),
+        neo4j_driver=None,
+        neo4j_database=None,
+        analysis_job_concurrency=1,
     )
 
 
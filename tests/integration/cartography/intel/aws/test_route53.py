@@ -6,6 +6,7 @@ TEST_UPDATE_TAG = 123456789
 TEST_ZONE_ID = "TESTZONEID"
 TEST_ZONE_NAME = "TESTZONENAME"
 TEST_AWS_ACCOUNTID = "AWSID"
+TEST_OTHER_AWS_ACCOUNTID = "OTHERAWSID"
 TEST_AWS_REGION = "us-east-1"
 
 
@@ -36,10 +37,18 @@ def _ensure_local_neo4j_has_test_route53_records(neo4j_session):
     cartography.intel.aws.route53.link_sub_zones(neo4j_session, TEST_UPDATE_TAG)
 
 
-def _ensure_local_neo4j_has_test_ec2_records(neo4j_session):
+def _ensure_local_neo4j_has_test_ec2_records(neo4j_session, aws_account_id=TEST_AWS_ACCOUNTID):
+    neo4j_session.run(
+        """
+        MERGE (a:AWSAccount{id:$AccountId})
+        SET a.lastupdated=$UpdateTag
+        """,
+        AccountId=aws_account_id,
+        UpdateTag=TEST_UPDATE_TAG,
+    )
     cartography.intel.aws.ec2.load_balancer_v2s.load_load_balancer_v2s(
         neo4j_session, tests.data.aws.ec2.load_balancers.LOAD_BALANCER_DATA,
-        TEST_AWS_REGION, TEST_AWS_ACCOUNTID, TEST_UPDATE_TAG,
+        TEST_AWS_REGION, aws_account_id, TEST_UPDATE_TAG,
     )
 
 
@@ -66,10 +75,12 @@ def test_transform_and_load_zones(neo4j_session):
 def test_transform_and_load_cname_records(neo4j_session):
     # Test that CNAME records are correctly transformed and loaded
     data = tests.data.aws.route53.CNAME_RECORD
-    first_data = cartography.intel.aws.route53.transform_record_set(data, TEST_ZONE_ID, data['Name'][:-1])
+    first_data = [cartography.intel.aws.route53.transform_record_set(data, TEST_ZONE_ID, data['Name'][:-1])]
     cartography.intel.aws.route53.load_cname_records(neo4j_session, first_data, TEST_UPDATE_TAG)
 
-    second_data = cartography.intel.aws.route53.transform_record_set(data, TEST_ZONE_ID + "2", data['Name'][:-1])
+    second_data = [
+        cartography.intel.aws.route53.transform_record_set(data, TEST_ZONE_ID + "2", data['Name'][:-1]),
+    ]
     cartography.intel.aws.route53.load_cname_records(neo4j_session, second_data, TEST_UPDATE_TAG)
     result = neo4j_session.run("MATCH (n:AWSDNSRecord{name:'subdomain.lyft.com'}) return count(n) as recordcount")
     for r in result:
@@ -169,3 +180,27 @@ def test_cleanup_dnspointsto_relationships(neo4j_session):
     actual = {(r['n1.id'], r['n2.name']) for r in result}
     expected = {("/hostedzone/HOSTED_ZONE/example.com/NS", "hello")}
     assert actual == expected
+
+
+def test_load_dnspointsto_relationships_across_accounts(neo4j_session):
+    # Arrange: the ELBv2 belongs to another account than the DNS record pointing to it
+    neo4j_session.run("MATCH (n) DETACH DELETE n;")
+    _ensure_local_neo4j_has_test_ec2_records(neo4j_session, TEST_OTHER_AWS_ACCOUNTID)
+
+    # Act: the account sync only links the record to resources of its own account
+    _ensure_local_neo4j_has_test_route53_records(neo4j_session)
+
+    # Assert
+    query = """
+    MATCH (n:AWSDNSRecord{id:"/hostedzone/HOSTED_ZONE/elbv2.example.com/ALIAS"})
+    -[:DNS_POINTS_TO]->(l:LoadBalancerV2{id:"myawesomeloadbalancer.amazonaws.com"})
+    return n.name, l.name
+    """
+    assert [r for r in neo4j_session.run(query)] == []
+
+    # Act: the global pass links records across accounts
+    cartography.intel.aws.route53.link_aws_resources(neo4j_session, TEST_UPDATE_TAG)
+
+    # Assert
+    actual = {(r['n.name'], r['l.name']) for r in neo4j_session.run(query)}
+    assert actual == {("elbv2.example.com", "myawesomeloadbalancer")}
@@ -1,3 +1,6 @@
+from datetime import datetime
+from datetime import timezone
+
 from cartography.intel.cve import feed
 from tests.data.cve.feed import GET_CVE_API_DATA
 from tests.integration.util import check_nodes
@@ -120,3 +123,28 @@ def test_sync(neo4j_session):
     ) == {
         ("CVE-2023-41782", "CVE-2023-41782"),
     }
+
+
+def test_cve_sync_checkpoint(neo4j_session):
+    # Arrange
+    window_start = datetime(2024, 4, 30, tzinfo=timezone.utc)
+    window_end = datetime(2024, 8, 28, tzinfo=timezone.utc)
+
+    # Act
+    feed.save_cve_sync_checkpoint(neo4j_session, "2024", window_start, window_end, 4000, TEST_UPDATE_TAG)
+
+    # Assert
+    assert feed.get_cve_sync_checkpoint(neo4j_session, "2024") == {
+        "window_start": window_start,
+        "window_end": window_end,
+        "start_index": 4000,
+    }
+    assert feed.get_cve_sync_checkpoint(neo4j_session, "modified") is None
+    # Checkpoints do not count as synced years
+    assert 2024 not in feed.get_cve_sync_metadata(neo4j_session)
+
+    # Act
+    feed.delete_cve_sync_checkpoint(neo4j_session, "2024")
+
+    # Assert
+    assert feed.get_cve_sync_checkpoint(neo4j_session, "2024") is None
@@ -0,0 +1,225 @@
+"""
+Checks that the batched GCP instance loader writes exactly the same graph as the original loader, which issued one
+query per instance, network tag, network interface and access config. The original queries are kept below verbatim as
+the reference.
+"""
+import copy
+
+import pytest
+
+import cartography.intel.gcp.compute
+import tests.data.gcp.compute
+
+TEST_UPDATE_TAG = 123456789
+
+LEGACY_INGEST_INSTANCE = """
+MERGE (p:GCPProject{id:$ProjectId})
+ON CREATE SET p.firstseen = timestamp()
+SET p.lastupdated = $gcp_update_tag
+
+MERGE (i:Instance:GCPInstance{id:$PartialUri})
+ON CREATE SET i.firstseen = timestamp(),
+i.partial_uri = $PartialUri
+SET i.self_link = $SelfLink,
+i.instancename = $InstanceName,
+i.hostname = $Hostname,
+i.zone_name = $ZoneName,
+i.project_id = $ProjectId,
+i.status = $Status,
+i.lastupdated = $gcp_update_tag
+WITH i, p
+
+MERGE (p)-[r:RESOURCE]->(i)
+ON CREATE SET r.firstseen = timestamp()
+SET r.lastupdated = $gcp_update_tag
+"""
+
+LEGACY_INGEST_TAG = """
+MATCH (i:GCPInstance{id:$InstanceId})
+
+MERGE (t:GCPNetworkTag{id:$TagId})
+ON CREATE SET t.tag_id = $TagId,
+t.value = $TagValue,
+t.firstseen = timestamp()
+SET t.lastupdated = $gcp_update_tag
+
+MERGE (i)-[h:TAGGED]->(t)
+ON CREATE SET h.firstseen = timestamp()
+SET h.lastupdated = $gcp_update_tag
+
+WITH t
+MATCH (vpc:GCPVpc{id:$VpcPartialUri})
+
+MERGE (vpc)<-[d:DEFINED_IN]-(t)
+ON CREATE SET d.firstseen = timestamp()
+SET d.lastupdated = $gcp_update_tag
+"""
+
+LEGACY_INGEST_NIC = """
+MATCH (i:GCPInstance{id:$InstanceId})
+MERGE (nic:GCPNetworkInterface:NetworkInterface{id:$NicId})
+ON CREATE SET nic.firstseen = timestamp(),
+nic.nic_id = $NicId
+SET nic.private_ip = $NetworkIP,
+nic.name = $NicName,
+nic.lastupdated = $gcp_update_tag
+
+MERGE (i)-[r:NETWORK_INTERFACE]->(nic)
+ON CREATE SET r.firstseen = timestamp()
+SET r.lastupdated = $gcp_update_tag
+
+MERGE (subnet:GCPSubnet{id:$SubnetPartialUri})
+ON CREATE SET subnet.firstseen = timestamp(),
+subnet.partial_uri = $SubnetPartialUri
+SET subnet.lastupdated = $gcp_update_tag
+
+MERGE (nic)-[p:PART_OF_SUBNET]->(subnet)
+ON CREATE SET p.firstseen = timestamp()
+SET p.lastupdated = $gcp_update_tag
+"""
+
+LEGACY_INGEST_ACCESS_CONFIG = """
+MATCH (nic{id:$NicId})
+MERGE (ac:GCPNicAccessConfig{id:$AccessConfigId})
+ON CREATE SET ac.firstseen = timestamp(),
+ac.access_config_id = $AccessConfigId
+SET ac.type=$Type,
+ac.name = $Name,
+ac.public_ip = $NatIP,
+ac.set_public_ptr = $SetPublicPtr,
+ac.public_ptr_domain_name = $PublicPtrDomainName,
+ac.network_tier = $NetworkTier,
+ac.lastupdated = $gcp_update_tag
+
+MERGE (nic)-[r:RESOURCE]->(ac)
+ON CREATE SET r.firstseen = timestamp()
+SET r.lastupdated = $gcp_update_tag
+"""
+
+LEGACY_ATTACH_VPC = """
+MATCH (i:GCPInstance{id:$InstanceId})-[:NETWORK_INTERFACE]->(nic:GCPNetworkInterface)
+      -[p:PART_OF_SUBNET]->(sn:GCPSubnet)<-[r:RESOURCE]-(vpc:GCPVpc)
+MERGE (i)-[m:MEMBER_OF_GCP_VPC]->(vpc)
+ON CREATE SET m.firstseen = timestamp()
+SET m.lastupdated = $gcp_update_tag
+"""
+
+
+def _get_instances():
+    return cartography.intel.gcp.compute.transform_gcp_instances(
+        [copy.deepcopy(tests.data.gcp.compute.GCP_LIST_INSTANCES_RESPONSE)],
+    )
+
+
+def _legacy_load(neo4j_session, instances):
+    for instance in instances:
+        neo4j_session.run(
+            LEGACY_INGEST_INSTANCE,
+            ProjectId=instance['project_id'],
+            PartialUri=instance['partial_uri'],
+            SelfLink=instance['selfLink'],
+            InstanceName=instance['name'],
+            ZoneName=instance['zone_name'],
+            Hostname=instance.get('hostname', None),
+            Status=instance['status'],
+            gcp_update_tag=TEST_UPDATE_TAG,
+        )
+        for tag in instance.get('tags', {}).get('items', []):
+            for nic in instance.get('networkInterfaces', []):
+                neo4j_session.run(
+                    LEGACY_INGEST_TAG,
+                    InstanceId=instance['partial_uri'],
+                    TagId=f"{nic['vpc_partial_uri']}/tags/{tag}",
+                    TagValue=tag,
+                    VpcPartialUri=nic['vpc_partial_uri'],
+                    gcp_update_tag=TEST_UPDATE_TAG,
+                )
+        for nic in instance.get('networkInterfaces', []):
+            nic_id = f"{instance['partial_uri']}/networkinterfaces/{nic['name']}"
+            neo4j_session.run(
+                LEGACY_INGEST_NIC,
+                InstanceId=instance['partial_uri'],
+                NicId=nic_id,
+                NetworkIP=nic.get('networkIP'),
+                NicName=nic['name'],
+                gcp_update_tag=TEST_UPDATE_TAG,
+                SubnetPartialUri=nic['subnet_partial_uri'],
+            )
+            for ac in nic.get('accessConfigs', []):
+                neo4j_session.run(
+                    LEGACY_INGEST_ACCESS_CONFIG,
+                    NicId=nic_id,
+                    AccessConfigId=f"{nic_id}/accessconfigs/{ac['type']}",
+                    Type=ac['type'],
+                    Name=ac['name'],
+                    NatIP=ac.get('natIP', None),
+                    SetPublicPtr=ac.get('setPublicPtr', None),
+                    PublicPtrDomainName=ac.get('publicPtrDomainName', None),
+                    NetworkTier=ac.get('networkTier', None),
+                    gcp_update_tag=TEST_UPDATE_TAG,
+                )
+        neo4j_session.run(
+            LEGACY_ATTACH_VPC,
+            InstanceId=instance['partial_uri'],
+            gcp_update_tag=TEST_UPDATE_TAG,
+        )
+
+
+def _snapshot_graph(neo4j_session):
+    """
+    Returns every node and relationship in the graph, ignoring `firstseen` since it holds the load time.
+    """
+    nodes = neo4j_session.run(
+        """
+        MATCH (n)
+        RETURN labels(n) AS labels, properties(n) AS props
+        """,
+    ).data()
+    rels = neo4j_session.run(
+        """
+        MATCH (a)-[r]->(b)
+        RETURN properties(a) AS a_props, type(r) AS type, properties(r) AS props, properties(b) AS b_props
+        """,
+    ).data()
+
+    def _strip(props):
+        return tuple(sorted((k, str(v)) for k, v in props.items() if k != 'firstseen'))
+
+    return (
+        sorted((tuple(sorted(n['labels'])), _strip(n['props'])) for n in nodes),
+        sorted((_strip(r['a_props']), r['type'], _strip(r['props']), _strip(r['b_props'])) for r in rels),
+    )
+
+
+def _reset_graph(neo4j_session, with_vpcs):
+    neo4j_session.run("MATCH (n) DETACH DELETE n;")
+    if with_vpcs:
+        cartography.intel.gcp.compute.load_gcp_vpcs(
+            neo4j_session, tests.data.gcp.compute.TRANSFORMED_GCP_VPCS, TEST_UPDATE_TAG,
+        )
+        cartography.intel.gcp.compute.load_gcp_subnets(
+            neo4j_session, tests.data.gcp.compute.TRANSFORMED_GCP_SUBNETS, TEST_UPDATE_TAG,
+        )
+
+
+@pytest.mark.parametrize('with_vpcs', [True, False])
+def test_batched_gcp_instance_loader_writes_the_same_graph_as_per_instance_loader(neo4j_session, with_vpcs):
+    # Arrange: without the VPCs and subnets, the NICs must still create their subnets, like the Shared VPC case.
+    _reset_graph(neo4j_session, with_vpcs)
+    _legacy_load(neo4j_session, _get_instances())
+    expected = _snapshot_graph(neo4j_session)
+    _reset_graph(neo4j_session, with_vpcs)
+
+    # Act
+    cartography.intel.gcp.compute.load_gcp_instances(neo4j_session, _get_instances(), TEST_UPDATE_TAG)
+
+    # Assert
+    assert _snapshot_graph(neo4j_session) == expected
+    rel_types = {rel[1] for rel in expected[1]}
+    assert {'RESOURCE', 'TAGGED', 'NETWORK_INTERFACE', 'PART_OF_SUBNET'} <= rel_types
+    if with_vpcs:
+        assert {'DEFINED_IN', 'MEMBER_OF_GCP_VPC'} <= rel_types
+
+    # Loading again with the same update tag must be idempotent, as it was before.
+    cartography.intel.gcp.compute.load_gcp_instances(neo4j_session, _get_instances(), TEST_UPDATE_TAG)
+    assert _snapshot_graph(neo4j_session) == expected
@@ -1,4 +1,5 @@
 import cartography.intel.github
+import cartography.util
 import tests.data.github.repos
 
 
@@ -263,3 +264,55 @@ def test_python_library_in_multiple_requirements_files(neo4j_session):
     node_ids = {n['lib_ids'] for n in nodes}
     assert len(node_ids) == 2
     assert node_ids == {'okta', 'okta|0.9.0'}
+
+
+def test_load_unchanged_repos(neo4j_session):
+    """
+    Ensure that an incremental sync keeps the repos that did not change, with everything attached to them, and still
+    cleans up the repos that are gone.
+    """
+    # Arrange
+    neo4j_session.run("MATCH (n) DETACH DELETE n;")
+    _ensure_local_neo4j_has_test_data(neo4j_session)
+    new_update_tag = TEST_UPDATE_TAG + 1
+    unchanged_repo = 'https://github.com/lyft/cartography'
+    deleted_repo = 'https://github.com/example_org/SampleRepo2'
+    kept_repo = 'https://github.com/example_org/sample_repo'
+
+    # Act
+    cartography.intel.github.repos.load_unchanged_repos(neo4j_session, new_update_tag, [unchanged_repo, kept_repo])
+    cartography.util.run_cleanup_job(
+        'github_repos_cleanup.json', neo4j_session, {'UPDATE_TAG': new_update_tag},
+    )
+
+    # Assert
+    repos = {r['repo.id'] for r in neo4j_session.run("MATCH (repo:GitHubRepository) RETURN repo.id")}
+    assert repos == {unchanged_repo, kept_repo}
+    languages = {
+        (r['repo.id'], r['pl.id']) for r in neo4j_session.run(
+            "MATCH (repo:GitHubRepository)-[:LANGUAGE]->(pl:ProgrammingLanguage) RETURN repo.id, pl.id",
+        )
+    }
+    assert (kept_repo, 'Python') in languages
+    requirements = {
+        r['repo.id'] for r in neo4j_session.run(
+            "MATCH (repo:GitHubRepository)-[:REQUIRES]->(lib:PythonLibrary) RETURN repo.id",
+        )
+    }
+    assert kept_repo in requirements
+    assert deleted_repo not in requirements
+
+
+def test_repos_watermark(neo4j_session):
+    # Arrange
+    neo4j_session.run("MATCH (n) DETACH DELETE n;")
+    assert cartography.intel.github.repos.get_repos_watermark(neo4j_session, 'example_org') is None
+
+    # Act
+    cartography.intel.github.repos.save_repos_watermark(
+        neo4j_session, 'example_org', '2020-09-02T18:35:17Z', TEST_UPDATE_TAG,
+    )
+
+    # Assert
+    assert cartography.intel.github.repos.get_repos_watermark(neo4j_session, 'example_org') == '2020-09-02T18:35:17Z'
+    assert cartography.intel.github.repos.get_repos_watermark(neo4j_session, 'other_org') is None
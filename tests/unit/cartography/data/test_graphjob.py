@@ -1,4 +1,11 @@
+from typing import List
+from unittest.mock import MagicMock
+from unittest.mock import patch
+
 from cartography.graph.job import GraphJob
+from cartography.graph.statement import AdaptiveIterationSize
+from cartography.graph.statement import GraphStatement
+from tests.data.graph.querybuilder.sample_models.interesting_asset import InterestingAssetSchema
 from tests.data.jobs.sample import SAMPLE_CLEANUP_JOB
 
 
@@ -10,3 +17,94 @@ def test_graphjob_from_json():
     assert job.name == "cleanup stale resources"
     assert len(job.statements) == 3
     assert job.short_name is None
+
+
+def _mock_session_deleting(deleted_per_batch: List[int], relationships: bool = False) -> MagicMock:
+    """
+    Returns a mock session whose successive write transactions delete the given numbers of nodes (or relationships).
+    """
+    summaries = []
+    for deleted in deleted_per_batch:
+        summary = MagicMock()
+        summary.counters.nodes_deleted = 0 if relationships else deleted
+        summary.counters.relationships_deleted = deleted if relationships else 2 * deleted
+        summary.counters.contains_updates = deleted > 0
+        summaries.append(summary)
+    session = MagicMock()
+    session.write_transaction.return_value.consume.side_effect = summaries
+    return session
+
+
+def test_graphjob_from_node_schema_is_adaptive_by_default():
+    job = GraphJob.from_node_schema(InterestingAssetSchema(), {'UPDATE_TAG': 1, 'sub_resource_id': 'a'})
+    assert all(s.iterative and s.adaptive_iteration == AdaptiveIterationSize() for s in job.statements)
+
+    fixed_job = GraphJob.from_node_schema(
+        InterestingAssetSchema(), {'UPDATE_TAG': 1, 'sub_resource_id': 'a'}, adaptive_iteration=None,
+    )
+    assert all(s.iterative and s.adaptive_iteration is None and s.iterationsize == 100 for s in fixed_job.statements)
+
+
+def test_adaptive_iteration_size_next_size():
+    adaptive = AdaptiveIterationSize(min_size=10, max_size=50, target_seconds=1.0)
+    assert adaptive.next_size(10, 0.1) == 20
+    assert adaptive.next_size(40, 0.1) == 50
+    assert adaptive.next_size(40, 0.7) == 40
+    assert adaptive.next_size(40, 2.0) == 20
+    assert adaptive.next_size(10, 2.0) == 10
+
+
+@patch('cartography.graph.statement.time.monotonic')
+@patch('cartography.graph.statement.stat_handler')
+def test_adaptive_iterative_statement_grows_shrinks_and_stops_on_partial_batch(mock_stats, mock_monotonic):
+    # Transactions take 0.1s, 0.1s, 2s, then 0.1s
+    mock_monotonic.side_effect = [0, 0.1, 1, 1.1, 2, 4, 5, 5.1]
+    session = _mock_session_deleting([10, 20, 40, 7])
+    statement = GraphStatement(
+        'MATCH (n) WITH n LIMIT $LIMIT_SIZE DETACH DELETE n',
+        iterative=True,
+        iterationsize=100,
+        parent_job_name='Fake',
+        parent_job_sequence_num=1,
+        adaptive_iteration=AdaptiveIterationSize(min_size=10, max_size=1000, target_seconds=1.0),
+    )
+    limits = []
+
+    def _write_transaction(tx_func):
+        limits.append(statement.parameters['LIMIT_SIZE'])
+        return session.write_transaction.return_value
+    session.write_transaction.side_effect = _write_transaction
+
+    statement.run(session)
+
+    # No extra empty transaction after the partial batch of 7
+    assert limits == [10, 20, 40, 20]
+    mock_stats.incr.assert_any_call('Fake.statement_1.nodes_deleted', 77)
+    mock_stats.incr.assert_any_call('Fake.statement_1.relationships_deleted', 154)
+
+
+def test_adaptive_iterative_statement_counts_relationships_for_relationship_cleanup():
+    session = _mock_session_deleting([100, 200, 0], relationships=True)
+    statement = GraphStatement(
+        'MATCH ()-[r]->() WITH r LIMIT $LIMIT_SIZE DELETE r',
+        iterative=True,
+        adaptive_iteration=AdaptiveIterationSize(min_size=100, max_size=200, target_seconds=60),
+    )
+
+    statement.run(session)
+
+    assert session.write_transaction.call_count == 3
+
+
+def test_fixed_iterative_statement_runs_until_no_updates():
+    session = MagicMock()
+    session.write_transaction.return_value.consume.side_effect = [
+        MagicMock(counters=MagicMock(contains_updates=contains_updates))
+        for contains_updates in [True, True, True, True, False, False]
+    ]
+    statement = GraphStatement('MATCH (n) WITH n LIMIT $LIMIT_SIZE DETACH DELETE n', iterative=True, iterationsize=5)
+
+    statement.run(session)
+
+    # Each batch calls consume() twice
+    assert session.write_transaction.call_count == 3
@@ -0,0 +1,113 @@
+import json
+import pathlib
+import re
+import threading
+from typing import List
+from typing import Optional
+from unittest import mock
+
+import cartography.data.jobs
+from cartography.graph.job import GraphJob
+from cartography.graph.jobscheduler import get_job_dependencies
+from cartography.graph.jobscheduler import run_jobs
+from cartography.util import load_analysis_job
+
+
+def _job(name: str, reads: Optional[List[str]] = None, writes: Optional[List[str]] = None) -> GraphJob:
+    return GraphJob(
+        name,
+        [],
+        name,
+        set(reads) if reads is not None else None,
+        set(writes) if writes is not None else None,
+    )
+
+
+def test_load_analysis_job_with_declared_labels():
+    job = load_analysis_job('gsuite_human_link.json', {'UPDATE_TAG': 1})
+
+    assert job.short_name == 'gsuite_human_link'
+    assert job.reads == {'Human', 'GSuiteUser', 'IDENTITY_GSUITE'}
+    assert job.writes == {'IDENTITY_GSUITE'}
+    assert job.as_dict()['writes'] == ['IDENTITY_GSUITE']
+
+
+def test_analysis_jobs_declare_the_relationships_they_traverse():
+    jobs_dir = pathlib.Path(cartography.data.jobs.__file__).parent
+    for path in list(jobs_dir.glob('analysis/*.json')) + list(jobs_dir.glob('scoped_analysis/*.json')):
+        job = json.loads(path.read_text())
+        if 'reads' not in job:
+            continue
+        rel_types = {
+            rel_type
+            for statement in job['statements']
+            for match in re.findall(r'\[\w*:([A-Z0-9_|]+)', statement['query'])
+            for rel_type in match.split('|')
+        }
+        assert rel_types <= set(job['reads']) | set(job['writes']), path
+
+
+def test_get_job_dependencies():
+    jobs = [
+        _job('gke_exposure', ['GKECluster'], ['GKECluster']),
+        _job('gsuite_human_link', ['Human', 'GSuiteUser'], ['IDENTITY_GSUITE']),
+        _job('gke_basic_auth', ['GKECluster'], ['GKECluster']),
+        _job('human_report', ['Human', 'IDENTITY_GSUITE'], ['HumanReport']),
+        _job('undeclared'),
+        _job('eks_exposure', ['EKSCluster'], ['EKSCluster']),
+    ]
+
+    assert get_job_dependencies(jobs) == [
+        set(),
+        set(),
+        # Writes what the first job writes
+        {0},
+        # Reads what the GSuite job writes
+        {1},
+        # Undeclared jobs conflict with every job
+        {0, 1, 2, 3},
+        {4},
+    ]
+
+
+def test_run_jobs_runs_independent_jobs_concurrently():
+    # Arrange: both jobs wait for each other, so they only finish if they run at the same time
+    barrier = threading.Barrier(2, timeout=10)
+    jobs = [
+        _job('gke_exposure', ['GKECluster'], ['GKECluster']),
+        _job('eks_exposure', ['EKSCluster'], ['EKSCluster']),
+        _job('foreign_accounts'),
+    ]
+    ran: List[str] = []
+
+    def _run(job: GraphJob, neo4j_session) -> None:
+        if job.short_name != 'foreign_accounts':
+            barrier.wait()
+        else:
+            # The undeclared job only starts after the others
+            assert sorted(ran) == ['eks_exposure', 'gke_exposure']
+        assert job.short_name is not None
+        ran.append(job.short_name)
+
+    # Act
+    with mock.patch.object(GraphJob, 'run', autospec=True, side_effect=_run):
+        failures = run_jobs(jobs, mock.MagicMock(), neo4j_driver=mock.MagicMock(), max_workers=4)
+
+    # Assert
+    assert failures == []
+    assert ran[-1] == 'foreign_accounts'
+
+
+def test_run_jobs_keeps_going_after_failures():
+    jobs = [_job('first'), _job('second'), _job('third')]
+    error = ValueError('second failed')
+
+    def _run(job: GraphJob, neo4j_session) -> None:
+        if job.short_name == 'second':
+            raise error
+
+    with mock.patch.object(GraphJob, 'run', autospec=True, side_effect=_run) as mock_run:
+        failures = run_jobs(jobs, mock.MagicMock())
+
+    assert mock_run.call_count == 3
+    assert failures == [(jobs[1], error)]
@@ -1,6 +1,16 @@
+import copy
+import random
+from unittest.mock import MagicMock
+from unittest.mock import patch
+
+import tests.data.aws.iam
 from cartography.intel.aws import iam
 from cartography.intel.aws.iam import PolicyType
 from cartography.intel.aws.iam import transform_policy_data
+from cartography.intel.aws.permission_relationships import principal_allowed_on_resource
+from tests.data.aws.permission_relationships import build_synthetic_account
+
+ASSUME_ROLE_ACTIONS = ['sts:AssumeRole', 'sts:Assume*', 'sts:*', 'sts:AssumeRoleWithSAML', 'iam:PassRole']
 
 SINGLE_STATEMENT = {
     "Resource": "*",
@@ -116,3 +126,238 @@ def test_transform_policy_data_correctly_creates_lists_of_statements():
 
     # Assert that we correctly converted the statement to a list
     assert isinstance(pol_statement_map['some-arn']['pol-name'], list)
+
+
+def test_transform_roles_flattens_trust_policies():
+    roles, trusted_principals, principal_accounts = iam.transform_roles(tests.data.aws.iam.LIST_ROLES['Roles'])
+
+    assert [r['RoleId'] for r in roles] == [
+        'AROA00000000000000000', 'AROA00000000000000001', 'AROA00000000000000002', 'AROA00000000000000003',
+    ]
+    assert roles[0]['CreateDate'] == '2019-01-01 00:00:01'
+    assert trusted_principals == [
+        {
+            'RoleArn': 'arn:aws:iam::000000000000:role/example-role-0',
+            'SpnArn': 'arn:aws:iam::000000000000:root',
+            'SpnType': 'AWS',
+        },
+        {
+            'RoleArn': 'arn:aws:iam::000000000000:role/example-role-1',
+            'SpnArn': 'arn:aws:iam::000000000000:role/example-role-0',
+            'SpnType': 'AWS',
+        },
+        {
+            'RoleArn': 'arn:aws:iam::000000000000:role/example-role-2',
+            'SpnArn': 'ec2.amazonaws.com',
+            'SpnType': 'Service',
+        },
+        {
+            'RoleArn': 'arn:aws:iam::000000000000:role/example-role-3',
+            'SpnArn': 'arn:aws:iam::000000000000:saml-provider/ADFS',
+            'SpnType': 'Federated',
+        },
+    ]
+    # Service principals are not mapped to an account
+    assert [p['SpnArn'] for p in principal_accounts] == [
+        'arn:aws:iam::000000000000:root',
+        'arn:aws:iam::000000000000:role/example-role-0',
+        'arn:aws:iam::000000000000:saml-provider/ADFS',
+    ]
+
+
+def test_transform_user_access_keys_skips_keys_without_id():
+    access_keys = {
+        'arn:aws:iam::000000000000:user/example-user-0': {
+            'AccessKeyMetadata': [
+                *tests.data.aws.iam.LIST_ACCESS_KEYS['arn:aws:iam::000000000000:user/example-user-0'][
+                    'AccessKeyMetadata'
+                ],
+                {'AccessKeyId': None},
+            ],
+        },
+    }
+    keys = iam.transform_user_access_keys(access_keys)
+    assert [k['AccessKeyId'] for k in keys] == ['AKIA00000000000000000', 'AKIA00000000000000001']
+    assert keys[0]['UserARN'] == 'arn:aws:iam::000000000000:user/example-user-0'
+
+
+def test_load_users_runs_one_transaction_per_batch():
+    neo4j_session = MagicMock()
+    users = [
+        {
+            **tests.data.aws.iam.LIST_USERS['Users'][0],
+            'Arn': f'arn:aws:iam::000000000000:user/user-{i}',
+            'UserName': f'user-{i}',
+        }
+        for i in range(2500)
+    ]
+
+    iam.load_users(neo4j_session, users, '000000000000', 123)
+
+    assert neo4j_session.run.call_count == 0
+    assert neo4j_session.write_transaction.call_count == 3
+    loaded = [
+        user
+        for call in neo4j_session.write_transaction.call_args_list
+        for user in call.kwargs['DictList']
+    ]
+    assert [u['UserName'] for u in loaded] == [f'user-{i}' for i in range(2500)]
+
+
+def test_transform_inline_policies_from_authorization_details():
+    details = copy.deepcopy(tests.data.aws.iam.GET_ACCOUNT_AUTHORIZATION_DETAILS)
+
+    policies = iam.transform_inline_policies(details['GroupDetailList'], 'GroupPolicyList')
+
+    # Every principal gets an entry, like with get_group_policy_data
+    assert policies == {
+        'arn:aws:iam::000000000000:group/example-group-0': {},
+        'arn:aws:iam::000000000000:group/example-group-1': {
+            'group-inline-1': {'Effect': 'Allow', 'Action': 'sqs:*', 'Resource': '*'},
+        },
+    }
+
+
+def test_transform_managed_policies_uses_default_version():
+    details = copy.deepcopy(tests.data.aws.iam.GET_ACCOUNT_AUTHORIZATION_DETAILS)
+
+    policies = iam.transform_managed_policies(details['RoleDetailList'], details['Policies'])
+
+    assert policies['arn:aws:iam::000000000000:role/example-role-0'] == {}
+    assert policies['arn:aws:iam::000000000000:role/example-role-1'] == {
+        'arn:aws:iam::000000000000:policy/example-local-policy': [
+            {'Effect': 'Allow', 'Action': ['ec2:Describe*', 's3:List*'], 'Resource': '*'},
+        ],
+    }
+
+
+def test_transform_managed_policies_skips_unknown_policies():
+    principals = [{
+        'Arn': 'arn:aws:iam::000000000000:role/example-role-0',
+        'AttachedManagedPolicies': [{'PolicyName': 'gone', 'PolicyArn': 'arn:aws:iam::000000000000:policy/gone'}],
+    }]
+    assert iam.transform_managed_policies(principals, []) == {'arn:aws:iam::000000000000:role/example-role-0': {}}
+
+
+def test_transform_group_memberships_from_users():
+    details = tests.data.aws.iam.GET_ACCOUNT_AUTHORIZATION_DETAILS
+
+    memberships = iam.transform_group_memberships_from_users(details['UserDetailList'], details['GroupDetailList'])
+
+    assert iam.transform_group_memberships(memberships) == iam.transform_group_memberships(
+        tests.data.aws.iam.GET_GROUP_MEMBERSHIPS,
+    )
+
+
+def test_transform_role_tags():
+    details = tests.data.aws.iam.GET_ACCOUNT_AUTHORIZATION_DETAILS
+
+    assert iam.transform_role_tags(details['RoleDetailList']) == [
+        {'ResourceARN': 'arn:aws:iam::000000000000:role/example-role-0', 'Tags': [{'Key': 'team', 'Value': 'team-0'}]},
+        {'ResourceARN': 'arn:aws:iam::000000000000:role/example-role-1', 'Tags': [{'Key': 'team', 'Value': 'team-1'}]},
+    ]
+
+
+def test_get_account_authorization_details_merges_pages():
+    mock_session = MagicMock()
+    paginator = mock_session.client.return_value.get_paginator.return_value
+    paginator.paginate.return_value = [
+        {'UserDetailList': [{'Arn': 'u0'}], 'RoleDetailList': [{'Arn': 'r0'}], 'IsTruncated': True},
+        {'RoleDetailList': [{'Arn': 'r1'}], 'Policies': [{'Arn': 'p0'}], 'IsTruncated': False},
+    ]
+
+    details = iam.get_account_authorization_details(mock_session, filters=['User', 'Role'])
+
+    paginator.paginate.assert_called_once_with(Filter=['User', 'Role'])
+    assert details == {
+        'UserDetailList': [{'Arn': 'u0'}],
+        'GroupDetailList': [],
+        'RoleDetailList': [{'Arn': 'r0'}, {'Arn': 'r1'}],
+        'Policies': [{'Arn': 'p0'}],
+    }
+
+
+@patch.object(iam, 'sync_principals_from_authorization_details')
+@patch.object(iam, 'sync_users')
+@patch.object(iam, 'sync_assumerole_relationships')
+@patch.object(iam, 'sync_user_access_keys')
+@patch.object(iam, 'run_cleanup_job')
+@patch.object(iam, 'merge_module_sync_metadata')
+def test_sync_uses_authorization_details_when_enabled(
+    mock_metadata, mock_cleanup, mock_keys, mock_assumerole, mock_sync_users, mock_sync_from_details,
+):
+    iam.sync(
+        MagicMock(), MagicMock(), [], '000000000000', 123,
+        {'UPDATE_TAG': 123, 'AWS_ID': '000000000000', 'aws_iam_use_authorization_details': True},
+    )
+
+    mock_sync_from_details.assert_called_once()
+    mock_sync_users.assert_not_called()
+    mock_assumerole.assert_called_once()
+    mock_keys.assert_called_once()
+
+
+def test_calculate_assumerole_relationships_matches_per_pair_evaluation():
+    rng = random.Random(7)
+    principals, _ = build_synthetic_account(num_principals=40, num_resources=10, seed=7)
+    for policies in principals.values():
+        for statements in policies.values():
+            for statement in statements:
+                if 'action' in statement:
+                    statement['action'].append(rng.choice(ASSUME_ROLE_ACTIONS))
+    role_arns = list(principals)
+    potential_matches = [(rng.choice(role_arns), rng.choice(role_arns)) for _ in range(300)]
+    # A source without any policy is never allowed
+    potential_matches.append(('arn:aws:iam::000000000000:user/no-policies', role_arns[0]))
+    potential_matches = list(dict.fromkeys(potential_matches))
+
+    expected = [
+        {'SourceArn': source_arn, 'TargetArn': target_arn}
+        for source_arn, target_arn in potential_matches
+        if principal_allowed_on_resource(principals.get(source_arn, {}), target_arn, ['sts:AssumeRole'])
+    ]
+    actual = iam.calculate_assumerole_relationships(potential_matches, principals)
+
+    assert actual == expected
+    assert 0 < len(actual) < len(potential_matches)
+
+
+def test_sync_assumerole_relationships_uses_one_read_and_one_write():
+    neo4j_session = MagicMock()
+    neo4j_session.run.side_effect = [
+        # Potential matches
+        [
+            {'source_arn': 'arn:aws:iam::000000000000:role/source', 'target_arn': 'arn:aws:iam::000000000000:role/a'},
+            {'source_arn': 'arn:aws:iam::000000000000:role/source', 'target_arn': 'arn:aws:iam::000000000000:role/b'},
+            {'source_arn': 'arn:aws:iam::000000000000:role/other', 'target_arn': 'arn:aws:iam::000000000000:role/a'},
+        ],
+        # Policies of all sources
+        [
+            {
+                'principal_arn': 'arn:aws:iam::000000000000:role/source',
+                'policy_id': 'policy',
+                'statements': [
+                    MagicMock(
+                        _properties={
+                            'effect': 'Allow',
+                            'action': ['sts:AssumeRole'],
+                            'resource': ['arn:aws:iam::000000000000:role/a'],
+                        },
+                    ),
+                ],
+            },
+        ],
+    ]
+
+    with patch.object(iam, 'run_cleanup_job'):
+        iam.sync_assumerole_relationships(neo4j_session, '000000000000', 123, {})
+
+    assert neo4j_session.run.call_count == 2
+    assert neo4j_session.run.call_args_list[1].kwargs['Arns'] == [
+        'arn:aws:iam::000000000000:role/source',
+        'arn:aws:iam::000000000000:role/other',
+    ]
+    neo4j_session.write_transaction.assert_called_once()
+    assert neo4j_session.write_transaction.call_args.kwargs['DictList'] == [
+        {'SourceArn': 'arn:aws:iam::000000000000:role/source', 'TargetArn': 'arn:aws:iam::000000000000:role/a'},
+    ]
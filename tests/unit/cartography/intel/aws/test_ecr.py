@@ -0,0 +1,31 @@
+import threading
+from unittest import mock
+
+from cartography.intel.aws import ecr
+from cartography.intel.aws.util.regions import fetch_regions_concurrently
+
+
+@mock.patch.object(ecr, 'get_ecr_repository_images')
+@mock.patch.object(ecr, 'get_ecr_repositories')
+def test_get_repositories_and_images_does_not_leak_threads(mock_get_repositories, mock_get_images):
+    # Arrange
+    mock_get_repositories.side_effect = lambda boto3_session, region: [
+        {'repositoryName': f'{region}-repo-{i}', 'repositoryUri': f'uri/{region}-repo-{i}'} for i in range(20)
+    ]
+    mock_get_images.side_effect = lambda boto3_session, region, repository_name: [
+        {'imageDigest': 'sha256:0', 'imageTag': repository_name},
+    ]
+    regions = ['us-east-1', 'us-west-2', 'eu-west-1']
+    threads_before = threading.active_count()
+
+    # Act: as many runs as accounts
+    for _ in range(5):
+        result = fetch_regions_concurrently(
+            mock.MagicMock(), regions, ecr._get_repositories_and_images, ecr._transform_repositories_and_images,
+        )
+
+    # Assert
+    assert threading.active_count() == threads_before
+    for region, (repositories, repo_images_list) in result:
+        assert len(repositories) == 20
+        assert [image['imageTag'] for image in repo_images_list] == [f'{region}-repo-{i}' for i in range(20)]
@@ -0,0 +1,81 @@
+from unittest import mock
+
+from cartography.intel.aws import ecs
+
+
+def _describe_task_definition(taskDefinition):
+    return {'taskDefinition': {'taskDefinitionArn': taskDefinition}}
+
+
+def test_get_ecs_task_definitions_describes_each_definition_once():
+    # Arrange: 300 tasks sharing 3 task definitions
+    tasks = [{'taskDefinitionArn': f'arn:td/{i % 3}'} for i in range(300)]
+    boto3_session = mock.MagicMock()
+    client = boto3_session.client.return_value
+    client.describe_task_definition.side_effect = _describe_task_definition
+    cache = {}
+
+    # Act
+    result = ecs.get_ecs_task_definitions(boto3_session, 'us-east-1', tasks, cache)
+
+    # Assert
+    assert [td['taskDefinitionArn'] for td in result] == ['arn:td/0', 'arn:td/1', 'arn:td/2']
+    assert client.describe_task_definition.call_count == 3
+    assert set(cache) == {'arn:td/0', 'arn:td/1', 'arn:td/2'}
+
+
+def test_get_ecs_task_definitions_skips_cached_definitions():
+    # Arrange
+    boto3_session = mock.MagicMock()
+    client = boto3_session.client.return_value
+    client.describe_task_definition.side_effect = _describe_task_definition
+    cache = {'arn:td/0': {'taskDefinitionArn': 'arn:td/0'}}
+    tasks = [{'taskDefinitionArn': 'arn:td/0'}, {'taskDefinitionArn': 'arn:td/1'}]
+
+    # Act
+    result = ecs.get_ecs_task_definitions(boto3_session, 'us-east-1', tasks, cache)
+    # Act: everything is cached, nothing to describe
+    result_cached = ecs.get_ecs_task_definitions(boto3_session, 'us-east-1', tasks, cache)
+
+    # Assert
+    assert result == [{'taskDefinitionArn': 'arn:td/1'}]
+    assert result_cached == []
+    client.describe_task_definition.assert_called_once_with(taskDefinition='arn:td/1')
+
+
+@mock.patch.object(ecs, 'cleanup_ecs')
+@mock.patch.object(ecs, 'load_ecs_task_definitions')
+@mock.patch.object(ecs, 'load_ecs_tasks')
+@mock.patch.object(ecs, 'load_ecs_services')
+@mock.patch.object(ecs, 'load_ecs_container_instances')
+@mock.patch.object(ecs, 'load_ecs_clusters')
+@mock.patch.object(ecs, 'get_ecs_task_definitions', return_value=[])
+@mock.patch.object(ecs, '_get_ecs_cluster_details')
+@mock.patch.object(ecs, 'get_ecs_clusters')
+@mock.patch.object(ecs, 'get_ecs_cluster_arns')
+def test_sync_loads_clusters_in_order_and_shares_the_task_definition_cache(
+    mock_get_cluster_arns, mock_get_clusters, mock_get_cluster_details, mock_get_task_definitions,
+    mock_load_clusters, mock_load_container_instances, mock_load_services, mock_load_tasks,
+    mock_load_task_definitions, mock_cleanup,
+):
+    # Arrange
+    cluster_arns = [f'arn:cluster/{i}' for i in range(12)]
+    mock_get_cluster_arns.return_value = cluster_arns
+    mock_get_clusters.return_value = [{'clusterArn': arn} for arn in cluster_arns]
+    mock_get_cluster_details.side_effect = lambda cluster_arn, boto3_session, region: (
+        [], [], [{'taskArn': f'{cluster_arn}/task'}],
+    )
+
+    # Act
+    ecs.sync(mock.MagicMock(), mock.MagicMock(), ['us-east-1', 'us-west-2'], '1234', 1, {})
+
+    # Assert: each cluster is loaded in order, after its details were fetched
+    loaded = [c[0][1] for c in mock_load_tasks.call_args_list]
+    assert loaded == cluster_arns * 2
+    assert [c[0][2] for c in mock_load_tasks.call_args_list] == [
+        [{'taskArn': f'{arn}/task'}] for arn in cluster_arns * 2
+    ]
+    # Assert: a single cache is used for the whole sync
+    caches = {id(c[0][3]) for c in mock_get_task_definitions.call_args_list}
+    assert len(caches) == 1
+    mock_cleanup.assert_called_once()
@@ -0,0 +1,36 @@
+from unittest import mock
+
+from cartography.intel import aws
+
+
+@mock.patch.object(aws, 'run_jobs', return_value=[])
+def test_perform_aws_analysis_scopes_jobs_to_synced_accounts(mock_run_jobs):
+    # Arrange
+    neo4j_session = mock.MagicMock()
+    common_job_parameters = {'UPDATE_TAG': 1}
+
+    # Act
+    aws._perform_aws_analysis(['ec2:instance', 'eks'], neo4j_session, common_job_parameters, ['111', '222'])
+
+    # Assert: account jobs run once per synced account, cross-account jobs run once without an account
+    mock_run_jobs.assert_called_once()
+    jobs = mock_run_jobs.call_args.args[0]
+    assert [(job.short_name, job.statements[0].parameters.get('AWS_ID')) for job in jobs] == [
+        ('aws_eks_asset_exposure', '111'),
+        ('aws_eks_asset_exposure', '222'),
+        ('aws_foreign_accounts', None),
+    ]
+    assert 'AWS_ID' not in common_job_parameters
+
+
+@mock.patch.object(aws, 'run_jobs')
+def test_perform_aws_analysis_raises_job_failures(mock_run_jobs):
+    job = mock.MagicMock(short_name='aws_foreign_accounts')
+    mock_run_jobs.return_value = [(job, ValueError('job failed'))]
+
+    try:
+        aws._perform_aws_analysis([], mock.MagicMock(), {'UPDATE_TAG': 1}, [])
+    except ValueError as e:
+        assert str(e) == 'job failed'
+    else:
+        raise AssertionError('The job failure was not raised')
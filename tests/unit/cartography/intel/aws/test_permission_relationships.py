@@ -1,4 +1,6 @@
 from cartography.intel.aws import permission_relationships
+from tests.data.aws.permission_relationships import build_synthetic_account
+from tests.data.aws.permission_relationships import PERMISSION_SETS
 
 
 GET_OBJECT_LOWERCASE_RESOURCE_WILDCARD = [
@@ -464,3 +466,54 @@ def test_permissions_list():
         assert False
     except ValueError:
         assert True
+
+
+def test_indexed_engine_matches_full_multiple_principal():
+    principals = {
+        "test_principal": {
+            "explicitallow": [{
+                "action": ["s3:getobject"],
+                "resource": ["arn:aws:s3:::testbucket"],
+                "effect": "Allow",
+            }],
+        },
+    }
+    assert permission_relationships.calculate_permission_relationships_indexed(
+        principals, ["arn:aws:s3:::testbucket", "arn:aws:s3:::otherbucket"], ["S3:GetObject"],
+    ) == [{"principal_arn": "test_principal", "resource_arn": "arn:aws:s3:::testbucket"}]
+
+
+def test_indexed_engine_matches_reference_on_synthetic_accounts():
+    for seed in range(5):
+        principals, resource_arns = build_synthetic_account(num_principals=40, num_resources=60, seed=seed)
+        index = permission_relationships.PrincipalPolicyIndex(principals)
+        for permissions in PERMISSION_SETS:
+            expected = permission_relationships.calculate_permission_relationships(
+                principals, resource_arns, permissions,
+            )
+            assert index.calculate_permission_relationships(resource_arns, permissions) == expected
+
+
+def test_indexed_engine_matches_reference_on_compiled_statements():
+    principals, resource_arns = build_synthetic_account(num_principals=20, num_resources=30, seed=42)
+    for policies in principals.values():
+        for statements in policies.values():
+            permission_relationships.compile_statement(statements)
+    for permissions in PERMISSION_SETS:
+        assert permission_relationships.calculate_permission_relationships_indexed(
+            principals, resource_arns, permissions,
+        ) == permission_relationships.calculate_permission_relationships(principals, resource_arns, permissions)
+
+
+def test_indexed_engine_regex_edge_cases():
+    resource_arns = ["arn:aws:s3:::a", "arn:aws:s3:::ab", "arn:aws:s3:::abb", "arn:aws:s3:::c", "arn:aws:s3:::a.b"]
+    for clause in [
+        "arn:aws:s3:::ab+", "arn:aws:s3:::ab{0}", "arn:aws:s3:::ab|arn:aws:s3:::c", "arn:aws:s3:::a?",
+        "arn:aws:s3:::a\\*", "arn:aws:s3:::a.b", "ARN:AWS:S3:::A*", "arn:aws:s3:::[",
+    ]:
+        principals = {"p": {"policy": [{"action": ["s3:*"], "resource": [clause], "effect": "Allow"}]}}
+        assert permission_relationships.calculate_permission_relationships_indexed(
+            principals, resource_arns, ["S3:GetObject"],
+        ) == permission_relationships.calculate_permission_relationships(
+            principals, resource_arns, ["S3:GetObject"],
+        ), clause
@@ -0,0 +1,47 @@
+from unittest import mock
+
+from cartography.intel.aws import route53
+
+
+def test_get_zones_fetches_record_sets_of_each_zone():
+    # Arrange
+    zones = [{'Id': f'zone-{i}'} for i in range(12)]
+    zone_paginator = mock.MagicMock()
+    zone_paginator.paginate.return_value = [{'HostedZones': zones[:6]}, {'HostedZones': zones[6:]}]
+
+    def _list_resource_record_sets(HostedZoneId, StartRecordName=None, StartRecordType=None):
+        if StartRecordName is None:
+            return {
+                'ResourceRecordSets': [{'Name': f'{HostedZoneId}-a'}],
+                'IsTruncated': True,
+                'NextRecordName': f'{HostedZoneId}-b',
+                'NextRecordType': 'A',
+            }
+        assert (StartRecordName, StartRecordType) == (f'{HostedZoneId}-b', 'A')
+        return {'ResourceRecordSets': [{'Name': f'{HostedZoneId}-b'}], 'IsTruncated': False}
+
+    client = mock.MagicMock()
+    client.get_paginator.return_value = zone_paginator
+    client.list_resource_record_sets.side_effect = _list_resource_record_sets
+
+    # Act
+    with mock.patch.object(route53._RequestRateLimiter, 'wait') as mock_wait:
+        result = route53.get_zones(client)
+
+    # Assert: zones keep their order, and only the requests that were sent went through the rate limiter
+    assert [zone['Id'] for zone, _ in result] == [zone['Id'] for zone in zones]
+    for zone, record_sets in result:
+        assert record_sets == [{'Name': f"{zone['Id']}-a"}, {'Name': f"{zone['Id']}-b"}]
+    assert client.list_resource_record_sets.call_count == len(zones) * 2
+    assert mock_wait.call_count == len(zones) * 2
+
+
+@mock.patch('cartography.intel.aws.route53.time')
+def test_request_rate_limiter_spaces_out_requests(mock_time):
+    mock_time.monotonic.return_value = 100.0
+    limiter = route53._RequestRateLimiter(4)
+
+    for _ in range(3):
+        limiter.wait()
+
+    assert [call.args[0] for call in mock_time.sleep.call_args_list] == [0.25, 0.5]
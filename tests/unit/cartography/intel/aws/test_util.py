@@ -1,6 +1,9 @@
+from unittest.mock import MagicMock
+
 import pytest
 
 from cartography.intel.aws.util.common import parse_and_validate_aws_requested_syncs
+from cartography.intel.aws.util.regions import fetch_regions_concurrently
 
 
 def test_parse_and_validate_requested_syncs():
@@ -17,3 +20,30 @@ def test_parse_and_validate_requested_syncs():
     absolute_garbage = '#@$@#RDFFHKjsdfkjsd,KDFJHW#@,'
     with pytest.raises(ValueError):
         parse_and_validate_aws_requested_syncs(absolute_garbage)
+
+
+def test_fetch_regions_concurrently_preserves_region_order():
+    boto3_session = MagicMock()
+    regions = ['us-east-1', 'us-west-2', 'eu-west-1']
+
+    def get_func(session, region):
+        session.client('ec2', region_name=region)
+        return [region]
+
+    def transform_func(data, region):
+        return [f'{item}-transformed' for item in data]
+
+    result = fetch_regions_concurrently(boto3_session, regions, get_func, transform_func, max_workers=2)
+
+    assert result == [(region, [f'{region}-transformed']) for region in regions]
+    assert boto3_session.client.call_count == len(regions)
+
+
+def test_fetch_regions_concurrently_raises_fetch_errors():
+    def get_func(session, region):
+        if region == 'us-west-2':
+            raise KeyError(region)
+        return []
+
+    with pytest.raises(KeyError):
+        fetch_regions_concurrently(MagicMock(), ['us-east-1', 'us-west-2'], get_func)
@@ -0,0 +1,42 @@
+from unittest.mock import MagicMock
+from unittest.mock import patch
+
+from cartography.intel.azure import storage
+
+TEST_SUBSCRIPTION_ID = '00-00-00-00'
+
+
+@patch('cartography.intel.azure.storage.StorageManagementClient')
+def test_get_client_is_cached(mock_client_class):
+    credentials = MagicMock()
+
+    client_1 = storage.get_client(credentials, TEST_SUBSCRIPTION_ID)
+    client_2 = storage.get_client(credentials, TEST_SUBSCRIPTION_ID)
+    storage.get_client(credentials, 'another-subscription')
+
+    assert client_1 is client_2
+    assert mock_client_class.call_count == 2
+
+
+@patch('cartography.intel.azure.storage.get_blob_services', side_effect=lambda c, s, account: [f"{account['name']}-b"])
+@patch('cartography.intel.azure.storage.get_file_services', side_effect=lambda c, s, account: [f"{account['name']}-f"])
+@patch('cartography.intel.azure.storage.get_table_services', side_effect=lambda c, s, account: [f"{account['name']}-t"])
+@patch('cartography.intel.azure.storage.get_queue_services', side_effect=lambda c, s, account: [f"{account['name']}-q"])
+def test_get_storage_account_details(mock_queues, mock_tables, mock_files, mock_blobs):
+    accounts = [{'id': f'id{i}', 'name': f'sa{i}', 'resourceGroup': 'rg'} for i in range(25)]
+
+    details = storage.get_storage_account_details(MagicMock(), TEST_SUBSCRIPTION_ID, accounts)
+
+    # Services are fetched concurrently but returned in the order of the storage accounts
+    assert details == [
+        (f'id{i}', f'sa{i}', 'rg', [f'sa{i}-q'], [f'sa{i}-t'], [f'sa{i}-f'], [f'sa{i}-b']) for i in range(25)
+    ]
+
+
+@patch('cartography.intel.azure.storage.get_queues', side_effect=lambda c, s, service: [{'name': service['id']}])
+def test_get_queue_services_details(mock_get_queues):
+    queue_services = [{'id': f'qs{i}'} for i in range(15)]
+
+    details = storage.get_queue_services_details(MagicMock(), TEST_SUBSCRIPTION_ID, queue_services)
+
+    assert details == [(f'qs{i}', [{'name': f'qs{i}'}]) for i in range(15)]
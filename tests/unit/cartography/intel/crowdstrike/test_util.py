@@ -0,0 +1,53 @@
+import threading
+from typing import Dict
+from typing import Iterator
+from typing import List
+
+import pytest
+
+from cartography.intel.crowdstrike.util import fetch_and_load
+
+
+def test_fetch_and_load_loads_all_batches_in_order():
+    batches = [[{'id': 1}, {'id': 2}], [{'id': 3}], [{'id': 4}, {'id': 5}]]
+    loaded: List[List[Dict]] = []
+    loader_threads = set()
+
+    def _load(batch: List[Dict]) -> None:
+        loader_threads.add(threading.current_thread())
+        loaded.append(batch)
+
+    count = fetch_and_load(iter(batches), _load, 'test', queue_size=1)
+
+    assert count == 5
+    assert loaded == batches
+    # Loading happens on the calling thread, which owns the Neo4j session
+    assert loader_threads == {threading.current_thread()}
+
+
+def test_fetch_and_load_raises_fetch_errors():
+    def _batches() -> Iterator[List[Dict]]:
+        yield [{'id': 1}]
+        raise ValueError('fetch failed')
+
+    loaded: List[List[Dict]] = []
+    with pytest.raises(ValueError, match='fetch failed'):
+        fetch_and_load(_batches(), loaded.append, 'test')
+    assert loaded == [[{'id': 1}]]
+
+
+def test_fetch_and_load_stops_fetching_on_load_errors():
+    fetched: List[int] = []
+
+    def _batches() -> Iterator[List[Dict]]:
+        for i in range(100):
+            fetched.append(i)
+            yield [{'id': i}]
+
+    def _load(batch: List[Dict]) -> None:
+        raise RuntimeError('load failed')
+
+    with pytest.raises(RuntimeError, match='load failed'):
+        fetch_and_load(_batches(), _load, 'test', queue_size=2)
+    # The fetcher is bounded by the queue, and stops once loading failed
+    assert len(fetched) < 100
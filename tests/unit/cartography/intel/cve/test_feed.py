@@ -1,16 +1,18 @@
 from datetime import datetime
-from datetime import timedelta
 from datetime import timezone
+from typing import Callable
+from unittest.mock import call
 from unittest.mock import Mock
 from unittest.mock import patch
 
+import pytest
 import requests
 
-from cartography.intel.cve.feed import _call_cves_api
-from cartography.intel.cve.feed import _map_cve_dict
-from cartography.intel.cve.feed import get_cves_in_batches
-from cartography.intel.cve.feed import get_modified_cves
-from cartography.intel.cve.feed import get_published_cves_per_year
+from cartography.intel.cve import MODIFIED_DATE_PARAM_NAMES
+from cartography.intel.cve import PUBLISHED_DATE_PARAM_NAMES
+from cartography.intel.cve import start_cve_ingestion
+from cartography.intel.cve.feed import get_date_windows
+from cartography.intel.cve.feed import sync_cve_pages
 from tests.data.cve.feed import GET_CVE_API_DATA
 from tests.data.cve.feed import GET_CVE_API_DATA_BATCH_2
 
@@ -18,9 +20,34 @@ NIST_CVE_URL = "https://services.nvd.nist.gov/rest/json/cves/2.0/"
 API_KEY = "nvd_api_key"
 
 
+def _patch_sync_cve_pages_loaders(func: Callable[..., None]) -> Callable[..., None]:
+    """
+    Patch the Neo4j reads and writes of sync_cve_pages, and keep the raw vulnerabilities of each page as its CVEs.
+    """
+    for decorator in reversed([
+        patch("cartography.intel.cve.feed.delete_cve_sync_checkpoint"),
+        patch("cartography.intel.cve.feed.save_cve_sync_checkpoint"),
+        patch("cartography.intel.cve.feed.get_cve_sync_checkpoint", return_value=None),
+        patch("cartography.intel.cve.feed.load_cves"),
+        patch("cartography.intel.cve.feed.load_cve_feed"),
+        patch("cartography.intel.cve.feed.transform_cves", side_effect=lambda page: page["vulnerabilities"]),
+    ]):
+        func = decorator(func)
+    return func
+
+
 @patch("cartography.intel.cve.feed.DEFAULT_SLEEP_TIME", 0)
 @patch("cartography.intel.cve.feed.requests.get")
-def test_call_cves_api(mock_get: Mock):
+@_patch_sync_cve_pages_loaders
+def test_sync_cve_pages_follows_api_pages(
+    mock_transform_cves: Mock,
+    mock_load_cve_feed: Mock,
+    mock_load_cves: Mock,
+    mock_get_checkpoint: Mock,
+    mock_save_checkpoint: Mock,
+    mock_delete_checkpoint: Mock,
+    mock_get: Mock,
+):
     # Arrange
     mock_response_1 = Mock()
     mock_response_1.status_code = 200
@@ -89,59 +116,46 @@ def test_call_cves_api(mock_get: Mock):
     }
 
     mock_get.side_effect = [mock_response_1, mock_response_2, mock_response_3]
-    params = {"start": "2024-01-10T00:00:00Z", "end": "2024-01-10T23:59:59Z"}
-    expected_result = {
-        "resultsPerPage": 0,
-        "startIndex": 4000,
-        "totalResults": 4000,
-        "format": "NVD_CVE",
-        "version": "2.0",
-        "timestamp": "2024-01-10T19:30:07.520",
-        "vulnerabilities": [
-            {
-                "cve": {
-                    "id": "CVE-2024-001",
-                },
-            },
-            {
-                "cve": {
-                    "id": "CVE-2024-002",
-                },
-            },
-            {
-                "cve": {
-                    "id": "CVE-2024-003",
-                },
-            },
-            {
-                "cve": {
-                    "id": "CVE-2024-004",
-                },
-            },
-            {
-                "cve": {
-                    "id": "CVE-2024-005",
-                },
-            },
-            {
-                "cve": {
-                    "id": "CVE-2024-006",
-                },
-            },
-        ],
-    }
+    neo4j_session = Mock()
 
     # Act
-    result = _call_cves_api(NIST_CVE_URL, API_KEY, params)
+    feed_metadata = sync_cve_pages(
+        neo4j_session,
+        NIST_CVE_URL,
+        API_KEY,
+        datetime(2024, 1, 10, tzinfo=timezone.utc),
+        datetime(2024, 1, 11, tzinfo=timezone.utc),
+        PUBLISHED_DATE_PARAM_NAMES,
+        "2024",
+        1,
+    )
 
-    # Assert
+    # Assert: pages are requested until the start index reaches the total, and each one is loaded as it arrives.
     assert mock_get.call_count == 3
-    assert result == expected_result
+    loaded_ids = [cve["cve"]["id"] for c in mock_load_cves.call_args_list for cve in c.args[1]]
+    assert loaded_ids == [f"CVE-2024-00{i}" for i in range(1, 7)]
+    assert [c.args[4] for c in mock_save_checkpoint.call_args_list] == [2000, 4000, 4000]
+    mock_delete_checkpoint.assert_called_once_with(neo4j_session, "2024")
+    assert feed_metadata == {
+        "FEED_ID": "NIST_NVD",
+        "format": "NVD_CVE",
+        "version": "2.0",
+        "timestamp": "2024-01-10T19:30:07.520",
+    }
 
 
 @patch("cartography.intel.cve.feed.DEFAULT_SLEEP_TIME", 0)
 @patch("cartography.intel.cve.feed.requests.get")
-def test_call_cves_api_with_error(mock_get: Mock):
+@_patch_sync_cve_pages_loaders
+def test_sync_cve_pages_with_error(
+    mock_transform_cves: Mock,
+    mock_load_cve_feed: Mock,
+    mock_load_cves: Mock,
+    mock_get_checkpoint: Mock,
+    mock_save_checkpoint: Mock,
+    mock_delete_checkpoint: Mock,
+    mock_get: Mock,
+):
     # Arrange
     mock_response = Mock()
     mock_response.status_code = 404
@@ -150,78 +164,239 @@ def test_call_cves_api_with_error(mock_get: Mock):
         response=mock_response,
     )
     mock_get.return_value = mock_response
-    params = {"start": "2024-01-10T00:00:00Z", "end": "2024-01-10T23:59:59Z"}
 
     # Act
-    try:
-        _call_cves_api(NIST_CVE_URL, API_KEY, params)
-    except requests.exceptions.HTTPError as err:
-        assert err.response == mock_response
+    with pytest.raises(requests.exceptions.HTTPError) as err:
+        sync_cve_pages(
+            Mock(),
+            NIST_CVE_URL,
+            API_KEY,
+            datetime(2024, 1, 10, tzinfo=timezone.utc),
+            datetime(2024, 1, 11, tzinfo=timezone.utc),
+            PUBLISHED_DATE_PARAM_NAMES,
+            "2024",
+            1,
+        )
+
+    # Assert: the request is retried MAX_RETRIES times, and the checkpoint is kept to resume from.
+    assert err.value.response == mock_response
     assert mock_get.call_count == 3
+    mock_load_cves.assert_not_called()
+    mock_delete_checkpoint.assert_not_called()
 
 
-@patch("cartography.intel.cve.feed._call_cves_api")
-def test_get_cves_in_batches(mock_call_cves_api: Mock):
+@patch("cartography.intel.cve.feed.get_cve_pages")
+@_patch_sync_cve_pages_loaders
+def test_sync_cve_pages_in_batches(
+    mock_transform_cves: Mock,
+    mock_load_cve_feed: Mock,
+    mock_load_cves: Mock,
+    mock_get_checkpoint: Mock,
+    mock_save_checkpoint: Mock,
+    mock_delete_checkpoint: Mock,
+    mock_get_cve_pages: Mock,
+):
     """
-    Ensure that we get the correct number of CVEs in batches of 120 days
+    Ensure that CVEs are queried in windows of 120 days
     """
     # Arrange
-    mock_call_cves_api.side_effect = [
-        GET_CVE_API_DATA,
-        GET_CVE_API_DATA_BATCH_2,
-    ]
-    start_date = datetime.strptime("2024-01-01T00:00:00Z", "%Y-%m-%dT%H:%M:%SZ")
-    end_date = datetime.strptime("2024-05-01T00:00:00Z", "%Y-%m-%dT%H:%M:%SZ")
-    date_param_names = {
-        "start": "startDate",
-        "end": "endDate",
-    }
-    excepted_cves = GET_CVE_API_DATA.copy()
-    _map_cve_dict(excepted_cves, GET_CVE_API_DATA_BATCH_2)
+    mock_get_cve_pages.side_effect = [iter([GET_CVE_API_DATA]), iter([GET_CVE_API_DATA_BATCH_2])]
+    neo4j_session = Mock()
+    start_date = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    end_date = datetime(2024, 5, 1, tzinfo=timezone.utc)
+
     # Act
-    cves = get_cves_in_batches(
-        NIST_CVE_URL, start_date, end_date, date_param_names, API_KEY,
+    sync_cve_pages(
+        neo4j_session, NIST_CVE_URL, API_KEY, start_date, end_date, PUBLISHED_DATE_PARAM_NAMES, "2024", 1,
     )
+
     # Assert
-    assert mock_call_cves_api.call_count == 2
-    assert cves == excepted_cves
+    assert mock_get_cve_pages.call_count == 2
+    assert mock_load_cves.call_args_list == [
+        call(neo4j_session, GET_CVE_API_DATA["vulnerabilities"], "NIST_NVD", 1),
+        call(neo4j_session, GET_CVE_API_DATA_BATCH_2["vulnerabilities"], "NIST_NVD", 1),
+    ]
 
 
-@patch("cartography.intel.cve.feed._call_cves_api")
-def test_get_modified_cves(mock_call_cves_api: Mock):
-    # Arrange
-    mock_call_cves_api.side_effect = [GET_CVE_API_DATA]
-    last_modified_date = datetime.now(tz=timezone.utc) + timedelta(days=-1)
-    last_modified_date_iso8601 = last_modified_date.strftime("%Y-%m-%dT%H:%M:%S")
-    current_date_iso8601 = datetime.now(tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%S")
-    expected_params = {
-        "lastModStartDate": last_modified_date_iso8601,
-        "lastModEndDate": current_date_iso8601,
+@patch("cartography.intel.cve.feed.DEFAULT_SLEEP_TIME", 0)
+@patch("cartography.intel.cve.feed.requests.get")
+@_patch_sync_cve_pages_loaders
+def test_sync_cve_pages_query_params(
+    mock_transform_cves: Mock,
+    mock_load_cve_feed: Mock,
+    mock_load_cves: Mock,
+    mock_get_checkpoint: Mock,
+    mock_save_checkpoint: Mock,
+    mock_delete_checkpoint: Mock,
+    mock_get: Mock,
+):
+    # Arrange: a single page of modified CVEs
+    mock_get.return_value.json.return_value = {
+        **GET_CVE_API_DATA, "resultsPerPage": 0, "startIndex": 0, "totalResults": 0,
     }
+    start_date = datetime(2024, 1, 9, 12, 30, tzinfo=timezone.utc)
+    end_date = datetime(2024, 1, 10, 12, 30, tzinfo=timezone.utc)
+
     # Act
-    cves = get_modified_cves(NIST_CVE_URL, last_modified_date_iso8601, API_KEY)
+    sync_cve_pages(
+        Mock(), NIST_CVE_URL, API_KEY, start_date, end_date, MODIFIED_DATE_PARAM_NAMES, "modified", 1,
+    )
+
     # Assert
-    mock_call_cves_api.assert_called_once_with(NIST_CVE_URL, API_KEY, expected_params)
-    assert cves == GET_CVE_API_DATA
+    mock_get.assert_called_once()
+    params = mock_get.call_args.kwargs["params"]
+    assert params["lastModStartDate"] == "2024-01-09T12:30:00"
+    assert params["lastModEndDate"] == "2024-01-10T12:30:00"
+    assert mock_get.call_args.kwargs["headers"]["apiKey"] == API_KEY
 
 
-@patch("cartography.intel.cve.feed._call_cves_api")
-def test_get_published_cves_per_year(mock_call_cves_api: Mock):
-    # Arrange
-    no_cves = {
-        "resultsPerPage": 0,
-        "startIndex": 4000,
-        "totalResults": 4000,
+def test_get_date_windows():
+    start_date = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    end_date = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+    windows = list(get_date_windows(start_date, end_date))
+
+    assert windows == [
+        (datetime(2024, 1, 1, tzinfo=timezone.utc), datetime(2024, 4, 30, tzinfo=timezone.utc)),
+        (datetime(2024, 4, 30, tzinfo=timezone.utc), datetime(2024, 8, 28, tzinfo=timezone.utc)),
+        (datetime(2024, 8, 28, tzinfo=timezone.utc), datetime(2024, 12, 26, tzinfo=timezone.utc)),
+        (datetime(2024, 12, 26, tzinfo=timezone.utc), datetime(2025, 1, 1, tzinfo=timezone.utc)),
+    ]
+
+
+@patch("cartography.intel.cve.feed.delete_cve_sync_checkpoint")
+@patch("cartography.intel.cve.feed.save_cve_sync_checkpoint")
+@patch("cartography.intel.cve.feed.get_cve_sync_checkpoint", return_value=None)
+@patch("cartography.intel.cve.feed.load_cves")
+@patch("cartography.intel.cve.feed.load_cve_feed")
+@patch("cartography.intel.cve.feed.transform_cves", side_effect=lambda page: page["vulnerabilities"])
+@patch("cartography.intel.cve.feed.get_cve_pages")
+def test_sync_cve_pages_loads_each_page_as_it_is_fetched(
+    mock_get_cve_pages: Mock,
+    mock_transform_cves: Mock,
+    mock_load_cve_feed: Mock,
+    mock_load_cves: Mock,
+    mock_get_checkpoint: Mock,
+    mock_save_checkpoint: Mock,
+    mock_delete_checkpoint: Mock,
+):
+    # Arrange: a year with a single window of two pages
+    start_date = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    end_date = datetime(2024, 3, 1, tzinfo=timezone.utc)
+    mock_get_cve_pages.return_value = iter([GET_CVE_API_DATA, GET_CVE_API_DATA_BATCH_2])
+    neo4j_session = Mock()
+
+    # Act
+    feed_metadata = sync_cve_pages(
+        neo4j_session, NIST_CVE_URL, API_KEY, start_date, end_date, {"start": "s", "end": "e"}, "2024", 1,
+    )
+
+    # Assert
+    mock_get_cve_pages.assert_called_once_with(
+        NIST_CVE_URL, start_date, end_date, {"start": "s", "end": "e"}, API_KEY, 0,
+    )
+    assert mock_load_cves.call_args_list == [
+        call(neo4j_session, GET_CVE_API_DATA["vulnerabilities"], "NIST_NVD", 1),
+        call(neo4j_session, GET_CVE_API_DATA_BATCH_2["vulnerabilities"], "NIST_NVD", 1),
+    ]
+    # A checkpoint pointing to the next page is saved after loading each page, and removed at the end.
+    assert mock_save_checkpoint.call_args_list == [
+        call(neo4j_session, "2024", start_date, end_date, 5, 1),
+        call(neo4j_session, "2024", start_date, end_date, 10, 1),
+    ]
+    mock_delete_checkpoint.assert_called_once_with(neo4j_session, "2024")
+    assert feed_metadata == {
+        "FEED_ID": "NIST_NVD",
         "format": "NVD_CVE",
         "version": "2.0",
-        "timestamp": "2024-01-10T19:30:07.520",
-        "vulnerabilities": [],
+        "timestamp": GET_CVE_API_DATA_BATCH_2["timestamp"],
     }
-    expected_cves = GET_CVE_API_DATA.copy()
-    _map_cve_dict(expected_cves, no_cves)
-    mock_call_cves_api.side_effect = [GET_CVE_API_DATA, no_cves, no_cves, no_cves]
+
+
+@patch("cartography.intel.cve.feed.delete_cve_sync_checkpoint")
+@patch("cartography.intel.cve.feed.save_cve_sync_checkpoint")
+@patch("cartography.intel.cve.feed.get_cve_sync_checkpoint")
+@patch("cartography.intel.cve.feed.load_cves")
+@patch("cartography.intel.cve.feed.load_cve_feed")
+@patch("cartography.intel.cve.feed.transform_cves", return_value=[])
+@patch("cartography.intel.cve.feed.get_cve_pages", return_value=iter([]))
+def test_sync_cve_pages_resumes_from_checkpoint(
+    mock_get_cve_pages: Mock,
+    mock_transform_cves: Mock,
+    mock_load_cve_feed: Mock,
+    mock_load_cves: Mock,
+    mock_get_checkpoint: Mock,
+    mock_save_checkpoint: Mock,
+    mock_delete_checkpoint: Mock,
+):
+    # Arrange: the previous sync stopped in the second window of the year
+    date_param_names = {"start": "s", "end": "e"}
+    mock_get_checkpoint.return_value = {
+        "window_start": datetime(2024, 4, 30, tzinfo=timezone.utc),
+        "window_end": datetime(2024, 8, 28, tzinfo=timezone.utc),
+        "start_index": 4000,
+    }
+
     # Act
-    cves = get_published_cves_per_year(NIST_CVE_URL, "2024", API_KEY)
-    # Assert
-    mock_call_cves_api.call_count == 4
-    assert cves == expected_cves
+    sync_cve_pages(
+        Mock(),
+        NIST_CVE_URL,
+        API_KEY,
+        datetime(2024, 1, 1, tzinfo=timezone.utc),
+        datetime(2025, 1, 1, tzinfo=timezone.utc),
+        date_param_names,
+        "2024",
+        1,
+    )
+
+    # Assert: the interrupted window continues at the saved index, the following windows start from the beginning.
+    assert mock_get_cve_pages.call_args_list == [
+        call(
+            NIST_CVE_URL,
+            datetime(2024, 4, 30, tzinfo=timezone.utc),
+            datetime(2024, 8, 28, tzinfo=timezone.utc),
+            date_param_names,
+            API_KEY,
+            4000,
+        ),
+        call(
+            NIST_CVE_URL,
+            datetime(2024, 8, 28, tzinfo=timezone.utc),
+            datetime(2024, 12, 26, tzinfo=timezone.utc),
+            date_param_names,
+            API_KEY,
+            0,
+        ),
+        call(
+            NIST_CVE_URL,
+            datetime(2024, 12, 26, tzinfo=timezone.utc),
+            datetime(2025, 1, 1, tzinfo=timezone.utc),
+            date_param_names,
+            API_KEY,
+            0,
+        ),
+    ]
+    mock_delete_checkpoint.assert_called_once()
+
+
+@patch("cartography.intel.cve.merge_module_sync_metadata")
+@patch("cartography.intel.cve.feed.sync_cve_pages", return_value=None)
+@patch("cartography.intel.cve.feed.get_last_modified_cve_date", return_value="2024-01-09T12:30:00")
+@patch("cartography.intel.cve.feed.get_cve_sync_metadata", return_value=list(range(2002, datetime.now().year + 1)))
+def test_start_cve_ingestion_records_modified_sync_without_pages(
+    mock_get_cve_sync_metadata: Mock,
+    mock_get_last_modified_cve_date: Mock,
+    mock_sync_cve_pages: Mock,
+    mock_merge_module_sync_metadata: Mock,
+):
+    # Arrange: all years are synced, and no CVE was modified since the last sync
+    config = Mock(cve_enabled=True, cve_api_key=API_KEY, nist_cve_url=NIST_CVE_URL, update_tag=1)
+
+    # Act
+    start_cve_ingestion(Mock(), config)
+
+    # Assert: the modified sync is recorded all the same
+    mock_sync_cve_pages.assert_called_once()
+    mock_merge_module_sync_metadata.assert_called_once()
+    assert mock_merge_module_sync_metadata.call_args.kwargs["synced_type"] == "modified"
+    assert mock_merge_module_sync_metadata.call_args.kwargs["group_id"] == str(datetime.now(tz=timezone.utc).year)
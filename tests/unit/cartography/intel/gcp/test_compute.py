@@ -1,4 +1,8 @@
+import copy
+from unittest.mock import MagicMock
+
 import cartography.intel.gcp.compute
+from tests.data.gcp.compute import GCP_LIST_INSTANCES_RESPONSE
 from tests.data.gcp.compute import LIST_FIREWALLS_RESPONSE
 from tests.data.gcp.compute import VPC_RESPONSE
 from tests.data.gcp.compute import VPC_SUBNET_RESPONSE
@@ -63,3 +67,117 @@ def test_transform_gcp_firewall():
     assert sample_fw_icmp_rule['fromport'] is None
     assert sample_fw_icmp_rule['toport'] is None
     assert sample_fw_icmp_rule['protocol'] == 'icmp'
+
+
+def test_transform_gcp_instance_children():
+    """
+    Ensure that the network tags, NICs and access configs of GCP instances are flattened with the ids that the
+    batched loader merges on.
+    """
+    instances = cartography.intel.gcp.compute.transform_gcp_instances([copy.deepcopy(GCP_LIST_INSTANCES_RESPONSE)])
+    instance_1 = 'projects/project-abc/zones/europe-west2-b/instances/instance-1'
+
+    tags = cartography.intel.gcp.compute.transform_gcp_instance_network_tags(instances)
+    assert tags == [{
+        'tag_id': 'projects/project-abc/global/networks/default/tags/test',
+        'value': 'test',
+        'instance_partial_uri': instance_1,
+        'vpc_partial_uri': 'projects/project-abc/global/networks/default',
+    }]
+
+    nics = cartography.intel.gcp.compute.transform_gcp_instance_nics(instances)
+    assert {(nic['nic_id'], nic['networkIP'], nic['subnet_partial_uri']) for nic in nics} == {
+        (
+            f'{instance_1}/networkinterfaces/nic0',
+            '10.0.0.2',
+            'projects/project-abc/regions/europe-west2/subnetworks/default',
+        ),
+        (
+            'projects/project-abc/zones/europe-west2-b/instances/instance-1-test/networkinterfaces/nic0',
+            '10.0.0.3',
+            'projects/project-abc/regions/europe-west2/subnetworks/default',
+        ),
+    }
+
+    access_configs = cartography.intel.gcp.compute.transform_gcp_nic_access_configs(nics)
+    assert {(ac['access_config_id'], ac['nic_id'], ac['natIP']) for ac in access_configs} == {
+        (
+            f'{instance_1}/networkinterfaces/nic0/accessconfigs/ONE_TO_ONE_NAT',
+            f'{instance_1}/networkinterfaces/nic0',
+            '1.2.3.4',
+        ),
+        (
+            'projects/project-abc/zones/europe-west2-b/instances/instance-1-test/networkinterfaces/nic0/accessconfigs/'
+            'ONE_TO_ONE_NAT',
+            'projects/project-abc/zones/europe-west2-b/instances/instance-1-test/networkinterfaces/nic0',
+            '1.3.4.5',
+        ),
+    }
+
+
+def test_get_gcp_instance_responses_follows_aggregated_list_pages():
+    """
+    Ensure that instances are fetched with the paginated aggregated list, and regrouped into one response object per
+    zone of the project.
+    """
+    compute = MagicMock()
+    instances = compute.instances.return_value
+    page_1 = {
+        'items': {
+            'zones/us-east1-b': {'instances': [{'name': 'instance-1'}]},
+            'zones/us-west1-a': {'warning': {'code': 'NO_RESULTS_ON_PAGE'}},
+        },
+        'nextPageToken': 'token',
+    }
+    page_2 = {
+        'items': {
+            'zones/us-east1-b': {'instances': [{'name': 'instance-2'}]},
+            'zones/europe-west2-b': {'instances': [{'name': 'instance-3'}]},
+        },
+    }
+    instances.aggregatedList.return_value.execute.return_value = page_1
+    page_2_request = MagicMock()
+    page_2_request.execute.return_value = page_2
+    instances.aggregatedList_next.side_effect = [page_2_request, None]
+    zones = [{'name': 'us-east1-b'}, {'name': 'us-west1-a'}]
+
+    responses = cartography.intel.gcp.compute.get_gcp_instance_responses('project-abc', zones, compute)
+
+    instances.aggregatedList.assert_called_once_with(project='project-abc')
+    assert instances.aggregatedList_next.call_count == 2
+    # europe-west2-b is not one of the project's zones
+    assert responses == [
+        {
+            'id': 'projects/project-abc/zones/us-east1-b/instances',
+            'items': [{'name': 'instance-1'}, {'name': 'instance-2'}],
+        },
+        {
+            'id': 'projects/project-abc/zones/us-west1-a/instances',
+            'items': [],
+        },
+    ]
+    instance_list = cartography.intel.gcp.compute.transform_gcp_instances(responses)
+    assert [instance['zone_name'] for instance in instance_list] == ['us-east1-b', 'us-east1-b']
+
+
+def test_get_gcp_vpcs_follows_list_pages():
+    compute = MagicMock()
+    networks = compute.networks.return_value
+    networks.list.return_value.execute.return_value = {
+        'id': 'projects/project-abc/global/networks',
+        'items': [{'name': 'vpc-1'}],
+        'nextPageToken': 'token',
+    }
+    page_2_request = MagicMock()
+    page_2_request.execute.return_value = {
+        'id': 'projects/project-abc/global/networks',
+        'items': [{'name': 'vpc-2'}],
+    }
+    networks.list_next.side_effect = [page_2_request, None]
+
+    response = cartography.intel.gcp.compute.get_gcp_vpcs('project-abc', compute)
+
+    assert response == {
+        'id': 'projects/project-abc/global/networks',
+        'items': [{'name': 'vpc-1'}, {'name': 'vpc-2'}],
+    }
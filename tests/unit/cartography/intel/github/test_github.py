@@ -1,5 +1,4 @@
 import typing
-from copy import deepcopy
 from datetime import datetime
 from datetime import timedelta
 from datetime import timezone as tz
@@ -10,17 +9,17 @@ import pytest
 from requests import Response
 from requests.exceptions import HTTPError
 
-from cartography.intel.github.util import _GRAPHQL_RATE_LIMIT_REMAINING_THRESHOLD
+from cartography.intel.github.util import call_github_api
 from cartography.intel.github.util import fetch_all
-from cartography.intel.github.util import handle_rate_limit_sleep
-from tests.data.github.rate_limit import RATE_LIMIT_RESPONSE_JSON
+from cartography.intel.github.util import get_rate_limiter
+from cartography.intel.github.util import GitHubRateLimiter
 
 
-@patch('cartography.intel.github.util.handle_rate_limit_sleep')
+@patch('cartography.intel.github.util.time.sleep')
 @patch('cartography.intel.github.util.fetch_page')
 def test_fetch_all_handles_retries(
     mock_fetch_page: Mock,
-    mock_handle_rate_limit_sleep: Mock,
+    mock_sleep: Mock,
 ) -> None:
     '''
     Ensures that fetch_all re-reaises the same exceptions when exceeding retry limit
@@ -35,58 +34,99 @@ def test_fetch_all_handles_retries(
     with pytest.raises(exception) as excinfo:
         fetch_all('my-token', 'my-api_url', 'my-org', 'my-query', 'my-resource', retries=retries)
     # Assert
-    assert mock_handle_rate_limit_sleep.call_count == retries
+    assert mock_sleep.call_count == retries - 1
     assert mock_fetch_page.call_count == retries
     assert 'my-error' in str(excinfo.value)
 
 
-@typing.no_type_check
-@patch('cartography.intel.github.util.time.sleep')
-@patch('cartography.intel.github.util.datetime')
-@patch('cartography.intel.github.util.requests.get')
-def test_handle_rate_limit_sleep(
-    mock_requests_get: Mock,
-    mock_datetime: Mock,
-    mock_sleep: Mock,
+@patch('cartography.intel.github.util.fetch_page')
+def test_fetch_all_stop_paging(
+    mock_fetch_page: Mock,
 ) -> None:
     '''
-    Ensure we sleep to avoid the rate limit
+    Ensures that fetch_all stops fetching pages as soon as stop_paging returns True
     '''
     # Arrange
-    mock_datetime.fromtimestamp = datetime.fromtimestamp
-    now = datetime(year=2040, month=1, day=1, hour=19, minute=0, second=0, tzinfo=tz.utc)
-    mock_datetime.now = Mock(return_value=now)
-    reset = (now + timedelta(minutes=47)).timestamp()
-    # sleep for one extra minute for safety
-    expected_sleep_seconds = timedelta(minutes=48).seconds
-
-    # above threshold
-    resp_0 = deepcopy(RATE_LIMIT_RESPONSE_JSON)
-    resp_0['resources']['graphql']['remaining'] = _GRAPHQL_RATE_LIMIT_REMAINING_THRESHOLD + 1
-    resp_0['resources']['graphql']['reset'] = reset
-
-    # below threshold
-    resp_1 = deepcopy(RATE_LIMIT_RESPONSE_JSON)
-    resp_1['resources']['graphql']['remaining'] = _GRAPHQL_RATE_LIMIT_REMAINING_THRESHOLD - 1
-    resp_1['resources']['graphql']['reset'] = reset
-
-    mock_requests_get.side_effect = [
-        Mock(json=Mock(return_value=resp_0)),
-        Mock(json=Mock(return_value=resp_1)),
-    ]
+    def _page(names, cursor):
+        return {
+            'data': {
+                'organization': {
+                    'url': 'https://github.com/my-org',
+                    'login': 'my-org',
+                    'my-resource': {
+                        'pageInfo': {'endCursor': cursor, 'hasNextPage': True},
+                        'nodes': [{'name': name} for name in names],
+                    },
+                },
+            },
+        }
+    mock_fetch_page.side_effect = [_page(['a', 'b'], 'c1'), _page(['c', 'stop'], 'c2'), _page(['d'], 'c3')]
 
     # Act
-    handle_rate_limit_sleep('my-token')
+    data, _ = fetch_all(
+        'my-token', 'my-api_url', 'my-org', 'my-query', 'my-resource',
+        stop_paging=lambda nodes: any(node['name'] == 'stop' for node in nodes),
+    )
+
+    # Assert
+    assert mock_fetch_page.call_count == 2
+    assert [node['name'] for node in data.nodes] == ['a', 'b', 'c', 'stop']
+
+
+@typing.no_type_check
+@patch('cartography.intel.github.util.time.sleep')
+def test_rate_limiter_wait(mock_sleep: Mock) -> None:
+    '''
+    Ensure the rate limiter only sleeps when the predicted cost of the next query would cross the threshold
+    '''
+    # Arrange
+    limiter = GitHubRateLimiter(threshold=100)
+    reset_at = datetime.now(tz.utc) + timedelta(minutes=30)
+    limiter.update_from_graphql(
+        'my-query',
+        {'data': {'rateLimit': {'cost': 50, 'remaining': 160, 'resetAt': reset_at.isoformat().replace('+00:00', 'Z')}}},
+    )
+
+    # Act: no state yet for an unseen token, nothing to wait for
+    GitHubRateLimiter().wait('my-query')
+    # Act: 160 - 50 is above the threshold, the cost is reserved
+    limiter.wait('my-query')
     # Assert
-    mock_datetime.now.assert_not_called()
     mock_sleep.assert_not_called()
+    assert limiter.remaining == 110
+
+    # Act: an unseen query is predicted to cost 1
+    limiter.wait('my-other-query')
+    # Assert
+    mock_sleep.assert_not_called()
+    assert limiter.remaining == 109
+
+    # Act: 109 - 50 is under the threshold
+    limiter.wait('my-query')
+    # Assert
+    mock_sleep.assert_called_once()
+    assert 30 * 60 < mock_sleep.call_args[0][0] <= 31 * 60
 
-    # reset mocks
-    mock_datetime.reset_mock()
-    mock_sleep.reset_mock()
+
+@typing.no_type_check
+@patch('cartography.intel.github.util.get_session')
+def test_call_github_api_updates_rate_limiter(mock_get_session: Mock) -> None:
+    '''
+    Ensure the rate limiter of the token is updated from the response headers, without an extra rate limit request
+    '''
+    # Arrange
+    reset = int((datetime.now(tz.utc) + timedelta(minutes=10)).timestamp())
+    mock_get_session.return_value.post.return_value = Mock(
+        headers={'x-ratelimit-remaining': '4321', 'x-ratelimit-reset': str(reset)},
+        json=Mock(return_value={'data': {}}),
+    )
 
     # Act
-    handle_rate_limit_sleep('my-token')
+    call_github_api('my-query', '{}', 'my-token-for-headers', 'my-api_url')
+
     # Assert
-    mock_datetime.now.assert_called_once_with(tz.utc)
-    mock_sleep.assert_called_once_with(expected_sleep_seconds)
+    mock_get_session.return_value.post.assert_called_once()
+    mock_get_session.return_value.get.assert_not_called()
+    limiter = get_rate_limiter('my-token-for-headers')
+    assert limiter.remaining == 4321
+    assert limiter.reset_at == datetime.fromtimestamp(reset, tz=tz.utc)
@@ -0,0 +1,130 @@
+from unittest.mock import call
+from unittest.mock import MagicMock
+from unittest.mock import patch
+
+from cartography.intel.github.repos import get_changed
+from cartography.intel.github.repos import get_watermark_from_repos
+from cartography.intel.github.repos import GITHUB_ORG_REPOS_PAGINATED_GRAPHQL
+from cartography.intel.github.repos import sync
+from cartography.intel.github.util import PaginatedGraphqlData
+
+TEST_ORG_DATA = {
+    'url': 'https://github.com/testorg',
+    'login': 'testorg',
+}
+TEST_UPDATE_TAG = 123456789
+
+
+def _repo(name, updated_at, pushed_at):
+    return {'url': f'https://github.com/testorg/{name}', 'updatedAt': updated_at, 'pushedAt': pushed_at}
+
+
+@patch('cartography.intel.github.repos.fetch_all')
+def test_get_changed(mock_fetch_all):
+    # Arrange: repo-1 was updated, repo-2 was pushed to and repo-3 did not change since the watermark.
+    watermark = '2024-01-01T00:00:00Z'
+    repo_1 = _repo('repo-1', '2024-02-01T00:00:00Z', '2023-01-01T00:00:00Z')
+    repo_2 = _repo('repo-2', '2023-06-01T00:00:00Z', '2024-03-01T00:00:00Z')
+    repo_3 = _repo('repo-3', '2023-05-01T00:00:00Z', None)
+    mock_fetch_all.side_effect = [
+        (PaginatedGraphqlData(nodes=[repo_1, repo_2, repo_3], edges=[]), TEST_ORG_DATA),
+        (PaginatedGraphqlData(nodes=[repo_2, repo_1], edges=[]), TEST_ORG_DATA),
+    ]
+
+    # Act
+    repos = get_changed('test-token', 'https://api.github.com/graphql', 'testorg', watermark)
+
+    # Assert
+    assert repos == [repo_1, repo_2]
+    orders = [c.kwargs['orderBy'] for c in mock_fetch_all.call_args_list]
+    assert orders == [{'field': 'UPDATED_AT', 'direction': 'DESC'}, {'field': 'PUSHED_AT', 'direction': 'DESC'}]
+    assert mock_fetch_all.call_args_list[0].args[3] == GITHUB_ORG_REPOS_PAGINATED_GRAPHQL
+    # Each pass stops paginating at the first page holding a repo older than the watermark.
+    stop_updated = mock_fetch_all.call_args_list[0].kwargs['stop_paging']
+    stop_pushed = mock_fetch_all.call_args_list[1].kwargs['stop_paging']
+    assert not stop_updated([repo_1])
+    assert stop_updated([repo_1, repo_2])
+    assert not stop_pushed([repo_2])
+    assert stop_pushed([repo_2, repo_1])
+    assert stop_pushed([repo_3])
+
+
+def test_get_watermark_from_repos():
+    assert get_watermark_from_repos([]) is None
+    assert get_watermark_from_repos([
+        _repo('repo-1', '2024-02-01T00:00:00Z', '2023-01-01T00:00:00Z'),
+        _repo('repo-2', '2023-06-01T00:00:00Z', '2024-03-01T00:00:00Z'),
+        _repo('repo-3', '2023-05-01T00:00:00Z', None),
+    ]) == '2024-03-01T00:00:00Z'
+
+
+@patch('cartography.intel.github.repos.save_repos_watermark')
+@patch('cartography.intel.github.repos.run_cleanup_job')
+@patch('cartography.intel.github.repos.load')
+@patch('cartography.intel.github.repos.transform')
+@patch('cartography.intel.github.repos.load_unchanged_repos')
+@patch('cartography.intel.github.repos.get_repo_urls')
+@patch('cartography.intel.github.repos.get_changed')
+@patch('cartography.intel.github.repos.get')
+@patch('cartography.intel.github.repos.get_repos_watermark', return_value='2024-01-01T00:00:00Z')
+def test_sync_incremental(
+    mock_get_repos_watermark,
+    mock_get,
+    mock_get_changed,
+    mock_get_repo_urls,
+    mock_load_unchanged_repos,
+    mock_transform,
+    mock_load,
+    mock_run_cleanup_job,
+    mock_save_repos_watermark,
+):
+    # Arrange
+    neo4j_session = MagicMock()
+    changed_repo = _repo('repo-1', '2024-02-01T00:00:00Z', '2024-01-15T00:00:00Z')
+    mock_get_changed.return_value = [changed_repo]
+    mock_get_repo_urls.return_value = [changed_repo['url'], 'https://github.com/testorg/repo-2']
+    common_job_parameters = {'UPDATE_TAG': TEST_UPDATE_TAG}
+
+    # Act
+    sync(neo4j_session, common_job_parameters, 'test-token', 'test-url', 'testorg', incremental=True)
+
+    # Assert: only the changed repo is fetched in full, the other one is kept fresh, and the watermark moves forward.
+    mock_get.assert_not_called()
+    mock_get_changed.assert_called_once_with('test-token', 'test-url', 'testorg', '2024-01-01T00:00:00Z')
+    mock_load_unchanged_repos.assert_called_once_with(
+        neo4j_session, TEST_UPDATE_TAG, ['https://github.com/testorg/repo-2'],
+    )
+    mock_transform.assert_called_once_with([changed_repo])
+    mock_run_cleanup_job.assert_called_once()
+    assert mock_save_repos_watermark.call_args == call(
+        neo4j_session, 'testorg', '2024-02-01T00:00:00Z', TEST_UPDATE_TAG,
+    )
+
+
+@patch('cartography.intel.github.repos.save_repos_watermark')
+@patch('cartography.intel.github.repos.run_cleanup_job')
+@patch('cartography.intel.github.repos.load')
+@patch('cartography.intel.github.repos.transform')
+@patch('cartography.intel.github.repos.get_changed')
+@patch('cartography.intel.github.repos.get')
+@patch('cartography.intel.github.repos.get_repos_watermark', return_value=None)
+def test_sync_incremental_first_run_is_full(
+    mock_get_repos_watermark,
+    mock_get,
+    mock_get_changed,
+    mock_transform,
+    mock_load,
+    mock_run_cleanup_job,
+    mock_save_repos_watermark,
+):
+    # Arrange
+    neo4j_session = MagicMock()
+    mock_get.return_value = [_repo('repo-1', '2024-02-01T00:00:00Z', '2024-01-15T00:00:00Z')]
+
+    # Act
+    sync(neo4j_session, {'UPDATE_TAG': TEST_UPDATE_TAG}, 'test-token', 'test-url', 'testorg', incremental=True)
+
+    # Assert
+    mock_get.assert_called_once_with('test-token', 'test-url', 'testorg')
+    mock_get_changed.assert_not_called()
+    mock_save_repos_watermark.assert_called_once_with(neo4j_session, 'testorg', '2024-02-01T00:00:00Z', TEST_UPDATE_TAG)
@@ -92,6 +92,36 @@ def test_get_team_repos_github_returns_none(mock_sleep, mock_get_team_repos):
     assert mock_sleep.call_count == 4
 
 
+@patch('cartography.intel.github.teams._get_team_repos')
+def test_get_team_repos_multiple_teams_concurrently(mock_get_team_repos):
+    # Arrange
+    team_data = [
+        {'slug': f'team{i}', 'repositories': {'totalCount': 0 if i == 3 else 1}} for i in range(10)
+    ]
+
+    def _team_repos(org, api_url, token, team):
+        team_repos = MagicMock()
+        team_repos.nodes = [{'url': f'https://github.com/org/{team}-repo'}]
+        team_repos.edges = [{'permission': 'ADMIN'}]
+        return team_repos
+    mock_get_team_repos.side_effect = _team_repos
+
+    # Act
+    result = _get_team_repos_for_multiple_teams(
+        team_data,
+        'test-org',
+        'https://api.github.com',
+        'test-token',
+        max_workers=4,
+    )
+
+    # Assert that every team gets its own repos, in the order of the input teams
+    assert list(result) == [f'team{i}' for i in range(10)]
+    assert result['team3'] == []
+    assert result['team7'] == [RepoPermission('https://github.com/org/team7-repo', 'ADMIN')]
+    assert mock_get_team_repos.call_count == 9
+
+
 def test_transform_teams_empty_team_data():
     # Arrange
     team_paginated_data = PaginatedGraphqlData(nodes=[], edges=[])
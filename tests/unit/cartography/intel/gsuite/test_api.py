@@ -199,3 +199,84 @@ def test_transform_users():
     ]
     result = api.transform_users(param)
     assert result == expected
+
+
+def test_get_members_for_groups():
+    # group1 has two pages of members
+    pages = {
+        ('group1@test.lyft.com', None): {'members': [{'id': 'user1'}], 'nextPageToken': 'token'},
+        ('group1@test.lyft.com', 'token'): {'members': [{'id': 'user2'}]},
+        ('group2@test.lyft.com', None): {'members': [{'id': 'group1'}]},
+        ('group3@test.lyft.com', None): {},
+    }
+
+    def _request(group_key, page_token=None):
+        request = mock.MagicMock()
+        request.group_key = group_key
+        request.page_token = page_token
+        request.execute.return_value = pages[(group_key, page_token)]
+        return request
+
+    client = mock.MagicMock()
+    client.members().list.side_effect = lambda groupKey, maxResults: _request(groupKey)
+    client.members().list_next.side_effect = lambda request, resp: (
+        _request(request.group_key, resp['nextPageToken']) if 'nextPageToken' in resp else None
+    )
+
+    batch_sizes = []
+
+    def _new_batch_http_request(callback):
+        added = []
+        batch_request = mock.MagicMock()
+        batch_request.add.side_effect = lambda request, request_id: added.append((request_id, request))
+
+        def _execute():
+            batch_sizes.append(len(added))
+            for request_id, request in added:
+                if request.group_key == 'group2@test.lyft.com':
+                    # A failed call in the batch is retried on its own
+                    callback(request_id, None, Exception('rate limited'))
+                else:
+                    callback(request_id, pages[(request.group_key, request.page_token)], None)
+        batch_request.execute.side_effect = _execute
+        return batch_request
+    client.new_batch_http_request.side_effect = _new_batch_http_request
+
+    result = api.get_members_for_groups(
+        client, ['group1@test.lyft.com', 'group2@test.lyft.com', 'group3@test.lyft.com'], batch_size=2,
+    )
+
+    assert result == {
+        'group1@test.lyft.com': [{'id': 'user1'}, {'id': 'user2'}],
+        'group2@test.lyft.com': [{'id': 'group1'}],
+        'group3@test.lyft.com': [],
+    }
+    # The first pages are sent in batches of 2, then the second page of group1 in a new round
+    assert batch_sizes == [2, 1, 1]
+
+
+@patch('cartography.intel.gsuite.api.load_gsuite_members')
+@patch(
+    'cartography.intel.gsuite.api.get_members_for_groups', return_value={
+        'group1@test.lyft.com': [{'id': 'user1'}, {'id': 'user2'}],
+        'group2@test.lyft.com': [{'id': 'group1'}],
+    },
+)
+def test_sync_gsuite_members(get_members_for_groups, load_gsuite_members):
+    admin_client = mock.MagicMock()
+    session = mock.MagicMock()
+    groups = [{'id': 'group1', 'email': 'group1@test.lyft.com'}, {'id': 'group2', 'email': 'group2@test.lyft.com'}]
+
+    api.sync_gsuite_members(groups, session, admin_client, 1)
+
+    # All memberships are loaded at once
+    get_members_for_groups.assert_called_once_with(admin_client, ['group1@test.lyft.com', 'group2@test.lyft.com'])
+    load_gsuite_members.assert_called_once_with(
+        session,
+        [
+            {'id': 'user1', 'group_id': 'group1'},
+            {'id': 'user2', 'group_id': 'group1'},
+            {'id': 'group1', 'group_id': 'group2'},
+        ],
+        1,
+    )
@@ -0,0 +1,194 @@
+import json
+from unittest.mock import MagicMock
+from unittest.mock import Mock
+from unittest.mock import patch
+
+import pytest
+
+import cartography.intel.kubernetes
+from cartography.config import Config
+from cartography.intel.kubernetes.pods import sync_pods
+from cartography.intel.kubernetes.pods import transform_pods
+from cartography.intel.kubernetes.services import transform_services
+from cartography.intel.kubernetes.util import get_epoch
+from cartography.intel.kubernetes.util import get_paginated_items
+
+TEST_CLUSTER = {"uid": "cluster-uid", "name": "my-cluster"}
+
+RAW_POD = {
+    "metadata": {
+        "uid": "pod-uid",
+        "name": "my-pod",
+        "namespace": "my-namespace",
+        "creationTimestamp": "2021-10-07T04:41:06Z",
+        "labels": {"app": "my-app"},
+    },
+    "spec": {
+        "nodeName": "my-node",
+        "containers": [{"name": "my-container", "image": "my-image:1.0"}],
+    },
+    "status": {
+        "phase": "Running",
+        "containerStatuses": [
+            {
+                "name": "my-container",
+                "imageID": "docker.io/my-image@sha256:0123",
+                "ready": True,
+                "started": True,
+                "state": {"running": {"startedAt": "2021-10-07T04:42:00Z"}},
+            },
+        ],
+    },
+}
+
+
+def _list_response(items, _continue=None):
+    metadata = {"continue": _continue} if _continue else {}
+    return Mock(data=json.dumps({"items": items, "metadata": metadata}).encode())
+
+
+def test_get_paginated_items():
+    list_func = Mock(side_effect=[_list_response([{"a": 1}], "token-1"), _list_response([{"b": 2}])])
+
+    assert list(get_paginated_items(list_func, page_size=1)) == [[{"a": 1}], [{"b": 2}]]
+
+    assert list_func.call_count == 2
+    list_func.assert_any_call(limit=1, _continue=None, _preload_content=False)
+    list_func.assert_called_with(limit=1, _continue="token-1", _preload_content=False)
+
+
+def test_get_epoch():
+    assert get_epoch("2021-10-07T04:41:06Z") == 1633581666
+    assert get_epoch(None) is None
+
+
+def test_transform_pods():
+    assert transform_pods([RAW_POD], TEST_CLUSTER) == [
+        {
+            "uid": "pod-uid",
+            "name": "my-pod",
+            "status_phase": "Running",
+            "creation_timestamp": 1633581666,
+            "deletion_timestamp": None,
+            "namespace": "my-namespace",
+            "node": "my-node",
+            "cluster_uid": "cluster-uid",
+            "labels": {"app": "my-app"},
+            "containers": [
+                {
+                    "name": "my-container",
+                    "image": "my-image:1.0",
+                    "uid": "pod-uid-my-container",
+                    "status": {
+                        "image_id": "docker.io/my-image@sha256:0123",
+                        "image_sha": "sha256:0123",
+                        "ready": True,
+                        "started": True,
+                        "state": "running",
+                    },
+                },
+            ],
+        },
+    ]
+
+
+def test_transform_services():
+    pods = transform_pods([RAW_POD], TEST_CLUSTER)
+    raw_services = [
+        {
+            "metadata": {"uid": "svc-1", "name": "my-service", "namespace": "my-namespace"},
+            "spec": {"type": "LoadBalancer", "selector": {"app": "my-app"}},
+            "status": {"loadBalancer": {"ingress": [{"hostname": "my-lb.example.com"}]}},
+        },
+        {
+            "metadata": {"uid": "svc-2", "name": "other-service", "namespace": "my-namespace"},
+            "spec": {"type": "ClusterIP", "selector": {"app": "other-app"}},
+        },
+    ]
+
+    services = transform_services(raw_services, TEST_CLUSTER, pods)
+
+    assert services[0]["ingress_host"] == "my-lb.example.com"
+    assert services[0]["ingress_ip"] is None
+    assert [pod["uid"] for pod in services[0]["pods"]] == ["pod-uid"]
+    assert services[1]["pods"] == []
+
+
+@patch('cartography.intel.kubernetes.pods.load_pods')
+def test_sync_pods_loads_each_page(mock_load_pods):
+    client = MagicMock()
+    second_pod = {**RAW_POD, "metadata": {**RAW_POD["metadata"], "uid": "pod-uid-2"}}
+    client.core.list_pod_for_all_namespaces.side_effect = [
+        _list_response([RAW_POD], "token-1"),
+        _list_response([second_pod]),
+    ]
+
+    pods = sync_pods(MagicMock(), client, 123, TEST_CLUSTER)
+
+    assert [pod["uid"] for pod in pods] == ["pod-uid", "pod-uid-2"]
+    assert mock_load_pods.call_count == 2
+    assert [pod["uid"] for pod in mock_load_pods.call_args_list[0][0][1]] == ["pod-uid"]
+
+
+def _k8s_clients(*names):
+    clients = []
+    for name in names:
+        client = MagicMock()
+        client.name = name
+        clients.append(client)
+    return clients
+
+
+@patch.object(cartography.intel.kubernetes, 'run_cleanup_job')
+@patch.object(cartography.intel.kubernetes, '_sync_cluster')
+@patch.object(cartography.intel.kubernetes, 'build_neo4j_driver')
+@patch.object(cartography.intel.kubernetes, 'get_k8s_clients')
+def test_start_k8s_ingestion_concurrently(mock_get_clients, mock_build_driver, mock_sync_cluster, mock_cleanup):
+    mock_get_clients.return_value = _k8s_clients('cluster-1', 'cluster-2', 'cluster-3')
+    session = MagicMock()
+    config = Config(
+        neo4j_uri='bolt://localhost:7687',
+        update_tag=123,
+        k8s_kubeconfig='kubeconfig',
+        k8s_sync_concurrency=2,
+    )
+
+    cartography.intel.kubernetes.start_k8s_ingestion(session, config)
+
+    # Each cluster is synced on its own session from the driver, then the cleanup runs once on the main session.
+    neo4j_driver = mock_build_driver.return_value
+    assert neo4j_driver.session.call_count == 3
+    assert {call.args[1].name for call in mock_sync_cluster.call_args_list} == {'cluster-1', 'cluster-2', 'cluster-3'}
+    neo4j_driver.close.assert_called_once()
+    mock_cleanup.assert_called_once()
+    assert mock_cleanup.call_args.args[1] is session
+
+
+@pytest.mark.parametrize('k8s_sync_concurrency', [1, 3])
+@patch.object(cartography.intel.kubernetes, 'run_cleanup_job')
+@patch.object(cartography.intel.kubernetes, '_sync_cluster')
+@patch.object(cartography.intel.kubernetes, 'build_neo4j_driver')
+@patch.object(cartography.intel.kubernetes, 'get_k8s_clients')
+def test_start_k8s_ingestion_aggregates_exceptions(
+    mock_get_clients, mock_build_driver, mock_sync_cluster, mock_cleanup, k8s_sync_concurrency,
+):
+    mock_get_clients.return_value = _k8s_clients('cluster-1', 'cluster-2', 'cluster-3')
+    mock_sync_cluster.side_effect = lambda session, client, update_tag: (
+        {}['foo'] if client.name != 'cluster-2' else None
+    )
+    config = Config(
+        neo4j_uri='bolt://localhost:7687',
+        update_tag=123,
+        k8s_kubeconfig='kubeconfig',
+        k8s_sync_concurrency=k8s_sync_concurrency,
+    )
+
+    with pytest.raises(Exception) as e:
+        cartography.intel.kubernetes.start_k8s_ingestion(MagicMock(), config)
+
+    # A failing cluster does not stop the others, and the cleanup is skipped so failed clusters keep their data.
+    assert mock_sync_cluster.call_count == 3
+    message = str(e.value)
+    assert message.count('KeyError') == 2
+    assert 'cluster-1' in message and 'cluster-3' in message
+    mock_cleanup.assert_not_called()
@@ -1,5 +1,7 @@
 import json
+from unittest import mock
 
+from cartography.intel.okta.applications import sync_okta_applications
 from cartography.intel.okta.applications import transform_application_assigned_groups
 from cartography.intel.okta.applications import transform_application_assigned_users
 from cartography.intel.okta.applications import transform_okta_application
@@ -117,3 +119,45 @@ def test_application_assigned_groups():
 
     expected = ["00gbkkGFFWZDLCNTAGQR", "00gg0xVALADWBPXOFZAS"]
     assert result == expected
+
+
+@mock.patch('cartography.intel.okta.applications._load_application_reply_urls')
+@mock.patch('cartography.intel.okta.applications._load_application_groups')
+@mock.patch('cartography.intel.okta.applications._load_application_users')
+@mock.patch('cartography.intel.okta.applications._load_okta_applications')
+@mock.patch('cartography.intel.okta.applications._get_application_assigned_groups')
+@mock.patch('cartography.intel.okta.applications._get_application_assigned_users')
+@mock.patch('cartography.intel.okta.applications._get_okta_applications')
+@mock.patch('cartography.intel.okta.applications.create_api_client')
+def test_sync_okta_applications_loads_assignments_in_bulk(
+    mock_api_client, mock_get_apps, mock_get_users, mock_get_groups, mock_load_apps, mock_load_users,
+    mock_load_groups, mock_load_reply_urls,
+):
+    app_1 = {**create_test_application(), 'settings': {}}
+    app_2 = {**json.loads(APPLICATION_WITH_REDITECT_URIS), 'id': 'app_2'}
+    mock_get_apps.return_value = [app_1, app_2]
+    mock_get_users.side_effect = lambda api_client, app_id, rate_limiter: [json.dumps([{'id': f'{app_id}_user'}])]
+    mock_get_groups.side_effect = lambda api_client, app_id, rate_limiter: [json.dumps([{'id': f'{app_id}_group'}])]
+
+    sync_okta_applications(mock.MagicMock(), 'org', 1, 'key')
+
+    # Both apps share the same rate limiter
+    assert len({call.args[2] for call in mock_get_users.call_args_list + mock_get_groups.call_args_list}) == 1
+    mock_load_users.assert_called_once_with(
+        mock.ANY,
+        [{'app_id': app_1['id'], 'user_id': f"{app_1['id']}_user"}, {'app_id': 'app_2', 'user_id': 'app_2_user'}],
+        1,
+    )
+    mock_load_groups.assert_called_once_with(
+        mock.ANY,
+        [{'app_id': app_1['id'], 'group_id': f"{app_1['id']}_group"}, {'app_id': 'app_2', 'group_id': 'app_2_group'}],
+        1,
+    )
+    mock_load_reply_urls.assert_called_once_with(
+        mock.ANY,
+        [
+            {'app_id': 'app_2', 'url': url}
+            for url in app_2['settings']['oauthClient']['redirect_uris']
+        ],
+        1,
+    )
@@ -1,6 +1,8 @@
 from typing import Dict
 from typing import List
+from unittest import mock
 
+from cartography.intel.okta.groups import sync_okta_group_membership
 from cartography.intel.okta.groups import transform_okta_group
 from cartography.intel.okta.groups import transform_okta_group_member_list
 from tests.data.okta.groups import create_test_group
@@ -93,3 +95,20 @@ def test_group_member_list_transform():
     assert ('Clarkson', 'OKTA_USER_ID_1') in last_names
     assert ('Hammond', 'OKTA_USER_ID_3') in last_names
     assert ('May', 'OKTA_USER_ID_2') in last_names
+
+
+@mock.patch('cartography.intel.okta.groups.load_okta_groups_members')
+@mock.patch('cartography.intel.okta.groups.get_okta_group_members')
+def test_sync_okta_group_membership_loads_in_bulk(mock_get_members, mock_load_members):
+    members = GROUP_MEMBERS_SAMPLE_DATA
+    mock_get_members.side_effect = lambda api_client, group_id, rate_limiter: members if group_id == 'group_1' else []
+
+    sync_okta_group_membership(mock.MagicMock(), mock.MagicMock(), [{'id': 'group_1'}, {'id': 'group_2'}], 1)
+
+    # Both groups share the same rate limiter
+    assert len({call.args[2] for call in mock_get_members.call_args_list}) == 1
+    mock_load_members.assert_called_once()
+    membership_list = mock_load_members.call_args.args[1]
+    assert len(membership_list) == len(members)
+    assert {membership['group_id'] for membership in membership_list} == {'group_1'}
+    assert {membership['id'] for membership in membership_list} == {member['id'] for member in members}
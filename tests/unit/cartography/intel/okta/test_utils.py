@@ -4,6 +4,7 @@ from unittest import mock
 import pytest
 
 from cartography.intel.okta.utils import check_rate_limit
+from cartography.intel.okta.utils import OktaRateLimiter
 from tests.data.okta.utils import create_long_timeout_response
 from tests.data.okta.utils import create_response
 from tests.data.okta.utils import create_throttled_response
@@ -33,3 +34,29 @@ def test_utils_log_rate_limit_reset():
 
     with pytest.raises(Exception):
         check_rate_limit(response)
+
+
+@mock.patch.object(time, 'sleep', return_value=None)
+def test_rate_limiter(mock_sleep: mock.MagicMock):
+    rate_limiter = OktaRateLimiter()
+    # No response seen yet, nothing to wait for
+    rate_limiter.wait()
+    mock_sleep.assert_not_called()
+
+    rate_limiter.update(create_response())
+    rate_limiter.wait()
+    mock_sleep.assert_not_called()
+    # The call is counted against the remaining requests until the next response updates them
+    assert rate_limiter.remaining == 298
+
+    rate_limiter.update(create_throttled_response())
+    rate_limiter.wait()
+    mock_sleep.assert_called_with(3)
+
+
+def test_rate_limiter_long_reset():
+    rate_limiter = OktaRateLimiter()
+    rate_limiter.update(create_long_timeout_response())
+
+    with pytest.raises(ValueError):
+        rate_limiter.wait()
@@ -163,4 +163,5 @@ def test_run_analysis_and_ensure_deps_no_requirements(mock_run_analysis_job: moc
         'aws_foreign_accounts.json',
         neo4j_session,
         common_job_parameters,
+        'cartography.data.jobs.analysis',
     )